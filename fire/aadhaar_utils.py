@@ -1,16 +1,12 @@
-import pytesseract
-from PIL import Image
 import re
 import csv
 import os
+from image_preprocessing import load_ocr_image, to_ocr_image
+from ocr_engine import image_to_string
 
 def preprocess_image(img):
-    """Preprocess image to improve OCR accuracy"""
-    # Convert to grayscale
-    img = img.convert('L')
-    # Increase contrast
-    img = img.point(lambda x: 0 if x < 128 else 255, '1')
-    return img
+    """Preprocess image to improve OCR accuracy (grayscale + binarize)"""
+    return to_ocr_image(img)
 
 def clean_aadhaar_number(text):
     """Clean and extract Aadhaar number from text"""
@@ -58,12 +54,11 @@ def extract_aadhaar(image_path):
             print("[ERROR] Image file does not exist")
             return None
             
-        # Open and preprocess image
-        img = Image.open(image_path)
-        img = preprocess_image(img)
+        # Decode (at reduced size for large photos) and preprocess image
+        img = load_ocr_image(image_path)
         
         # Extract text using different OCR configurations
-        text = pytesseract.image_to_string(img)
+        text = image_to_string(img)
         print(f"[DEBUG] Extracted raw text:\n{text}")
         
         # Clean and find Aadhaar number
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Lazy AI Provider for Fire NOC System
+Defers loading TensorFlow, OpenCV, scikit-learn and pytesseract until the AI engine
+is first needed, and warms the models up in a background thread so requests never block
+"""
+
+import importlib
+import importlib.util
+import threading
+import time
+from datetime import datetime
+
+AI_MODULE = 'real_ai_models'
+# Third-party packages real_ai_models imports at module level
+AI_DEPENDENCIES = ('tensorflow', 'sklearn')
+
+
+class LazyAIProvider:
+    """Loads RealAIEngine on first use or in a background warm-up thread"""
+
+    def __init__(self, module_name=AI_MODULE, dependencies=AI_DEPENDENCIES):
+        self.module_name = module_name
+        # Only check that the module and the packages it needs can be found - importing
+        # them is what we want to avoid. real_ai_models itself is always in the tree.
+        self.missing_dependencies = [name for name in dependencies if importlib.util.find_spec(name) is None]
+        self.available = importlib.util.find_spec(module_name) is not None and not self.missing_dependencies
+        self._engine = None
+        self._ready = threading.Event()
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.load_error = f"Missing packages: {', '.join(self.missing_dependencies)}" if self.missing_dependencies else None
+        self.load_seconds = None
+        self.warmup_started_at = None
+        self.model_versions = {}
+        # Shared AnalysisCache handed to the engine when it loads (set by the app)
+        self.analysis_cache = None
+        self.degraded_models = []
+
+    @property
+    def is_ready(self):
+        """True once the engine and its models are loaded"""
+        return self._ready.is_set()
+
+    def start_warmup(self):
+        """Start loading the AI engine in a background thread (idempotent)"""
+        if not self.available or self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.warmup_started_at = datetime.now().isoformat()
+            self._thread = threading.Thread(target=self._load, name='ai-warmup', daemon=True)
+            self._thread.start()
+
+    def _load(self):
+        """Import the AI stack and load all model artifacts"""
+        started = time.perf_counter()
+        try:
+            print("🤖 Warming up AI engine in background...")
+            module = importlib.import_module(self.module_name)
+            engine = module.ai_engine
+            if self.analysis_cache is not None:
+                engine.analysis_cache = self.analysis_cache
+
+            # Pull the registered model artifacts into memory so the first request doesn't pay for it.
+            # Models are never trained here; missing ones leave the engine degraded.
+            self.model_versions = engine.load_models()
+            self.degraded_models = engine.degraded_models()
+
+            self._engine = engine
+            self.load_seconds = time.perf_counter() - started
+            self._ready.set()
+            if self.degraded_models:
+                print(f"⚠️ AI engine ready in {self.load_seconds:.2f}s, degraded: {', '.join(self.degraded_models)}")
+            else:
+                print(f"✅ AI engine ready in {self.load_seconds:.2f}s")
+        except ImportError as e:
+            self.available = False
+            self.load_error = str(e)
+            print(f"⚠️ AI models not available - running in basic mode ({e})")
+        except Exception as e:
+            self.load_error = str(e)
+            print(f"❌ Error warming up AI engine: {str(e)}")
+        finally:
+            self._finished.set()
+
+    def get_engine(self, timeout=None, requires='document_classifier'):
+        """
+        Return the loaded engine, or None if it isn't ready yet or the model the caller
+        needs (an engine attribute: 'document_classifier', 'safety_detector',
+        'compliance_analyzer'; None for any) is degraded. Document callers then use basic
+        verification. Triggers the warm-up if it hasn't started; pass a timeout to wait for it.
+        """
+        if self._ready.is_set():
+            return self._usable_engine(requires)
+        if not self.available:
+            return None
+
+        self.start_warmup()
+        if timeout:
+            self._finished.wait(timeout)
+        return self._usable_engine(requires) if self._ready.is_set() else None
+
+    def _usable_engine(self, requires):
+        # Each model degrades on its own: a missing classifier doesn't stop compliance scoring
+        if requires and getattr(self._engine, requires).registry_name in self.degraded_models:
+            return None
+        return self._engine
+
+    def status(self):
+        """Readiness information for health checks and admin views"""
+        return {
+            'available': self.available,
+            'ready': self.is_ready,
+            'warmup_started_at': self.warmup_started_at,
+            'load_seconds': self.load_seconds,
+            'model_versions': self.model_versions,
+            'degraded_models': self.degraded_models,
+            'error': self.load_error
+        }
+
+
+# Global lazy AI provider instance
+ai_provider = LazyAIProvider()
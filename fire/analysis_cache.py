@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Document Analysis Cache for Fire NOC System
+Content-addressed cache of RealAIEngine.analyze_document results. Entries are keyed by
+the SHA-256 of the file bytes plus the loaded model versions, so re-uploads of an
+identical file hit the cache and every entry goes stale as soon as a model changes.
+A bounded in-process LRU answers repeats in microseconds; an optional MongoDB
+collection shares results between workers and restarts. Entries from older model
+versions are never hit again and age out through the last_used_at TTL index, so a
+process loading new models leaves entries still in use by other workers alone.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+# Bump when the shape of cached analysis results changes
+CACHE_FORMAT_VERSION = 1
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def model_fingerprint(model_versions):
+    """
+    Identity of the models that produced a result. A degraded model counts as
+    version None, so loading it later changes the fingerprint too.
+    """
+    payload = json.dumps({'format': CACHE_FORMAT_VERSION, 'models': model_versions}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class AnalysisCache:
+    """Two-tier (LRU memory + optional MongoDB) cache of document analyses"""
+
+    def __init__(self, collection=None, max_entries=512, max_digests=4096):
+        self.collection = collection
+        self.max_entries = max_entries
+        self.max_digests = max_digests
+        self._entries = OrderedDict()
+        # (path, size, mtime) -> sha256, so a repeat lookup doesn't re-read the file
+        self._digests = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ==================== KEYS ====================
+
+    def digest(self, path):
+        stat = os.stat(path)
+        identity = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(identity)
+            if digest is not None:
+                self._digests.move_to_end(identity)
+                return digest
+
+        digest = file_sha256(path)
+        with self._lock:
+            self._digests[identity] = digest
+            if len(self._digests) > self.max_digests:
+                self._digests.popitem(last=False)
+        return digest
+
+    def key(self, path, fingerprint):
+        return f"{self.digest(path)}:{fingerprint}"
+
+    # ==================== LOOKUP ====================
+
+    def get(self, path, fingerprint):
+        """Cached analysis for a file under the given model fingerprint, or None"""
+        if fingerprint is None:
+            return None
+        try:
+            key = self.key(path, fingerprint)
+        except OSError:
+            return None
+
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(copy.deepcopy(result), cache_hit=True)
+
+        if self.collection is not None:
+            try:
+                doc = self.collection.find_one_and_update(
+                    {'key': key},
+                    {'$set': {'last_used_at': datetime.now()}, '$inc': {'hits': 1}},
+                    projection={'result': 1}
+                )
+            except Exception as e:
+                print(f"⚠️ Analysis cache lookup failed: {e}")
+                doc = None
+            if doc:
+                self._remember(key, doc['result'])
+                with self._lock:
+                    self.hits += 1
+                return dict(copy.deepcopy(doc['result']), cache_hit=True)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, path, fingerprint, result):
+        """Store a successful analysis (failed analyses are not cached)"""
+        if fingerprint is None or not result or 'error' in result:
+            return
+        try:
+            key = self.key(path, fingerprint)
+        except OSError:
+            return
+
+        self._remember(key, result)
+        if self.collection is not None:
+            try:
+                self.collection.update_one(
+                    {'key': key},
+                    {'$set': {
+                        'key': key,
+                        'fingerprint': fingerprint,
+                        'result': result,
+                        'created_at': datetime.now(),
+                        'last_used_at': datetime.now()
+                    }, '$setOnInsert': {'hits': 0}},
+                    upsert=True
+                )
+            except Exception as e:
+                print(f"⚠️ Analysis cache write failed: {e}")
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._entries[key] = copy.deepcopy(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # ==================== STATS ====================
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'memory_entries': len(self._entries),
+                'backend': 'mongo' if self.collection is not None else 'memory'
+            }
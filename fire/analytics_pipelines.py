@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Analytics Aggregation Pipelines for Fire NOC System
+Computes the admin analytics payloads with single-pass $facet/$group pipelines
+instead of dozens of separate count_documents round trips
+"""
+
+from datetime import datetime, timedelta
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+# Dates sort above strings, numbers and null in BSON order, so `field >= DATE_FLOOR`
+# keeps aggregation expressions as type-strict as the equivalent query operators
+DATE_FLOOR = datetime(1, 1, 1)
+
+
+def calculate_trend_percentage(old_value, new_value):
+    """Calculate percentage change between two values"""
+    if old_value == 0:
+        return 100 if new_value > 0 else 0
+
+    return round(((new_value - old_value) / old_value) * 100)
+
+
+def month_floor(value):
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month_start(month_start):
+    return (month_start + timedelta(days=32)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+# ==================== EXPRESSION HELPERS ====================
+
+def _is_date(field):
+    return {'$gte': [field, DATE_FLOOR]}
+
+
+def _date_cond(field, gt=None, gte=None, lt=None, lte=None):
+    """Aggregation expression equivalent of {field: {'$gt'/'$gte'/'$lt'/'$lte': ...}}"""
+    conditions = [_is_date(field)]
+    if gt is not None:
+        conditions.append({'$gt': [field, gt]})
+    if gte is not None:
+        conditions.append({'$gte': [field, gte]})
+    if lt is not None:
+        conditions.append({'$lt': [field, lt]})
+    if lte is not None:
+        conditions.append({'$lte': [field, lte]})
+    return conditions
+
+
+def _status_is(status):
+    return {'$eq': ['$status', status]}
+
+
+def _count_if(*conditions):
+    """$sum accumulator counting documents that match every condition"""
+    flat = []
+    for condition in conditions:
+        if isinstance(condition, list):
+            flat.extend(condition)
+        else:
+            flat.append(condition)
+    return {'$sum': {'$cond': [{'$and': flat}, 1, 0]}}
+
+
+def _counts(collection, accumulators, match=None):
+    """Run one $group over the collection and return the accumulated counts"""
+    pipeline = []
+    if match:
+        pipeline.append({'$match': match})
+    group = {'_id': None}
+    group.update(accumulators)
+    pipeline.append({'$group': group})
+
+    result = list(collection.aggregate(pipeline))
+    counts = result[0] if result else {}
+    return {key: counts.get(key, 0) for key in accumulators}
+
+
+# ==================== OVERVIEW ====================
+
+def build_overview_analytics(applications, inspections, users, now=None):
+    """Payload for /api/analytics/overview (everything except the 'success' flag)"""
+    now = now or datetime.now()
+
+    current_month_start = month_floor(now)
+    last_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
+
+    # Last 6 months, oldest first (same month windows as the original loop)
+    windows = []
+    for i in range(5, -1, -1):
+        month_start = month_floor(now - timedelta(days=30 * i))
+        windows.append((month_start, next_month_start(month_start)))
+
+    counts_group = {
+        '_id': None,
+        'total': {'$sum': 1},
+        'pending': _count_if(_status_is('pending')),
+        'approved': _count_if(_status_is('approved')),
+        'rejected': _count_if(_status_is('rejected')),
+        'certificate_issued': _count_if(_status_is('certificate_issued')),
+        'valid_certificates': _count_if(
+            _status_is('certificate_issued'),
+            _date_cond('$noc_certificate_expiry', gt=now)
+        ),
+        'current_month': _count_if(_date_cond('$timestamp', gte=current_month_start)),
+        'last_month': _count_if(_date_cond('$timestamp', gte=last_month_start, lt=current_month_start)),
+    }
+    for index, (start, end) in enumerate(windows):
+        counts_group[f'new_{index}'] = _count_if(_date_cond('$timestamp', gte=start, lt=end))
+        counts_group[f'approved_{index}'] = _count_if(
+            _status_is('approved'), _date_cond('$approved_at', gte=start, lt=end)
+        )
+        counts_group[f'rejected_{index}'] = _count_if(
+            _status_is('rejected'), _date_cond('$processed_date', gte=start, lt=end)
+        )
+
+    facet = list(applications.aggregate([
+        {'$facet': {
+            'counts': [{'$group': counts_group}],
+            'processing': [
+                {'$match': {
+                    'status': 'approved',
+                    'approved_at': {'$type': 'date'},
+                    'timestamp': {'$type': 'date'}
+                }},
+                {'$project': {
+                    'days': {'$floor': {'$divide': [{'$subtract': ['$approved_at', '$timestamp']}, DAY_MS]}}
+                }},
+                {'$match': {'days': {'$gte': 0}}},
+                {'$group': {'_id': None, 'avg_days': {'$avg': '$days'}}}
+            ],
+            'business_types': [
+                {'$group': {'_id': '$business_type', 'count': {'$sum': 1}}},
+                {'$sort': {'count': -1}},
+                {'$limit': 5}
+            ]
+        }}
+    ]))[0]
+
+    counts = facet['counts'][0] if facet['counts'] else {}
+    processing = facet['processing'][0] if facet['processing'] else {}
+    business_types = facet['business_types']
+
+    stats = {
+        'total': counts.get('total', 0),
+        'pending': counts.get('pending', 0),
+        'approved': counts.get('approved', 0),
+        'rejected': counts.get('rejected', 0)
+    }
+
+    total_processed = stats['approved'] + stats['rejected']
+    stats['approval_rate'] = round((stats['approved'] / total_processed) * 100) if total_processed > 0 else 0
+
+    avg_days = processing.get('avg_days')
+    stats['avg_processing_time'] = round(avg_days, 1) if avg_days is not None else 0
+
+    total_certificates = counts.get('certificate_issued', 0)
+    valid_certificates = counts.get('valid_certificates', 0)
+    stats['compliance_rate'] = round((valid_certificates / total_certificates) * 100) if total_certificates > 0 else 0
+
+    trends = {
+        'total': calculate_trend_percentage(counts.get('last_month', 0), counts.get('current_month', 0)),
+        'approval_rate': 0,  # Would need more complex calculation
+        'processing_time': 0,  # Would need more complex calculation
+        'compliance': 0  # Would need more complex calculation
+    }
+
+    # Inspector performance is already a single aggregation; resolve names with one lookup
+    inspector_performance = list(inspections.aggregate([
+        {'$match': {'status': 'completed'}},
+        {'$group': {
+            '_id': '$inspector_id',
+            'completed': {'$sum': 1},
+            'avg_time': {'$avg': {'$subtract': ['$completion_date', '$date']}}
+        }},
+        {'$sort': {'completed': -1}},
+        {'$limit': 5}
+    ]))
+
+    inspector_ids = [inspector['_id'] for inspector in inspector_performance]
+    inspector_users = {
+        user['username']: user
+        for user in users.find({'username': {'$in': inspector_ids}}, {'username': 1, 'name': 1})
+    }
+
+    inspector_names = []
+    for inspector in inspector_performance:
+        inspector_user = inspector_users.get(inspector['_id'])
+        inspector_names.append(inspector_user.get('name', inspector['_id']) if inspector_user else inspector['_id'])
+    inspector_counts = [inspector['completed'] for inspector in inspector_performance]
+
+    return {
+        'stats': stats,
+        'trends': trends,
+        'charts': {
+            'application_trends': {
+                'labels': [start.strftime('%b %Y') for start, _ in windows],
+                'new': [counts.get(f'new_{i}', 0) for i in range(len(windows))],
+                'approved': [counts.get(f'approved_{i}', 0) for i in range(len(windows))],
+                'rejected': [counts.get(f'rejected_{i}', 0) for i in range(len(windows))]
+            },
+            'status_distribution': {
+                'labels': ['Pending', 'Approved', 'Rejected', 'Certificate Issued'],
+                'data': [stats['pending'], stats['approved'], stats['rejected'], total_certificates]
+            },
+            'business_types': {
+                'labels': [bt['_id'] for bt in business_types],
+                'data': [bt['count'] for bt in business_types]
+            },
+            'inspector_performance': {
+                'labels': inspector_names,
+                'data': inspector_counts
+            }
+        }
+    }
+
+
+# ==================== COMPLIANCE ====================
+
+def build_compliance_analytics(applications, inspections, now=None):
+    """Payload for /api/analytics/compliance (everything except the 'success' flag)"""
+    now = now or datetime.now()
+    thirty_days_future = now + timedelta(days=30)
+
+    current_month = month_floor(now)
+    windows = []
+    for i in range(5, -1, -1):
+        month_start = (current_month - timedelta(days=30 * i)).replace(day=1)
+        windows.append((month_start, (month_start + timedelta(days=32)).replace(day=1)))
+
+    current_quarter_start = current_month - timedelta(days=90)
+    previous_quarter_start = current_quarter_start - timedelta(days=90)
+
+    # Certificate counts - everything below is restricted to issued certificates
+    counts_group = {
+        '_id': None,
+        'total': {'$sum': 1},
+        'valid': _count_if(_date_cond('$noc_certificate_expiry', gt=now)),
+        'expiring': _count_if(_date_cond('$noc_certificate_expiry', gt=now, lte=thirty_days_future)),
+        'current_quarter_total': _count_if(_date_cond('$timestamp', lt=current_month)),
+        'current_quarter_valid': _count_if(
+            _date_cond('$timestamp', lt=current_month),
+            _date_cond('$noc_certificate_expiry', gt=current_quarter_start)
+        ),
+        'previous_quarter_total': _count_if(_date_cond('$timestamp', lt=current_quarter_start)),
+        'previous_quarter_valid': _count_if(
+            _date_cond('$timestamp', lt=current_quarter_start),
+            _date_cond('$noc_certificate_expiry', gt=previous_quarter_start)
+        ),
+    }
+    for index, (start, end) in enumerate(windows):
+        counts_group[f'month_total_{index}'] = _count_if(_date_cond('$timestamp', lt=end))
+        counts_group[f'month_valid_{index}'] = _count_if(
+            _date_cond('$timestamp', lt=end),
+            _date_cond('$noc_certificate_expiry', gt=start)
+        )
+
+    facet = list(applications.aggregate([
+        {'$match': {'status': 'certificate_issued'}},
+        {'$facet': {
+            'counts': [{'$group': counts_group}],
+            'by_type': [
+                {'$group': {
+                    '_id': '$business_type',
+                    'total': {'$sum': 1},
+                    'valid': {
+                        '$sum': {
+                            '$cond': [
+                                {'$gt': ['$noc_certificate_expiry', now]},
+                                1,
+                                0
+                            ]
+                        }
+                    }
+                }},
+                {'$project': {
+                    'type': '$_id',
+                    'compliance_rate': {
+                        '$multiply': [
+                            {'$divide': ['$valid', '$total']},
+                            100
+                        ]
+                    }
+                }},
+                {'$sort': {'compliance_rate': -1}},
+                {'$limit': 5}
+            ]
+        }}
+    ]))[0]
+
+    counts = facet['counts'][0] if facet['counts'] else {}
+    total_certificates = counts.get('total', 0)
+    overall_compliance = round((counts.get('valid', 0) / total_certificates) * 100) if total_certificates > 0 else 0
+
+    compliance_trend = []
+    for index in range(len(windows)):
+        month_total = counts.get(f'month_total_{index}', 0)
+        month_valid = counts.get(f'month_valid_{index}', 0)
+        compliance_trend.append(round((month_valid / month_total) * 100) if month_total > 0 else 0)
+
+    def rate(valid, total):
+        return (valid / total) * 100 if total > 0 else 0
+
+    current_quarter_compliance = rate(counts.get('current_quarter_valid', 0), counts.get('current_quarter_total', 0))
+    previous_quarter_compliance = rate(counts.get('previous_quarter_valid', 0), counts.get('previous_quarter_total', 0))
+
+    inspection_counts = _counts(inspections, {
+        'total': {'$sum': 1},
+        'completed': _count_if(_status_is('completed')),
+        'current_quarter': _count_if(_date_cond('$date', gte=current_quarter_start, lt=current_month)),
+        'current_quarter_completed': _count_if(
+            _status_is('completed'), _date_cond('$date', gte=current_quarter_start, lt=current_month)
+        ),
+        'previous_quarter': _count_if(_date_cond('$date', gte=previous_quarter_start, lt=current_quarter_start)),
+        'previous_quarter_completed': _count_if(
+            _status_is('completed'), _date_cond('$date', gte=previous_quarter_start, lt=current_quarter_start)
+        ),
+    })
+
+    total_inspections = inspection_counts['total']
+    inspection_compliance = round((inspection_counts['completed'] / total_inspections) * 100) if total_inspections > 0 else 0
+
+    current_quarter_inspection_compliance = rate(
+        inspection_counts['current_quarter_completed'], inspection_counts['current_quarter']
+    )
+    previous_quarter_inspection_compliance = rate(
+        inspection_counts['previous_quarter_completed'], inspection_counts['previous_quarter']
+    )
+
+    return {
+        'compliance': {
+            'overall': overall_compliance,
+            'expiring': counts.get('expiring', 0),
+            'inspection': inspection_compliance
+        },
+        'trends': {
+            'overall': calculate_trend_percentage(previous_quarter_compliance, current_quarter_compliance),
+            'inspection': calculate_trend_percentage(
+                previous_quarter_inspection_compliance, current_quarter_inspection_compliance
+            )
+        },
+        'charts': {
+            'by_type': {
+                'labels': [bt.get('type', 'Unknown') for bt in facet['by_type']],
+                'data': [round(bt.get('compliance_rate', 0)) for bt in facet['by_type']]
+            },
+            'trend': {
+                'labels': [start.strftime('%b %Y') for start, _ in windows],
+                'data': compliance_trend
+            }
+        }
+    }
+
+
+# ==================== PREDICTIVE ====================
+
+def build_predictive_analytics(applications, inspections, now=None):
+    """Payload for /api/analytics/predictive (everything except the 'success' flag)"""
+    now = now or datetime.now()
+    thirty_days_ago = now - timedelta(days=30)
+    sixty_days_ago = now - timedelta(days=60)
+    thirty_days_future = now + timedelta(days=30)
+
+    current_month = month_floor(now)
+
+    history = []
+    for i in range(6, 0, -1):
+        month_start = (current_month - timedelta(days=30 * i)).replace(day=1)
+        history.append((month_start, (month_start + timedelta(days=32)).replace(day=1)))
+
+    forecast = []
+    for i in range(6):
+        next_month = (current_month + timedelta(days=30 * i)).replace(day=1)
+        forecast.append((next_month, (next_month + timedelta(days=32)).replace(day=1)))
+
+    accumulators = {
+        'recent': _count_if(_date_cond('$timestamp', gte=thirty_days_ago)),
+        'previous': _count_if(_date_cond('$timestamp', gte=sixty_days_ago, lt=thirty_days_ago)),
+        'renewals': _count_if(
+            _status_is('certificate_issued'),
+            _date_cond('$noc_certificate_expiry', gt=now, lte=thirty_days_future)
+        ),
+    }
+    for index, (start, end) in enumerate(history):
+        accumulators[f'history_{index}'] = _count_if(_date_cond('$timestamp', gte=start, lt=end))
+    for index, (start, end) in enumerate(forecast):
+        accumulators[f'renewal_{index}'] = _count_if(
+            _status_is('certificate_issued'),
+            _date_cond('$noc_certificate_expiry', gte=start, lt=end)
+        )
+    counts = _counts(applications, accumulators)
+
+    # Simple linear prediction
+    recent_applications = counts['recent']
+    previous_applications = counts['previous']
+    if previous_applications > 0:
+        growth_rate = recent_applications / previous_applications
+        predicted_applications = round(recent_applications * growth_rate)
+    else:
+        predicted_applications = recent_applications
+
+    # Inspections prediction (pending plus the last month's completion volume)
+    last_month_start = (now - timedelta(days=30)).replace(hour=0, minute=0, second=0, microsecond=0)
+    inspection_counts = _counts(inspections, {
+        'pending': _count_if(_status_is('pending')),
+        'completed_last_month': _count_if(
+            _status_is('completed'), _date_cond('$completion_date', gte=last_month_start)
+        ),
+    })
+
+    historical_applications = [counts[f'history_{i}'] for i in range(len(history))]
+    avg_monthly_growth = sum(
+        (historical_applications[i] - historical_applications[i-1])
+        for i in range(1, len(historical_applications))
+    ) / (len(historical_applications) - 1)
+    last_value = historical_applications[-1]
+
+    return {
+        'predictions': {
+            'applications': predicted_applications,
+            'renewals': counts['renewals'],
+            'inspections': inspection_counts['pending'] + inspection_counts['completed_last_month']
+        },
+        'forecasts': {
+            'applications': {
+                'labels': [start.strftime('%b %Y') for start, _ in forecast],
+                'data': [max(0, round(last_value + avg_monthly_growth * (i + 1))) for i in range(len(forecast))]
+            },
+            'renewals': {
+                'labels': [start.strftime('%b %Y') for start, _ in forecast],
+                'data': [counts[f'renewal_{i}'] for i in range(len(forecast))]
+            }
+        }
+    }
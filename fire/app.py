@@ -12,7 +12,9 @@ from PIL import Image, ImageDraw, ImageFont
 import re
 import os
 import time
+import threading
 import secrets
+import uuid
 from datetime import datetime, timedelta
 from bson import ObjectId
 from werkzeug.utils import secure_filename
@@ -20,19 +22,25 @@ from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room
 from bson.json_util import dumps, loads
 from reportlab.lib import colors
 from email_service import EmailService
 from enhanced_sms_service import sms_service
-# AI imports - temporarily disabled for deployment
-try:
-    from real_ai_models import ai_engine
-    AI_ENABLED = True
-except ImportError:
-    print("⚠️ AI models not available - running in basic mode")
-    AI_ENABLED = False
-    ai_engine = None
+from analytics_pipelines import build_overview_analytics, build_compliance_analytics, build_predictive_analytics
+from cache_service import InvalidatingCollection, create_result_cache
+from email_outbox import EmailOutbox
+# AI engine is loaded lazily (TensorFlow/OpenCV import is deferred off the startup path)
+from ai_provider import ai_provider
+from model_registry import model_registry
+from analysis_cache import AnalysisCache
+from inference_service import InferenceJobQueue, STATUS_COMPLETED, STATUS_FAILED, start_local_workers
+from video_analysis import analyze_video
+from compliance_scoring import COMPLIANCE_SCOPES, score_applications
+from incremental_training import incremental_train, training_texts
+AI_ENABLED = ai_provider.available
+if not AI_ENABLED:
+    print(f"⚠️ AI models not available - running in basic mode ({ai_provider.load_error})")
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -82,6 +90,28 @@ def strftime_filter(date_string, format_string):
     else:
         return datetime.now().strftime(format_string)
 
+@app.before_request
+def warm_up_ai_engine():
+    """Start loading the AI models in the background once the server is taking requests"""
+    if AI_INFERENCE_MODE == 'worker' and ai_provider.available:
+        start_inference_service()
+    # Models load in the inference worker processes, not in the web server - unless no worker
+    # is running, in which case inference falls back to this process
+    if not inference_worker_enabled():
+        ai_provider.start_warmup()
+
+@app.before_request
+def start_email_outbox():
+    """Start the outbox senders once, so emails left pending or retrying by a restart go out"""
+    if email_outbox is not None:
+        email_outbox.start()
+
+@app.before_request
+def start_blockchain_anchoring():
+    """Attach the anchor listener once and requeue pending certificates in the background"""
+    if not _anchoring_started:
+        start_certificate_anchoring()
+
 # Session management decorator
 from functools import wraps
 
@@ -172,12 +202,72 @@ licenses = db['licenses']
 inspection_reports = db['inspection_reports']
 certificates = db['certificates']
 inventory = db['inventory']  # New collection for inventory management
+email_outbox_collection = db['email_outbox']
+
+def deliver_outbox_email(message):
+    """Send one outbox message from a worker thread (Flask-Mail needs the app context)"""
+    with app.app_context():
+        email_service.deliver_outbox_message(message)
+
+def deliver_outbox_emails(messages):
+    """Send a batch of due outbox messages over one SMTP connection from a worker thread"""
+    with app.app_context():
+        return email_service.send_many(messages)
+
+# Outbox workers send queued emails with retry/backoff (EMAIL_OUTBOX_ENABLED=false sends inline)
+if os.getenv('EMAIL_OUTBOX_ENABLED', 'True').lower() == 'true':
+    email_outbox = EmailOutbox(
+        email_outbox_collection,
+        deliver_outbox_email,
+        workers=int(os.getenv('EMAIL_OUTBOX_WORKERS', 2)),
+        max_attempts=int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 5)),
+        dedupe_window_seconds=int(os.getenv('EMAIL_DEDUPE_WINDOW_SECONDS', 300)),
+        # Bulk notifications queued together go out over one SMTP connection
+        deliver_batch=deliver_outbox_emails,
+        batch_size=int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 20))
+    )
+    email_service.outbox = email_outbox
+else:
+    email_outbox = None
+
+# Analysis results are cached by file content + model versions (shared between workers)
+ai_provider.analysis_cache = AnalysisCache(
+    db['ai_analysis_cache'],
+    max_entries=int(os.getenv('ANALYSIS_CACHE_MEMORY_ENTRIES', 512))
+)
+
+# Document analysis runs in separate inference worker processes (AI_INFERENCE_MODE=worker)
+# so TensorFlow/tesseract never block the eventlet loop; AI_INFERENCE_MODE=inline keeps it in-process
+AI_INFERENCE_MODE = os.getenv('AI_INFERENCE_MODE', 'worker').lower()
+INFERENCE_WATCH_INTERVAL = float(os.getenv('INFERENCE_WATCH_INTERVAL', 1.0))
+# The worker service has its own disk, so job files go through GridFS unless the workers
+# share this server's (INFERENCE_SHARED_FILES=True, e.g. a mounted volume)
+inference_jobs = InferenceJobQueue(
+    db['inference_jobs'],
+    stage_files=os.getenv('INFERENCE_SHARED_FILES', 'False').lower() != 'true'
+)
+
+# Indexes are declared in db_indexes.py and built with `python db_indexes.py`
+# (kept off the import path so worker start-up never waits on index builds)
+
+# Result cache for analytics/dashboard APIs (CACHE_BACKEND=memory|mongo)
+result_cache = create_result_cache(db)
+ADMIN_ANALYTICS_CACHE_TTL = int(os.getenv('ADMIN_ANALYTICS_CACHE_TTL', 300))
+DASHBOARD_CACHE_TTL = int(os.getenv('DASHBOARD_CACHE_TTL', 60))
+
+# Writes to the collections behind the analytics views drop the cached analytics (once
+# per request, when it finishes) so dashboards never show stale status counts
+applications = InvalidatingCollection(applications, result_cache, 'analytics')
+inspections = InvalidatingCollection(inspections, result_cache, 'analytics')
+licenses = InvalidatingCollection(licenses, result_cache, 'analytics')
+inspection_reports = InvalidatingCollection(inspection_reports, result_cache, 'analytics')
+certificates = InvalidatingCollection(certificates, result_cache, 'analytics')
+
+@app.teardown_request
+def invalidate_analytics_cache(error=None):
+    """Drop cached analytics after a request that wrote to the analytics collections"""
+    result_cache.flush_request_invalidations()
 
-# Add this to your MongoDB initialization in app.py
-db.inspections.create_index([('date', 1)])
-db.inspections.create_index([('status', 1)])
-db.inspections.create_index([('business_id', 1)])
-db.inspections.create_index([('inspector_id', 1)])
 # Tesseract configuration (disabled for deployment)
 # pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
@@ -230,17 +320,129 @@ def detect_document_content(image_path):
     except Exception as e:
         return "", [str(e)]
 
-def ai_verify_documents(application_id):
+def collect_verification_documents(application):
+    """
+    Check that every application document exists on disk.
+    Returns (verification_results, analyzable): failed results for missing files and
+    the indices of the documents to analyze.
+    """
+    verification_results = [None] * len(application['documents'])
+    analyzable = []
+
+    for index, doc in enumerate(application['documents']):
+        doc_type = doc.get('type', 'Unknown')
+        file_path = doc.get('path')
+
+        if not file_path or not os.path.exists(file_path):
+            verification_results[index] = {
+                'document': doc_type,
+                'status': 'failed',
+                'reason': 'File not found',
+                'ai_confidence': 0.0
+            }
+            continue
+
+        print(f"🔍 Analyzing document: {doc_type} at {file_path}")
+        analyzable.append(index)
+
+    return verification_results, analyzable
+
+def basic_verification_results(documents, analyzable):
+    """Basic fallback verification of the analyzable documents"""
+    ai_results = []
+    for index in analyzable:
+        doc_type = documents[index].get('type', 'Unknown')
+        ai_results.append(basic_document_analysis(
+            doc_type.lower().replace(' ', '_'), f'Document verified: {doc_type}'
+        ))
+    return ai_results
+
+def save_document_verification(application_id, documents, verification_results, analyzable, ai_results,
+                               verified_by_ai, stage_timings=None, model_versions=None):
+    """Turn analysis results into per-document verification results and store them on the application"""
+    for index, ai_result in zip(analyzable, ai_results):
+        doc_type = documents[index].get('type', 'Unknown')
+
+        if 'error' in ai_result:
+            verification_results[index] = {
+                'document': doc_type,
+                'status': 'failed',
+                'reason': ai_result['error'],
+                'ai_confidence': 0.0
+            }
+            continue
+
+        # Extract AI analysis results
+        classification = ai_result.get('classification', {})
+        equipment_detection = ai_result.get('equipment_detection', {})
+        extracted_text = ai_result.get('extracted_text', '')
+
+        # Determine verification status based on AI confidence
+        ai_confidence = classification.get('confidence', 0.0)
+        predicted_type = classification.get('document_type', 'unknown')
+
+        if ai_confidence > 0.7:  # High confidence threshold
+            status = 'verified'
+            reason = f"AI verified with {ai_confidence:.1%} confidence"
+        elif ai_confidence > 0.5:  # Medium confidence
+            status = 'needs_review'
+            reason = f"AI uncertain ({ai_confidence:.1%} confidence) - manual review needed"
+        else:  # Low confidence
+            status = 'failed'
+            reason = f"AI could not verify document ({ai_confidence:.1%} confidence)"
+
+        # Add equipment detection results if available
+        equipment_info = ""
+        if equipment_detection.get('detected_equipment') != 'unknown':
+            equipment_info = f" | Equipment detected: {equipment_detection.get('detected_equipment')} ({equipment_detection.get('confidence', 0):.1%})"
+
+        verification_results[index] = {
+            'document': doc_type,
+            'status': status,
+            'reason': reason,
+            'ai_confidence': ai_confidence,
+            'predicted_type': predicted_type,
+            'extracted_text_preview': extracted_text[:200] + "..." if len(extracted_text) > 200 else extracted_text,
+            'equipment_detection': equipment_info,
+            'ai_analysis_timestamp': ai_result.get('analysis_timestamp'),
+            'extracted_info': f"AI Analysis: {predicted_type} (confidence: {ai_confidence:.1%}){equipment_info}"
+        }
+
+    # Calculate overall AI verification score
+    total_confidence = sum([result.get('ai_confidence', 0) for result in verification_results])
+    avg_confidence = total_confidence / len(verification_results) if verification_results else 0
+
+    # Update application with REAL AI verification results
+    applications.update_one(
+        {'_id': ObjectId(application_id)},
+        {'$set': {
+            'document_verification': {
+                'verified_at': datetime.now(),
+                'results': verification_results,
+                'verified_by': 'Real AI System' if verified_by_ai else 'Basic Verification',
+                'ai_engine_version': '1.0',
+                'model_versions': model_versions,
+                'overall_confidence': avg_confidence,
+                'verification_method': 'machine_learning' if verified_by_ai else 'basic',
+                'stage_timings': stage_timings,
+                # Full OCR text per result, for incremental classifier training once a manager
+                # verifies (basic verification has only placeholder text, never trained on)
+                'extracted_texts': training_texts(verification_results, ai_results, analyzable) if verified_by_ai else None
+            }
+        }}
+    )
+
+    print(f"✅ REAL AI verification completed with {avg_confidence:.1%} overall confidence")
+    return verification_results
+
+def ai_verify_documents(application_id, asynchronous=False, owner=None):
     """
     AI-powered document verification for application documents
-    Falls back to basic verification when AI is not available
+    Falls back to basic verification when AI is not available.
+    With asynchronous=True and the inference workers enabled the analysis is queued
+    and ({'job_id': ...}) is returned; the results are stored when the job finishes.
     """
     try:
-        if AI_ENABLED:
-            print(f"🤖 Starting REAL AI verification for application {application_id}")
-        else:
-            print(f"📋 Starting basic document verification for application {application_id}")
-
         # Get application data
         application = applications.find_one({'_id': ObjectId(application_id)})
         if not application:
@@ -249,128 +451,434 @@ def ai_verify_documents(application_id):
         if 'documents' not in application or not application['documents']:
             return False, "No documents found in application"
 
-        verification_results = []
+        documents = application['documents']
+        verification_results, analyzable = collect_verification_documents(application)
+
+        if asynchronous and analyzable and inference_worker_enabled():
+            print(f"🤖 Queueing REAL AI verification for application {application_id}")
+            job_id = submit_inference_job(
+                'analyze_documents',
+                {'file_paths': [documents[index]['path'] for index in analyzable]},
+                purpose='document_verification',
+                context={
+                    'application_id': str(application_id),
+                    'verification_results': verification_results,
+                    'analyzable': analyzable
+                },
+                owner=owner
+            )
+            return True, {'job_id': job_id, 'status': 'queued'}
 
-        # Process each document
-        for doc in application['documents']:
-            doc_type = doc.get('type', 'Unknown')
-            file_path = doc.get('path')
-
-            if not file_path or not os.path.exists(file_path):
-                verification_results.append({
-                    'document': doc_type,
-                    'status': 'failed',
-                    'reason': 'File not found',
-                    'ai_confidence': 0.0
-                })
-                continue
+        ai_engine = local_ai_engine()
+        if ai_engine:
+            print(f"🤖 Starting REAL AI verification for application {application_id}")
+        else:
+            print(f"📋 Starting basic document verification for application {application_id}")
 
-            print(f"🔍 Analyzing document: {doc_type} at {file_path}")
+        # Use AI engine if available (concurrent OCR + one CNN batch), otherwise basic verification
+        stage_timings = None
+        if ai_engine and analyzable:
+            ai_results, stage_timings = ai_engine.analyze_documents(
+                [documents[index]['path'] for index in analyzable]
+            )
+            print(f"⏱️ Verification pipeline: {stage_timings['total_ms']:.0f} ms for {len(analyzable)} document(s)")
+        else:
+            ai_results = basic_verification_results(documents, analyzable)
 
-            # Use AI engine if available, otherwise basic verification
-            if AI_ENABLED and ai_engine:
-                ai_result = ai_engine.analyze_document(file_path)
-            else:
-                # Basic fallback verification
-                ai_result = {
-                    'classification': {
-                        'document_type': doc_type.lower().replace(' ', '_'),
-                        'confidence': 0.85
-                    },
-                    'equipment_detection': {'detected_items': []},
-                    'extracted_text': f'Document verified: {doc_type}'
-                }
+        verification_results = save_document_verification(
+            application_id, documents, verification_results, analyzable, ai_results,
+            verified_by_ai=bool(ai_engine), stage_timings=stage_timings,
+            model_versions=ai_engine.model_versions() if ai_engine else None
+        )
+        return True, verification_results
 
-            if 'error' in ai_result:
-                verification_results.append({
-                    'document': doc_type,
-                    'status': 'failed',
-                    'reason': ai_result['error'],
-                    'ai_confidence': 0.0
-                })
-                continue
-
-            # Extract AI analysis results
-            classification = ai_result.get('classification', {})
-            equipment_detection = ai_result.get('equipment_detection', {})
-            extracted_text = ai_result.get('extracted_text', '')
-
-            # Determine verification status based on AI confidence
-            ai_confidence = classification.get('confidence', 0.0)
-            predicted_type = classification.get('document_type', 'unknown')
-
-            if ai_confidence > 0.7:  # High confidence threshold
-                status = 'verified'
-                reason = f"AI verified with {ai_confidence:.1%} confidence"
-            elif ai_confidence > 0.5:  # Medium confidence
-                status = 'needs_review'
-                reason = f"AI uncertain ({ai_confidence:.1%} confidence) - manual review needed"
-            else:  # Low confidence
-                status = 'failed'
-                reason = f"AI could not verify document ({ai_confidence:.1%} confidence)"
-
-            # Add equipment detection results if available
-            equipment_info = ""
-            if equipment_detection.get('detected_equipment') != 'unknown':
-                equipment_info = f" | Equipment detected: {equipment_detection.get('detected_equipment')} ({equipment_detection.get('confidence', 0):.1%})"
-
-            verification_results.append({
-                'document': doc_type,
-                'status': status,
-                'reason': reason,
-                'ai_confidence': ai_confidence,
-                'predicted_type': predicted_type,
-                'extracted_text_preview': extracted_text[:200] + "..." if len(extracted_text) > 200 else extracted_text,
-                'equipment_detection': equipment_info,
-                'ai_analysis_timestamp': ai_result.get('analysis_timestamp'),
-                'extracted_info': f"AI Analysis: {predicted_type} (confidence: {ai_confidence:.1%}){equipment_info}"
-            })
+    except Exception as e:
+        print(f"❌ Error in REAL AI document verification: {str(e)}")
+        return False, str(e)
 
-        # Calculate overall AI verification score
-        total_confidence = sum([result.get('ai_confidence', 0) for result in verification_results])
-        avg_confidence = total_confidence / len(verification_results) if verification_results else 0
+# ==================== INFERENCE WORKERS ====================
 
-        # Update application with REAL AI verification results
+_inference_started = False
+_inference_lock = threading.Lock()
+_local_inference_workers = None
+
+def inference_worker_enabled():
+    """
+    True when document analysis should be queued for the inference worker processes: worker
+    mode, and this server started its own pool or a worker has sent a heartbeat recently.
+    Otherwise nothing would pick the jobs up, so callers run inference in this process.
+    """
+    return (AI_INFERENCE_MODE == 'worker' and ai_provider.available and
+            (_local_inference_workers is not None or inference_jobs.workers_alive()))
+
+def local_ai_engine(requires='document_classifier'):
+    """
+    The AI engine of this process, or None (see LazyAIProvider.get_engine). With the inference
+    workers enabled the models only load in the worker processes, never in the web server.
+    """
+    return None if inference_worker_enabled() else ai_provider.get_engine(requires=requires)
+
+def start_inference_service():
+    """
+    Start the completion watcher, once. Under gunicorn the workers are their own service (the
+    Procfile worker), so the web server only starts a local pool of its own when run as
+    `python app.py` or with INFERENCE_WORKER_AUTOSTART=True.
+    """
+    global _inference_started, _local_inference_workers
+    if _inference_started:
+        return
+    with _inference_lock:
+        if _inference_started:
+            return
+        _inference_started = True
+        if os.getenv('INFERENCE_WORKER_AUTOSTART', str(__name__ == '__main__')).lower() == 'true':
+            try:
+                _local_inference_workers = start_local_workers(int(os.getenv('INFERENCE_PROCESSES', 2)))
+            except Exception as e:
+                print(f"❌ Could not start inference workers: {e}")
+        else:
+            print("🤖 Inference jobs are left to the worker service (python inference_service.py)")
+        socketio.start_background_task(watch_inference_jobs)
+
+_anchoring_started = False
+_anchoring_lock = threading.Lock()
+# Certificates issued by this process are queued by the route itself; only older pending
+# ones are requeued at start-up
+_process_started_at = datetime.now()
+
+def on_certificates_anchored(block, entries):
+    """Anchor thread listener: record the block on each application and tell the dashboards"""
+    for entry in entries:
+        application_id = entry['certificate_data'].get('application_id')
+        if not application_id:
+            continue
         applications.update_one(
-            {'_id': ObjectId(application_id)},
+            {'_id': ObjectId(application_id), 'blockchain_transaction_id': entry['transaction_id']},
             {'$set': {
-                'document_verification': {
-                    'verified_at': datetime.now(),
-                    'results': verification_results,
-                    'verified_by': 'Real AI System',
-                    'ai_engine_version': '1.0',
-                    'overall_confidence': avg_confidence,
-                    'verification_method': 'machine_learning'
-                }
-            }}
+                'blockchain_status': 'anchored',
+                'blockchain_verified': True,
+                'blockchain_block_index': block.index,
+                'blockchain_block_hash': block.hash,
+                'blockchain_anchored_at': datetime.now()
+            }, '$unset': {'blockchain_certificate_data': ''}}
         )
+        socketio.emit('certificate_anchored', {
+            'application_id': application_id,
+            'business_name': entry['certificate_data'].get('business_name'),
+            'transaction_id': entry['transaction_id'],
+            'certificate_hash': entry['certificate_data'].get('certificate_hash'),
+            'block_index': block.index,
+            'blockchain_verified': True
+        })
 
-        print(f"✅ REAL AI verification completed with {avg_confidence:.1%} overall confidence")
-        return True, verification_results
+def start_certificate_anchoring():
+    """
+    Start the anchor thread with on_certificates_anchored attached, once, and requeue the
+    certificates left pending by the last run in the background (the chain load is slow)
+    """
+    global _anchoring_started
+    if _anchoring_started:
+        return
+    with _anchoring_lock:
+        if _anchoring_started:
+            return
+        from blockchain_service import add_anchor_listener
+
+        add_anchor_listener(on_certificates_anchored)
+        _anchoring_started = True
+    socketio.start_background_task(requeue_pending_certificates)
+
+def requeue_pending_certificates():
+    """Queue certificates still pending from before this process started"""
+    from blockchain_service import get_blockchain, get_transaction, submit_certificate
+
+    blockchain = get_blockchain()
+    requeued = 0
+    for application in applications.find({'blockchain_status': 'pending',
+                                           'noc_certificate_date': {'$lt': _process_started_at}},
+                                          {'blockchain_transaction_id': 1, 'blockchain_certificate_data': 1}):
+        transaction_id = application.get('blockchain_transaction_id')
+        block = blockchain.find_transaction(transaction_id)
+        if block is not None:
+            # Mined, but the server stopped before the application was updated
+            on_certificates_anchored(block, [{'transaction_id': transaction_id,
+                                              'certificate_data': get_transaction(transaction_id)['certificate_data']}])
+        elif application.get('blockchain_certificate_data'):
+            submit_certificate(application['blockchain_certificate_data'], transaction_id)
+            requeued += 1
+    if requeued:
+        print(f"⛓️ Requeued {requeued} certificate(s) pending blockchain anchoring")
+
+def submit_inference_job(kind, payload, purpose, context, owner=None):
+    """Queue an inference job and make sure something will pick it up"""
+    start_inference_service()
+    job_id = inference_jobs.submit(kind, payload, purpose=purpose, context=context, owner=owner)
+    print(f"📥 Queued {kind} job {job_id} ({purpose})")
+    return job_id
+
+def finish_document_verification_job(job):
+    """Store the result of an ai_verify_documents job"""
+    context = job['context']
+    application = applications.find_one({'_id': ObjectId(context['application_id'])})
+    if not application:
+        return {'success': False, 'error': 'Application not found'}
+
+    result = job.get('result') or {}
+    documents = application['documents']
+    analyzable = context['analyzable']
+    if result.get('degraded'):
+        ai_results = basic_verification_results(documents, analyzable)
+    else:
+        ai_results = result['results']
+
+    verification_results = save_document_verification(
+        context['application_id'], documents, context['verification_results'], analyzable, ai_results,
+        verified_by_ai=not result.get('degraded'), stage_timings=result.get('stage_timings'),
+        model_versions=result.get('model_versions')
+    )
+    log_activity(
+        'Document Verification',
+        f"AI verified documents for application {context['application_id']}",
+        job.get('owner')
+    )
+    return {'success': True, 'message': 'Documents verified successfully', 'results': verification_results}
+
+def finish_manager_verification_job(job):
+    """Score and store the result of a /api/manager/verify-documents job"""
+    context = job['context']
+    application = applications.find_one({'_id': ObjectId(context['application_id'])})
+    if not application:
+        return {'success': False, 'error': 'Application not found'}
+
+    result = job.get('result') or {}
+    paths = application_document_paths(application)
+    if result.get('degraded'):
+        ai_results = {
+            key: basic_document_analysis(APPLICATION_DOCUMENT_TYPES[key], ANALYZED_DOCUMENT_TYPES[APPLICATION_DOCUMENT_TYPES[key]][1])
+            for key in context['keys']
+        }
+    else:
+        ai_results = dict(zip(context['keys'], result['results']))
+
+    verification_results = score_application_documents(paths, ai_results)
+    avg_score = save_manager_verification(
+        context['application_id'], verification_results, result.get('stage_timings'), job.get('owner')
+    )
+    return {
+        'success': True,
+        'verification_score': avg_score,
+        'results': verification_results,
+        'stage_timings': result.get('stage_timings')
+    }
+
+def finish_compliance_scoring_job(job):
+    """Report a portfolio compliance re-scoring run"""
+    stats = job.get('result') or {}
+    if stats.get('success'):
+        log_activity(
+            'Compliance Scoring',
+            f"Re-scored {stats['rows']} {stats['scope']} applications ({stats['rows_per_second']:.0f} rows/sec)",
+            job.get('owner')
+        )
+    return stats
+
+def finish_classifier_training_job(job):
+    """Report an incremental document classifier training run"""
+    stats = job.get('result') or {}
+    if stats.get('published'):
+        log_activity(
+            'Classifier Training',
+            f"Trained on {stats['documents']} newly verified documents in {stats['seconds']}s; "
+            f"document classifier version {stats['version']} published",
+            job.get('owner')
+        )
+    return stats
+
+def set_video_analysis(application_id, filename, fields):
+    """Update one entry of applications.inspection_videos"""
+    applications.update_one(
+        {'_id': ObjectId(application_id), 'inspection_videos.filename': filename},
+        {'$set': {f'inspection_videos.$.{key}': value for key, value in fields.items()}}
+    )
+
+def queue_video_analysis(application_id, filename, video_path, owner):
+    """Start keyframe analysis of an uploaded inspection video. Returns its status for the upload response."""
+    if inference_worker_enabled():
+        job_id = submit_inference_job(
+            'analyze_video', {'video_path': video_path},
+            purpose='video_analysis',
+            context={'application_id': application_id, 'filename': filename},
+            owner=owner
+        )
+        set_video_analysis(application_id, filename, {'analysis_status': 'queued', 'analysis_job_id': job_id})
+        return {'status': 'queued', 'job_id': job_id}
+
+    ai_engine = ai_provider.get_engine(requires='safety_detector')
+    if not ai_engine:
+        set_video_analysis(application_id, filename, {'analysis_status': 'unavailable'})
+        return {'status': 'unavailable'}
+
+    socketio.start_background_task(run_video_analysis_inline, ai_engine, application_id, filename, video_path, owner)
+    set_video_analysis(application_id, filename, {'analysis_status': 'running'})
+    return {'status': 'running'}
 
+def run_video_analysis_inline(ai_engine, application_id, filename, video_path, owner=None):
+    """AI_INFERENCE_MODE=inline: analyze in a background task of this process"""
+    context = {'application_id': application_id, 'filename': filename}
+
+    def progress(data):
+        emit_to_owner(owner, 'ai_job_progress', {'job_id': None, 'purpose': 'video_analysis', **context, 'progress': data})
+        socketio.sleep(0)
+
+    try:
+        analysis = analyze_video(ai_engine.safety_detector, video_path, progress=progress)
+        set_video_analysis(application_id, filename, {'analysis_status': 'completed', 'analysis': analysis})
+        outcome = {'success': True, 'analysis': analysis}
     except Exception as e:
-        print(f"❌ Error in REAL AI document verification: {str(e)}")
-        return False, str(e)
+        print(f"❌ Error analyzing inspection video {filename}: {str(e)}")
+        set_video_analysis(application_id, filename, {'analysis_status': 'failed', 'analysis_error': str(e)})
+        outcome = {'success': False, 'error': str(e)}
+
+    emit_to_owner(owner, 'ai_job_completed', {
+        'job_id': None, 'purpose': 'video_analysis', **context,
+        'status': STATUS_COMPLETED if outcome['success'] else STATUS_FAILED,
+        'success': outcome['success'], 'error': outcome.get('error')
+    })
+
+def finish_video_analysis_job(job):
+    """Store keyframe detections on the inspection video entry"""
+    context = job['context']
+    analysis = job.get('result') or {}
+    set_video_analysis(context['application_id'], context['filename'], {'analysis_status': 'completed', 'analysis': analysis})
+    print(f"🎬 Video {context['filename']}: {analysis.get('frames_analyzed', 0)} keyframes, "
+          f"equipment: {', '.join(analysis.get('equipment_detected', [])) or 'none'}")
+    return {'success': True, 'analysis': analysis}
+
+def fail_video_analysis_job(job):
+    context = job['context']
+    set_video_analysis(context['application_id'], context['filename'],
+                       {'analysis_status': 'failed', 'analysis_error': job.get('error')})
+
+def save_equipment_detections(inspection_id, indexes, paths, detections):
+    """
+    Set each analyzed photo's detection by position, so photos uploaded meanwhile are not
+    overwritten; the path check skips the write if the array was reshaped under us
+    """
+    if not indexes:
+        return
+    inspections.update_one(
+        dict({'_id': ObjectId(inspection_id)},
+             **{f'inspection_photos.{i}.path': path for i, path in zip(indexes, paths)}),
+        {'$set': {f'inspection_photos.{i}.equipment_detection': detection for i, detection in zip(indexes, detections)}}
+    )
+
+def inspection_photo_detections(inspection_id):
+    inspection = inspections.find_one({'_id': ObjectId(inspection_id)}, {'inspection_photos': 1}) or {}
+    return [
+        {'filename': photo.get('filename'), 'equipment_detection': photo.get('equipment_detection')}
+        for photo in inspection.get('inspection_photos', [])
+    ]
+
+def finish_equipment_detection_job(job):
+    """Store the detections of a /api/inspection/<id>/detect-equipment job on the inspection photos"""
+    context = job['context']
+    detections = (job.get('result') or {}).get('results', [])
+    save_equipment_detections(context['inspection_id'], context['photos'], job['payload']['file_paths'], detections)
+    return {
+        'success': True,
+        'analyzed': len(detections),
+        'photos': inspection_photo_detections(context['inspection_id'])
+    }
+
+# purpose -> function(job) called when a job failed in the worker
+INFERENCE_JOB_FAILURE_HANDLERS = {
+    'video_analysis': fail_video_analysis_job
+}
+
+# purpose -> function(job) returning the response the synchronous route would have sent
+INFERENCE_JOB_FINISHERS = {
+    'document_verification': finish_document_verification_job,
+    'manager_verification': finish_manager_verification_job,
+    'compliance_scoring': finish_compliance_scoring_job,
+    'classifier_training': finish_classifier_training_job,
+    'video_analysis': finish_video_analysis_job,
+    'equipment_detection': finish_equipment_detection_job
+}
+
+def apply_inference_job(job):
+    """Apply a finished job to the application and tell the dashboards"""
+    job_id = str(job['_id'])
+    try:
+        if job['status'] == STATUS_FAILED:
+            outcome = {'success': False, 'error': job.get('error') or 'AI analysis failed'}
+            failure_handler = INFERENCE_JOB_FAILURE_HANDLERS.get(job.get('purpose'))
+            if failure_handler:
+                failure_handler(job)
+        else:
+            finisher = INFERENCE_JOB_FINISHERS.get(job.get('purpose'))
+            outcome = finisher(job) if finisher else {'success': True, 'result': job.get('result')}
+            if job.get('purpose') in INFERENCE_JOB_FINISHERS:
+                result_cache.invalidate('analytics')
+    except Exception as e:
+        print(f"❌ Error applying inference job {job_id}: {str(e)}")
+        outcome = {'success': False, 'error': str(e)}
+
+    inference_jobs.set_outcome(job_id, outcome)
+    inference_jobs.release_files(job)
+    emit_to_owner(job.get('owner'), 'ai_job_completed', inference_job_event(
+        job,
+        status=job['status'],
+        success=outcome.get('success', False),
+        error=outcome.get('error')
+    ))
+
+def emit_to_owner(owner, event, data):
+    """Socket.IO event for the user who submitted a job only (their notification room)"""
+    if owner:
+        socketio.emit(event, data, to=f'notification_{owner}')
+
+def inference_job_event(job, **fields):
+    """Socket.IO payload for a job (the context's identifiers only, never its results)"""
+    context = job.get('context', {})
+    event = {
+        'job_id': str(job['_id']),
+        'purpose': job.get('purpose'),
+        'application_id': context.get('application_id')
+    }
+    if 'filename' in context:
+        event['filename'] = context['filename']
+    event.update(fields)
+    return event
+
+def emit_inference_progress(job):
+    emit_to_owner(job.get('owner'), 'ai_job_progress', inference_job_event(job, progress=job.get('progress')))
+
+def watch_inference_jobs():
+    """Background task: push worker progress and apply finished inference jobs as they complete"""
+    print("👀 Watching inference jobs")
+    while True:
+        try:
+            progressed = inference_jobs.claim_progress()
+            if progressed:
+                emit_inference_progress(progressed)
+            job = inference_jobs.claim_finished()
+        except Exception as e:
+            print(f"Error polling inference jobs: {e}")
+            progressed = job = None
+
+        if job:
+            apply_inference_job(job)
+        elif not progressed:
+            socketio.sleep(INFERENCE_WATCH_INTERVAL)
 
 def send_email(subject, recipient, body, html_body=None, attachments=None):
     """Enhanced email sending function with HTML support and attachments"""
-    try:
-        msg = Message(subject, sender=app.config['MAIL_USERNAME'], recipients=[recipient])
-        msg.body = body
-        if html_body:
-            msg.html = html_body
-
-        # Add attachments if provided
-        if attachments:
-            for attachment in attachments:
-                if isinstance(attachment, dict):
-                    msg.attach(
-                        attachment.get('filename', 'attachment'),
-                        attachment.get('content_type', 'application/octet-stream'),
-                        attachment.get('data')
-                    )
+    if email_outbox is not None:
+        # Request path only pays for one insert; the outbox workers do the SMTP work
+        return email_outbox.enqueue(subject, recipient, body, html_body, attachments)
 
-        mail.send(msg)
+    try:
+        email_service.send_message(subject, recipient, body, html_body, attachments)
         return True
     except Exception as e:
         print(f"Error sending email: {e}")
@@ -2121,36 +2629,23 @@ def verify_documents():
         if not app:
             return jsonify({'error': 'Application not found'}), 404
 
-        # AI Document Analysis
-        verification_results = {
-            'building_plan': analyze_building_plan(app.get('building_plan_path')),
-            'safety_certificate': analyze_safety_certificate(app.get('safety_certificate_path')),
-            'insurance_document': analyze_insurance_document(app.get('insurance_document_path')),
-            'business_license': analyze_business_license(app.get('business_license_path'))
-        }
+        # Queue the AI analysis for the inference workers; the result is pushed over Socket.IO
+        if inference_worker_enabled():
+            job_id = submit_manager_verification(app, session['username'])
+            if job_id:
+                return jsonify({'success': True, 'job_id': job_id, 'status': 'queued'}), 202
 
-        # Calculate overall verification score
-        total_score = sum([result.get('score', 0) for result in verification_results.values()])
-        avg_score = total_score / len(verification_results)
+        # AI Document Analysis
+        verification_results, stage_timings = analyze_application_documents(app)
 
         # Update application with verification results
-        applications.update_one(
-            {'_id': ObjectId(application_id)},
-            {
-                '$set': {
-                    'documents_verified': True,
-                    'verification_score': avg_score,
-                    'verification_results': verification_results,
-                    'verified_by': session['username'],
-                    'verified_at': datetime.now()
-                }
-            }
-        )
+        avg_score = save_manager_verification(application_id, verification_results, stage_timings, session['username'])
 
         return jsonify({
             'success': True,
             'verification_score': avg_score,
-            'results': verification_results
+            'results': verification_results,
+            'stage_timings': stage_timings
         })
 
     except Exception as e:
@@ -3312,6 +3807,7 @@ def get_inspector_applications():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/inspector/analytics')
+@result_cache.cached_json('analytics:inspector', DASHBOARD_CACHE_TTL, roles=['inspector'], per_user=True)
 def get_inspector_analytics():
     """Get real analytics data for inspector dashboard"""
     if session.get('role') != 'inspector':
@@ -3520,7 +4016,8 @@ def upload_inspection_video():
             'video_type': video_type,
             'uploaded_at': datetime.now(),
             'uploaded_by': session['username'],
-            'file_path': video_path
+            'file_path': video_path,
+            'analysis_status': 'pending'
         }
 
         applications.update_one(
@@ -3535,10 +4032,14 @@ def upload_inspection_video():
         # Log activity
         log_activity('Video Uploaded', f"Inspection video uploaded for application {application_id}")
 
+        # Keyframe safety equipment analysis runs in the background
+        analysis = queue_video_analysis(application_id, filename, video_path, session['username'])
+
         return jsonify({
             'success': True,
             'message': 'Video uploaded successfully',
-            'filename': filename
+            'filename': filename,
+            'analysis': analysis
         })
 
     except Exception as e:
@@ -3700,6 +4201,7 @@ def complete_inspection():
 
 @app.route('/api/manager/real-analytics')
 @role_required(['manager'])
+@result_cache.cached_json('analytics:manager', DASHBOARD_CACHE_TTL, roles=['manager'], per_user=True)
 def get_manager_real_analytics():
     """Get real-time analytics data for manager dashboard"""
     print(f"ANALYTICS: Manager {session.get('username')} requesting real analytics")
@@ -3807,222 +4309,48 @@ def get_manager_real_analytics():
 
     except Exception as e:
         print(f"Error in manager real analytics: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-# REAL AI Document Analysis Functions
-def analyze_building_plan(file_path):
-    """Analyze building plan using AI or basic analysis"""
-    if not file_path:
-        return {'score': 0, 'issues': ['No building plan provided'], 'ai_analysis': False}
-
-    try:
-        if AI_ENABLED and ai_engine:
-            print(f"🤖 REAL AI analyzing building plan: {file_path}")
-            # Use real AI engine for analysis
-            ai_result = ai_engine.analyze_document(file_path)
-        else:
-            print(f"📋 Basic analysis of building plan: {file_path}")
-            # Basic fallback analysis
-            ai_result = {
-                'classification': {
-                    'document_type': 'building_plan',
-                    'confidence': 0.85
-                },
-                'equipment_detection': {'detected_items': []},
-                'extracted_text': 'Building plan document verified'
-            }
-
-        if 'error' in ai_result:
-            return {
-                'score': 0,
-                'issues': [ai_result['error']],
-                'ai_analysis': True,
-                'ai_error': True
-            }
-
-        # Extract AI results
-        classification = ai_result.get('classification', {})
-        confidence = classification.get('confidence', 0.0)
-        predicted_type = classification.get('document_type', 'unknown')
-
-        # Calculate score based on AI confidence and document type match
-        if predicted_type == 'building_plan':
-            score = int(confidence * 100)
-            issues = [] if confidence > 0.7 else ['AI confidence below threshold']
-            recommendations = ['AI verified building plan'] if confidence > 0.7 else ['Manual review recommended']
-        else:
-            score = max(0, int(confidence * 50))  # Lower score for wrong type
-            issues = [f'Document type mismatch: detected as {predicted_type}']
-            recommendations = ['Verify document type', 'Manual review required']
-
-        return {
-            'score': score,
-            'issues': issues,
-            'recommendations': recommendations,
-            'ai_analysis': True,
-            'ai_confidence': confidence,
-            'predicted_type': predicted_type
-        }
-
-    except Exception as e:
-        print(f"❌ Error in AI building plan analysis: {str(e)}")
-        return {
-            'score': 0,
-            'issues': [f'AI analysis failed: {str(e)}'],
-            'recommendations': ['Manual review required'],
-            'ai_analysis': True,
-            'ai_error': True
-        }
-
-def analyze_safety_certificate(file_path):
-    """Analyze safety certificate using AI or basic analysis"""
-    if not file_path:
-        return {'score': 0, 'issues': ['No safety certificate provided'], 'ai_analysis': False}
-
-    try:
-        if AI_ENABLED and ai_engine:
-            print(f"🤖 REAL AI analyzing safety certificate: {file_path}")
-            # Use real AI engine for analysis
-            ai_result = ai_engine.analyze_document(file_path)
-        else:
-            print(f"📋 Basic analysis of safety certificate: {file_path}")
-            # Basic fallback analysis
-            ai_result = {
-                'classification': {
-                    'document_type': 'safety_certificate',
-                    'confidence': 0.85
-                },
-                'equipment_detection': {'detected_items': []},
-                'extracted_text': 'Safety certificate document verified'
-            }
-
-        if 'error' in ai_result:
-            return {
-                'score': 0,
-                'issues': [ai_result['error']],
-                'ai_analysis': True,
-                'ai_error': True
-            }
-
-        # Extract AI results
-        classification = ai_result.get('classification', {})
-        confidence = classification.get('confidence', 0.0)
-        predicted_type = classification.get('document_type', 'unknown')
-
-        # Calculate score based on AI confidence and document type match
-        if predicted_type == 'safety_certificate':
-            score = int(confidence * 100)
-            issues = [] if confidence > 0.7 else ['AI confidence below threshold']
-            recommendations = ['AI verified safety certificate'] if confidence > 0.7 else ['Manual review recommended']
-        else:
-            score = max(0, int(confidence * 50))
-            issues = [f'Document type mismatch: detected as {predicted_type}']
-            recommendations = ['Verify document type', 'Manual review required']
-
-        return {
-            'score': score,
-            'issues': issues,
-            'recommendations': recommendations,
-            'ai_analysis': True,
-            'ai_confidence': confidence,
-            'predicted_type': predicted_type
-        }
-
-    except Exception as e:
-        print(f"❌ Error in AI safety certificate analysis: {str(e)}")
-        return {
-            'score': 0,
-            'issues': [f'AI analysis failed: {str(e)}'],
-            'recommendations': ['Manual review required'],
-            'ai_analysis': True,
-            'ai_error': True
-        }
-
-def analyze_insurance_document(file_path):
-    """Analyze insurance document using AI or basic analysis"""
-    if not file_path:
-        return {'score': 0, 'issues': ['No insurance document provided'], 'ai_analysis': False}
-
-    try:
-        if AI_ENABLED and ai_engine:
-            print(f"🤖 REAL AI analyzing insurance document: {file_path}")
-            # Use real AI engine for analysis
-            ai_result = ai_engine.analyze_document(file_path)
-        else:
-            print(f"📋 Basic analysis of insurance document: {file_path}")
-            # Basic fallback analysis
-            ai_result = {
-                'classification': {
-                    'document_type': 'insurance',
-                    'confidence': 0.85
-                },
-                'equipment_detection': {'detected_items': []},
-                'extracted_text': 'Insurance document verified'
-            }
-
-        if 'error' in ai_result:
-            return {
-                'score': 0,
-                'issues': [ai_result['error']],
-                'ai_analysis': True,
-                'ai_error': True
-            }
-
-        # Extract AI results
-        classification = ai_result.get('classification', {})
-        confidence = classification.get('confidence', 0.0)
-        predicted_type = classification.get('document_type', 'unknown')
-
-        # Calculate score based on AI confidence and document type match
-        if predicted_type == 'insurance':
-            score = int(confidence * 100)
-            issues = [] if confidence > 0.7 else ['AI confidence below threshold']
-            recommendations = ['AI verified insurance document'] if confidence > 0.7 else ['Manual review recommended']
-        else:
-            score = max(0, int(confidence * 50))
-            issues = [f'Document type mismatch: detected as {predicted_type}']
-            recommendations = ['Verify document type', 'Manual review required']
-
-        return {
-            'score': score,
-            'issues': issues,
-            'recommendations': recommendations,
-            'ai_analysis': True,
-            'ai_confidence': confidence,
-            'predicted_type': predicted_type
-        }
-
-    except Exception as e:
-        print(f"❌ Error in AI insurance document analysis: {str(e)}")
-        return {
-            'score': 0,
-            'issues': [f'AI analysis failed: {str(e)}'],
-            'recommendations': ['Manual review required'],
-            'ai_analysis': True,
-            'ai_error': True
-        }
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-def analyze_business_license(file_path):
-    """Analyze business license using AI or basic analysis"""
+# REAL AI Document Analysis Functions
+# document_type -> (label, basic verification text)
+ANALYZED_DOCUMENT_TYPES = {
+    'building_plan': ('building plan', 'Building plan document verified'),
+    'safety_certificate': ('safety certificate', 'Safety certificate document verified'),
+    'insurance': ('insurance document', 'Insurance document verified'),
+    'business_license': ('business license', 'Business license document verified')
+}
+
+def basic_document_analysis(document_type, extracted_text):
+    """Fallback analysis result used when the AI engine is not loaded"""
+    return {
+        'classification': {
+            'document_type': document_type,
+            'confidence': 0.85
+        },
+        'equipment_detection': {'detected_items': []},
+        'extracted_text': extracted_text
+    }
+
+def analyze_document_file(file_path, document_type, ai_result=None):
+    """
+    Score one application document against its expected type.
+    ai_result can be passed in when the document was already analyzed in a batch.
+    """
+    label, basic_text = ANALYZED_DOCUMENT_TYPES[document_type]
     if not file_path:
-        return {'score': 0, 'issues': ['No business license provided'], 'ai_analysis': False}
+        return {'score': 0, 'issues': [f'No {label} provided'], 'ai_analysis': False}
 
     try:
-        if AI_ENABLED and ai_engine:
-            print(f"🤖 REAL AI analyzing business license: {file_path}")
-            # Use real AI engine for analysis
-            ai_result = ai_engine.analyze_document(file_path)
-        else:
-            print(f"📋 Basic analysis of business license: {file_path}")
-            # Basic fallback analysis
-            ai_result = {
-                'classification': {
-                    'document_type': 'business_license',
-                    'confidence': 0.85
-                },
-                'equipment_detection': {'detected_items': []},
-                'extracted_text': 'Business license document verified'
-            }
+        if ai_result is None:
+            ai_engine = local_ai_engine()
+            if ai_engine:
+                print(f"🤖 REAL AI analyzing {label}: {file_path}")
+                # Use real AI engine for analysis
+                ai_result = ai_engine.analyze_document(file_path)
+            else:
+                print(f"📋 Basic analysis of {label}: {file_path}")
+                # Basic fallback analysis
+                ai_result = basic_document_analysis(document_type, basic_text)
 
         if 'error' in ai_result:
             return {
@@ -4038,12 +4366,12 @@ def analyze_business_license(file_path):
         predicted_type = classification.get('document_type', 'unknown')
 
         # Calculate score based on AI confidence and document type match
-        if predicted_type == 'business_license':
+        if predicted_type == document_type:
             score = int(confidence * 100)
             issues = [] if confidence > 0.7 else ['AI confidence below threshold']
-            recommendations = ['AI verified business license'] if confidence > 0.7 else ['Manual review recommended']
+            recommendations = [f'AI verified {label}'] if confidence > 0.7 else ['Manual review recommended']
         else:
-            score = max(0, int(confidence * 50))
+            score = max(0, int(confidence * 50))  # Lower score for wrong type
             issues = [f'Document type mismatch: detected as {predicted_type}']
             recommendations = ['Verify document type', 'Manual review required']
 
@@ -4057,7 +4385,7 @@ def analyze_business_license(file_path):
         }
 
     except Exception as e:
-        print(f"❌ Error in AI business license analysis: {str(e)}")
+        print(f"❌ Error in AI {label} analysis: {str(e)}")
         return {
             'score': 0,
             'issues': [f'AI analysis failed: {str(e)}'],
@@ -4066,6 +4394,99 @@ def analyze_business_license(file_path):
             'ai_error': True
         }
 
+def analyze_building_plan(file_path, ai_result=None):
+    """Analyze building plan using AI or basic analysis"""
+    return analyze_document_file(file_path, 'building_plan', ai_result)
+
+def analyze_safety_certificate(file_path, ai_result=None):
+    """Analyze safety certificate using AI or basic analysis"""
+    return analyze_document_file(file_path, 'safety_certificate', ai_result)
+
+def analyze_insurance_document(file_path, ai_result=None):
+    """Analyze insurance document using AI or basic analysis"""
+    return analyze_document_file(file_path, 'insurance', ai_result)
+
+def analyze_business_license(file_path, ai_result=None):
+    """Analyze business license using AI or basic analysis"""
+    return analyze_document_file(file_path, 'business_license', ai_result)
+
+# application field -> (upload path field, expected document type)
+APPLICATION_DOCUMENT_FIELDS = {
+    'building_plan': 'building_plan_path',
+    'safety_certificate': 'safety_certificate_path',
+    'insurance_document': 'insurance_document_path',
+    'business_license': 'business_license_path'
+}
+APPLICATION_DOCUMENT_TYPES = {
+    'building_plan': 'building_plan',
+    'safety_certificate': 'safety_certificate',
+    'insurance_document': 'insurance',
+    'business_license': 'business_license'
+}
+
+def application_document_paths(application):
+    return {key: application.get(field) for key, field in APPLICATION_DOCUMENT_FIELDS.items()}
+
+def score_application_documents(paths, ai_results):
+    """Score every application document, using the already computed AI results where given"""
+    return {
+        key: analyze_document_file(path, APPLICATION_DOCUMENT_TYPES[key], ai_results.get(key))
+        for key, path in paths.items()
+    }
+
+def analyze_application_documents(application):
+    """
+    Analyze the building plan, safety certificate, insurance document and business license
+    of an application. With the AI engine loaded all four go through one verification
+    pipeline run (concurrent OCR, one CNN batch). Returns (results, stage_timings).
+    """
+    paths = application_document_paths(application)
+
+    ai_results = {}
+    stage_timings = None
+    keys = [key for key, path in paths.items() if path]
+    ai_engine = local_ai_engine() if keys else None
+    if ai_engine:
+        print(f"🤖 REAL AI analyzing {len(keys)} application document(s)")
+        batch_results, stage_timings = ai_engine.analyze_documents([paths[key] for key in keys])
+        ai_results = dict(zip(keys, batch_results))
+
+    return score_application_documents(paths, ai_results), stage_timings
+
+def save_manager_verification(application_id, verification_results, stage_timings, verified_by):
+    """Store a manager document verification on the application. Returns the overall score."""
+    total_score = sum([result.get('score', 0) for result in verification_results.values()])
+    avg_score = total_score / len(verification_results)
+
+    applications.update_one(
+        {'_id': ObjectId(application_id)},
+        {
+            '$set': {
+                'documents_verified': True,
+                'verification_score': avg_score,
+                'verification_results': verification_results,
+                'verified_by': verified_by,
+                'verified_at': datetime.now(),
+                'verification_stage_timings': stage_timings
+            }
+        }
+    )
+    return avg_score
+
+def submit_manager_verification(application, owner):
+    """Queue the AI analysis of an application's documents. Returns the job id (None if there is nothing to analyze)."""
+    paths = application_document_paths(application)
+    keys = [key for key, path in paths.items() if path]
+    if not keys:
+        return None
+    return submit_inference_job(
+        'analyze_documents',
+        {'file_paths': [paths[key] for key in keys]},
+        purpose='manager_verification',
+        context={'application_id': str(application['_id']), 'keys': keys},
+        owner=owner
+    )
+
 def send_inspection_notification(email, application_id, inspection_date):
     """Send email notification to inspector"""
     try:
@@ -5076,6 +5497,7 @@ def test_submission():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/dashboard-stats')
+@result_cache.cached_json('analytics:dashboard-stats', DASHBOARD_CACHE_TTL, roles=['admin'])
 def get_dashboard_stats():
     if session.get('role') != 'admin':
         return jsonify({'error': 'Unauthorized'}), 401
@@ -6335,13 +6757,6 @@ def get_approval_report(report_id):
         app.logger.error(f"Error fetching report details: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-# Add these indexes to your MongoDB collections
-applications.create_index([('status', 1)])
-applications.create_index([('timestamp', -1)])
-applications.create_index([('business_name', 1)])
-applications.create_index([('business_type', 1)])
-applications.create_index([('noc_certificate_expiry', 1)])
-
 @app.route('/api/manager-applications')
 def get_manager_applications():
     """Get applications assigned to the current manager"""
@@ -6785,7 +7200,7 @@ def generate_noc_certificate_route(application_id):
             }), 400
 
         # Import blockchain service
-        from blockchain_service import generate_certificate_hash, store_certificate
+        from blockchain_service import generate_certificate_hash, submit_certificate
 
         # Generate a unique certificate hash
         issue_date = datetime.now().strftime('%Y-%m-%d')
@@ -6808,9 +7223,6 @@ def generate_noc_certificate_route(application_id):
             'certificate_hash': certificate_hash
         }
 
-        # Store certificate on blockchain
-        transaction_id = store_certificate(certificate_data)
-
         # Generate the certificate
         pdf_buffer = generate_noc_report(application, application_id)
         if not pdf_buffer:
@@ -6830,7 +7242,9 @@ def generate_noc_certificate_route(application_id):
         with open(file_path, 'wb') as f:
             f.write(pdf_buffer.getvalue())
 
-        # Update application with certificate info and blockchain data
+        # Record the issued certificate as pending before queueing it, so on_certificates_anchored
+        # (which matches blockchain_transaction_id) always finds it and nothing overwrites its update
+        transaction_id = str(uuid.uuid4())
         applications.update_one(
             {'_id': ObjectId(application_id)},
             {'$set': {
@@ -6842,10 +7256,17 @@ def generate_noc_certificate_route(application_id):
                 'status': 'certificate_issued',
                 'certificate_hash': certificate_hash,
                 'blockchain_transaction_id': transaction_id,
-                'blockchain_verified': True
+                'blockchain_status': 'pending',
+                'blockchain_verified': False,
+                # Kept until anchored so a restart can queue the certificate again
+                'blockchain_certificate_data': certificate_data
             }}
         )
 
+        # Only now that the certificate is issued, hand it to the anchor thread; mining happens
+        # off the request path and on_certificates_anchored fills in the blockchain_* fields
+        submit_certificate(certificate_data, transaction_id)
+
         # Send email with certificate
         try:
             with open(file_path, 'rb') as cert_file:
@@ -6899,7 +7320,9 @@ Fire Safety Department
         socketio.emit('noc_certificate_issued', {
             'application_id': application_id,
             'business_name': application.get('business_name'),
-            'blockchain_verified': True
+            'blockchain_verified': False,
+            'blockchain_status': 'pending',
+            'transaction_id': transaction_id
         })
 
         return jsonify({
@@ -6907,6 +7330,8 @@ Fire Safety Department
             'message': 'Blockchain-verified NOC Certificate generated and sent successfully',
             'download_url': url_for('download_certificate', filename=filename),
             'certificate_hash': certificate_hash,
+            'transaction_id': transaction_id,
+            'blockchain_status': 'pending',
             'verification_url': url_for('verify_certificate', _external=True)
         })
 
@@ -6916,11 +7341,12 @@ Fire Safety Department
 
 @app.route('/verify-certificate', methods=['GET', 'POST'])
 def verify_certificate():
-    """Verify a certificate using blockchain"""
+    """Verify a certificate using blockchain (?format=json or a JSON POST returns the result as JSON)"""
     verification_result = None
 
     if request.method == 'POST':
-        certificate_hash = request.form.get('certificate_hash')
+        certificate_hash = (request.get_json(silent=True) or {}).get('certificate_hash') if request.is_json \
+            else request.form.get('certificate_hash')
         if certificate_hash:
             # Import blockchain service
             from blockchain_service import verify_certificate as blockchain_verify
@@ -6937,6 +7363,10 @@ def verify_certificate():
         # Verify certificate on blockchain
         verification_result = blockchain_verify(certificate_hash)
 
+    # Batched certificates include a Merkle inclusion proof the caller can check offline
+    if request.is_json or request.args.get('format') == 'json':
+        return jsonify(verification_result or {'verified': False, 'error': 'certificate_hash is required'})
+
     return render_template('verify_certificate.html', verification_result=verification_result)
 
 @app.route('/verify')
@@ -7807,271 +8237,135 @@ def advanced_analytics():
                           compliance=compliance)
 
 @app.route('/api/analytics/overview')
+@result_cache.cached_json('analytics:overview', ADMIN_ANALYTICS_CACHE_TTL, roles=['admin'])
 def api_analytics_overview():
     """API endpoint for overview analytics data"""
     if session.get('role') != 'admin':
         return jsonify({'success': False, 'error': 'Unauthorized'}), 401
 
     try:
-        # Basic stats
-        stats = {
-            'total': applications.count_documents({}),
-            'pending': applications.count_documents({'status': 'pending'}),
-            'approved': applications.count_documents({'status': 'approved'}),
-            'rejected': applications.count_documents({'status': 'rejected'})
-        }
-
-        # Calculate approval rate
-        total_processed = stats['approved'] + stats['rejected']
-        stats['approval_rate'] = round((stats['approved'] / total_processed) * 100) if total_processed > 0 else 0
-
-        # Calculate average processing time
-        processing_times = []
-        for app in applications.find({'status': 'approved', 'approved_at': {'$exists': True}, 'timestamp': {'$exists': True}}):
-            if 'approved_at' in app and 'timestamp' in app:
-                processing_time = (app['approved_at'] - app['timestamp']).days
-                if processing_time >= 0:  # Sanity check
-                    processing_times.append(processing_time)
-
-        stats['avg_processing_time'] = round(sum(processing_times) / len(processing_times), 1) if processing_times else 0
+        # Status counts, monthly trends and business types in one $facet pass
+        overview = build_overview_analytics(applications, inspections, users)
+        return jsonify({'success': True, **overview})
+    except Exception as e:
+        print(f"Error in analytics overview API: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-        # Calculate compliance rate
-        total_certificates = applications.count_documents({'status': 'certificate_issued'})
-        valid_certificates = applications.count_documents({
-            'status': 'certificate_issued',
-            'noc_certificate_expiry': {'$gt': datetime.now()}
-        })
-        stats['compliance_rate'] = round((valid_certificates / total_certificates) * 100) if total_certificates > 0 else 0
+@app.route('/api/admin/cache-stats')
+def api_admin_cache_stats():
+    """Hit/miss counters for the analytics result cache"""
+    if session.get('role') != 'admin':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
 
-        # Calculate trends (month-over-month change)
-        current_month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        last_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
+    return jsonify({'success': True, 'cache': result_cache.stats()})
 
-        current_month_apps = applications.count_documents({'timestamp': {'$gte': current_month_start}})
-        last_month_apps = applications.count_documents({
-            'timestamp': {'$gte': last_month_start, '$lt': current_month_start}
-        })
+@app.route('/api/admin/ai-models')
+def api_admin_ai_models():
+    """Registered and loaded AI model versions"""
+    if session.get('role') != 'admin':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
 
-        # Calculate trend percentages
-        trends = {
-            'total': calculate_trend_percentage(last_month_apps, current_month_apps),
-            'approval_rate': 0,  # Would need more complex calculation
-            'processing_time': 0,  # Would need more complex calculation
-            'compliance': 0  # Would need more complex calculation
+    return jsonify({
+        'success': True,
+        'engine': ai_provider.status(),
+        'models': model_registry.status(),
+        'analysis_cache': ai_provider.analysis_cache.stats(),
+        'inference': {
+            'mode': AI_INFERENCE_MODE,
+            'workers_enabled': inference_worker_enabled(),
+            'workers_alive': inference_jobs.workers_alive(),
+            'jobs': inference_jobs.status_counts()
         }
+    })
 
-        # Application trends chart data (last 6 months)
-        months = []
-        new_apps = []
-        approved_apps = []
-        rejected_apps = []
-
-        for i in range(5, -1, -1):
-            month_start = (datetime.now() - timedelta(days=30*i)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            month_end = (month_start + timedelta(days=32)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            month_name = month_start.strftime('%b %Y')
-
-            months.append(month_name)
-            new_apps.append(applications.count_documents({
-                'timestamp': {'$gte': month_start, '$lt': month_end}
-            }))
-            approved_apps.append(applications.count_documents({
-                'approved_at': {'$gte': month_start, '$lt': month_end},
-                'status': 'approved'
-            }))
-            rejected_apps.append(applications.count_documents({
-                'processed_date': {'$gte': month_start, '$lt': month_end},
-                'status': 'rejected'
-            }))
-
-        # Status distribution data
-        status_distribution = [
-            stats['pending'],
-            stats['approved'],
-            stats['rejected'],
-            applications.count_documents({'status': 'certificate_issued'})
-        ]
+@app.route('/api/admin/compliance-scoring', methods=['POST'])
+def api_admin_compliance_scoring():
+    """Re-score every application's compliance with the current model in one batch"""
+    if session.get('role') != 'admin':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
 
-        # Business type distribution
-        business_types = list(applications.aggregate([
-            {'$group': {
-                '_id': '$business_type',
-                'count': {'$sum': 1}
-            }},
-            {'$sort': {'count': -1}},
-            {'$limit': 5}
-        ]))
+    scope = (request.get_json(silent=True) or {}).get('scope', 'certified')
+    if scope not in COMPLIANCE_SCOPES:
+        return jsonify({'success': False, 'error': f'Unknown scope: {scope}'}), 400
 
-        # Inspector performance
-        inspector_performance = list(inspections.aggregate([
-            {'$match': {'status': 'completed'}},
-            {'$group': {
-                '_id': '$inspector_id',
-                'completed': {'$sum': 1},
-                'avg_time': {'$avg': {'$subtract': ['$completion_date', '$date']}}
-            }},
-            {'$sort': {'completed': -1}},
-            {'$limit': 5}
-        ]))
+    try:
+        if inference_worker_enabled():
+            job_id = submit_inference_job(
+                'score_compliance', {'scope': scope},
+                purpose='compliance_scoring', context={'scope': scope}, owner=session.get('username')
+            )
+            return jsonify({'success': True, 'job': inference_jobs.status(job_id)}), 202
 
-        # Format inspector performance data
-        inspector_names = []
-        inspector_counts = []
+        ai_engine = ai_provider.get_engine(requires='compliance_analyzer')
+        if not ai_engine:
+            return jsonify({'success': False, 'error': 'AI engine not available'}), 503
 
-        for inspector in inspector_performance:
-            inspector_user = users.find_one({'username': inspector['_id']})
-            name = inspector_user.get('name', inspector['_id']) if inspector_user else inspector['_id']
-            inspector_names.append(name)
-            inspector_counts.append(inspector['completed'])
+        stats = score_applications(ai_engine.compliance_analyzer, applications, scope)
+        if not stats['success']:
+            return jsonify(stats), 503
+        result_cache.invalidate('analytics')
+        return jsonify(stats)
 
-        return jsonify({
-            'success': True,
-            'stats': stats,
-            'trends': trends,
-            'charts': {
-                'application_trends': {
-                    'labels': months,
-                    'new': new_apps,
-                    'approved': approved_apps,
-                    'rejected': rejected_apps
-                },
-                'status_distribution': {
-                    'labels': ['Pending', 'Approved', 'Rejected', 'Certificate Issued'],
-                    'data': status_distribution
-                },
-                'business_types': {
-                    'labels': [bt['_id'] for bt in business_types],
-                    'data': [bt['count'] for bt in business_types]
-                },
-                'inspector_performance': {
-                    'labels': inspector_names,
-                    'data': inspector_counts
-                }
-            }
-        })
     except Exception as e:
-        print(f"Error in analytics overview API: {str(e)}")
+        print(f"Error in compliance scoring: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
-def calculate_trend_percentage(old_value, new_value):
-    """Calculate percentage change between two values"""
-    if old_value == 0:
-        return 100 if new_value > 0 else 0
-
-    return round(((new_value - old_value) / old_value) * 100)
-
-@app.route('/api/analytics/predictive')
-def api_analytics_predictive():
-    """API endpoint for predictive analytics data"""
+@app.route('/api/admin/classifier-training', methods=['POST'])
+def api_admin_classifier_training():
+    """Continue training the document classifier on documents verified since its last version"""
     if session.get('role') != 'admin':
         return jsonify({'success': False, 'error': 'Unauthorized'}), 401
 
     try:
-        # Simple predictions based on historical data
-        predictions = {}
-
-        # Applications prediction (based on last 30 days trend)
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        sixty_days_ago = datetime.now() - timedelta(days=60)
-
-        recent_applications = applications.count_documents({'timestamp': {'$gte': thirty_days_ago}})
-        previous_applications = applications.count_documents({'timestamp': {'$gte': sixty_days_ago, '$lt': thirty_days_ago}})
-
-        # Simple linear prediction
-        if previous_applications > 0:
-            growth_rate = recent_applications / previous_applications
-            predictions['applications'] = round(recent_applications * growth_rate)
-        else:
-            predictions['applications'] = recent_applications
-
-        # Renewals prediction (certificates expiring in next 30 days)
-        thirty_days_future = datetime.now() + timedelta(days=30)
-        predictions['renewals'] = applications.count_documents({
-            'status': 'certificate_issued',
-            'noc_certificate_expiry': {
-                '$gt': datetime.now(),
-                '$lte': thirty_days_future
-            }
-        })
+        if inference_worker_enabled():
+            job_id = submit_inference_job(
+                'train_classifier', {}, purpose='classifier_training', owner=session.get('username')
+            )
+            return jsonify({'success': True, 'job': inference_jobs.status(job_id)}), 202
 
-        # Inspections prediction (based on pending applications and historical completion rate)
-        pending_inspections = inspections.count_documents({'status': 'pending'})
+        if not ai_provider.get_engine(requires=None):
+            return jsonify({'success': False, 'error': 'AI engine not available'}), 503
 
-        # Calculate average inspections completed per month
-        last_month_start = (datetime.now() - timedelta(days=30)).replace(hour=0, minute=0, second=0, microsecond=0)
-        completed_last_month = inspections.count_documents({
-            'status': 'completed',
-            'completion_date': {'$gte': last_month_start}
-        })
+        # A separate instance: the live classifier keeps serving while this one trains and
+        # switches to the published version on its next analysis (refresh_document_classifier)
+        from real_ai_models import DocumentClassifier
+        return jsonify(incremental_train(DocumentClassifier(backend='hashing'), applications))
 
-        # Predict based on pending and historical completion rate
-        predictions['inspections'] = pending_inspections + completed_last_month
+    except Exception as e:
+        print(f"Error in classifier training: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-        # Generate forecast data for next 6 months
-        months = []
-        application_forecast = []
-        renewal_forecast = []
+@app.route('/api/admin/email-outbox')
+def api_admin_email_outbox():
+    """Delivery status of queued emails"""
+    if session.get('role') != 'admin':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
 
-        current_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if email_outbox is None:
+        return jsonify({'success': True, 'enabled': False})
 
-        # Get historical monthly data for the past 6 months
-        historical_months = []
-        historical_applications = []
+    failed = list(email_outbox_collection.find(
+        {'status': 'failed'},
+        {'_id': 0, 'subject': 1, 'recipient': 1, 'attempts': 1, 'last_error': 1, 'failed_at': 1}
+    ).sort('failed_at', -1).limit(20))
 
-        for i in range(6, 0, -1):
-            month_start = (current_month - timedelta(days=30*i)).replace(day=1)
-            month_end = (month_start + timedelta(days=32)).replace(day=1)
+    return jsonify({
+        'success': True,
+        'enabled': True,
+        'counts': email_outbox.status_counts(),
+        'recent_failures': failed
+    })
 
-            historical_months.append(month_start.strftime('%b %Y'))
-            monthly_count = applications.count_documents({
-                'timestamp': {'$gte': month_start, '$lt': month_end}
-            })
-            historical_applications.append(monthly_count)
-
-        # Simple forecasting for next 6 months
-        # This is a very basic linear regression - in a real system you'd use more sophisticated ML
-        if len(historical_applications) > 0:
-            avg_monthly_growth = sum(
-                (historical_applications[i] - historical_applications[i-1])
-                for i in range(1, len(historical_applications))
-            ) / (len(historical_applications) - 1)
-
-            last_value = historical_applications[-1]
-
-            for i in range(6):
-                next_month = (current_month + timedelta(days=30*i)).replace(day=1)
-                months.append(next_month.strftime('%b %Y'))
-
-                # Apply growth trend
-                forecast_value = max(0, round(last_value + avg_monthly_growth * (i+1)))
-                application_forecast.append(forecast_value)
-
-                # For renewals, use certificates that will expire in that month
-                month_end = (next_month + timedelta(days=32)).replace(day=1)
-                renewal_count = applications.count_documents({
-                    'status': 'certificate_issued',
-                    'noc_certificate_expiry': {'$gte': next_month, '$lt': month_end}
-                })
-                renewal_forecast.append(renewal_count)
+@app.route('/api/analytics/predictive')
+def api_analytics_predictive():
+    """API endpoint for predictive analytics data"""
+    if session.get('role') != 'admin':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
 
-        return jsonify({
-            'success': True,
-            'predictions': {
-                'applications': predictions['applications'],
-                'renewals': predictions['renewals'],
-                'inspections': predictions['inspections']
-            },
-            'forecasts': {
-                'applications': {
-                    'labels': months,
-                    'data': application_forecast
-                },
-                'renewals': {
-                    'labels': months,
-                    'data': renewal_forecast
-                }
-            }
-        })
+    try:
+        # Historical and forecast windows are all counted in one pass per collection
+        predictive = build_predictive_analytics(applications, inspections)
+        return jsonify({'success': True, **predictive})
     except Exception as e:
         print(f"Error in predictive analytics API: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -8176,183 +8470,16 @@ def api_analytics_risk_map():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/analytics/compliance')
+@result_cache.cached_json('analytics:compliance', ADMIN_ANALYTICS_CACHE_TTL, roles=['admin'])
 def api_analytics_compliance():
     """API endpoint for compliance analytics data"""
     if session.get('role') != 'admin':
         return jsonify({'success': False, 'error': 'Unauthorized'}), 401
 
     try:
-        # Calculate overall compliance rate
-        total_certificates = applications.count_documents({'status': 'certificate_issued'})
-        valid_certificates = applications.count_documents({
-            'status': 'certificate_issued',
-            'noc_certificate_expiry': {'$gt': datetime.now()}
-        })
-
-        overall_compliance = round((valid_certificates / total_certificates) * 100) if total_certificates > 0 else 0
-
-        # Calculate certificates expiring soon
-        thirty_days_future = datetime.now() + timedelta(days=30)
-        expiring_soon = applications.count_documents({
-            'status': 'certificate_issued',
-            'noc_certificate_expiry': {
-                '$gt': datetime.now(),
-                '$lte': thirty_days_future
-            }
-        })
-
-        # Calculate inspection compliance
-        total_inspections = inspections.count_documents({})
-        completed_inspections = inspections.count_documents({'status': 'completed'})
-        inspection_compliance = round((completed_inspections / total_inspections) * 100) if total_inspections > 0 else 0
-
-        # Calculate compliance by business type
-        business_types = list(applications.aggregate([
-            {'$match': {'status': 'certificate_issued'}},
-            {'$group': {
-                '_id': '$business_type',
-                'total': {'$sum': 1},
-                'valid': {
-                    '$sum': {
-                        '$cond': [
-                            {'$gt': ['$noc_certificate_expiry', datetime.now()]},
-                            1,
-                            0
-                        ]
-                    }
-                }
-            }},
-            {'$project': {
-                'type': '$_id',
-                'compliance_rate': {
-                    '$multiply': [
-                        {'$divide': ['$valid', '$total']},
-                        100
-                    ]
-                }
-            }},
-            {'$sort': {'compliance_rate': -1}},
-            {'$limit': 5}
-        ]))
-
-        # Format compliance by type data
-        compliance_types = []
-        compliance_rates = []
-
-        for bt in business_types:
-            compliance_types.append(bt.get('type', 'Unknown'))
-            compliance_rates.append(round(bt.get('compliance_rate', 0)))
-
-        # Calculate compliance trend over last 6 months
-        months = []
-        compliance_trend = []
-
-        current_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-        for i in range(5, -1, -1):
-            month_start = (current_month - timedelta(days=30*i)).replace(day=1)
-            month_end = (month_start + timedelta(days=32)).replace(day=1)
-            month_name = month_start.strftime('%b %Y')
-
-            # Calculate compliance for that month
-            month_total = applications.count_documents({
-                'status': 'certificate_issued',
-                'timestamp': {'$lt': month_end}
-            })
-
-            month_valid = applications.count_documents({
-                'status': 'certificate_issued',
-                'timestamp': {'$lt': month_end},
-                'noc_certificate_expiry': {'$gt': month_start}
-            })
-
-            month_compliance = round((month_valid / month_total) * 100) if month_total > 0 else 0
-
-            months.append(month_name)
-            compliance_trend.append(month_compliance)
-
-        # Calculate trends
-        current_quarter_start = current_month - timedelta(days=90)
-        previous_quarter_start = current_quarter_start - timedelta(days=90)
-
-        # Current quarter compliance
-        current_quarter_total = applications.count_documents({
-            'status': 'certificate_issued',
-            'timestamp': {'$lt': current_month}
-        })
-
-        current_quarter_valid = applications.count_documents({
-            'status': 'certificate_issued',
-            'timestamp': {'$lt': current_month},
-            'noc_certificate_expiry': {'$gt': current_quarter_start}
-        })
-
-        current_quarter_compliance = (current_quarter_valid / current_quarter_total) * 100 if current_quarter_total > 0 else 0
-
-        # Previous quarter compliance
-        previous_quarter_total = applications.count_documents({
-            'status': 'certificate_issued',
-            'timestamp': {'$lt': current_quarter_start}
-        })
-
-        previous_quarter_valid = applications.count_documents({
-            'status': 'certificate_issued',
-            'timestamp': {'$lt': current_quarter_start},
-            'noc_certificate_expiry': {'$gt': previous_quarter_start}
-        })
-
-        previous_quarter_compliance = (previous_quarter_valid / previous_quarter_total) * 100 if previous_quarter_total > 0 else 0
-
-        # Calculate trend
-        overall_trend = calculate_trend_percentage(previous_quarter_compliance, current_quarter_compliance)
-
-        # Calculate inspection compliance trend similarly
-        current_quarter_inspections = inspections.count_documents({
-            'date': {'$gte': current_quarter_start, '$lt': current_month}
-        })
-
-        current_quarter_completed = inspections.count_documents({
-            'status': 'completed',
-            'date': {'$gte': current_quarter_start, '$lt': current_month}
-        })
-
-        current_quarter_inspection_compliance = (current_quarter_completed / current_quarter_inspections) * 100 if current_quarter_inspections > 0 else 0
-
-        previous_quarter_inspections = inspections.count_documents({
-            'date': {'$gte': previous_quarter_start, '$lt': current_quarter_start}
-        })
-
-        previous_quarter_completed = inspections.count_documents({
-            'status': 'completed',
-            'date': {'$gte': previous_quarter_start, '$lt': current_quarter_start}
-        })
-
-        previous_quarter_inspection_compliance = (previous_quarter_completed / previous_quarter_inspections) * 100 if previous_quarter_inspections > 0 else 0
-
-        inspection_trend = calculate_trend_percentage(previous_quarter_inspection_compliance, current_quarter_inspection_compliance)
-
-        return jsonify({
-            'success': True,
-            'compliance': {
-                'overall': overall_compliance,
-                'expiring': expiring_soon,
-                'inspection': inspection_compliance
-            },
-            'trends': {
-                'overall': overall_trend,
-                'inspection': inspection_trend
-            },
-            'charts': {
-                'by_type': {
-                    'labels': compliance_types,
-                    'data': compliance_rates
-                },
-                'trend': {
-                    'labels': months,
-                    'data': compliance_trend
-                }
-            }
-        })
+        # Certificate and inspection compliance computed with one pipeline per collection
+        compliance = build_compliance_analytics(applications, inspections)
+        return jsonify({'success': True, **compliance})
     except Exception as e:
         print(f"Error in compliance analytics API: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -8728,7 +8855,7 @@ def inspection_details(inspection_id):
                 'updated_at': datetime.now()
             }
 
-            result = db.inspections.update_one(
+            result = inspections.update_one(
                 {'_id': ObjectId(inspection_id)},
                 {'$set': update_data}
             )
@@ -9494,8 +9621,16 @@ def verify_documents_api(application_id):
         return jsonify({'success': False, 'error': 'Unauthorized'}), 401
 
     try:
-        # Call the AI verification function
-        success, result = ai_verify_documents(application_id)
+        # Call the AI verification function (queued for the inference workers when enabled)
+        success, result = ai_verify_documents(application_id, asynchronous=True, owner=session.get('username'))
+
+        if success and isinstance(result, dict) and 'job_id' in result:
+            return jsonify({
+                'success': True,
+                'message': 'Document verification queued',
+                'job_id': result['job_id'],
+                'status': result['status']
+            }), 202
 
         if success:
             # Log the verification
@@ -9524,6 +9659,85 @@ def verify_documents_api(application_id):
             'error': str(e)
         }), 500
 
+# Roles allowed to queue each kind of AI job
+AI_JOB_ROLES = {
+    'document_verification': ['admin'],
+    'manager_verification': ['manager']
+}
+
+def get_visible_inference_job(job_id):
+    """The job if the current user submitted it (admins see every job), else None"""
+    job = inference_jobs.get(job_id)
+    if not job:
+        return None
+    if session.get('role') != 'admin' and job.get('owner') != session.get('username'):
+        return None
+    return job
+
+@app.route('/api/ai/jobs', methods=['POST'])
+def submit_ai_job():
+    """Queue AI document verification of an application on the inference workers"""
+    data = request.get_json() or {}
+    purpose = data.get('purpose', 'document_verification')
+    application_id = data.get('application_id')
+
+    if purpose not in AI_JOB_ROLES:
+        return jsonify({'success': False, 'error': f'Unknown job purpose: {purpose}'}), 400
+    if session.get('role') not in AI_JOB_ROLES[purpose]:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+    if not inference_worker_enabled():
+        return jsonify({'success': False, 'error': 'AI inference workers are not enabled or none is running'}), 503
+
+    try:
+        if purpose == 'document_verification':
+            success, result = ai_verify_documents(application_id, asynchronous=True, owner=session.get('username'))
+            if not success:
+                return jsonify({'success': False, 'error': result}), 400
+            if 'job_id' not in result:
+                # Nothing needed the AI engine (e.g. every file missing) - already verified
+                return jsonify({'success': True, 'results': result})
+            job_id = result['job_id']
+        else:
+            application = applications.find_one({'_id': ObjectId(application_id)})
+            if not application:
+                return jsonify({'success': False, 'error': 'Application not found'}), 404
+            job_id = submit_manager_verification(application, session['username'])
+            if not job_id:
+                return jsonify({'success': False, 'error': 'No documents to analyze'}), 400
+
+        return jsonify({'success': True, 'job': inference_jobs.status(job_id)}), 202
+
+    except Exception as e:
+        print(f"Error submitting AI job: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/ai/jobs/<job_id>')
+def ai_job_status(job_id):
+    """Progress of a queued AI job"""
+    if 'username' not in session:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+
+    job = get_visible_inference_job(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': inference_jobs.status(job_id)})
+
+@app.route('/api/ai/jobs/<job_id>/result')
+def ai_job_result(job_id):
+    """
+    Result of a finished AI job - the same body the synchronous verification route
+    returns. 202 while the job is still queued or running.
+    """
+    if 'username' not in session:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+
+    job = get_visible_inference_job(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    if job.get('outcome') is None:
+        return jsonify({'success': True, 'job': inference_jobs.status(job_id)}), 202
+    return jsonify(job['outcome'])
+
 @app.route('/api/notifications', methods=['GET'])
 def get_user_notifications():
     """Get notifications for the current user"""
@@ -9846,6 +10060,73 @@ def upload_inspection_photo():
         print(f"Error uploading inspection photo: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/inspection/<inspection_id>/detect-equipment', methods=['POST'])
+def detect_inspection_equipment(inspection_id):
+    """Run safety equipment detection over all photos of an inspection in one batch"""
+    if session.get('role') not in ['inspector', 'manager', 'admin']:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+
+    try:
+        inspection = inspections.find_one(
+            {'_id': ObjectId(inspection_id)},
+            {'inspection_photos': 1, 'inspector_id': 1, 'inspector': 1, 'assigned_manager': 1}
+        )
+        if not inspection:
+            return jsonify({'success': False, 'error': 'Inspection not found'}), 404
+
+        # Inspectors and managers may only run detection on inspections assigned to them
+        username = session.get('username')
+        if session.get('role') == 'inspector' and username not in (inspection.get('inspector_id'), inspection.get('inspector')):
+            return jsonify({'success': False, 'error': 'Unauthorized - Not assigned to this inspection'}), 401
+        if session.get('role') == 'manager' and inspection.get('assigned_manager') != username:
+            return jsonify({'success': False, 'error': 'Unauthorized - Not assigned to this inspection'}), 401
+
+        photos = inspection.get('inspection_photos', [])
+        force = request.args.get('force') == 'true'
+        pending = [
+            i for i, photo in enumerate(photos)
+            if photo.get('path') and (force or 'equipment_detection' not in photo)
+        ]
+        paths = [photos[i]['path'] for i in pending]
+
+        # Queue the detection for the inference workers; the result is pushed over Socket.IO
+        if inference_worker_enabled() and pending:
+            job_id = submit_inference_job(
+                'detect_equipment', {'file_paths': paths},
+                purpose='equipment_detection',
+                context={'inspection_id': inspection_id, 'photos': pending},
+                owner=session.get('username')
+            )
+            return jsonify({'success': True, 'job_id': job_id, 'status': 'queued'}), 202
+
+        ai_engine = local_ai_engine(requires='safety_detector')
+        if pending and not ai_engine:
+            return jsonify({'success': False, 'error': 'AI engine is not loaded yet'}), 503
+        if pending and not ai_engine.safety_detector.is_loaded():
+            return jsonify({'success': False, 'error': 'Safety detector model is not available'}), 503
+
+        started = time.perf_counter()
+        detections = ai_engine.safety_detector.detect_equipment_batch(paths) if pending else []
+        elapsed = time.perf_counter() - started
+
+        for i, detection in zip(pending, detections):
+            photos[i]['equipment_detection'] = detection
+        save_equipment_detections(inspection_id, pending, paths, detections)
+
+        return jsonify({
+            'success': True,
+            'analyzed': len(pending),
+            'elapsed_ms': round(elapsed * 1000, 2),
+            'photos': [
+                {'filename': photo.get('filename'), 'equipment_detection': photo.get('equipment_detection')}
+                for photo in photos
+            ]
+        })
+
+    except Exception as e:
+        print(f"Error detecting inspection equipment: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/update-profile-image', methods=['POST'])
 def update_user_profile_image():
     if 'username' not in session:
@@ -9907,6 +10188,9 @@ def update_user_profile_image():
 @socketio.on('connect')
 def handle_connect():
     print('Client connected')
+    # Per-user room for events only the user should see (e.g. their AI job results)
+    if 'username' in session:
+        join_room(f"notification_{session['username']}")
     emit('connection_response', {'data': 'Connected'})
 
 @socketio.on('disconnect')
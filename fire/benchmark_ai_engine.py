@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+AI Engine Benchmark for Fire NOC System
+Measures each stage of RealAIEngine.analyze_document on its own: OCR (decode +
+tesseract), text classification, safety equipment detection and compliance analysis,
+plus the uncached end-to-end analysis. Every stage is run at each requested
+concurrency level and reports throughput, p50/p95/p99 latency and the process's peak
+RSS. Fixtures (rendered document images, OCR-like texts and application records) are
+generated locally from a fixed seed, so two runs on the same host are comparable.
+
+Results can be written as JSON and compared against a previous run; --compare exits
+with status 1 when any stage's p95 latency or throughput regresses by more than
+--max-regression, so the benchmark can gate a commit.
+
+Models come from the registry (AI_MODELS_DIR); stages whose model is not built are
+reported as skipped. Run train_ai_models.py first.
+
+Usage:
+    python benchmark_ai_engine.py [--documents N] [--concurrency 1 4] [--iterations N]
+                                  [--stages ocr classification ...] [--json FILE]
+                                  [--compare BASELINE.json] [--max-regression 0.2]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from benchmark_document_classifier import KEYWORDS, synthetic_corpus
+
+STAGES = ('ocr', 'classification', 'detection', 'compliance', 'end_to_end')
+PAGE_SIZE = (1240, 1754)  # A4 at 150 dpi
+
+
+# ==================== FIXTURES ====================
+
+def page_font(size):
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 only has the small bitmap font
+        return ImageFont.load_default()
+
+
+def write_document_images(directory, count, page_size=PAGE_SIZE, seed=0):
+    """Render count scanned-looking JPEG pages of document text; returns [(path, document_type)]"""
+    from PIL import Image, ImageDraw
+
+    texts, labels = synthetic_corpus(count, 120, seed=seed)
+    rng = np.random.default_rng(seed)
+    font = page_font(28)
+    width, height = page_size
+    documents = []
+    for i, (text, label) in enumerate(zip(texts, labels)):
+        page = Image.new('L', page_size, color=235)
+        draw = ImageDraw.Draw(page)
+        draw.text((80, 80), KEYWORDS[label].upper()[:48], fill=20, font=page_font(40))
+        words = text.split()
+        for line, start in enumerate(range(0, len(words), 10)):
+            draw.text((80, 180 + line * 44), ' '.join(words[start:start + 10]), fill=30, font=font)
+        # Scanner noise, so decode and binarization do realistic work
+        noise = rng.normal(0, 12, (height, width))
+        page = Image.fromarray(np.clip(np.asarray(page, dtype=np.float32) + noise, 0, 255).astype(np.uint8))
+        path = os.path.join(directory, f'{label}_{i:03d}.jpg')
+        page.convert('RGB').save(path, quality=85)
+        documents.append((path, label))
+    return documents
+
+
+def application_fixtures(count, seed=0):
+    """Application records with the compliance form fields filled in as the app stores them"""
+    rng = np.random.default_rng(seed)
+    return [{
+        'building_area': str(int(rng.integers(300, 6000))),
+        'max_occupancy': str(int(rng.integers(10, 300))),
+        'fire_extinguishers': str(int(rng.integers(0, 16))),
+        'emergency_exits': str(int(rng.integers(0, 7))),
+        'smoke_detectors': str(int(rng.integers(0, 26)))
+    } for _ in range(count)]
+
+
+# ==================== MEASUREMENT ====================
+
+def peak_rss_mb():
+    """High-water mark of this process's resident set (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def latency_summary(latencies, wall_seconds, errors=0):
+    """Throughput and latency percentiles (ms) for one stage run"""
+    latencies = np.asarray(latencies, dtype=np.float64) * 1000
+    p50, p95, p99 = np.percentile(latencies, (50, 95, 99))
+    return {
+        'operations': int(len(latencies)),
+        'errors': errors,
+        'wall_seconds': round(wall_seconds, 3),
+        'throughput_per_second': round(len(latencies) / wall_seconds, 2),
+        'mean_ms': round(float(latencies.mean()), 2),
+        'p50_ms': round(float(p50), 2),
+        'p95_ms': round(float(p95), 2),
+        'p99_ms': round(float(p99), 2),
+        'max_ms': round(float(latencies.max()), 2)
+    }
+
+
+def run_stage(function, inputs, concurrency, iterations):
+    """Call function(item) for every input, iterations times, on concurrency threads"""
+    function(inputs[0])  # warm-up: lazy imports, graph tracing, thread pools
+
+    def timed(item):
+        started = time.perf_counter()
+        result = function(item)
+        failed = isinstance(result, dict) and 'error' in result
+        return time.perf_counter() - started, failed
+
+    work = list(inputs) * iterations
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='bench') as executor:
+        outcomes = list(executor.map(timed, work))
+    wall_seconds = time.perf_counter() - started
+
+    summary = latency_summary([seconds for seconds, _ in outcomes], wall_seconds,
+                              errors=sum(1 for _, failed in outcomes if failed))
+    summary['peak_rss_mb'] = peak_rss_mb()
+    return summary
+
+
+def compare_results(results, baseline, max_regression):
+    """
+    Regressions of results against a baseline run: a list of (stage, concurrency,
+    metric, baseline value, current value) where p95 latency grew, or throughput
+    fell, by more than max_regression (a fraction).
+    """
+    previous = {(r['stage'], r['concurrency']): r for r in baseline.get('results', []) if 'p95_ms' in r}
+    regressions = []
+    for result in results:
+        before = previous.get((result['stage'], result['concurrency']))
+        if before is None or 'p95_ms' not in result:
+            continue
+        if result['p95_ms'] > before['p95_ms'] * (1 + max_regression):
+            regressions.append((result['stage'], result['concurrency'], 'p95_ms', before['p95_ms'], result['p95_ms']))
+        if result['throughput_per_second'] < before['throughput_per_second'] * (1 - max_regression):
+            regressions.append((result['stage'], result['concurrency'], 'throughput_per_second',
+                                before['throughput_per_second'], result['throughput_per_second']))
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+# ==================== STAGES ====================
+
+def stage_plan(engine, documents, texts, applications):
+    """stage -> (function, inputs) or (None, reason it is skipped)"""
+    from image_preprocessing import load_cnn_input
+
+    paths = [path for path, _ in documents]
+    cnn_inputs = [load_cnn_input(path, engine.safety_detector.input_size) for path in paths]
+
+    plan = {
+        'ocr': (engine.read_document, paths),
+        'classification': (engine.document_classifier.classify_document, texts),
+        'detection': (lambda array: engine.safety_detector.detect_equipment_arrays([array])[0], cnn_inputs),
+        'compliance': (engine.analyze_compliance, applications),
+        # _analyze_document bypasses the analysis cache, which would otherwise answer repeat files
+        'end_to_end': (engine._analyze_document, paths)
+    }
+    missing = {
+        'classification': engine.document_classifier,
+        'detection': engine.safety_detector,
+        'compliance': engine.compliance_analyzer,
+        'end_to_end': engine.document_classifier
+    }
+    for stage, component in missing.items():
+        if not component.is_loaded():
+            plan[stage] = (None, f"{component.registry_name} not loaded ({component.load_error})")
+    try:
+        engine.read_document(paths[0])
+    except Exception as e:
+        plan['ocr'] = plan['end_to_end'] = (None, f"OCR unavailable ({e})")
+    return plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-stage AI engine benchmark')
+    parser.add_argument('--documents', type=int, default=12, help='rendered document pages')
+    parser.add_argument('--texts', type=int, default=500, help='classification texts and applications')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--iterations', type=int, default=3, help='passes over the fixtures per stage')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='baseline JSON from an earlier run')
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='allowed p95/throughput change vs the baseline (fraction)')
+    args = parser.parse_args()
+
+    try:
+        from real_ai_models import ai_engine
+    except ImportError as e:
+        print(f"❌ The AI stack is required for this benchmark (tensorflow, scikit-learn, pytesseract): {e}")
+        return 1
+
+    print("🧪 Fire NOC AI Engine Benchmark")
+    print("=" * 96)
+    load_started = time.perf_counter()
+    model_versions = ai_engine.load_models()
+    load_seconds = time.perf_counter() - load_started
+    print(f"Models: {model_versions}   load: {load_seconds:.2f}s   RSS after load: {peak_rss_mb()} MB")
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"⏳ Rendering {args.documents} document pages...")
+        documents = write_document_images(directory, args.documents)
+        texts, _ = synthetic_corpus(args.texts, 150, seed=2)
+        applications = application_fixtures(args.texts)
+        plan = stage_plan(ai_engine, documents, texts, applications)
+
+        print()
+        print(f"   {'stage':<16}{'conc':>5}{'ops':>7}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}{'peak MB':>9}")
+        for stage in args.stages:
+            function, inputs = plan[stage]
+            if function is None:
+                print(f"   {stage:<16} skipped: {inputs}")
+                results.append({'stage': stage, 'skipped': inputs})
+                continue
+            for concurrency in args.concurrency:
+                summary = run_stage(function, inputs, concurrency, args.iterations)
+                summary.update(stage=stage, concurrency=concurrency)
+                results.append(summary)
+                print(f"   {stage:<16}{concurrency:>5}{summary['operations']:>7}{summary['throughput_per_second']:>10.1f}"
+                      f"{summary['p50_ms']:>10.2f}{summary['p95_ms']:>10.2f}{summary['p99_ms']:>10.2f}"
+                      f"{summary['errors']:>8}{summary['peak_rss_mb'] or 0:>9.1f}")
+
+    report = {
+        'benchmark': 'ai_engine',
+        'commit': git_commit(),
+        'created_at': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'cpu_count': os.cpu_count(),
+        'config': {
+            'documents': args.documents,
+            'texts': args.texts,
+            'iterations': args.iterations,
+            'concurrency': args.concurrency,
+            'classifier_backend': ai_engine.document_classifier.backend,
+            'detector_architecture': ai_engine.safety_detector.architecture
+        },
+        'model_versions': model_versions,
+        'model_load_seconds': round(load_seconds, 3),
+        'peak_rss_mb': peak_rss_mb(),
+        'results': results
+    }
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\n📄 Results written to {args.json}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.max_regression)
+        print(f"\n📊 Compared with {args.compare} (commit {baseline.get('commit')}), "
+              f"allowed change {args.max_regression:.0%}:")
+        for stage, concurrency, metric, before, after in regressions:
+            print(f"   ❌ {stage} @ {concurrency}: {metric} {before} -> {after}")
+        if regressions:
+            return 1
+        print("   ✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
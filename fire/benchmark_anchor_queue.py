@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Anchor Queue Benchmark for Fire NOC System
+What certificate issuance costs the request that triggers it, and how long until the
+certificate is on the chain:
+
+    inline   store_certificate mines and persists the block inside the request
+    queued   submit_certificate hands the certificate to the anchor thread and returns a
+             pending transaction ID; the thread mines and persists it afterwards
+
+Certificates arrive at --rate per second, like admins issuing them one at a time.
+
+Usage:
+    python benchmark_anchor_queue.py [--certificates 200] [--rate 20] [--json FILE]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import tempfile
+import threading
+import time
+
+import blockchain_service
+from benchmark_certificate_anchoring import certificate
+from blockchain_service import AnchorQueue, Blockchain
+
+
+def milliseconds(samples):
+    samples = sorted(samples)
+    return {
+        'p50_ms': round(statistics.median(samples) * 1000, 3),
+        'p99_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 3),
+        'max_ms': round(samples[-1] * 1000, 3)
+    }
+
+
+def run(mode, count, rate):
+    """Request-path latency (and for queued, submit-to-anchored lag) of count certificates"""
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        blockchain_service._blockchain = Blockchain(directory)
+        queue = blockchain_service._anchor_queue = AnchorQueue(mode='block')
+        submitted, anchored_at = {}, {}
+        done = threading.Event()
+
+        def listener(block, entries):
+            for entry in entries:
+                anchored_at[entry['transaction_id']] = time.perf_counter()
+            if len(anchored_at) == count:
+                done.set()
+
+        queue.listeners.append(listener)
+        queue.start()
+
+        request_times = []
+        for i in range(count):
+            started = time.perf_counter()
+            if mode == 'inline':
+                blockchain_service.store_certificate(certificate(i))
+            else:
+                submitted[blockchain_service.submit_certificate(certificate(i))] = started
+            request_times.append(time.perf_counter() - started)
+            time.sleep(max(0, 1 / rate - (time.perf_counter() - started)))
+
+        result = {'mode': mode, 'request': milliseconds(request_times)}
+        if mode == 'queued':
+            assert done.wait(60), 'anchor thread fell behind'
+            result['anchored_after'] = milliseconds([anchored_at[t] - submitted[t] for t in submitted])
+        assert len(blockchain_service._blockchain.chain) == count + 1
+
+        queue.stop()
+        blockchain_service._blockchain = None
+        blockchain_service._anchor_queue = None
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Request-path cost of inline vs queued certificate anchoring')
+    parser.add_argument('--certificates', type=int, default=200)
+    parser.add_argument('--rate', type=float, default=20, help='certificates issued per second')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    print("⏱️ Fire NOC Anchor Queue Benchmark")
+    print("=" * 72)
+    print(f"Certificates: {args.certificates}   rate: {args.rate:g}/s   anchor mode: block")
+    print()
+
+    results = [run('inline', args.certificates, args.rate), run('queued', args.certificates, args.rate)]
+
+    print(f"   {'mode':<8}{'request p50 ms':>16}{'p99 ms':>10}{'max ms':>10}{'anchored p50 ms':>18}{'p99 ms':>10}")
+    for r in results:
+        lag = r.get('anchored_after')
+        lag_columns = f"{lag['p50_ms']:>18.3f}{lag['p99_ms']:>10.3f}" if lag else f"{'(in request)':>18}{'':>10}"
+        print(f"   {r['mode']:<8}{r['request']['p50_ms']:>16.3f}{r['request']['p99_ms']:>10.3f}"
+              f"{r['request']['max_ms']:>10.3f}{lag_columns}")
+
+    inline, queued = results
+    print()
+    print(f"✅ Request path {inline['request']['p50_ms'] / queued['request']['p50_ms']:,.0f}x shorter at p50, "
+          f"{inline['request']['p99_ms'] / queued['request']['p99_ms']:,.0f}x at p99")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'certificates': args.certificates, 'rate': args.rate, 'results': results}, f, indent=2)
+        print(f"📄 Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Block Storage Benchmark for Fire NOC System
+Cost of persisting one new block and of loading the chain, for a chain of --blocks
+certificate blocks:
+
+    rewrite   the old format: the whole chain re-dumped to blockchain.json per block
+    log       one fsynced JSON line appended to blocks.jsonl per block, with the chain
+              compacted into snapshot.jsonl every SNAPSHOT_INTERVAL blocks
+
+Blocks are hashed but not mined, so only storage is timed.
+
+Usage:
+    python benchmark_block_storage.py [--blocks 100000] [--appends N] [--json FILE]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from benchmark_blockchain import build_chain
+from blockchain_service import LEGACY_CHAIN_FILE, SNAPSHOT_INTERVAL, Block, Blockchain, generate_certificate_hash
+
+
+def legacy_save(blockchain, path):
+    """save_chain before the block log"""
+    with open(path, 'w') as f:
+        json.dump([block.to_dict() for block in blockchain.chain], f, indent=4)
+
+
+def legacy_load(path):
+    """load_chain before the block log"""
+    with open(path, 'r') as f:
+        chain_data = json.load(f)
+
+    chain = []
+    for block_data in chain_data:
+        block = Block(block_data['index'], block_data['timestamp'], block_data['data'], block_data['previous_hash'])
+        block.nonce = block_data['nonce']
+        block.hash = block_data['hash']
+        chain.append(block)
+    return chain
+
+
+def next_block(blockchain):
+    previous = blockchain.get_latest_block()
+    index = previous.index + 1
+    return Block(index, '2025-01-01 00:00:00', {
+        'transaction_id': f'tx-{index:08d}',
+        'certificate_data': {'certificate_hash': generate_certificate_hash(index, 'Business', '2025-01-01')},
+        'timestamp': '2025-01-01 00:00:00'
+    }, previous.hash)
+
+
+def milliseconds(samples):
+    samples = sorted(samples)
+    return {
+        'p50_ms': round(statistics.median(samples) * 1000, 3),
+        'p99_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 3),
+        'mean_ms': round(statistics.mean(samples) * 1000, 3)
+    }
+
+
+def timed(function):
+    started = time.perf_counter()
+    result = function()
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Block append and chain load cost by storage format')
+    parser.add_argument('--blocks', type=int, default=100000, help='blocks already in the chain')
+    parser.add_argument('--appends', type=int, default=2000, help='blocks appended to the log')
+    parser.add_argument('--rewrites', type=int, default=5, help='full rewrites timed for the old format')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    print("💾 Fire NOC Block Storage Benchmark")
+    print("=" * 72)
+    print(f"Chain: {args.blocks:,} blocks   snapshot interval: {SNAPSHOT_INTERVAL}")
+    print()
+
+    results = {'blocks': args.blocks, 'snapshot_interval': SNAPSHOT_INTERVAL}
+    with tempfile.TemporaryDirectory() as directory:
+        blockchain = build_chain(os.path.join(directory, 'log'), args.blocks)
+
+        legacy_file = os.path.join(directory, LEGACY_CHAIN_FILE)
+        rewrites = []
+        for _ in range(args.rewrites):
+            blockchain.chain.append(next_block(blockchain))
+            rewrites.append(timed(lambda: legacy_save(blockchain, legacy_file))[0])
+        legacy_load_seconds, legacy_chain = timed(lambda: legacy_load(legacy_file))
+        results['rewrite'] = dict(milliseconds(rewrites), load_seconds=round(legacy_load_seconds, 3),
+                                  file_mb=round(os.path.getsize(legacy_file) / (1024 * 1024), 1))
+        del legacy_chain
+
+        snapshot_seconds = timed(blockchain.save_chain)[0]
+        appends = []
+        for _ in range(args.appends):
+            block = next_block(blockchain)
+            blockchain.chain.append(block)
+            blockchain.index_block(block, len(blockchain.chain) - 1)
+            appends.append(timed(lambda: blockchain.append_block(block))[0])
+        expected = [block.hash for block in blockchain.chain]
+        del blockchain
+
+        log_load_seconds, loaded = timed(lambda: Blockchain(os.path.join(directory, 'log')))
+        assert [block.hash for block in loaded.chain] == expected
+        results['log'] = dict(milliseconds(appends), load_seconds=round(log_load_seconds, 3),
+                              snapshot_seconds=round(snapshot_seconds, 3),
+                              logged_blocks_at_load=loaded.logged_blocks)
+
+    rewrite, log = results['rewrite'], results['log']
+    print(f"   {'format':<10}{'append p50 ms':>15}{'p99 ms':>10}{'mean ms':>10}{'load s':>9}")
+    for name in ('rewrite', 'log'):
+        r = results[name]
+        print(f"   {name:<10}{r['p50_ms']:>15.3f}{r['p99_ms']:>10.3f}{r['mean_ms']:>10.3f}{r['load_seconds']:>9.3f}")
+    print()
+    print(f"📄 blockchain.json at {args.blocks:,} blocks: {rewrite['file_mb']} MB rewritten per block")
+    print(f"📸 Snapshot of the chain: {log['snapshot_seconds']:.3f}s once every {SNAPSHOT_INTERVAL} blocks "
+          f"(included in the log p99/mean)")
+    print(f"✅ Append {rewrite['mean_ms'] / log['mean_ms']:,.0f}x cheaper on average, "
+          f"load {rewrite['load_seconds'] / log['load_seconds']:.1f}x faster")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📄 Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Blockchain Verification Benchmark for Fire NOC System
+Certificate verification cost vs chain length: the old linear scan over every block
+against the certificate_hash index, plus the one-off cost of building the indexes when
+the chain is loaded. Chains of synthetic certificate blocks are built in memory (hashed
+but not mined, and never written to disk).
+
+Usage:
+    python benchmark_blockchain.py [--sizes 10000 100000 1000000] [--lookups N]
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+
+from blockchain_service import Block, Blockchain, generate_certificate_hash
+
+
+def build_chain(directory, blocks):
+    """A Blockchain holding blocks certificate blocks after its genesis block"""
+    blockchain = Blockchain(directory)
+    previous = blockchain.get_latest_block()
+    for i in range(1, blocks + 1):
+        block = Block(i, f'2025-01-01 00:00:{i % 60:02d}', {
+            'transaction_id': f'tx-{i:08d}',
+            'certificate_data': {
+                'application_id': f'{i:024x}',
+                'business_name': f'Business {i}',
+                'certificate_hash': generate_certificate_hash(i, 'Business', '2025-01-01')
+            },
+            'timestamp': '2025-01-01 00:00:00'
+        }, previous.hash)
+        blockchain.chain.append(block)
+        previous = block
+    return blockchain
+
+
+def linear_verify(blockchain, certificate_hash):
+    """verify_certificate before the index: scan every block"""
+    for block in blockchain.chain:
+        if 'certificate_data' in block.data and 'certificate_hash' in block.data['certificate_data']:
+            if block.data['certificate_data']['certificate_hash'] == certificate_hash:
+                return block
+    return None
+
+
+def microseconds_per_lookup(function, hashes):
+    started = time.perf_counter()
+    for certificate_hash in hashes:
+        function(certificate_hash)
+    return (time.perf_counter() - started) / len(hashes) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Certificate verification cost vs chain length')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--lookups', type=int, default=100000, help='indexed lookups per size')
+    parser.add_argument('--scan-lookups', type=int, default=20, help='linear-scan lookups per size')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    print("⛓️ Fire NOC Blockchain Verification Benchmark")
+    print("=" * 88)
+    print(f"{args.lookups:,} indexed and {args.scan_lookups} linear lookups per size, half of them misses")
+    print()
+    print(f"   {'blocks':>10}{'index build s':>15}{'index MB':>10}{'scan us':>14}{'index us':>11}{'speed-up':>14}")
+
+    rng = random.Random(0)
+    results = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            blockchain = build_chain(directory, size)
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            blockchain.rebuild_indexes()
+            build_seconds = time.perf_counter() - started
+            index_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            def sample(count):
+                hits = [blockchain.chain[rng.randrange(1, size + 1)].data['certificate_data']['certificate_hash']
+                        for _ in range(count - count // 2)]
+                return hits + [generate_certificate_hash('missing', i, '') for i in range(count // 2)]
+
+            scan_us = microseconds_per_lookup(lambda h: linear_verify(blockchain, h), sample(args.scan_lookups))
+            index_us = microseconds_per_lookup(blockchain.find_certificate, sample(args.lookups))
+            for certificate_hash in sample(10):
+                assert linear_verify(blockchain, certificate_hash) is blockchain.find_certificate(certificate_hash)
+
+        results.append({
+            'blocks': size,
+            'index_build_seconds': round(build_seconds, 3),
+            'index_mb': round(index_bytes / (1024 * 1024), 1),
+            'linear_scan_us': round(scan_us, 1),
+            'indexed_us': round(index_us, 3)
+        })
+        print(f"   {size:>10,}{build_seconds:>15.3f}{index_bytes / (1024 * 1024):>10.1f}{scan_us:>14,.0f}"
+              f"{index_us:>11.3f}{scan_us / index_us:>13,.0f}x")
+        del blockchain
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'results': results}, f, indent=2)
+        print(f"📄 Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
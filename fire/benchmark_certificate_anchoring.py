@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Certificate Anchoring Benchmark for Fire NOC System
+Issues --certificates certificates into a fresh chain with each anchor mode and reports
+blocks added, proof-of-work hash attempts, time, bytes written to the block log, and the
+cost of verifying a certificate (including checking its Merkle inclusion proof):
+
+    block   one mined block per certificate (BLOCKCHAIN_ANCHOR_MODE=block)
+    batch   one mined block per --batch-size certificates holding their Merkle root
+
+Usage:
+    python benchmark_certificate_anchoring.py [--certificates 4096] [--batch-size 256 1024]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
+
+import blockchain_service
+from blockchain_service import (BLOCK_LOG_FILE, SNAPSHOT_FILE, AnchorQueue, Blockchain,
+                                generate_certificate_hash, verify_merkle_proof)
+
+
+def certificate(i):
+    return {
+        'application_id': f'{i:024x}',
+        'business_name': f'Business {i}',
+        'address': f'{i} Station Road',
+        'business_type': 'Restaurant',
+        'issue_date': '2025-01-01',
+        'expiry_date': '2026-01-01',
+        'approved_by': 'Administrator',
+        'certificate_hash': generate_certificate_hash(i, f'Business {i}', '2025-01-01')
+    }
+
+
+def issue(mode, count, batch_size):
+    """Issue count certificates with one anchor mode; returns its measurements"""
+    with tempfile.TemporaryDirectory() as directory:
+        # Mining prints one line per block
+        with contextlib.redirect_stdout(io.StringIO()):
+            blockchain_service._blockchain = Blockchain(directory)
+            blockchain_service._anchor_queue = AnchorQueue(mode='batch', batch_size=batch_size, interval=0)
+            certificates = [certificate(i) for i in range(count)]
+
+            started = time.perf_counter()
+            if mode == 'block':
+                for data in certificates:
+                    blockchain_service.store_certificate(data)
+            else:
+                for data in certificates:
+                    blockchain_service._anchor_queue.submit(data)
+                blockchain_service._anchor_queue.flush_all()
+            seconds = time.perf_counter() - started
+
+        blockchain = blockchain_service._blockchain
+        blocks = blockchain.chain[1:]
+        stored_bytes = sum(os.path.getsize(os.path.join(directory, name))
+                           for name in (BLOCK_LOG_FILE, SNAPSHOT_FILE)
+                           if os.path.exists(os.path.join(directory, name)))
+
+        hashes = [data['certificate_hash'] for data in random.Random(0).sample(certificates, min(count, 1000))]
+        started = time.perf_counter()
+        results = [blockchain_service.verify_certificate(certificate_hash) for certificate_hash in hashes]
+        verify_us = (time.perf_counter() - started) / len(hashes) * 1e6
+
+        proof_us, proof_hashes = None, 0
+        if mode == 'batch':
+            started = time.perf_counter()
+            for result in results:
+                proof = result['merkle_proof']
+                assert verify_merkle_proof(proof['leaf_hash'], proof['path'], result['merkle_root'])
+            proof_us = (time.perf_counter() - started) / len(results) * 1e6
+            proof_hashes = max(len(result['merkle_proof']['path']) for result in results)
+        assert all(result['verified'] for result in results) and blockchain.is_chain_valid()
+
+        blockchain_service._blockchain = None
+        blockchain_service._anchor_queue = None
+
+    return {
+        'mode': mode if mode == 'block' else f'batch/{batch_size}',
+        'blocks': len(blocks),
+        'hash_attempts': sum(block.nonce + 1 for block in blocks),
+        'seconds': round(seconds, 3),
+        'certificates_per_second': round(count / seconds, 1),
+        'stored_mb': round(stored_bytes / (1024 * 1024), 2),
+        'verify_us': round(verify_us, 1),
+        'proof_check_us': round(proof_us, 1) if proof_us is not None else None,
+        'proof_hashes': proof_hashes
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-certificate blocks with Merkle-batched anchoring')
+    parser.add_argument('--certificates', type=int, default=4096)
+    parser.add_argument('--batch-size', type=int, nargs='+', default=[256, 1024])
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    print("🌳 Fire NOC Certificate Anchoring Benchmark")
+    print("=" * 96)
+    print(f"Certificates: {args.certificates:,}")
+    print()
+
+    results = [issue('block', args.certificates, 1)]
+    results += [issue('batch', args.certificates, size) for size in args.batch_size]
+
+    print(f"   {'mode':<12}{'blocks':>8}{'hash attempts':>15}{'seconds':>9}{'certs/s':>10}"
+          f"{'stored MB':>11}{'verify us':>11}{'proof us':>10}{'proof len':>11}")
+    for r in results:
+        proof_us = f"{r['proof_check_us']:.1f}" if r['proof_check_us'] is not None else '-'
+        print(f"   {r['mode']:<12}{r['blocks']:>8,}{r['hash_attempts']:>15,}{r['seconds']:>9.2f}"
+              f"{r['certificates_per_second']:>10,.0f}{r['stored_mb']:>11.2f}{r['verify_us']:>11.1f}"
+              f"{proof_us:>10}{r['proof_hashes']:>11}")
+
+    baseline = results[0]
+    print()
+    for r in results[1:]:
+        print(f"✅ {r['mode']}: {baseline['blocks'] / r['blocks']:,.0f}x fewer blocks, "
+              f"{baseline['hash_attempts'] / r['hash_attempts']:,.0f}x fewer hash attempts, "
+              f"{r['certificates_per_second'] / baseline['certificates_per_second']:,.1f}x issuance throughput")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'certificates': args.certificates, 'results': results}, f, indent=2)
+        print(f"📄 Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
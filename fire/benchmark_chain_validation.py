@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Chain Validation Benchmark for Fire NOC System
+Blocks/sec for a full revalidation of a --blocks chain with 1..N worker processes, and the
+cost of a checkpointed audit after --new-blocks more blocks are appended.
+
+Usage:
+    python benchmark_chain_validation.py [--blocks 100000] [--workers 1 2 4] [--json FILE]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+
+from benchmark_blockchain import build_chain
+from benchmark_block_storage import next_block
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Full vs checkpointed chain validation')
+    parser.add_argument('--blocks', type=int, default=100000)
+    parser.add_argument('--new-blocks', type=int, default=1000, help='blocks appended after the checkpoint')
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    print("🔍 Fire NOC Chain Validation Benchmark")
+    print("=" * 72)
+    print(f"Chain: {args.blocks:,} blocks   CPUs: {os.cpu_count()}")
+    print()
+
+    results = {'blocks': args.blocks, 'cpus': os.cpu_count(), 'full': []}
+    with tempfile.TemporaryDirectory() as directory:
+        blockchain = build_chain(directory, args.blocks)
+
+        print(f"   {'audit':<22}{'blocks checked':>16}{'seconds':>10}{'blocks/sec':>13}")
+        for workers in args.workers:
+            report = blockchain.validate_chain(full=True, workers=workers)
+            assert report['valid']
+            results['full'].append(report)
+            print(f"   {f'full, {workers} worker(s)':<22}{report['blocks_checked']:>16,}"
+                  f"{report['seconds']:>10.3f}{report['blocks_per_second']:>13,.0f}")
+
+        for _ in range(args.new_blocks):
+            block = next_block(blockchain)
+            blockchain.chain.append(block)
+        report = blockchain.validate_chain()
+        assert report['valid'] and report['resumed_from_checkpoint']
+        results['checkpointed'] = report
+        print(f"   {'checkpointed':<22}{report['blocks_checked']:>16,}{report['seconds']:>10.3f}"
+              f"{report['blocks_per_second']:>13,.0f}")
+
+    sequential = results['full'][0]
+    print()
+    print(f"✅ Checkpointed audit after {args.new_blocks:,} new blocks: {results['checkpointed']['seconds']:.3f}s vs "
+          f"{sequential['seconds']:.3f}s for a sequential full audit "
+          f"({sequential['seconds'] / results['checkpointed']['seconds']:,.0f}x)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📄 Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
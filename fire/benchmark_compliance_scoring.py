@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Compliance Scoring Benchmark for Fire NOC System
+Rows/sec for re-scoring a --rows portfolio with the compliance SVC:
+
+    per-row   one SVC.predict plus the recommendation checks per application
+              (ComplianceAnalyzer.analyze_compliance in a loop)
+    batch     one SVC.predict over the whole feature matrix plus the vectorized checks
+              (score_feature_matrix, what score_applications runs)
+
+The SVC is fitted the way ComplianceAnalyzer.train_model fits it, without touching the
+model registry.
+
+Usage:
+    python benchmark_compliance_scoring.py [--rows 100000] [--per-row-sample 5000] [--json FILE]
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+from sklearn.svm import SVC
+
+from compliance_scoring import RECOMMENDATION_SETS, recommendation_codes, score_feature_matrix
+
+# ComplianceAnalyzer.create_training_data
+TRAINING_DATA = [
+    ([1000, 50, 5, 2, 10], 95),
+    ([500, 25, 2, 1, 5], 85),
+    ([2000, 100, 3, 1, 8], 60),
+    ([1500, 75, 8, 3, 15], 98),
+    ([800, 40, 1, 1, 3], 45)
+]
+
+
+def compliance_model():
+    model = SVC(kernel='rbf', gamma='scale')
+    model.fit(np.array([row for row, _ in TRAINING_DATA]), np.array([score for _, score in TRAINING_DATA]))
+    return model
+
+
+def portfolio(rows, seed=0):
+    """Feature matrix [area_sqft, occupancy, extinguishers, exits, smoke_detectors]"""
+    rng = np.random.default_rng(seed)
+    area = rng.integers(200, 20000, rows)
+    return np.column_stack([
+        area,
+        rng.integers(5, 500, rows),
+        rng.integers(0, 20, rows),
+        rng.integers(0, 6, rows),
+        rng.integers(0, 40, rows)
+    ]).astype(np.float64)
+
+
+def score_per_row(model, features):
+    scores = []
+    for row in features:
+        score = model.predict([row])[0]
+        list(RECOMMENDATION_SETS[recommendation_codes(np.array([row]), np.array([score]))[0]])
+        scores.append(score)
+    return np.array(scores, dtype=np.float64)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-application vs batched compliance scoring')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--per-row-sample', type=int, default=5000, help='rows timed one by one')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    model = compliance_model()
+    features = portfolio(args.rows)
+    sample = features[:min(args.per_row_sample, args.rows)]
+
+    print("📊 Fire NOC Compliance Scoring Benchmark")
+    print("=" * 72)
+    print(f"Rows: {args.rows:,}   model: SVC(kernel='rbf'), {len(model.support_)} support vectors")
+    print()
+
+    started = time.perf_counter()
+    per_row_scores = score_per_row(model, sample)
+    per_row_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch_predict = model.predict(features)
+    predict_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scores, _, _ = score_feature_matrix(model, features)
+    batch_seconds = time.perf_counter() - started
+    assert np.array_equal(scores[:len(sample)], per_row_scores) and np.array_equal(scores, batch_predict)
+
+    results = {
+        'rows': args.rows,
+        'per_row': {'rows': len(sample), 'seconds': round(per_row_seconds, 4),
+                    'rows_per_second': round(len(sample) / per_row_seconds, 1)},
+        'batch_predict_only': {'rows': args.rows, 'seconds': round(predict_seconds, 4),
+                               'rows_per_second': round(args.rows / predict_seconds, 1)},
+        'batch': {'rows': args.rows, 'seconds': round(batch_seconds, 4),
+                  'rows_per_second': round(args.rows / batch_seconds, 1)}
+    }
+
+    print(f"   {'path':<22}{'rows':>10}{'seconds':>10}{'rows/sec':>14}")
+    for name in ('per_row', 'batch_predict_only', 'batch'):
+        r = results[name]
+        print(f"   {name:<22}{r['rows']:>10,}{r['seconds']:>10.3f}{r['rows_per_second']:>14,.0f}")
+    print()
+    print(f"✅ Batched scoring {results['batch']['rows_per_second'] / results['per_row']['rows_per_second']:,.0f}x "
+          f"the per-row rate, same scores")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📄 Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
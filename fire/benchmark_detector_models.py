@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Safety Detector Architecture Benchmark for Fire NOC System
+Trains the original Keras CNN ('cnn') and the compact separable-conv/GAP model served
+as int8 TFLite ('compact') on the same training set, then compares artifact size,
+load time, single-image p50/p99 latency, batch throughput and accuracy on a held-out set.
+
+Without --data a synthetic set is used: each class is a distinct colour/stripe pattern
+under noise, so accuracy numbers are meaningful relative to each other. With --data,
+DIR/<class name>/*.jpg is split 80/20 into train and held-out images.
+
+Usage:
+    python benchmark_detector_models.py [--data DIR] [--epochs N] [--samples N] [--json FILE]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+ARCHITECTURES = ('cnn', 'compact')
+
+
+def synthetic_dataset(classes, samples, size, seed=0):
+    """Class k: a horizontal band at a class-specific height and colour, plus noise"""
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, len(classes), samples)
+    images = rng.normal(0.45, 0.15, (samples, size, size, 3)).astype(np.float32)
+    band = size // (len(classes) + 1)
+    for i, label in enumerate(labels):
+        top = band * label + rng.integers(0, band // 2 + 1)
+        images[i, top:top + band, :, label % 3] += 0.4
+    return np.clip(images, 0.0, 1.0), labels
+
+
+def directory_dataset(root, classes, size):
+    from image_preprocessing import load_cnn_input
+
+    images, labels = [], []
+    for label, name in enumerate(classes):
+        folder = os.path.join(root, name)
+        for filename in sorted(os.listdir(folder)) if os.path.isdir(folder) else []:
+            images.append(load_cnn_input(os.path.join(folder, filename), size))
+            labels.append(label)
+    if not images:
+        raise ValueError(f"No images found under {root}/<class>/")
+    return np.stack(images), np.array(labels)
+
+
+def percentile_ms(samples, q):
+    return round(float(np.percentile(samples, q)) * 1000, 2)
+
+
+def load_artifact(detector):
+    """Load the saved artifact the way the app does; returns (model, seconds)"""
+    from tensorflow import keras
+    from tflite_model import TFLiteModel
+
+    started = time.perf_counter()
+    if detector.architecture == 'compact':
+        model = TFLiteModel(detector.model_path)
+    else:
+        model = keras.models.load_model(detector.model_path, compile=False)
+    return model, time.perf_counter() - started
+
+
+def benchmark_architecture(architecture, train, held_out, epochs, runs, directory):
+    from tensorflow import keras
+    from model_registry import ModelRegistry
+    from real_ai_models import SafetyEquipmentDetector
+
+    detector = SafetyEquipmentDetector(ModelRegistry(directory), architecture=architecture)
+    (x_train, y_train), (x_test, y_test) = train, held_out
+
+    keras_model = detector.create_model()
+    started = time.perf_counter()
+    keras_model.fit(x_train, keras.utils.to_categorical(y_train, len(detector.classes)),
+                    epochs=epochs, batch_size=32, verbose=0)
+    train_seconds = time.perf_counter() - started
+    detector.save_model(keras_model, x_train)
+
+    model, load_seconds = load_artifact(detector)
+
+    # Single-image latency (what one uploaded photo costs)
+    for image in x_test[:5]:
+        model.predict_on_batch(image[None])
+    latencies = []
+    for i in range(runs):
+        image = x_test[i % len(x_test)][None]
+        started = time.perf_counter()
+        model.predict_on_batch(image)
+        latencies.append(time.perf_counter() - started)
+
+    # Held-out accuracy and batch throughput
+    started = time.perf_counter()
+    predictions = np.concatenate([
+        np.asarray(model.predict_on_batch(x_test[i:i + 32])) for i in range(0, len(x_test), 32)
+    ])
+    batch_seconds = time.perf_counter() - started
+
+    return {
+        'architecture': architecture,
+        'parameters': int(keras_model.count_params()),
+        'artifact': os.path.basename(detector.model_path),
+        'size_mb': round(os.path.getsize(detector.model_path) / (1024 * 1024), 3),
+        'train_seconds': round(train_seconds, 1),
+        'load_seconds': round(load_seconds, 3),
+        'p50_ms': percentile_ms(latencies, 50),
+        'p99_ms': percentile_ms(latencies, 99),
+        'images_per_second': round(len(x_test) / batch_seconds, 1),
+        'accuracy': round(float(np.mean(np.argmax(predictions, axis=1) == y_test)), 4)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare safety detector architectures')
+    parser.add_argument('--data', help='directory with one sub-directory of images per class')
+    parser.add_argument('--samples', type=int, default=400, help='synthetic images (without --data)')
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--runs', type=int, default=200, help='single-image latency samples')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    try:
+        from real_ai_models import SafetyEquipmentDetector
+    except ImportError as e:
+        print(f"❌ The AI stack is required for this benchmark (tensorflow): {e}")
+        return 1
+
+    reference = SafetyEquipmentDetector(architecture='cnn')
+    if args.data:
+        images, labels = directory_dataset(args.data, reference.classes, reference.input_size)
+    else:
+        images, labels = synthetic_dataset(reference.classes, args.samples, reference.input_size)
+    order = np.random.default_rng(1).permutation(len(images))
+    split = int(len(order) * 0.8)
+    train = (images[order[:split]], labels[order[:split]])
+    held_out = (images[order[split:]], labels[order[split:]])
+
+    print("📸 Fire NOC Safety Detector Architecture Benchmark")
+    print("=" * 96)
+    print(f"Train: {len(train[1])} images   held-out: {len(held_out[1])}   epochs: {args.epochs}   "
+          f"source: {args.data or 'synthetic'}")
+    print()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for architecture in ARCHITECTURES:
+            print(f"⏳ Training and exporting {architecture}...")
+            results.append(benchmark_architecture(architecture, train, held_out, args.epochs, args.runs, directory))
+
+    print()
+    print(f"   {'model':<10}{'params':>12}{'size MB':>10}{'load s':>9}{'p50 ms':>9}{'p99 ms':>9}{'img/s':>9}{'accuracy':>10}")
+    for r in results:
+        print(f"   {r['architecture']:<10}{r['parameters']:>12,}{r['size_mb']:>10.2f}{r['load_seconds']:>9.3f}"
+              f"{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['images_per_second']:>9.1f}{r['accuracy']:>10.1%}")
+
+    baseline, compact = results
+    print()
+    print(f"✅ compact vs cnn: {baseline['size_mb'] / compact['size_mb']:.0f}x smaller, "
+          f"{baseline['load_seconds'] / compact['load_seconds']:.1f}x faster load, "
+          f"{baseline['p50_ms'] / compact['p50_ms']:.1f}x lower p50, "
+          f"accuracy {compact['accuracy'] - baseline['accuracy']:+.1%}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'results': results, 'train_images': len(train[1]), 'held_out_images': len(held_out[1])}, f, indent=2)
+        print(f"📄 Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Document Classifier Backend Benchmark for Fire NOC System
+Trains the TF-IDF + Random Forest ('forest') and feature hashing + SGD ('hashing')
+document classifiers on the same OCR-like corpus, then compares artifact size, model
+load time, per-document throughput (the old predict + predict_proba path and the
+single-pass classify_document) and batched classify_batch throughput.
+
+The corpus is synthetic: each document type has a pool of keywords, and every document
+mixes a few of them into OCR noise, so held-out accuracy is comparable across backends.
+
+Usage:
+    python benchmark_document_classifier.py [--train N] [--docs N] [--words N] [--json FILE]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+BACKENDS = ('forest', 'hashing')
+
+KEYWORDS = {
+    'aadhaar': 'aadhaar unique identification authority uid enrollment government india dob male female address',
+    'pan': 'income tax department permanent account number pan father name signature card',
+    'building_plan': 'architectural drawing floor plan elevation section site layout dimensions scale blueprint',
+    'safety_certificate': 'fire safety certificate department compliance prevention emergency systems issued',
+    'business_license': 'trade license municipal corporation business registration shop establishment permit',
+    'insurance': 'insurance policy premium coverage general company property risk insured sum'
+}
+NOISE = ('the of and to in for on with by at from no date page ref sl 1 2 3 a b c total '
+         'name office copy original signed seal stamp valid till').split()
+
+
+def synthetic_corpus(count, words, seed=0):
+    """(texts, labels): every text carries a few class keywords (~5%) among OCR-style noise"""
+    rng = np.random.default_rng(seed)
+    types = sorted(KEYWORDS)
+    pools = {name: KEYWORDS[name].split() for name in types}
+    texts, labels = [], []
+    for _ in range(count):
+        label = types[rng.integers(len(types))]
+        keyword_count = max(1, words // 20)
+        tokens = list(rng.choice(pools[label], keyword_count)) + list(rng.choice(NOISE, words - keyword_count))
+        rng.shuffle(tokens)
+        texts.append(' '.join(tokens))
+        labels.append(label)
+    return texts, labels
+
+
+def throughput(function, items, min_seconds=1.0):
+    """Items per second for function(item), repeated for at least min_seconds"""
+    done, started = 0, time.perf_counter()
+    while True:
+        for item in items:
+            function(item)
+        done += len(items)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return done / elapsed
+
+
+def benchmark_backend(backend, train, held_out, directory, batch_size):
+    from model_registry import ModelRegistry
+    from real_ai_models import DocumentClassifier
+
+    registry = ModelRegistry(directory)
+    trainer = DocumentClassifier(registry, backend=backend)
+    trainer.create_training_data = lambda: list(zip(*train))
+    started = time.perf_counter()
+    trainer.train_model()
+    train_seconds = time.perf_counter() - started
+
+    # What a freshly started worker pays before its first classification
+    started = time.perf_counter()
+    classifier = DocumentClassifier(registry, backend=backend)
+    classifier.load_model()
+    load_seconds = time.perf_counter() - started
+
+    texts, labels = held_out
+    sample = texts[:200]
+
+    def two_pass(text):
+        X = classifier.vectorizer.transform([text.lower().strip()])
+        classifier.model.predict(X)
+        classifier.model.predict_proba(X)
+
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    started = time.perf_counter()
+    predictions = [result['document_type'] for batch in batches for result in classifier.classify_batch(batch)]
+    batch_seconds = time.perf_counter() - started
+
+    artifacts = [classifier.model_path] + ([classifier.vectorizer_path] if classifier.vectorizer_path else [])
+    return {
+        'backend': backend,
+        'size_mb': round(sum(os.path.getsize(path) for path in artifacts) / (1024 * 1024), 3),
+        'train_seconds': round(train_seconds, 2),
+        'load_seconds': round(load_seconds, 4),
+        'two_pass_docs_per_second': round(throughput(two_pass, sample), 1),
+        'single_docs_per_second': round(throughput(classifier.classify_document, sample), 1),
+        'batch_docs_per_second': round(len(texts) / batch_seconds, 1),
+        'accuracy': round(float(np.mean(np.array(predictions) == np.array(labels))), 4)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare document classifier backends')
+    parser.add_argument('--train', type=int, default=2000, help='training documents')
+    parser.add_argument('--docs', type=int, default=5000, help='held-out documents')
+    parser.add_argument('--words', type=int, default=150, help='words per document')
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    try:
+        import real_ai_models  # noqa: F401
+    except ImportError as e:
+        print(f"❌ The AI stack is required for this benchmark (scikit-learn, tensorflow): {e}")
+        return 1
+
+    train = synthetic_corpus(args.train, args.words, seed=0)
+    held_out = synthetic_corpus(args.docs, args.words, seed=1)
+
+    print("📄 Fire NOC Document Classifier Backend Benchmark")
+    print("=" * 96)
+    print(f"Train: {args.train} docs   held-out: {args.docs} docs   words/doc: {args.words}   batch: {args.batch_size}")
+    print()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in BACKENDS:
+            print(f"⏳ Training {backend}...")
+            results.append(benchmark_backend(backend, train, held_out, directory, args.batch_size))
+
+    print()
+    print(f"   {'backend':<10}{'size MB':>9}{'load s':>9}{'2-pass/s':>11}{'single/s':>11}{'batch/s':>11}{'accuracy':>10}")
+    for r in results:
+        print(f"   {r['backend']:<10}{r['size_mb']:>9.2f}{r['load_seconds']:>9.4f}{r['two_pass_docs_per_second']:>11,.0f}"
+              f"{r['single_docs_per_second']:>11,.0f}{r['batch_docs_per_second']:>11,.0f}{r['accuracy']:>10.1%}")
+
+    forest, hashing = results
+    print()
+    print(f"✅ forest single pass: {forest['single_docs_per_second'] / forest['two_pass_docs_per_second']:.1f}x "
+          f"the two-pass rate; hashing vs forest: "
+          f"{forest['load_seconds'] / hashing['load_seconds']:.1f}x faster load, "
+          f"{hashing['batch_docs_per_second'] / forest['batch_docs_per_second']:.1f}x batch docs/sec, "
+          f"accuracy {hashing['accuracy'] - forest['accuracy']:+.1%}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'results': results, 'train_docs': args.train, 'held_out_docs': args.docs,
+                       'words_per_doc': args.words}, f, indent=2)
+        print(f"📄 Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
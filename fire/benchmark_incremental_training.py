@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Incremental Training Benchmark for Fire NOC System
+Training time vs corpus size for the document classifier. For each corpus size N it
+compares a full rebuild over all N documents (forest: TF-IDF + Random Forest fit;
+hashing: SGD fit from scratch) with an incremental run that applies only the newest
+10% of the corpus to an existing hashing model via partial_fit, the way
+incremental_training.py does after each batch of manager verifications.
+
+Documents are fed from memory, so the numbers are model cost only. With --mongo-uri
+the incremental run instead streams the new documents from a scratch database through
+incremental_train() end to end.
+
+Usage:
+    python benchmark_incremental_training.py [--sizes 1000 10000 100000] [--new 0.1] [--mongo-uri URI]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmark_document_classifier import synthetic_corpus
+from incremental_training import DEFAULT_BATCH_SIZE
+
+# Classifier label -> document type as uploaded on an application
+UPLOADED_TYPES = {
+    'aadhaar': 'Aadhaar Card',
+    'pan': 'PAN Card',
+    'building_plan': 'Building Plan',
+    'safety_certificate': 'Safety Certificate',
+    'business_license': 'Business License',
+    'insurance': 'Insurance Document'
+}
+
+
+def timed(function):
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def full_rebuild_seconds(backend, texts, labels, directory):
+    from model_registry import ModelRegistry
+    from real_ai_models import DocumentClassifier
+
+    classifier = DocumentClassifier(ModelRegistry(directory), backend=backend)
+    classifier.create_training_data = lambda: list(zip(texts, labels))
+    return timed(classifier.train_model)
+
+
+def base_model(texts, labels, directory):
+    """Hashing model trained on the older part of the corpus and registered"""
+    from model_registry import ModelRegistry
+    from real_ai_models import DocumentClassifier
+
+    classifier = DocumentClassifier(ModelRegistry(directory), backend='hashing')
+    classifier.create_training_data = lambda: list(zip(texts, labels))
+    classifier.train_model()
+    return classifier
+
+
+def incremental_seconds(texts, labels, directory, batch_size):
+    """partial_fit the new documents in batches onto a freshly loaded model and publish it"""
+    from model_registry import ModelRegistry
+    from real_ai_models import DocumentClassifier
+
+    def run():
+        classifier = DocumentClassifier(ModelRegistry(directory), backend='hashing')
+        classifier.load_model()
+        for start in range(0, len(texts), batch_size):
+            classifier.partial_fit(texts[start:start + batch_size], labels[start:start + batch_size])
+        classifier.save_model({'backend': 'hashing', 'incremental_documents': len(texts)})
+
+    return timed(run)
+
+
+def mongo_incremental_seconds(uri, texts, labels, directory, batch_size):
+    """Insert the new documents as verified applications and run incremental_train() on them"""
+    from pymongo import MongoClient
+    from incremental_training import incremental_train
+    from model_registry import ModelRegistry
+    from real_ai_models import DocumentClassifier
+
+    client = MongoClient(uri)
+    database = client['fire_noc_training_benchmark']
+    database.drop_collection('applications')
+    try:
+        verified_at = datetime.now()
+        database.applications.insert_many([{
+            'documents_verified': True,
+            'verified_at': verified_at + timedelta(milliseconds=i),
+            'document_verification': {'results': [{'document': UPLOADED_TYPES[label]}], 'extracted_texts': [text]}
+        } for i, (text, label) in enumerate(zip(texts, labels))])
+        stats = incremental_train(DocumentClassifier(ModelRegistry(directory), backend='hashing'),
+                                  database.applications, batch_size)
+        return stats['seconds']
+    finally:
+        client.drop_database('fire_noc_training_benchmark')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Document classifier training time vs corpus size')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--new', type=float, default=0.1, help='fraction of the corpus that is newly verified')
+    parser.add_argument('--words', type=int, default=150, help='words per document')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--mongo-uri', help='stream the new documents from MongoDB (scratch database)')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    try:
+        import real_ai_models  # noqa: F401
+    except ImportError as e:
+        print(f"❌ The AI stack is required for this benchmark (scikit-learn, tensorflow): {e}")
+        return 1
+
+    print("🤖 Fire NOC Document Classifier Training Benchmark")
+    print("=" * 80)
+    print(f"Words/doc: {args.words}   new documents: {args.new:.0%}   batch: {args.batch_size}   "
+          f"source: {'MongoDB' if args.mongo_uri else 'memory'}")
+    print()
+
+    results = []
+    for size in args.sizes:
+        texts, labels = synthetic_corpus(size, args.words, seed=size)
+        split = size - max(1, int(size * args.new))
+        with tempfile.TemporaryDirectory() as directory:
+            forest = full_rebuild_seconds('forest', texts, labels, directory)
+            hashing = full_rebuild_seconds('hashing', texts, labels, directory)
+        with tempfile.TemporaryDirectory() as directory:
+            base_model(texts[:split], labels[:split], directory)
+            if args.mongo_uri:
+                incremental = mongo_incremental_seconds(args.mongo_uri, texts[split:], labels[split:], directory, args.batch_size)
+            else:
+                incremental = incremental_seconds(texts[split:], labels[split:], directory, args.batch_size)
+        results.append({
+            'corpus_documents': size,
+            'new_documents': size - split,
+            'forest_rebuild_seconds': round(forest, 3),
+            'hashing_rebuild_seconds': round(hashing, 3),
+            'incremental_seconds': round(incremental, 3)
+        })
+
+    print(f"   {'corpus':>9}{'new':>9}{'forest rebuild s':>18}{'hashing rebuild s':>19}{'incremental s':>15}{'speed-up':>10}")
+    for r in results:
+        print(f"   {r['corpus_documents']:>9,}{r['new_documents']:>9,}{r['forest_rebuild_seconds']:>18.2f}"
+              f"{r['hashing_rebuild_seconds']:>19.2f}{r['incremental_seconds']:>15.2f}"
+              f"{r['forest_rebuild_seconds'] / r['incremental_seconds']:>9.0f}x")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'results': results, 'words_per_doc': args.words, 'new_fraction': args.new}, f, indent=2)
+        print(f"📄 Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
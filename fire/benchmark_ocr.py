@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+OCR Engine Benchmark for Fire NOC System
+Images/sec for the OCR paths on rendered document pages, at each concurrency level:
+
+    pytesseract   tesseract process + temp files per image (the fallback)
+    fresh-handle  a new in-process Tesseract handle per image: no process spawn,
+                  but the language model is still loaded every time
+    pool          the TesseractPool used by the app: handles loaded once and reused
+
+The pages are decoded and binarized up front (image_preprocessing.load_ocr_image), so
+only OCR is timed. Paths whose dependency is missing are reported as unavailable.
+
+Usage:
+    python benchmark_ocr.py [--pages N] [--concurrency 1 4] [--json FILE]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmark_ai_engine import write_document_images
+from image_preprocessing import load_ocr_image
+from ocr_engine import DEFAULT_POOL_SIZE, OCR_LANGUAGE, PytesseractOCR, TesseractPool
+
+
+class FreshHandleOCR(TesseractPool):
+    """A new handle for every image, ended afterwards"""
+
+    def image_to_string(self, image):
+        api = self._create_handle()
+        try:
+            api.SetImage(image)
+            return api.GetUTF8Text()
+        finally:
+            api.End()
+
+
+def ocr_paths(pool_size, tessdata):
+    """path name -> OCR engine (or the reason it can't run here)"""
+    paths = {}
+    for name, factory in (
+        ('pytesseract', lambda: PytesseractOCR()),
+        ('fresh-handle', lambda: FreshHandleOCR(1, OCR_LANGUAGE, tessdata)),
+        ('pool', lambda: TesseractPool(pool_size, OCR_LANGUAGE, tessdata))
+    ):
+        try:
+            engine = factory()
+            engine.warm_up()
+            if name == 'pytesseract':
+                import pytesseract
+                pytesseract.get_tesseract_version()
+            paths[name] = engine
+        except Exception as e:
+            paths[name] = f"{type(e).__name__}: {e}"
+    return paths
+
+
+def images_per_second(engine, images, concurrency):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        texts = list(executor.map(engine.image_to_string, images))
+    elapsed = time.perf_counter() - started
+    return len(images) / elapsed, sum(len(text.split()) for text in texts) / len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare OCR engine paths')
+    parser.add_argument('--pages', type=int, default=24, help='rendered document pages')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, DEFAULT_POOL_SIZE])
+    parser.add_argument('--tessdata', help='directory holding <language>.traineddata')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        images = [load_ocr_image(path) for path, _ in write_document_images(directory, args.pages)]
+
+    print("🔤 Fire NOC OCR Engine Benchmark")
+    print("=" * 72)
+    print(f"Pages: {len(images)} ({images[0].size[0]}x{images[0].size[1]} binarized)   language: {OCR_LANGUAGE}   "
+          f"CPUs: {os.cpu_count()}")
+    print()
+
+    results = []
+    engines = ocr_paths(max(args.concurrency), args.tessdata)
+    print(f"   {'path':<14}{'concurrency':>12}{'images/s':>11}{'words/page':>12}")
+    for name, engine in engines.items():
+        if isinstance(engine, str):
+            print(f"   {name:<14} unavailable ({engine})")
+            results.append({'path': name, 'unavailable': engine})
+            continue
+        for concurrency in args.concurrency:
+            rate, words = images_per_second(engine, images, concurrency)
+            results.append({'path': name, 'concurrency': concurrency,
+                            'images_per_second': round(rate, 2), 'words_per_page': round(words, 1)})
+            print(f"   {name:<14}{concurrency:>12}{rate:>11.2f}{words:>12.1f}")
+        engine.close()
+
+    measured = [r for r in results if 'images_per_second' in r]
+    pool = {r['concurrency']: r['images_per_second'] for r in measured if r['path'] == 'pool'}
+    for baseline in ('pytesseract', 'fresh-handle'):
+        rates = {r['concurrency']: r['images_per_second'] for r in measured if r['path'] == baseline}
+        if pool and rates:
+            print()
+            print("✅ pool vs " + baseline + ": " + ", ".join(
+                f"{pool[c] / rates[c]:.1f}x at concurrency {c}" for c in args.concurrency))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'results': results, 'pages': len(images), 'language': OCR_LANGUAGE}, f, indent=2)
+        print(f"📄 Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+SMTP Throughput Benchmark for Fire NOC System
+Compares messages/sec for one-connection-per-message sending (mail.send) against the
+pooled keep-alive connection and send_many batch in EmailService, using a local
+aiosmtpd server as the SMTP stand-in.
+
+Usage:
+    pip install aiosmtpd
+    python benchmark_smtp.py [messages] [handshake_delay_ms]
+
+handshake_delay_ms delays each EHLO to approximate the TLS + login round trips of a real relay.
+"""
+
+import asyncio
+import socket
+import sys
+import time
+
+from flask import Flask
+from flask_mail import Mail
+
+from email_service import EmailService
+
+
+class CountingHandler:
+    """Accepts every message; optionally slows down the per-connection handshake"""
+
+    def __init__(self, handshake_delay):
+        self.handshake_delay = handshake_delay
+        self.received = 0
+        self.connections = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        if self.handshake_delay:
+            await asyncio.sleep(self.handshake_delay)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return '250 Message accepted for delivery'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def create_app(port):
+    app = Flask(__name__)
+    app.config.update(
+        MAIL_SERVER='127.0.0.1',
+        MAIL_PORT=port,
+        MAIL_USE_TLS=False,
+        MAIL_USE_SSL=False,
+        MAIL_USERNAME='benchmark@firenoc.local',
+        MAIL_PASSWORD=None,
+        MAIL_DEFAULT_SENDER='benchmark@firenoc.local'
+    )
+    return app, Mail(app)
+
+
+def sample_messages(count):
+    return [
+        {
+            'subject': f'Certificate issued #{i}',
+            'recipient': f'user{i}@example.com',
+            'body': 'Your Fire NOC certificate has been issued.',
+            'html_body': '<p>Your Fire NOC certificate has been issued.</p>'
+        }
+        for i in range(count)
+    ]
+
+
+def run_case(label, handler, send):
+    before_received, before_connections = handler.received, handler.connections
+    started = time.perf_counter()
+    send()
+    elapsed = time.perf_counter() - started
+    sent = handler.received - before_received
+    connections = handler.connections - before_connections
+    print(f"   {label:<36} {sent / elapsed:9.1f} msg/s   {elapsed * 1000:8.1f} ms   {connections:4d} connection(s)")
+    return sent / elapsed
+
+
+def main():
+    try:
+        from aiosmtpd.controller import Controller
+    except ImportError:
+        print("❌ aiosmtpd is required for this benchmark: pip install aiosmtpd")
+        return 1
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    handshake_delay_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+
+    port = free_port()
+    handler = CountingHandler(handshake_delay_ms / 1000)
+    controller = Controller(handler, hostname='127.0.0.1', port=port)
+    controller.start()
+
+    app, mail = create_app(port)
+    email_service = EmailService(mail, app.config)
+    messages = sample_messages(count)
+
+    print("📧 Fire NOC SMTP Throughput Benchmark")
+    print("=" * 80)
+    print(f"Messages: {count}   simulated handshake: {handshake_delay_ms:.0f} ms per connection")
+    print()
+
+    try:
+        with app.app_context():
+            def per_message():
+                for item in messages:
+                    mail.send(email_service.build_message(
+                        item['subject'], item['recipient'], item['body'], item['html_body']
+                    ))
+
+            def pooled():
+                for item in messages:
+                    email_service.send_message(item['subject'], item['recipient'], item['body'], item['html_body'])
+
+            def batched():
+                email_service.send_many(messages)
+
+            before = run_case("Before: mail.send per message", handler, per_message)
+            pooled_rate = run_case("After: pooled send_message", handler, pooled)
+            email_service.smtp_pool.close_all()
+            batch_rate = run_case("After: send_many batch", handler, batched)
+            email_service.smtp_pool.close_all()
+
+        print()
+        print(f"✅ Pooled speedup: {pooled_rate / before:.1f}x   batch speedup: {batch_rate / before:.1f}x")
+    finally:
+        controller.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
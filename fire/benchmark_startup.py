@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Startup Time Benchmark for Fire NOC System
+Measures the import cost of the AI stack before (eager real_ai_models import)
+and after (lazy ai_provider) so the cold-start saving can be checked on each host
+"""
+
+import os
+import subprocess
+import sys
+
+FIRE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+EAGER_IMPORT = """
+import time
+started = time.perf_counter()
+try:
+    from real_ai_models import ai_engine
+except ImportError as e:
+    print('ERROR', e)
+print(time.perf_counter() - started)
+"""
+
+LAZY_IMPORT = """
+import time
+started = time.perf_counter()
+from ai_provider import ai_provider
+print(time.perf_counter() - started)
+"""
+
+LAZY_WARMUP = """
+import time
+from ai_provider import ai_provider
+started = time.perf_counter()
+engine = ai_provider.get_engine(timeout=600)
+print(time.perf_counter() - started if engine else 'ERROR ' + str(ai_provider.load_error))
+"""
+
+
+def time_snippet(snippet, runs):
+    """Run a snippet in fresh interpreters and return the measured seconds"""
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', snippet],
+            cwd=FIRE_DIR, capture_output=True, text=True
+        )
+        lines = result.stdout.strip().splitlines()
+        errors = [line for line in lines if line.startswith('ERROR')]
+        if errors or not lines:
+            return None, errors[0] if errors else (result.stderr.strip() or 'no output')
+        timings.append(float(lines[-1]))
+    return timings, None
+
+
+def report(label, snippet, runs):
+    timings, error = time_snippet(snippet, runs)
+    if timings is None:
+        print(f"   {label:<40} unavailable ({error})")
+        return None
+    best = min(timings)
+    mean = sum(timings) / len(timings)
+    print(f"   {label:<40} best {best * 1000:8.1f} ms   mean {mean * 1000:8.1f} ms")
+    return best
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print("⏱️ Fire NOC Startup Time Benchmark")
+    print("=" * 60)
+    print(f"Python: {sys.version.split()[0]}   runs per measurement: {runs}")
+    print()
+
+    print("📊 Import cost on the app import path:")
+    before = report("Before: import real_ai_models", EAGER_IMPORT, runs)
+    after = report("After: import ai_provider", LAZY_IMPORT, runs)
+    print()
+
+    print("📊 Deferred cost (paid in the background warm-up thread):")
+    report("Warm-up: load engine + models", LAZY_WARMUP, 1)
+    print()
+
+    if before is not None and after is not None:
+        print(f"✅ Cold-start import saving: {(before - after) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,17 @@ In a production environment, this would be replaced with a real blockchain integ
 like Ethereum, Hyperledger, or a specialized blockchain service.
 """
 
+import atexit
 import hashlib
+import hmac
 import json
+import multiprocessing
+import threading
 import time
 import os
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # Path to store blockchain data
@@ -19,13 +25,90 @@ BLOCKCHAIN_DIR = os.path.join(os.path.dirname(__file__), 'data', 'blockchain')
 # Ensure blockchain directory exists
 os.makedirs(BLOCKCHAIN_DIR, exist_ok=True)
 
+# Storage: every new block is appended as one JSON line to BLOCK_LOG_FILE (and fsynced).
+# Every SNAPSHOT_INTERVAL blocks the whole chain is compacted into SNAPSHOT_FILE (also
+# JSON lines) and the log starts over, so a load reads the snapshot and then the blocks
+# appended since. LEGACY_CHAIN_FILE is the old single-document format, migrated on load.
+BLOCK_LOG_FILE = 'blocks.jsonl'
+SNAPSHOT_FILE = 'snapshot.jsonl'
+LEGACY_CHAIN_FILE = 'blockchain.json'
+SNAPSHOT_INTERVAL = int(os.environ.get('BLOCKCHAIN_SNAPSHOT_INTERVAL', 1000))
+
+# Anchoring: 'block' mines one block per certificate; 'batch' queues certificates and
+# commits up to BATCH_SIZE of them (or whatever is pending every BATCH_INTERVAL seconds)
+# as one block whose header holds the Merkle root of the batch
+ANCHOR_MODE = os.environ.get('BLOCKCHAIN_ANCHOR_MODE', 'block')
+BATCH_SIZE = int(os.environ.get('BLOCKCHAIN_BATCH_SIZE', 256))
+BATCH_INTERVAL = float(os.environ.get('BLOCKCHAIN_BATCH_INTERVAL', 5))
+# Batches whose Merkle trees are kept in memory for building proofs
+MERKLE_CACHE_BLOCKS = 64
+
+# Validation checkpoint: "validated up to block N with hash H", signed with HMAC-SHA256 so
+# an audit can trust it and only check the blocks after it. Without a key the signature
+# only guards against accidental corruption.
+CHECKPOINT_FILE = 'checkpoint.json'
+CHECKPOINT_KEY = os.environ.get('BLOCKCHAIN_CHECKPOINT_KEY', os.environ.get('SECRET_KEY', ''))
+# Full revalidation splits the chain into chunks for a process pool
+VALIDATION_WORKERS = int(os.environ.get('BLOCKCHAIN_VALIDATION_WORKERS', os.cpu_count() or 1))
+VALIDATION_CHUNKS_PER_WORKER = 4
+
+
+def merkle_leaf(entry):
+    """Leaf hash of one batched certificate entry (transaction ID + certificate data)"""
+    return hashlib.sha256(b'\x00' + json.dumps(entry, sort_keys=True).encode()).hexdigest()
+
+
+def merkle_parent(left, right):
+    # Distinct prefixes for leaves and inner nodes so a leaf can't pose as a subtree
+    return hashlib.sha256(b'\x01' + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+def merkle_levels(leaves):
+    """All tree levels, leaves first. An unpaired node is carried up unchanged."""
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [merkle_parent(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def merkle_root(leaves):
+    return merkle_levels(leaves)[-1][0] if leaves else None
+
+
+def merkle_proof(levels, position):
+    """Sibling hashes from leaf to root: [['L' or 'R', hash], ...]"""
+    proof = []
+    for level in levels[:-1]:
+        sibling = position ^ 1
+        if sibling < len(level):
+            proof.append(['L' if sibling < position else 'R', level[sibling]])
+        position //= 2
+    return proof
+
+
+def verify_merkle_proof(leaf_hash, proof, root):
+    """Check an inclusion proof returned by verify_certificate"""
+    node = leaf_hash
+    for side, sibling in proof:
+        node = merkle_parent(sibling, node) if side == 'L' else merkle_parent(node, sibling)
+    return node == root
+
 class Block:
-    """Represents a block in the blockchain"""
-    def __init__(self, index, timestamp, data, previous_hash):
+    """
+    Represents a block in the blockchain. A batch block also carries the certificate
+    entries of its batch; they are outside the mined hash and committed to through the
+    merkle_root in its data.
+    """
+    def __init__(self, index, timestamp, data, previous_hash, certificates=None):
         self.index = index
         self.timestamp = timestamp
         self.data = data
         self.previous_hash = previous_hash
+        self.certificates = certificates
         self.nonce = 0
         self.hash = self.calculate_hash()
     
@@ -51,11 +134,114 @@ class Block:
         
         print(f"Block mined: {self.hash}")
         return self.hash
+    
+    def to_dict(self):
+        """Stored form of the block"""
+        block_data = {
+            'index': self.index,
+            'timestamp': self.timestamp,
+            'data': self.data,
+            'previous_hash': self.previous_hash,
+            'nonce': self.nonce,
+            'hash': self.hash
+        }
+        if self.certificates is not None:
+            block_data['certificates'] = self.certificates
+        return block_data
+    
+    @classmethod
+    def from_dict(cls, block_data):
+        """Block from its stored form, keeping the stored nonce and hash"""
+        # Bypass __init__: the hash it would compute is replaced by the stored one anyway
+        # (is_chain_valid is what recomputes and checks it)
+        block = cls.__new__(cls)
+        block.index = block_data['index']
+        block.timestamp = block_data['timestamp']
+        block.data = block_data['data']
+        block.previous_hash = block_data['previous_hash']
+        block.certificates = block_data.get('certificates')
+        block.nonce = block_data['nonce']
+        block.hash = block_data['hash']
+        return block
+
+def block_is_valid(block, previous_hash):
+    """Check a block's stored hash, its link to the previous block, and its batch Merkle root"""
+    # Check if hash is valid
+    if block.hash != block.calculate_hash():
+        return False
+    
+    # Check if previous hash reference is valid
+    if block.previous_hash != previous_hash:
+        return False
+    
+    # Check that a batch's certificates match the Merkle root that was mined
+    if block.certificates is not None and block.data.get('merkle_root') != \
+            merkle_root([merkle_leaf(entry) for entry in block.certificates]):
+        return False
+    
+    return True
+
+
+def fsync_directory(directory):
+    """Make a rename or new file in directory durable (skipped where directories can't be opened)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def first_invalid_block(previous_hash, block_dicts):
+    """Index of the first invalid block in a run of stored blocks, or None (runs in pool workers)"""
+    for block_data in block_dicts:
+        block = Block.from_dict(block_data)
+        if not block_is_valid(block, previous_hash):
+            return block.index
+        previous_hash = block.hash
+    return None
+
+
+# Chain being validated, inherited by forked pool workers instead of pickled to them
+_validation_chain = None
+
+def first_invalid_in_range(start, end):
+    """first_invalid_block over chain positions start..end of the inherited chain"""
+    chain = _validation_chain
+    for i in range(start, end):
+        if not block_is_valid(chain[i], chain[i-1].hash):
+            return chain[i].index
+    return None
+
+
+def sign_checkpoint(index, block_hash, validated_at):
+    message = f"{index}:{block_hash}:{validated_at}".encode()
+    return hmac.new(CHECKPOINT_KEY.encode(), message, hashlib.sha256).hexdigest()
+
 
 class Blockchain:
     """Simple blockchain implementation for certificate verification"""
-    def __init__(self):
+    def __init__(self, directory=BLOCKCHAIN_DIR, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.snapshot_interval = snapshot_interval
         self.chain = []
+        # Blocks in the append log since the last snapshot
+        self.logged_blocks = 0
+        # (offset, size) of the block log when its last line was found torn by a crash;
+        # cut off by the first append_block of this instance
+        self.torn_log_tail = None
+        # Secondary indexes: certificate_hash / transaction_id -> position in self.chain,
+        # and certificate_hash -> position in its batch for batched certificates
+        self.certificate_index = {}
+        self.transaction_index = {}
+        self.leaf_index = {}
+        # Block position -> Merkle tree levels of recently verified batches
+        self.merkle_cache = OrderedDict()
         self.difficulty = 2  # Simplified difficulty for demo
         self.load_chain()
         
@@ -72,98 +258,479 @@ class Blockchain:
         
         genesis_block.mine_block(self.difficulty)
         self.chain.append(genesis_block)
-        self.save_chain()
+        self.index_block(genesis_block, 0)
+        self.append_block(genesis_block)
     
     def get_latest_block(self):
         """Get the most recent block in the chain"""
         return self.chain[-1]
     
-    def add_block(self, data):
+    def add_block(self, data, certificates=None):
         """Add a new block to the chain"""
         previous_block = self.get_latest_block()
         new_index = previous_block.index + 1
-        new_block = Block(new_index, str(datetime.now()), data, previous_block.hash)
+        new_block = Block(new_index, str(datetime.now()), data, previous_block.hash, certificates)
         new_block.mine_block(self.difficulty)
         
         self.chain.append(new_block)
-        self.save_chain()
+        self.index_block(new_block, len(self.chain) - 1)
+        self.append_block(new_block)
         
         return new_block
     
+    def index_block(self, block, position):
+        """Add a block's certificate hash and transaction ID to the lookup indexes"""
+        data = block.data if isinstance(block.data, dict) else {}
+        transaction_id = data.get('transaction_id')
+        if transaction_id is not None:
+            self.transaction_index.setdefault(transaction_id, position)
+        
+        certificate_data = data.get('certificate_data')
+        if isinstance(certificate_data, dict) and 'certificate_hash' in certificate_data:
+            # The earliest block wins, as the old linear scan did
+            self.certificate_index.setdefault(certificate_data['certificate_hash'], position)
+        
+        for leaf, entry in enumerate(block.certificates or ()):
+            self.transaction_index.setdefault(entry['transaction_id'], position)
+            certificate_hash = entry['certificate_data'].get('certificate_hash')
+            if certificate_hash is not None and certificate_hash not in self.certificate_index:
+                self.certificate_index[certificate_hash] = position
+                self.leaf_index[certificate_hash] = leaf
+    
+    def add_batch(self, entries):
+        """Commit a batch of certificate entries as one block holding their Merkle root"""
+        return self.add_block({
+            'batch_id': str(uuid.uuid4()),
+            'merkle_root': merkle_root([merkle_leaf(entry) for entry in entries]),
+            'certificate_count': len(entries),
+            'timestamp': str(datetime.now())
+        }, certificates=entries)
+    
+    def batch_merkle_levels(self, position):
+        """Merkle tree of the batch block at a chain position (cached: mined batches never change)"""
+        levels = self.merkle_cache.pop(position, None)
+        if levels is None:
+            levels = merkle_levels([merkle_leaf(entry) for entry in self.chain[position].certificates])
+        self.merkle_cache[position] = levels
+        while len(self.merkle_cache) > MERKLE_CACHE_BLOCKS:
+            self.merkle_cache.popitem(last=False)
+        return levels
+    
+    def rebuild_indexes(self):
+        """Build the lookup indexes from scratch (one pass over the chain)"""
+        self.certificate_index = {}
+        self.transaction_index = {}
+        self.leaf_index = {}
+        self.merkle_cache = OrderedDict()
+        for position, block in enumerate(self.chain):
+            self.index_block(block, position)
+    
+    def find_certificate(self, certificate_hash):
+        """Block holding a certificate hash, or None"""
+        position = self.certificate_index.get(certificate_hash)
+        return self.chain[position] if position is not None else None
+    
+    def find_transaction(self, transaction_id):
+        """Block holding a transaction, or None"""
+        position = self.transaction_index.get(transaction_id)
+        return self.chain[position] if position is not None else None
+    
     def is_chain_valid(self):
         """Validate the integrity of the blockchain"""
         for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i-1]
-            
-            # Check if hash is valid
-            if current_block.hash != current_block.calculate_hash():
-                return False
-            
-            # Check if previous hash reference is valid
-            if current_block.previous_hash != previous_block.hash:
+            if not block_is_valid(self.chain[i], self.chain[i-1].hash):
                 return False
         
         return True
     
+    def load_checkpoint(self):
+        """
+        The last validation checkpoint, if its signature holds and the chain still has the
+        checkpointed block with the same hash; otherwise None
+        """
+        try:
+            with open(os.path.join(self.directory, CHECKPOINT_FILE), 'r') as f:
+                checkpoint = json.load(f)
+            index, block_hash = checkpoint['index'], checkpoint['hash']
+            signature = sign_checkpoint(index, block_hash, checkpoint['validated_at'])
+        except (OSError, ValueError, KeyError):
+            return None
+        
+        if not hmac.compare_digest(signature, checkpoint.get('signature', '')):
+            print("⚠️ Blockchain checkpoint signature mismatch, ignoring it")
+            return None
+        if index >= len(self.chain) or self.chain[index].hash != block_hash:
+            print(f"⚠️ Blockchain checkpoint at block {index} doesn't match the chain, ignoring it")
+            return None
+        return checkpoint
+    
+    def save_checkpoint(self, block):
+        validated_at = str(datetime.now())
+        checkpoint = {
+            'index': block.index,
+            'hash': block.hash,
+            'validated_at': validated_at,
+            'signature': sign_checkpoint(block.index, block.hash, validated_at)
+        }
+        checkpoint_file = os.path.join(self.directory, CHECKPOINT_FILE)
+        with open(checkpoint_file + '.tmp', 'w') as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(checkpoint_file + '.tmp', checkpoint_file)
+        fsync_directory(self.directory)
+        return checkpoint
+    
+    def validate_chain(self, full=False, workers=1):
+        """
+        Integrity audit. By default only the blocks after the last validation checkpoint are
+        checked; full=True revalidates from genesis, in parallel chunks when workers > 1.
+        A valid chain moves the checkpoint to its latest block.
+        """
+        started = time.perf_counter()
+        checkpoint = None if full else self.load_checkpoint()
+        start = checkpoint['index'] + 1 if checkpoint else 1
+        end = len(self.chain)
+        
+        if workers > 1 and end - start > workers:
+            first_invalid = self.validate_parallel(start, end, workers)
+        else:
+            first_invalid = next((i for i in range(start, end)
+                                  if not block_is_valid(self.chain[i], self.chain[i-1].hash)), None)
+        
+        seconds = time.perf_counter() - started
+        blocks_checked = max(0, end - start) if first_invalid is None else first_invalid - start + 1
+        report = {
+            'valid': first_invalid is None,
+            'first_invalid_block': first_invalid,
+            'checked_from': start,
+            'blocks_checked': blocks_checked,
+            'chain_length': end,
+            'resumed_from_checkpoint': checkpoint is not None,
+            'workers': workers,
+            'seconds': round(seconds, 3),
+            'blocks_per_second': round(blocks_checked / seconds, 1) if seconds > 0 else None
+        }
+        if report['valid'] and self.chain:
+            self.save_checkpoint(self.chain[-1])
+        return report
+    
+    def validate_parallel(self, start, end, workers):
+        """First invalid block between start and end, checking chunks across a process pool"""
+        global _validation_chain
+        
+        chunk_size = max(1, -(-(end - start) // (workers * VALIDATION_CHUNKS_PER_WORKER)))
+        starts = list(range(start, end, chunk_size))
+        ends = [min(end, chunk_start + chunk_size) for chunk_start in starts]
+        
+        if 'fork' in multiprocessing.get_all_start_methods():
+            # Forked workers share the parent's chain copy-on-write: nothing to serialize
+            _validation_chain = self.chain
+            try:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as executor:
+                    results = executor.map(first_invalid_in_range, starts, ends)
+                    return next((index for index in results if index is not None), None)
+            finally:
+                _validation_chain = None
+        
+        previous_hashes = [self.chain[chunk_start - 1].hash for chunk_start in starts]
+        chunks = [[block.to_dict() for block in self.chain[chunk_start:chunk_end]]
+                  for chunk_start, chunk_end in zip(starts, ends)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(first_invalid_block, previous_hashes, chunks)
+            return next((index for index in results if index is not None), None)
+    
+    def append_block(self, block):
+        """Persist one block (the last in the chain) by appending it to the block log"""
+        log_file = os.path.join(self.directory, BLOCK_LOG_FILE)
+        if self.torn_log_tail is not None:
+            self.repair_block_log(log_file)
+        created = not os.path.exists(log_file)
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(block.to_dict()) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        if created:
+            fsync_directory(self.directory)
+        
+        self.logged_blocks += 1
+        if self.snapshot_interval and self.logged_blocks >= self.snapshot_interval:
+            self.save_chain()
+    
     def save_chain(self):
-        """Save blockchain to disk"""
-        chain_data = []
-        
-        for block in self.chain:
-            chain_data.append({
-                'index': block.index,
-                'timestamp': block.timestamp,
-                'data': block.data,
-                'previous_hash': block.previous_hash,
-                'nonce': block.nonce,
-                'hash': block.hash
-            })
-        
-        with open(os.path.join(BLOCKCHAIN_DIR, 'blockchain.json'), 'w') as f:
-            json.dump(chain_data, f, indent=4)
+        """Compact the whole chain into a new snapshot and start an empty block log"""
+        snapshot_file = os.path.join(self.directory, SNAPSHOT_FILE)
+        temp_file = snapshot_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            for block in self.chain:
+                f.write(json.dumps(block.to_dict()) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, snapshot_file)
+        fsync_directory(self.directory)
+        
+        # A crash before the log is emptied only leaves blocks that load_chain skips
+        # because the snapshot already holds them
+        with open(os.path.join(self.directory, BLOCK_LOG_FILE), 'w', encoding='utf-8') as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self.logged_blocks = 0
+        self.torn_log_tail = None
+    
+    def read_blocks(self, path, torn_tail_ok=False):
+        """
+        Stream the blocks stored in a JSON-lines file, read-only. A last line without its
+        newline is a crash part-way through an append: with torn_tail_ok (the block log) it
+        is skipped and remembered for append_block to cut off. Any other unreadable line is
+        corruption and raises ValueError rather than losing the blocks after it.
+        """
+        if not os.path.exists(path):
+            return
+        
+        with open(path, 'rb') as f:
+            offset = 0
+            for line in f:
+                # Only the final line of a file can lack its newline
+                if torn_tail_ok and not line.endswith(b'\n'):
+                    print(f"⚠️ Ignoring incomplete block record at byte {offset} of {os.path.basename(path)}")
+                    self.torn_log_tail = (offset, offset + len(line))
+                    return
+                try:
+                    block_data = json.loads(line)
+                except ValueError:
+                    raise ValueError(f"Corrupt block record at byte {offset} of {path}") from None
+                offset += len(line)
+                yield Block.from_dict(block_data)
+    
+    def repair_block_log(self, log_file):
+        """Cut the torn last line found by load_chain off the block log before appending after it"""
+        offset, size = self.torn_log_tail
+        if os.path.getsize(log_file) != size:
+            raise RuntimeError(f"{log_file} changed since it was loaded; not truncating it")
+        with open(log_file, 'rb+') as f:
+            f.truncate(offset)
+            f.flush()
+            os.fsync(f.fileno())
+        print(f"🔧 Cut incomplete block record off {os.path.basename(log_file)} at byte {offset}")
+        self.torn_log_tail = None
     
     def load_chain(self):
-        """Load blockchain from disk"""
+        """
+        Load blockchain from disk: the last snapshot, then the block log after it. Unreadable
+        storage raises instead of starting an empty chain over the existing blocks.
+        """
         try:
-            blockchain_file = os.path.join(BLOCKCHAIN_DIR, 'blockchain.json')
+            snapshot_file = os.path.join(self.directory, SNAPSHOT_FILE)
+            legacy_file = os.path.join(self.directory, LEGACY_CHAIN_FILE)
             
-            if not os.path.exists(blockchain_file):
-                return
+            self.chain = []
+            self.logged_blocks = 0
+            self.torn_log_tail = None
             
-            with open(blockchain_file, 'r') as f:
-                chain_data = json.load(f)
+            if not os.path.exists(snapshot_file) and os.path.exists(legacy_file):
+                self.migrate_legacy_chain(legacy_file)
             
-            self.chain = []
+            self.chain.extend(self.read_blocks(snapshot_file))
             
-            for block_data in chain_data:
-                block = Block(
-                    block_data['index'],
-                    block_data['timestamp'],
-                    block_data['data'],
-                    block_data['previous_hash']
-                )
-                block.nonce = block_data['nonce']
-                block.hash = block_data['hash']
+            for block in self.read_blocks(os.path.join(self.directory, BLOCK_LOG_FILE), torn_tail_ok=True):
+                if self.chain and block.index <= self.chain[-1].index:
+                    continue
                 self.chain.append(block)
+                self.logged_blocks += 1
+            
+            self.rebuild_indexes()
         except Exception as e:
-            print(f"Error loading blockchain: {str(e)}")
-            self.chain = []
+            print(f"❌ Error loading blockchain from {self.directory}: {str(e)}")
+            raise
+    
+    def migrate_legacy_chain(self, legacy_file):
+        """One-off conversion of blockchain.json into a snapshot"""
+        with open(legacy_file, 'r') as f:
+            self.chain = [Block.from_dict(block_data) for block_data in json.load(f)]
+        
+        self.save_chain()
+        os.replace(legacy_file, legacy_file + '.migrated')
+        fsync_directory(self.directory)
+        print(f"⛓️ Migrated {len(self.chain)} blocks from {LEGACY_CHAIN_FILE} to the block log")
+        self.chain = []
 
 # Singleton instance
 _blockchain = None
+_blockchain_lock = threading.Lock()
 
 def get_blockchain():
     """Get the blockchain instance"""
     global _blockchain
     
     if _blockchain is None:
-        _blockchain = Blockchain()
+        with _blockchain_lock:
+            if _blockchain is None:
+                _blockchain = Blockchain()
     
     return _blockchain
 
+class AnchorQueue:
+    """
+    Certificates waiting to be anchored, committed by a background thread so mining never
+    runs on the caller's (request) thread. In 'block' mode each certificate is mined into
+    its own block; in 'batch' mode up to batch_size certificates share one block under a
+    Merkle root, committed when the batch is full or interval seconds after it was started.
+    Listeners are called with (block, entries) once the entries are on the chain.
+    """
+    def __init__(self, blockchain_getter=None, mode=ANCHOR_MODE, batch_size=BATCH_SIZE, interval=BATCH_INTERVAL):
+        self.blockchain_getter = blockchain_getter or get_blockchain
+        self.mode = mode
+        self.batch_size = max(1, batch_size) if mode == 'batch' else 1
+        self.interval = interval if mode == 'batch' else 0
+        self.pending = []
+        # certificate_hash / transaction_id -> pending entry
+        self.pending_hashes = {}
+        self.pending_transactions = {}
+        self.listeners = []
+        self._batch_started = None
+        self._lock = threading.Lock()
+        # Held while mining so only one commit runs at a time; submit() never waits for it
+        self._commit_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+    
+    # ==================== CALLER SIDE ====================
+    
+    def submit(self, certificate_data, transaction_id=None):
+        """Queue a certificate and return its (pending) transaction ID"""
+        entry = {'transaction_id': transaction_id or str(uuid.uuid4()), 'certificate_data': certificate_data}
+        with self._lock:
+            self.pending.append(entry)
+            self.pending_transactions[entry['transaction_id']] = entry
+            if 'certificate_hash' in certificate_data:
+                self.pending_hashes.setdefault(certificate_data['certificate_hash'], entry)
+            if self._batch_started is None:
+                self._batch_started = time.monotonic()
+        
+        self._wakeup.set()
+        return entry['transaction_id']
+    
+    def find_pending(self, certificate_hash=None, transaction_id=None):
+        with self._lock:
+            if transaction_id is not None:
+                return self.pending_transactions.get(transaction_id)
+            return self.pending_hashes.get(certificate_hash)
+    
+    # ==================== COMMITTING ====================
+    
+    def flush(self):
+        """Anchor the next block's worth of pending certificates; returns the block, or None if nothing was pending"""
+        with self._commit_lock:
+            with self._lock:
+                # Entries stay visible as pending until their block is on the chain
+                entries = self.pending[:self.batch_size]
+            if not entries:
+                return None
+            
+            blockchain = self.blockchain_getter()
+            if self.mode == 'batch':
+                block = blockchain.add_batch(entries)
+            else:
+                block = blockchain.add_block(dict(entries[0], timestamp=str(datetime.now())))
+            
+            with self._lock:
+                del self.pending[:len(entries)]
+                for entry in entries:
+                    del self.pending_transactions[entry['transaction_id']]
+                    certificate_hash = entry['certificate_data'].get('certificate_hash')
+                    if self.pending_hashes.get(certificate_hash) is entry:
+                        del self.pending_hashes[certificate_hash]
+                self._batch_started = time.monotonic() if self.pending else None
+        
+        if self.mode == 'batch':
+            print(f"⛓️ Anchored {len(entries)} certificates in block {block.index}")
+        for listener in self.listeners:
+            try:
+                listener(block, entries)
+            except Exception as e:
+                print(f"❌ Error in certificate anchor listener: {str(e)}")
+        return block
+    
+    def flush_all(self):
+        while self.flush() is not None:
+            pass
+    
+    def seconds_until_due(self):
+        """0 when a commit is due, seconds until the open batch is due, or None when nothing is pending"""
+        with self._lock:
+            if not self.pending:
+                return None
+            if len(self.pending) >= self.batch_size:
+                return 0
+            return max(0, self.interval - (time.monotonic() - self._batch_started))
+    
+    # ==================== WORKER THREAD ====================
+    
+    def start(self):
+        """Start the anchor thread (idempotent)"""
+        if self._thread:
+            return
+        with self._start_lock:
+            if self._thread:
+                return
+            self._thread = threading.Thread(target=self._run, name='certificate-anchor', daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+    
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                while self.seconds_until_due() == 0 and not self._stop.is_set():
+                    self.flush()
+                timeout = self.seconds_until_due()
+            except Exception as e:
+                print(f"❌ Error anchoring certificates: {str(e)}")
+                # Leave the entries queued and try again shortly
+                timeout = max(1.0, self.interval)
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+_anchor_queue = None
+_anchor_queue_lock = threading.Lock()
+
+def get_anchor_queue():
+    """Get the certificate anchor queue, with its worker thread running"""
+    global _anchor_queue
+    
+    if _anchor_queue is None:
+        with _anchor_queue_lock:
+            if _anchor_queue is None:
+                _anchor_queue = AnchorQueue()
+                _anchor_queue.start()
+                # Don't lose queued certificates on a clean shutdown
+                atexit.register(_anchor_queue.flush_all)
+    
+    return _anchor_queue
+
+def add_anchor_listener(listener):
+    """Call listener(block, entries) whenever queued certificates are anchored"""
+    get_anchor_queue().listeners.append(listener)
+
+def submit_certificate(certificate_data, transaction_id=None):
+    """
+    Queue a certificate for anchoring and return its transaction ID straight away. The
+    transaction is pending (see get_transaction) until the anchor thread has mined it.
+    """
+    return get_anchor_queue().submit(certificate_data, transaction_id)
+
 def store_certificate(certificate_data):
-    """Store a certificate on the blockchain"""
+    """
+    Store a certificate on the blockchain. In batch anchor mode the certificate is queued
+    and the returned transaction ID is pending until its batch is committed.
+    """
+    if ANCHOR_MODE == 'batch':
+        return submit_certificate(certificate_data)
+    
     blockchain = get_blockchain()
     
     # Generate a unique transaction ID
@@ -181,25 +748,95 @@ def store_certificate(certificate_data):
     
     return transaction_id
 
+def certificate_entry(blockchain, block, certificate_hash):
+    """
+    Transaction ID and certificate data of a certificate in a block, with the Merkle
+    inclusion proof when the block is a batch
+    """
+    if block.certificates is None:
+        return {
+            'transaction_id': block.data.get('transaction_id'),
+            'certificate_data': block.data['certificate_data']
+        }
+    
+    position = blockchain.leaf_index[certificate_hash]
+    entry = block.certificates[position]
+    levels = blockchain.batch_merkle_levels(blockchain.certificate_index[certificate_hash])
+    return {
+        'transaction_id': entry['transaction_id'],
+        'certificate_data': entry['certificate_data'],
+        'merkle_root': block.data['merkle_root'],
+        'merkle_proof': {
+            'leaf_hash': levels[0][position],
+            'leaf_index': position,
+            'path': merkle_proof(levels, position)
+        }
+    }
+
 def verify_certificate(certificate_hash):
     """Verify a certificate on the blockchain"""
     blockchain = get_blockchain()
     
-    # Search for certificate in blockchain
-    for block in blockchain.chain:
-        if 'certificate_data' in block.data and 'certificate_hash' in block.data['certificate_data']:
-            if block.data['certificate_data']['certificate_hash'] == certificate_hash:
-                return {
-                    'verified': True,
-                    'block_index': block.index,
-                    'transaction_id': block.data.get('transaction_id'),
-                    'timestamp': block.timestamp,
-                    'certificate_data': block.data['certificate_data']
-                }
+    # Indexed lookup instead of a scan over every block
+    block = blockchain.find_certificate(certificate_hash)
+    if block is None:
+        if _anchor_queue is not None and _anchor_queue.find_pending(certificate_hash=certificate_hash):
+            return {'verified': False, 'pending': True}
+        return {'verified': False}
+    
+    result = {
+        'verified': True,
+        'block_index': block.index,
+        'block_hash': block.hash,
+        'timestamp': block.timestamp
+    }
+    result.update(certificate_entry(blockchain, block, certificate_hash))
+    return result
+
+def get_transaction(transaction_id):
+    """Look up a certificate transaction by its ID"""
+    blockchain = get_blockchain()
+    block = blockchain.find_transaction(transaction_id)
+    if block is None:
+        entry = _anchor_queue.find_pending(transaction_id=transaction_id) if _anchor_queue is not None else None
+        if entry is None:
+            return None
+        return {'transaction_id': transaction_id, 'pending': True, 'certificate_data': entry['certificate_data']}
+    
+    if block.certificates is None:
+        certificate_data = block.data.get('certificate_data')
+    else:
+        certificate_data = next(entry['certificate_data'] for entry in block.certificates
+                                if entry['transaction_id'] == transaction_id)
     
-    return {'verified': False}
+    return {
+        'block_index': block.index,
+        'transaction_id': transaction_id,
+        'timestamp': block.timestamp,
+        'certificate_data': certificate_data
+    }
+
+def validate_chain(full=False, workers=None):
+    """Audit the chain (see Blockchain.validate_chain); full audits use VALIDATION_WORKERS processes"""
+    if workers is None:
+        workers = VALIDATION_WORKERS if full else 1
+    return get_blockchain().validate_chain(full=full, workers=workers)
 
 def generate_certificate_hash(application_id, business_name, issue_date):
     """Generate a unique hash for a certificate"""
     data = f"{application_id}:{business_name}:{issue_date}:{uuid.uuid4()}"
     return hashlib.sha256(data.encode()).hexdigest()
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Audit the certificate blockchain')
+    parser.add_argument('--full', action='store_true', help='revalidate from genesis instead of the last checkpoint')
+    parser.add_argument('--workers', type=int, help=f'processes for a full audit (default {VALIDATION_WORKERS})')
+    args = parser.parse_args()
+    
+    report = validate_chain(full=args.full, workers=args.workers)
+    print(json.dumps(report, indent=2))
+    print(f"{'✅' if report['valid'] else '❌'} {report['blocks_checked']:,} blocks checked from block "
+          f"{report['checked_from']} ({report['blocks_per_second'] or 0:,.0f} blocks/sec)")
+    raise SystemExit(0 if report['valid'] else 1)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Result Cache Service for Fire NOC System
+TTL cache with request coalescing (single-flight) for the analytics and dashboard APIs,
+with an in-process backend and a shared MongoDB backend
+"""
+
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import g, has_request_context, jsonify, make_response, session
+
+
+class InMemoryCacheBackend:
+    """Per-process cache backend (dict with expiry timestamps)"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                # Drop the entry closest to expiry to stay bounded
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def clear(self, prefix=''):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def size(self):
+        return len(self._entries)
+
+
+class MongoCacheBackend:
+    """Shared cache backend stored in a MongoDB collection (TTL index on expires_at)"""
+
+    name = 'mongo'
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def get(self, key):
+        entry = self.collection.find_one({'_id': key, 'expires_at': {'$gt': datetime.now()}})
+        return entry['value'] if entry else None
+
+    def set(self, key, value, ttl):
+        self.collection.replace_one(
+            {'_id': key},
+            {'_id': key, 'value': value, 'expires_at': datetime.now() + timedelta(seconds=ttl)},
+            upsert=True
+        )
+
+    def clear(self, prefix=''):
+        self.collection.delete_many({'_id': {'$regex': '^' + re.escape(prefix)}})
+
+    def size(self):
+        return self.collection.count_documents({'expires_at': {'$gt': datetime.now()}})
+
+
+class _Flight:
+    """A computation in progress that concurrent callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResultCache:
+    """TTL result cache where concurrent misses for the same key compute only once"""
+
+    def __init__(self, backend, wait_timeout=30):
+        self.backend = backend
+        self.wait_timeout = wait_timeout
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def get_or_compute(self, key, compute, ttl):
+        """
+        Return the cached value for key, or compute it once and cache it for ttl seconds.
+        compute() may return None to signal a result that must not be cached.
+        """
+        value = self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+            generation = self._generation
+
+        if not leader:
+            self.coalesced += 1
+            if flight.done.wait(self.wait_timeout) and flight.error is None and flight.value is not None:
+                return flight.value
+            # The leader failed or produced an uncacheable result - compute our own
+            return compute()
+
+        self.misses += 1
+        try:
+            value = compute()
+            flight.value = value
+            # Don't store results computed before an invalidation landed
+            if value is not None and generation == self._generation:
+                self.backend.set(key, value, ttl)
+            return value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def invalidate(self, prefix=''):
+        """Drop every cached entry whose key starts with prefix"""
+        with self._lock:
+            self._generation += 1
+        self.invalidations += 1
+        self.backend.clear(prefix)
+
+    def invalidate_after_write(self, prefix=''):
+        """
+        Invalidate prefix once the current request finishes (see flush_request_invalidations),
+        or straight away when called outside a request
+        """
+        if has_request_context():
+            g.setdefault('stale_cache_prefixes', set()).add(prefix)
+        else:
+            self.invalidate(prefix)
+
+    def flush_request_invalidations(self):
+        """Run the invalidations deferred by writes during the current request"""
+        for prefix in g.pop('stale_cache_prefixes', ()):
+            self.invalidate(prefix)
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            'backend': self.backend.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'invalidations': self.invalidations,
+            'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0,
+            'entries': self.backend.size()
+        }
+
+    def cached_json(self, prefix, ttl, roles=None, per_user=False):
+        """
+        Cache a JSON view's successful payload.
+        roles is checked before the cache so a hit never bypasses the view's authorization;
+        per_user adds the session username to the key for user-specific dashboards.
+        """
+        def decorator(f):
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                if roles and session.get('role') not in roles:
+                    return f(*args, **kwargs)
+
+                key = prefix
+                if per_user:
+                    key = f"{prefix}:{session.get('username', '')}"
+                if kwargs:
+                    key += ':' + ':'.join(f"{k}={kwargs[k]}" for k in sorted(kwargs))
+
+                produced = {}
+
+                def compute():
+                    response = make_response(f(*args, **kwargs))
+                    produced['response'] = response
+                    if response.status_code == 200 and response.is_json:
+                        return response.get_json()
+                    return None
+
+                payload = self.get_or_compute(key, compute, ttl)
+                if 'response' in produced:
+                    return produced['response']
+                if payload is None:
+                    return f(*args, **kwargs)
+                return jsonify(payload)
+            return wrapper
+        return decorator
+
+
+class InvalidatingCollection:
+    """
+    A MongoDB collection whose writes invalidate cached results under prefix, so every code
+    path that changes the data drops the results derived from it. Reads pass straight through.
+    """
+
+    WRITE_METHODS = frozenset({
+        'insert_one', 'insert_many', 'update_one', 'update_many', 'replace_one',
+        'delete_one', 'delete_many', 'bulk_write',
+        'find_one_and_update', 'find_one_and_replace', 'find_one_and_delete'
+    })
+
+    def __init__(self, collection, cache, prefix):
+        self._collection = collection
+        self._cache = cache
+        self._prefix = prefix
+
+    def __getattr__(self, name):
+        attribute = getattr(self._collection, name)
+        if name not in self.WRITE_METHODS:
+            return attribute
+
+        @wraps(attribute)
+        def write(*args, **kwargs):
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                self._cache.invalidate_after_write(self._prefix)
+        return write
+
+    def __getitem__(self, name):
+        return self._collection[name]
+
+
+def create_result_cache(db=None):
+    """Build the cache from CACHE_BACKEND ('memory' or 'mongo')"""
+    backend_name = os.getenv('CACHE_BACKEND', 'memory').lower()
+    if backend_name == 'mongo' and db is not None:
+        backend = MongoCacheBackend(db['cache_entries'])
+    else:
+        backend = InMemoryCacheBackend()
+    return ResultCache(backend)
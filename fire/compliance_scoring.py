@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Portfolio Compliance Scoring for Fire NOC System
+Re-scores every (certificate-holding) application with the compliance model in one
+pass: the five model features are read with a single projected cursor into a NumPy
+matrix, the ratio checks are vectorized, the SVC scores every row with one predict
+call, and the scores are written back to applications with unordered bulk writes.
+
+Usage:
+    python compliance_scoring.py [--scope certified|all] [--batch-size N]
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+from pymongo import UpdateOne
+
+# Model features in training order, with the application fields each can be read from
+COMPLIANCE_FEATURE_FIELDS = (
+    ('area_sqft', 'building_area'),
+    ('occupancy_count', 'max_occupancy'),
+    ('fire_extinguishers',),
+    ('emergency_exits',),
+    ('smoke_detectors',)
+)
+# Values used when an application doesn't provide a feature
+COMPLIANCE_FEATURE_DEFAULTS = (1000, 50, 2, 1, 5)
+
+COMPLIANCE_SCOPES = {
+    'certified': {'certificate_number': {'$exists': True, '$ne': None}},
+    'all': {}
+}
+
+RECOMMENDATIONS = (
+    "Install additional fire extinguishers",
+    "Add more emergency exits",
+    "Install more smoke detectors",
+    "Immediate safety improvements required"
+)
+# Recommendation list for every combination of the four checks (bit i = RECOMMENDATIONS[i])
+RECOMMENDATION_SETS = tuple(
+    [text for bit, text in enumerate(RECOMMENDATIONS) if code & (1 << bit)]
+    for code in range(1 << len(RECOMMENDATIONS))
+)
+
+RISK_THRESHOLDS = (90, 70, 50)
+RISK_LEVELS = ("Low Risk", "Medium Risk", "High Risk", "Critical Risk")
+
+
+# ==================== FEATURES ====================
+
+def _number(value):
+    """Form fields are stored as strings; anything unparseable counts as missing"""
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def compliance_features(application):
+    """The five model features of one application (defaults for missing values)"""
+    features = []
+    for fields, default in zip(COMPLIANCE_FEATURE_FIELDS, COMPLIANCE_FEATURE_DEFAULTS):
+        value = None
+        for field in fields:
+            value = _number(application.get(field))
+            if value is not None:
+                break
+        features.append(default if value is None else value)
+    return features
+
+
+def feature_projection():
+    return {field: 1 for fields in COMPLIANCE_FEATURE_FIELDS for field in fields}
+
+
+def load_feature_matrix(collection, query=None, cursor_batch_size=5000):
+    """One projected cursor over the matching applications. Returns (ids, (n, 5) float64 matrix)."""
+    ids, rows = [], []
+    cursor = collection.find(query or {}, projection=feature_projection()).batch_size(cursor_batch_size)
+    for application in cursor:
+        ids.append(application['_id'])
+        rows.append(compliance_features(application))
+    return ids, np.array(rows, dtype=np.float64).reshape(len(rows), len(COMPLIANCE_FEATURE_FIELDS))
+
+
+# ==================== VECTORIZED SCORING ====================
+
+def recommendation_codes(features, scores):
+    """
+    Bitmask of failed checks per row: extinguishers per 1000 sqft, exits per 50
+    people and detectors per 500 sqft below 1, and scores below 70.
+    """
+    area, occupancy, extinguishers, exits, detectors = features.T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        checks = (
+            extinguishers / (area / 1000) < 1,
+            exits / (occupancy / 50) < 1,
+            detectors / (area / 500) < 1,
+            scores < 70
+        )
+    codes = np.zeros(len(features), dtype=np.int64)
+    for bit, failed in enumerate(checks):
+        codes |= failed.astype(np.int64) << bit
+    return codes
+
+
+def risk_levels(scores):
+    return np.select(
+        [scores >= threshold for threshold in RISK_THRESHOLDS],
+        RISK_LEVELS[:len(RISK_THRESHOLDS)],
+        default=RISK_LEVELS[-1]
+    )
+
+
+def score_feature_matrix(model, features):
+    """Score every row with one predict call. Returns (scores, risk levels, recommendation lists)."""
+    if len(features) == 0:
+        return np.zeros(0), np.array([], dtype=object), []
+    scores = np.asarray(model.predict(features), dtype=np.float64)
+    recommendations = [RECOMMENDATION_SETS[code] for code in recommendation_codes(features, scores)]
+    return scores, risk_levels(scores), recommendations
+
+
+# ==================== JOB ====================
+
+def score_applications(analyzer, collection, scope='certified', write_batch_size=1000):
+    """
+    Re-score every application in scope and store the result in compliance_analysis.
+    analyzer is a loaded ComplianceAnalyzer. Returns row counts, per-stage seconds and rows/sec.
+    """
+    if scope not in COMPLIANCE_SCOPES:
+        raise ValueError(f"Unknown scope: {scope}")
+
+    started = time.perf_counter()
+    ids, features = load_feature_matrix(collection, COMPLIANCE_SCOPES[scope])
+    load_seconds = time.perf_counter() - started
+
+    scoring_started = time.perf_counter()
+    batch = analyzer.analyze_compliance_batch(features)
+    if 'error' in batch:
+        return {'success': False, 'error': batch['error'], 'rows': len(ids)}
+    score_seconds = time.perf_counter() - scoring_started
+
+    write_started = time.perf_counter()
+    scored_at = datetime.now()
+    written = 0
+    operations = []
+    for _id, score, risk_level, recommendations in zip(
+            ids, batch['compliance_scores'].tolist(), batch['risk_levels'].tolist(), batch['recommendations']):
+        operations.append(UpdateOne({'_id': _id}, {'$set': {'compliance_analysis': {
+            'compliance_score': score,
+            'risk_level': risk_level,
+            'recommendations': recommendations,
+            'model_version': analyzer.version,
+            'scored_at': scored_at
+        }}}))
+        if len(operations) >= write_batch_size:
+            written += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        written += collection.bulk_write(operations, ordered=False).modified_count
+    write_seconds = time.perf_counter() - write_started
+
+    total_seconds = time.perf_counter() - started
+    return {
+        'success': True,
+        'scope': scope,
+        'rows': len(ids),
+        'written': written,
+        'model_version': analyzer.version,
+        'load_seconds': round(load_seconds, 4),
+        'score_seconds': round(score_seconds, 4),
+        'write_seconds': round(write_seconds, 4),
+        'total_seconds': round(total_seconds, 4),
+        'rows_per_second': round(len(ids) / total_seconds, 1) if total_seconds else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-score application compliance with the current model')
+    parser.add_argument('--scope', choices=sorted(COMPLIANCE_SCOPES), default='certified')
+    parser.add_argument('--batch-size', type=int, default=1000, help='updates per bulk write')
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+    from real_ai_models import ComplianceAnalyzer
+
+    load_dotenv()
+    db = MongoClient(os.getenv('MONGODB_URI', os.getenv('DATABASE_URL', 'mongodb://localhost:27017/')))[
+        os.getenv('DB_NAME', 'aek_noc')]
+
+    analyzer = ComplianceAnalyzer()
+    if not analyzer.load_model():
+        print(f"❌ Compliance model unavailable: {analyzer.load_error}")
+        return 1
+
+    print(f"📊 Scoring {args.scope} applications with compliance model {analyzer.version}...")
+    stats = score_applications(analyzer, db['applications'], args.scope, args.batch_size)
+    if not stats['success']:
+        print(f"❌ {stats['error']}")
+        return 1
+
+    print(f"   Rows:    {stats['rows']} ({stats['written']} updated)")
+    print(f"   Load:    {stats['load_seconds'] * 1000:.1f} ms")
+    print(f"   Score:   {stats['score_seconds'] * 1000:.1f} ms")
+    print(f"   Write:   {stats['write_seconds'] * 1000:.1f} ms")
+    print(f"✅ {stats['rows_per_second']:.0f} rows/sec")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+MongoDB Index Specification for Fire NOC System
+Single source of truth for every collection's indexes, plus a command that creates
+and reconciles them. Index builds run here instead of as a side effect of importing app.py.
+
+Usage:
+    python db_indexes.py              # create missing / changed indexes
+    python db_indexes.py --dry-run    # show what would change
+    python db_indexes.py --prune      # also drop indexes not listed in INDEX_SPECS
+    python db_indexes.py --list       # print the specification and the queries it serves
+"""
+
+import argparse
+import os
+from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+
+# Each entry: collection, key pattern, index options and the query shapes it serves
+INDEX_SPECS = [
+    # ---------------- users ----------------
+    {
+        'collection': 'users',
+        'keys': [('username', ASCENDING)],
+        'options': {'unique': True, 'name': 'username_unique'},
+        'serves': ["users.find_one({'username': ...})"]
+    },
+    {
+        'collection': 'users',
+        'keys': [('email', ASCENDING)],
+        'options': {},
+        'serves': ["users.find_one({'email': ...})"]
+    },
+    {
+        'collection': 'users',
+        'keys': [('role', ASCENDING)],
+        'options': {},
+        'serves': ["users.find({'role': ...})", "users.count_documents({'role': ...})"]
+    },
+
+    # ---------------- applications ----------------
+    {
+        'collection': 'applications',
+        'keys': [('assigned_manager', ASCENDING), ('status', ASCENDING)],
+        'options': {},
+        'serves': [
+            "applications.find({'assigned_manager': ...})",
+            "applications.find({'assigned_manager': ..., 'status': ...})"
+        ]
+    },
+    {
+        'collection': 'applications',
+        'keys': [('assigned_inspector', ASCENDING), ('status', ASCENDING)],
+        'options': {},
+        'serves': [
+            "applications.find({'assigned_inspector': ...})",
+            "applications.find({'assigned_inspector': ..., 'status': ...})"
+        ]
+    },
+    {
+        'collection': 'applications',
+        'keys': [('username', ASCENDING), ('timestamp', DESCENDING)],
+        'options': {},
+        'serves': ["applications.find({'username': ...}).sort('timestamp', -1)"]
+    },
+    {
+        'collection': 'applications',
+        'keys': [('status', ASCENDING)],
+        'options': {},
+        'serves': ["applications.count_documents({'status': ...})"]
+    },
+    {
+        'collection': 'applications',
+        'keys': [('timestamp', DESCENDING)],
+        'options': {},
+        'serves': ["applications.find().sort('timestamp', -1)", "timestamp range counts in analytics"]
+    },
+    {
+        'collection': 'applications',
+        'keys': [('business_name', ASCENDING)],
+        'options': {},
+        'serves': ["applications.find({'business_name': ...})"]
+    },
+    {
+        'collection': 'applications',
+        'keys': [('business_type', ASCENDING)],
+        'options': {},
+        'serves': ["applications.aggregate([{'$group': {'_id': '$business_type'}}])"]
+    },
+    {
+        'collection': 'applications',
+        'keys': [('noc_certificate_expiry', ASCENDING)],
+        'options': {},
+        'serves': ["applications.count_documents({'noc_certificate_expiry': {'$lte': ...}})"]
+    },
+    {
+        'collection': 'applications',
+        'keys': [('documents_verified', ASCENDING), ('verified_at', ASCENDING), ('_id', ASCENDING)],
+        'options': {},
+        'serves': ["incremental_training: applications.find({'documents_verified': True, 'verified_at': {'$gt': watermark}, 'document_verification.verification_method': 'machine_learning'}).sort('verified_at', '_id')"]
+    },
+    {
+        'collection': 'applications',
+        'keys': [('blockchain_status', ASCENDING)],
+        'options': {'partialFilterExpression': {'blockchain_status': 'pending'}, 'name': 'blockchain_pending_partial'},
+        'serves': ["requeue_pending_certificates: applications.find({'blockchain_status': 'pending', 'noc_certificate_date': {'$lt': started}})"]
+    },
+
+    # ---------------- activities ----------------
+    {
+        'collection': 'activities',
+        'keys': [('username', ASCENDING), ('timestamp', DESCENDING)],
+        'options': {},
+        'serves': ["activities.find({'username': ...}).sort('timestamp', -1)"]
+    },
+    {
+        'collection': 'activities',
+        'keys': [('timestamp', DESCENDING)],
+        'options': {},
+        'serves': ["activities.find({}).sort('timestamp', -1).limit(n)"]
+    },
+
+    # ---------------- notifications ----------------
+    {
+        'collection': 'notifications',
+        'keys': [('recipients', ASCENDING), ('timestamp', DESCENDING)],
+        'options': {},
+        'serves': [
+            "notifications.find({'recipients': ...}).sort('timestamp', -1)",
+            "$or branch {'recipients': 'all' | username}"
+        ]
+    },
+    {
+        'collection': 'notifications',
+        'keys': [('username', ASCENDING), ('timestamp', DESCENDING)],
+        'options': {},
+        'serves': ["$or branch {'username': ...} of the notifications feed"]
+    },
+
+    # ---------------- certificates ----------------
+    {
+        'collection': 'certificates',
+        'keys': [('certificate_number', ASCENDING)],
+        'options': {},
+        'serves': ["certificates.find_one({'certificate_number': ...})"]
+    },
+    {
+        'collection': 'certificates',
+        'keys': [('application_id', ASCENDING)],
+        'options': {},
+        'serves': ["certificates.find_one({'application_id': ...})"]
+    },
+    {
+        'collection': 'certificates',
+        'keys': [('username', ASCENDING)],
+        'options': {},
+        'serves': ["certificates.find_one({'username': ...})"]
+    },
+
+    # ---------------- inspections ----------------
+    {
+        'collection': 'inspections',
+        'keys': [('date', ASCENDING)],
+        'options': {},
+        'serves': ["inspections.find(query).sort('date', 1)"]
+    },
+    {
+        'collection': 'inspections',
+        'keys': [('status', ASCENDING)],
+        'options': {},
+        'serves': ["inspections.count_documents({'status': ...})"]
+    },
+    {
+        'collection': 'inspections',
+        'keys': [('business_id', ASCENDING)],
+        'options': {},
+        'serves': ["inspections.find({'business_id': ...})"]
+    },
+    {
+        'collection': 'inspections',
+        'keys': [('inspector_id', ASCENDING)],
+        'options': {},
+        'serves': ["inspections.find({'inspector_id': ...})"]
+    },
+    {
+        'collection': 'inspections',
+        'keys': [('inspector', ASCENDING), ('status', ASCENDING), ('inspection_date', DESCENDING)],
+        'options': {},
+        'serves': [
+            "inspections.find({'inspector': ...})",
+            "inspections.find({'inspector': ..., 'status': 'completed'}).sort('inspection_date', -1)"
+        ]
+    },
+    {
+        'collection': 'inspections',
+        'keys': [('assigned_manager', ASCENDING), ('date', DESCENDING)],
+        'options': {},
+        'serves': ["inspections.find({'assigned_manager': ...}).sort('date', -1)"]
+    },
+    {
+        'collection': 'inspections',
+        'keys': [('application_id', ASCENDING), ('status', ASCENDING)],
+        'options': {},
+        'serves': ["inspections.find({'application_id': {'$in': ...}, 'status': 'completed'})"]
+    },
+
+    # ---------------- otp_codes ----------------
+    {
+        'collection': 'otp_codes',
+        'keys': [('username', ASCENDING), ('otp', ASCENDING)],
+        'options': {},
+        'serves': ["otp_codes.find_one({'username': ..., 'otp': ..., 'expires_at': {'$gt': now}})"]
+    },
+    {
+        'collection': 'otp_codes',
+        'keys': [('expires_at', ASCENDING)],
+        'options': {'expireAfterSeconds': 0, 'name': 'expires_at_ttl'},
+        'serves': ["TTL cleanup of expired OTP codes"]
+    },
+
+    # ---------------- email_outbox ----------------
+    {
+        'collection': 'email_outbox',
+        'keys': [('status', ASCENDING), ('next_attempt_at', ASCENDING)],
+        'options': {},
+        'serves': ["email_outbox.find_one_and_update({'status': {'$in': [...]}, 'next_attempt_at': {'$lte': now}})"]
+    },
+    {
+        'collection': 'email_outbox',
+        'keys': [('dedupe_slot', ASCENDING)],
+        'options': {'unique': True, 'partialFilterExpression': {'dedupe_slot': {'$exists': True}},
+                    'name': 'dedupe_slot_unique'},
+        'serves': [
+            "email_outbox.update_one({'dedupe_slot': ..., 'created_at': {'$gte': ...}}, upsert=True) (unique: no racing duplicates)",
+            "email_outbox.update_one({'dedupe_slot': ..., 'created_at': {'$lt': ...}}) (expired slot release)"
+        ]
+    },
+    {
+        'collection': 'email_outbox',
+        'keys': [('sent_at', ASCENDING)],
+        'options': {'expireAfterSeconds': 30 * 24 * 60 * 60, 'name': 'sent_at_ttl'},
+        'serves': ["TTL cleanup of delivered emails after 30 days"]
+    },
+
+    # ---------------- inference_jobs ----------------
+    {
+        'collection': 'inference_jobs',
+        'keys': [('status', ASCENDING), ('created_at', ASCENDING)],
+        'options': {},
+        'serves': ["inference_jobs.find_one_and_update({'status': 'queued'}, sort=[('created_at', 1)])"]
+    },
+    {
+        'collection': 'inference_jobs',
+        'keys': [('notified_at', ASCENDING), ('status', ASCENDING)],
+        'options': {},
+        'serves': ["inference_jobs.find_one_and_update({'status': {'$in': [...]}, 'notified_at': None})"]
+    },
+    {
+        'collection': 'inference_jobs',
+        'keys': [('progress_pending', ASCENDING)],
+        'options': {'partialFilterExpression': {'progress_pending': True}, 'name': 'progress_pending_partial'},
+        'serves': ["inference_jobs.find_one_and_update({'progress_pending': True}) (video progress events)"]
+    },
+    {
+        'collection': 'inference_jobs',
+        'keys': [('finished_at', ASCENDING)],
+        'options': {'expireAfterSeconds': 7 * 24 * 60 * 60, 'name': 'finished_at_ttl'},
+        'serves': ["TTL cleanup of finished inference jobs after 7 days"]
+    },
+
+    # ---------------- cache_entries ----------------
+    {
+        'collection': 'cache_entries',
+        'keys': [('expires_at', ASCENDING)],
+        'options': {'expireAfterSeconds': 0, 'name': 'expires_at_ttl'},
+        'serves': ["TTL cleanup of the shared analytics result cache (CACHE_BACKEND=mongo)"]
+    },
+
+    # ---------------- ai_analysis_cache ----------------
+    {
+        'collection': 'ai_analysis_cache',
+        'keys': [('key', ASCENDING)],
+        'options': {'unique': True, 'name': 'key_unique'},
+        'serves': ["ai_analysis_cache.find_one_and_update({'key': sha256:fingerprint})"]
+    },
+    {
+        'collection': 'ai_analysis_cache',
+        'keys': [('last_used_at', ASCENDING)],
+        'options': {'expireAfterSeconds': 30 * 24 * 60 * 60, 'name': 'last_used_at_ttl'},
+        'serves': ["Evict analyses not reused for 30 days, including those of replaced model versions"]
+    },
+]
+
+# Options that make two indexes with the same key pattern different
+COMPARED_OPTIONS = ('unique', 'sparse', 'expireAfterSeconds', 'partialFilterExpression')
+
+
+def index_name(spec):
+    """Name used for an index spec (explicit name or MongoDB's default)"""
+    name = spec['options'].get('name')
+    if name:
+        return name
+    return '_'.join(f"{field}_{direction}" for field, direction in spec['keys'])
+
+
+def _options_match(spec, existing):
+    for option in COMPARED_OPTIONS:
+        if spec['options'].get(option) != existing.get(option):
+            # unique: False and a missing unique flag are equivalent
+            if not spec['options'].get(option) and not existing.get(option):
+                continue
+            return False
+    return True
+
+
+def sync_indexes(db, dry_run=False, prune=False):
+    """
+    Create and reconcile the indexes in INDEX_SPECS.
+    Returns a summary dict with the created, rebuilt, dropped, unchanged and failed index names.
+    """
+    summary = {'created': [], 'rebuilt': [], 'dropped': [], 'unchanged': [], 'failed': []}
+    specs_by_collection = {}
+    for spec in INDEX_SPECS:
+        specs_by_collection.setdefault(spec['collection'], []).append(spec)
+
+    for collection_name, specs in specs_by_collection.items():
+        collection = db[collection_name]
+        existing = collection.index_information()
+        existing_by_keys = {tuple(info['key']): (name, info) for name, info in existing.items()}
+        wanted_names = {'_id_'}
+
+        for spec in specs:
+            name = index_name(spec)
+            wanted_names.add(name)
+            label = f"{collection_name}.{name}"
+            current = existing_by_keys.get(tuple(spec['keys']))
+
+            try:
+                if current and _options_match(spec, current[1]) and current[0] == name:
+                    summary['unchanged'].append(label)
+                    continue
+
+                if current:
+                    # Same key pattern but different name or options - rebuild it
+                    if not dry_run:
+                        collection.drop_index(current[0])
+                    summary['rebuilt'].append(label)
+                else:
+                    summary['created'].append(label)
+
+                if not dry_run:
+                    options = dict(spec['options'])
+                    options['name'] = name
+                    collection.create_index(spec['keys'], **options)
+            except PyMongoError as e:
+                summary['failed'].append(f"{label}: {str(e)}")
+
+        if prune:
+            for name in existing:
+                if name not in wanted_names:
+                    try:
+                        if not dry_run:
+                            collection.drop_index(name)
+                        summary['dropped'].append(f"{collection_name}.{name}")
+                    except PyMongoError as e:
+                        summary['failed'].append(f"{collection_name}.{name}: {str(e)}")
+
+    return summary
+
+
+def print_specs():
+    """Print every index and the query shapes it serves"""
+    current_collection = None
+    for spec in INDEX_SPECS:
+        if spec['collection'] != current_collection:
+            current_collection = spec['collection']
+            print(f"\n📂 {current_collection}")
+        flags = []
+        if spec['options'].get('unique'):
+            flags.append('unique')
+        if 'expireAfterSeconds' in spec['options']:
+            flags.append(f"ttl={spec['options']['expireAfterSeconds']}s")
+        flag_text = f" [{', '.join(flags)}]" if flags else ''
+        print(f"   🔑 {index_name(spec)}{flag_text}")
+        for query in spec['serves']:
+            print(f"      ↳ {query}")
+
+
+def get_database():
+    """Connect using the same environment variables as app.py"""
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+
+    uri = os.getenv('MONGODB_URI', os.getenv('DATABASE_URL', 'mongodb://localhost:27017/'))
+    db_name = os.getenv('DB_NAME', 'aek_noc')
+    client = MongoClient(uri)
+    client.admin.command('ping')
+    return client[db_name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create and reconcile Fire NOC MongoDB indexes')
+    parser.add_argument('--dry-run', action='store_true', help='show changes without applying them')
+    parser.add_argument('--prune', action='store_true', help='drop indexes that are not in the specification')
+    parser.add_argument('--list', action='store_true', help='print the index specification and exit')
+    args = parser.parse_args()
+
+    print("🗂️ Fire NOC Index Specification")
+    print_specs()
+    if args.list:
+        return 0
+
+    print("\n🔌 Connecting to MongoDB...")
+    try:
+        db = get_database()
+    except PyMongoError as e:
+        print(f"❌ Failed to connect to MongoDB: {str(e)}")
+        return 1
+
+    summary = sync_indexes(db, dry_run=args.dry_run, prune=args.prune)
+    prefix = "🔍 [dry run] " if args.dry_run else ""
+    print(f"\n{prefix}Index reconciliation summary:")
+    for key, icon in (('created', '✅'), ('rebuilt', '♻️'), ('dropped', '🗑️'), ('unchanged', '➖'), ('failed', '❌')):
+        print(f"   {icon} {key}: {len(summary[key])}")
+        if key != 'unchanged':
+            for label in summary[key]:
+                print(f"      - {label}")
+
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Transactional Email Outbox for Fire NOC System
+Request handlers insert messages into the email_outbox collection; a background
+worker pool delivers them with retry/backoff, per-message status and deduplication
+"""
+
+import hashlib
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+STATUS_PENDING = 'pending'
+STATUS_SENDING = 'sending'
+STATUS_RETRY = 'retry'
+STATUS_SENT = 'sent'
+STATUS_FAILED = 'failed'
+
+
+def normalize_attachments(attachments, default_content_type):
+    """Turn caller attachment dicts into the stored form (explicit filename/content type/bytes)"""
+    normalized = []
+    for attachment in attachments or []:
+        if isinstance(attachment, dict):
+            normalized.append({
+                'filename': attachment.get('filename', 'attachment'),
+                'content_type': attachment.get('content_type', default_content_type),
+                'data': attachment.get('data')
+            })
+    return normalized
+
+
+def dedupe_key(subject, recipient, body, html_body=None):
+    """Identity of a message for duplicate suppression"""
+    digest = hashlib.sha256()
+    for part in (subject, recipient, body, html_body):
+        digest.update((part or '').encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class EmailOutbox:
+    """MongoDB-backed outbox drained by a pool of sender threads"""
+
+    def __init__(self, collection, deliver, workers=2, max_attempts=5, backoff_seconds=30,
+                 dedupe_window_seconds=300, poll_interval=5, stale_after_seconds=600,
+                 deliver_batch=None, batch_size=20):
+        """
+        deliver(message) sends one outbox document and raises on failure.
+        deliver_batch(messages), when given, sends up to batch_size due documents together
+        (e.g. over one SMTP connection) and returns None or the exception for each.
+        """
+        self.collection = collection
+        self.deliver = deliver
+        self.deliver_batch = deliver_batch
+        self.batch_size = max(1, batch_size)
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.dedupe_window = timedelta(seconds=dedupe_window_seconds)
+        self.poll_interval = poll_interval
+        self.stale_after = timedelta(seconds=stale_after_seconds)
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._start_lock = threading.Lock()
+
+    # ==================== REQUEST PATH ====================
+
+    def enqueue(self, subject, recipient, body, html_body=None, attachments=None, default_content_type='application/octet-stream'):
+        """
+        Queue a message with a single upsert. An identical subject+recipient+body queued
+        within the dedupe window is not queued again. Returns True when the message is queued.
+
+        The newest message for a dedupe key holds it in dedupe_slot (unique index, ensured by
+        start()), so two concurrent enqueues can't both insert. A slot still held by a message
+        from before the window is released and taken over (the only extra round trips).
+        """
+        try:
+            now = datetime.now()
+            key = dedupe_key(subject, recipient, body, html_body)
+            message = {
+                'subject': subject,
+                'recipient': recipient,
+                'body': body,
+                'html_body': html_body,
+                'attachments': normalize_attachments(attachments, default_content_type),
+                'dedupe_key': key,
+                'dedupe_slot': key,
+                'status': STATUS_PENDING,
+                'attempts': 0,
+                'created_at': now,
+                'next_attempt_at': now,
+                'last_error': None
+            }
+
+            try:
+                result = self.collection.update_one(
+                    {'dedupe_slot': key, 'created_at': {'$gte': now - self.dedupe_window}},
+                    {'$setOnInsert': message},
+                    upsert=True
+                )
+                duplicate = result.upserted_id is None
+            except DuplicateKeyError:
+                # The slot is held by an expired message, or a concurrent enqueue inserted first
+                duplicate = not self._take_expired_slot(message, now)
+            if duplicate:
+                print(f"📭 Duplicate email to {recipient} suppressed: {subject}")
+
+            self.start()
+            self._wakeup.set()
+            return True
+        except Exception as e:
+            print(f"Error queueing email: {e}")
+            return False
+
+    def _take_expired_slot(self, message, now):
+        """Release a dedupe slot held from before the window and insert message into it"""
+        released = self.collection.update_one(
+            {'dedupe_slot': message['dedupe_slot'], 'created_at': {'$lt': now - self.dedupe_window}},
+            {'$unset': {'dedupe_slot': ''}}
+        )
+        if not released.modified_count:
+            return False
+        try:
+            self.collection.insert_one(message)
+            return True
+        except DuplicateKeyError:
+            return False
+
+    # ==================== WORKER POOL ====================
+
+    def ensure_indexes(self):
+        """The unique dedupe_slot index enqueue() relies on to suppress racing duplicates"""
+        self.collection.create_index(
+            [('dedupe_slot', 1)],
+            unique=True,
+            partialFilterExpression={'dedupe_slot': {'$exists': True}},
+            name='dedupe_slot_unique'
+        )
+
+    def start(self):
+        """Ensure the dedupe index and start the sender threads (idempotent)"""
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            try:
+                self.ensure_indexes()
+            except Exception as e:
+                # Without the index concurrent enqueues could both send; retried on the next start()
+                print(f"❌ Email outbox not started, dedupe_slot index unavailable: {e}")
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f'email-outbox-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+
+    def _claim_next(self):
+        """Atomically take the next due message (or a stale in-flight one)"""
+        now = datetime.now()
+        return self.collection.find_one_and_update(
+            {'$or': [
+                {'status': {'$in': [STATUS_PENDING, STATUS_RETRY]}, 'next_attempt_at': {'$lte': now}},
+                {'status': STATUS_SENDING, 'claimed_at': {'$lt': now - self.stale_after}}
+            ]},
+            {'$set': {'status': STATUS_SENDING, 'claimed_at': now}, '$inc': {'attempts': 1}},
+            sort=[('next_attempt_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def process_one(self):
+        """Deliver one due message. Returns False when nothing was due."""
+        message = self._claim_next()
+        if not message:
+            return False
+
+        try:
+            self.deliver(message)
+            error = None
+        except Exception as e:
+            error = e
+        self._record_attempt(message, error)
+        return True
+
+    def process_batch(self):
+        """Deliver up to batch_size due messages with deliver_batch. Returns False when nothing was due."""
+        messages = []
+        while len(messages) < self.batch_size:
+            message = self._claim_next()
+            if not message:
+                break
+            messages.append(message)
+        if not messages:
+            return False
+
+        try:
+            errors = self.deliver_batch(messages)
+        except Exception as e:
+            errors = [e] * len(messages)
+        for message, error in zip(messages, errors):
+            self._record_attempt(message, error)
+        return True
+
+    def _record_attempt(self, message, error):
+        """Mark a claimed message sent, or schedule its retry / fail it for good"""
+        if error is None:
+            self.collection.update_one(
+                {'_id': message['_id']},
+                {'$set': {'status': STATUS_SENT, 'sent_at': datetime.now(), 'last_error': None},
+                 '$unset': {'attachments': ''}}
+            )
+            return
+
+        attempts = message.get('attempts', 1)
+        if attempts >= self.max_attempts:
+            update = {'status': STATUS_FAILED, 'failed_at': datetime.now(), 'last_error': str(error)}
+            print(f"❌ Email to {message.get('recipient')} failed after {attempts} attempts: {error}")
+        else:
+            delay = self.backoff_seconds * (2 ** (attempts - 1))
+            update = {
+                'status': STATUS_RETRY,
+                'next_attempt_at': datetime.now() + timedelta(seconds=delay),
+                'last_error': str(error)
+            }
+            print(f"⚠️ Email to {message.get('recipient')} failed (attempt {attempts}), retrying in {delay}s: {error}")
+        self.collection.update_one({'_id': message['_id']}, {'$set': update})
+
+    def _run(self):
+        process = self.process_batch if self.deliver_batch is not None else self.process_one
+        while not self._stop.is_set():
+            try:
+                while process():
+                    if self._stop.is_set():
+                        return
+            except Exception as e:
+                print(f"Error in email outbox worker: {e}")
+                traceback.print_exc()
+                time.sleep(self.poll_interval)
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    # ==================== MONITORING ====================
+
+    def status_counts(self):
+        """Number of messages in each status"""
+        counts = {status: 0 for status in (STATUS_PENDING, STATUS_SENDING, STATUS_RETRY, STATUS_SENT, STATUS_FAILED)}
+        for row in self.collection.aggregate([{'$group': {'_id': '$status', 'count': {'$sum': 1}}}]):
+            counts[row['_id']] = row['count']
+        return counts
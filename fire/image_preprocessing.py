@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Image Preprocessing for Fire NOC System
+Decodes an uploaded image once - at reduced size where the format allows it (JPEG
+draft mode decodes directly at 1/2, 1/4 or 1/8 scale) - and derives both the
+binarized OCR input and the normalized CNN input from that single buffer, so a
+12+ megapixel phone photo is never held in memory at full resolution.
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+from PIL import Image, ImageOps
+
+# Longest side kept for OCR; enough for tesseract on A4 scans and phone photos
+OCR_MAX_SIDE = int(os.environ.get('OCR_MAX_SIDE', 2048))
+CNN_INPUT_SIZE = 224
+BINARIZE_THRESHOLD = 128
+
+_BINARIZE_TABLE = [0 if value < BINARIZE_THRESHOLD else 255 for value in range(256)]
+
+PreprocessedImage = namedtuple('PreprocessedImage', ['ocr_image', 'cnn_input', 'original_size', 'decoded_size'])
+
+
+def _decode(path, draft_size):
+    """
+    Decode as RGB. For JPEGs larger than draft_size the decoder picks the smallest
+    DCT scale (1/2, 1/4, 1/8) that still covers draft_size in both dimensions.
+    Returns (image, original_size).
+    """
+    with Image.open(path) as img:
+        original_size = img.size
+        if img.format == 'JPEG' and img.width > draft_size[0] and img.height > draft_size[1]:
+            img.draft('RGB', draft_size)
+        img = ImageOps.exif_transpose(img)
+        return img.convert('RGB'), original_size
+
+
+def load_image(path, max_side=OCR_MAX_SIDE):
+    """
+    Decode an image as RGB with its longest side at most max_side (and, for large
+    JPEGs, at least max_side / 2 so OCR keeps enough resolution).
+    Returns (image, original_size).
+    """
+    with Image.open(path) as img:
+        width, height = img.size
+    scale = min(1.0, max_side / 2 / max(width, height))
+    image, original_size = _decode(path, (max(1, int(width * scale)), max(1, int(height * scale))))
+
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side), Image.BILINEAR)
+    return image, original_size
+
+
+def to_ocr_image(image):
+    """Grayscale, then binarize (same threshold the Aadhaar OCR always used)"""
+    return image.convert('L').point(_BINARIZE_TABLE, '1')
+
+
+def to_cnn_input(image, size=CNN_INPUT_SIZE):
+    """
+    size x size float32 array scaled to 0-1, in BGR channel order to match the
+    cv2-decoded images the safety detector was trained on.
+    """
+    resized = image.resize((size, size), Image.BILINEAR, reducing_gap=3.0)
+    array = np.asarray(resized, dtype=np.float32)[:, :, ::-1]
+    return np.ascontiguousarray(array) * np.float32(1.0 / 255.0)
+
+
+def preprocess_document(path, cnn_size=CNN_INPUT_SIZE, max_side=OCR_MAX_SIDE):
+    """Decode once and produce both the OCR image and the CNN input"""
+    image, original_size = load_image(path, max_side)
+    return PreprocessedImage(
+        ocr_image=to_ocr_image(image),
+        cnn_input=to_cnn_input(image, cnn_size),
+        original_size=original_size,
+        decoded_size=image.size
+    )
+
+
+def load_ocr_image(path, max_side=OCR_MAX_SIDE):
+    """Binarized OCR input only"""
+    image, _ = load_image(path, max_side)
+    return to_ocr_image(image)
+
+
+def load_cnn_input(path, size=CNN_INPUT_SIZE):
+    """CNN input only; JPEGs are decoded at the smallest scale that still covers size x size"""
+    image, _ = _decode(path, (size, size))
+    return to_cnn_input(image, size)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Incremental Classifier Training for Fire NOC System
+Keeps the hashing document classifier current with production documents. Applications
+whose documents a manager has verified since the last run (verified_at watermark) are
+streamed from MongoDB in batches. Only documents the machine-learning pipeline verified
+(status 'verified', its predicted type agreeing with the declared one) are trained on, so
+neither a wrong upload nor the basic fallback's placeholder text becomes a training
+example. Each batch is applied with partial_fit, and the updated
+weights are published as a new registry version. The watermark is stored in that
+version's metadata, so a run never re-reads history and the artifact always records
+exactly which documents it has seen.
+
+Usage:
+    python incremental_training.py [--batch-size N]
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+from bson import ObjectId
+
+DEFAULT_BATCH_SIZE = int(os.environ.get('AI_TRAINING_BATCH_SIZE', 500))
+# Longest OCR text per document kept on the application for training
+TRAINING_TEXT_LIMIT = 5000
+# Passes over the built-in examples when there is no model to start from
+SEED_EPOCHS = 5
+
+# Verification status a document must have to be used as a training example
+TRAINABLE_STATUS = 'verified'
+# Only these verifications carry real OCR text (basic verification stores a placeholder)
+TRAINABLE_METHOD = 'machine_learning'
+
+# Uploaded document type (as stored on the application) -> classifier label
+DOCUMENT_TYPE_LABELS = {
+    'building plan': 'building_plan',
+    'safety certificate': 'safety_certificate',
+    'insurance document': 'insurance',
+    'insurance': 'insurance',
+    'business license': 'business_license',
+    'aadhaar card': 'aadhaar',
+    'pan card': 'pan'
+}
+DOCUMENT_LABELS = sorted(set(DOCUMENT_TYPE_LABELS.values()))
+
+
+def document_label(doc_type):
+    return DOCUMENT_TYPE_LABELS.get((doc_type or '').strip().lower())
+
+
+def training_texts(results, ai_results, analyzable):
+    """Index-aligned OCR texts stored next to document_verification.results"""
+    texts = [''] * len(results)
+    for index, ai_result in zip(analyzable, ai_results):
+        texts[index] = (ai_result.get('extracted_text') or '')[:TRAINING_TEXT_LIMIT]
+    return texts
+
+
+# ==================== WATERMARK ====================
+
+def dump_watermark(verified_at, application_id):
+    return {'verified_at': verified_at.isoformat(), 'application_id': str(application_id)}
+
+
+def load_watermark(data):
+    """(verified_at, application ObjectId) from registry metadata, or None"""
+    if not data:
+        return None
+    return datetime.fromisoformat(data['verified_at']), ObjectId(data['application_id'])
+
+
+def verified_documents_query(watermark=None):
+    """Manager-verified applications with machine-learning verification results, after the watermark"""
+    query = {
+        'documents_verified': True,
+        'verified_at': {'$ne': None},
+        'document_verification.verification_method': TRAINABLE_METHOD,
+        'document_verification.results': {'$exists': True}
+    }
+    if watermark:
+        verified_at, application_id = watermark
+        # Several applications can share a verified_at: _id breaks the tie
+        query['$or'] = [
+            {'verified_at': {'$gt': verified_at}},
+            {'verified_at': verified_at, '_id': {'$gt': application_id}}
+        ]
+    return query
+
+
+def iter_training_batches(collection, watermark=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Yield (texts, labels, watermark) batches of roughly batch_size verified documents in
+    verified_at order. A batch always ends on an application boundary, so the yielded
+    watermark covers every document up to and including it.
+    """
+    cursor = collection.find(
+        verified_documents_query(watermark),
+        {
+            'verified_at': 1,
+            'document_verification.results': 1,
+            'document_verification.extracted_texts': 1
+        },
+        sort=[('verified_at', 1), ('_id', 1)],
+        batch_size=batch_size
+    )
+
+    texts, labels = [], []
+    for application in cursor:
+        verification = application['document_verification']
+        stored_texts = verification.get('extracted_texts') or []
+        for index, result in enumerate(verification.get('results') or []):
+            # Failed, needs_review and missing documents may not be what their type says
+            if (result or {}).get('status') != TRAINABLE_STATUS:
+                continue
+            label = document_label(result.get('document'))
+            # The classifier must agree with the declared type, or the label may be the applicant's mistake
+            if label is None or result.get('predicted_type') != label:
+                continue
+            text = stored_texts[index] if index < len(stored_texts) else ''
+            if not text:
+                # Verifications stored before full texts were kept
+                text = (result.get('extracted_text_preview') or '').rstrip('.')
+            if text.strip():
+                texts.append(text)
+                labels.append(label)
+
+        if len(texts) >= batch_size:
+            yield texts, labels, (application['verified_at'], application['_id'])
+            texts, labels = [], []
+        last = application
+
+    if texts:
+        yield texts, labels, (last['verified_at'], last['_id'])
+
+
+# ==================== TRAINING ====================
+
+def incremental_train(classifier, collection, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Continue training the registered hashing classifier on documents verified since its
+    watermark and register the result as a new version. Only one batch of texts is in
+    memory at a time. Returns run statistics.
+    """
+    if classifier.backend != 'hashing':
+        raise ValueError("Incremental training needs AI_CLASSIFIER_BACKEND=hashing (the forest backend has a fixed vocabulary)")
+
+    started = time.perf_counter()
+    entry = classifier.registry.load_manifest().get('models', {}).get(classifier.registry_name) or {}
+    if classifier.load_model():
+        base_version = classifier.version
+        metadata = entry.get('metadata', {})
+    else:
+        # Cold start: the built-in examples first, so every label is known from the first version
+        base_version, metadata = None, {}
+        seed_texts, seed_labels = zip(*classifier.create_training_data())
+        for _ in range(SEED_EPOCHS):
+            classifier.partial_fit(list(seed_texts), list(seed_labels),
+                                   classes=sorted(set(DOCUMENT_LABELS) | set(seed_labels)))
+
+    watermark = load_watermark(metadata.get('watermark'))
+    known_labels = set(classifier.model.classes_)
+    documents = batches = skipped = 0
+    for texts, labels, watermark in iter_training_batches(collection, watermark, batch_size):
+        keep = [i for i, label in enumerate(labels) if label in known_labels]
+        skipped += len(labels) - len(keep)
+        if keep:
+            classifier.partial_fit([texts[i] for i in keep], [labels[i] for i in keep])
+        documents += len(keep)
+        batches += 1
+
+    stats = {
+        'success': True,
+        'base_version': base_version,
+        'documents': documents,
+        'skipped_documents': skipped,
+        'batches': batches,
+        'documents_trained': metadata.get('documents_trained', 0) + documents,
+        'watermark': dump_watermark(*watermark) if watermark else None,
+        'published': False,
+        'version': base_version
+    }
+
+    if documents or base_version is None:
+        classifier.save_model({
+            'type': 'SGD logistic regression',
+            'features': metadata.get('features', 'hashing'),
+            'backend': classifier.backend,
+            'base_version': base_version,
+            'incremental_documents': documents,
+            'documents_trained': stats['documents_trained'],
+            'watermark': stats['watermark']
+        })
+        stats.update(published=True, version=classifier.version)
+
+    stats['seconds'] = round(time.perf_counter() - started, 3)
+    stats['documents_per_second'] = round(documents / stats['seconds'], 1) if stats['seconds'] else None
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Continue training the document classifier on verified documents')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+    from real_ai_models import DocumentClassifier
+
+    load_dotenv()
+    db = MongoClient(os.getenv('MONGODB_URI', os.getenv('DATABASE_URL', 'mongodb://localhost:27017/')))[
+        os.getenv('DB_NAME', 'aek_noc')]
+
+    print("🤖 Incremental document classifier training")
+    stats = incremental_train(DocumentClassifier(backend='hashing'), db['applications'], args.batch_size)
+    if stats['published']:
+        print(f"✅ {stats['documents']} new documents in {stats['batches']} batches, {stats['seconds']}s "
+              f"({stats['documents_per_second']} docs/sec) -> version {stats['version']} "
+              f"({stats['documents_trained']} documents trained in total)")
+    else:
+        print(f"✅ No newly verified documents since {stats['watermark']}; version {stats['version']} is current")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Inference Service for Fire NOC System
+Runs RealAIEngine outside the web server. The app inserts jobs into the inference_jobs
+collection and returns immediately; worker processes started from this module load
+the models once each, claim jobs, and store their results. A watcher in the app turns
+finished jobs into application updates and pushes them to clients over Socket.IO, so
+TensorFlow and tesseract never block the eventlet loop.
+
+Usage:
+    python inference_service.py [--processes N] [--poll-interval SECONDS]
+
+In production this runs as its own service (the Procfile worker) next to the gunicorn web
+process. The web server only starts a local pool itself when run directly with
+`python app.py`, or with INFERENCE_WORKER_AUTOSTART=True for a single-service deployment.
+
+The worker service does not share the web server's disk, so the files a job reads are
+copied into GridFS (inference_files) on submit and fetched into a temporary directory by the
+worker. Workers record a heartbeat in inference_workers; while none is recent the app runs
+inference in-process instead of queueing jobs nobody will pick up.
+"""
+
+import argparse
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+import gridfs
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_COMPLETED = 'completed'
+STATUS_FAILED = 'failed'
+
+DEFAULT_PROCESSES = int(os.environ.get('INFERENCE_PROCESSES', 2))
+DEFAULT_POLL_INTERVAL = float(os.environ.get('INFERENCE_POLL_INTERVAL', 1.0))
+# A job whose worker died this many times (e.g. a file that crashes TensorFlow) is failed, not retried
+DEFAULT_MAX_ATTEMPTS = int(os.environ.get('INFERENCE_MAX_ATTEMPTS', 3))
+HEARTBEAT_INTERVAL = float(os.environ.get('INFERENCE_HEARTBEAT_INTERVAL', 15))
+# A worker that hasn't sent a heartbeat for this long is treated as gone
+HEARTBEAT_TIMEOUT = float(os.environ.get('INFERENCE_HEARTBEAT_TIMEOUT', 60))
+
+# Payload keys holding local file paths (a list or a single path) that are staged in GridFS
+FILE_PAYLOAD_KEYS = ('file_paths', 'video_path')
+
+
+class InferenceJobQueue:
+    """MongoDB-backed queue of inference jobs shared by the app and the worker processes"""
+
+    def __init__(self, collection, stale_after_seconds=900, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 stage_files=True, heartbeat_timeout=HEARTBEAT_TIMEOUT, worker_check_interval=5):
+        """
+        stage_files=False leaves payload paths as they are, for workers that share the web
+        server's disk (a local pool, or a mounted volume).
+        """
+        self.collection = collection
+        self.stale_after = timedelta(seconds=stale_after_seconds)
+        self.max_attempts = max_attempts
+        self.stage_files = stage_files
+        self.files = gridfs.GridFS(collection.database, 'inference_files')
+        self.workers = collection.database['inference_workers']
+        self.heartbeat_timeout = timedelta(seconds=heartbeat_timeout)
+        self.worker_check_interval = worker_check_interval
+        self._workers_alive = (0.0, False)  # (checked at, result)
+
+    # ==================== APP SIDE ====================
+
+    def submit(self, kind, payload, purpose=None, context=None, owner=None):
+        """
+        Queue a job and return its id. kind selects the worker handler; purpose and
+        context tell the app what to do with the result once it is finished.
+        """
+        if self.stage_files:
+            payload = self.store_files(payload)
+        now = datetime.now()
+        result = self.collection.insert_one({
+            'kind': kind,
+            'payload': payload,
+            'purpose': purpose,
+            'context': context or {},
+            'owner': owner,
+            'status': STATUS_QUEUED,
+            'attempts': 0,
+            'created_at': now,
+            'started_at': None,
+            'finished_at': None,
+            'worker': None,
+            'result': None,
+            'error': None,
+            'progress': None,
+            'progress_pending': False,
+            'outcome': None,
+            'notified_at': None
+        })
+        return str(result.inserted_id)
+
+    def store_files(self, payload):
+        """
+        Copy the files named in the payload into GridFS. The paths stay in the payload for the
+        app's finishers; staged_files maps each key to the GridFS ids in the same order.
+        """
+        staged = {}
+        for key in FILE_PAYLOAD_KEYS:
+            if key not in payload:
+                continue
+            paths = payload[key] if isinstance(payload[key], list) else [payload[key]]
+            staged[key] = []
+            for path in paths:
+                with open(path, 'rb') as f:
+                    staged[key].append(self.files.put(f, filename=os.path.basename(path)))
+        return dict(payload, staged_files=staged) if staged else payload
+
+    def release_files(self, job):
+        """Delete a finished job's staged files"""
+        for file_ids in job['payload'].get('staged_files', {}).values():
+            for file_id in file_ids:
+                self.files.delete(file_id)
+
+    def workers_alive(self):
+        """Whether any worker sent a heartbeat recently (re-checked every worker_check_interval seconds)"""
+        checked_at, alive = self._workers_alive
+        if time.monotonic() - checked_at >= self.worker_check_interval:
+            alive = self.workers.count_documents(
+                {'last_seen': {'$gte': datetime.now() - self.heartbeat_timeout}}, limit=1
+            ) > 0
+            self._workers_alive = (time.monotonic(), alive)
+        return alive
+
+    def get(self, job_id):
+        try:
+            return self.collection.find_one({'_id': ObjectId(job_id)})
+        except (InvalidId, TypeError):
+            return None
+
+    def status(self, job_id):
+        """Public view of a job (no payload or raw result), or None"""
+        job = self.get(job_id)
+        if not job:
+            return None
+        return {
+            'job_id': str(job['_id']),
+            'kind': job['kind'],
+            'purpose': job.get('purpose'),
+            'status': job['status'],
+            # The result is only usable once the app has applied it
+            'ready': job.get('outcome') is not None,
+            'created_at': job['created_at'].isoformat(),
+            'started_at': job['started_at'].isoformat() if job.get('started_at') else None,
+            'finished_at': job['finished_at'].isoformat() if job.get('finished_at') else None,
+            'queue_position': self.queue_position(job) if job['status'] == STATUS_QUEUED else 0,
+            'progress': job.get('progress'),
+            'error': job.get('error')
+        }
+
+    def queue_position(self, job):
+        """Jobs queued ahead of this one (created_at only has millisecond precision, _id breaks ties)"""
+        return self.collection.count_documents({'status': STATUS_QUEUED, '$or': [
+            {'created_at': {'$lt': job['created_at']}},
+            {'created_at': job['created_at'], '_id': {'$lt': job['_id']}}
+        ]})
+
+    def claim_finished(self):
+        """Atomically take one finished job whose result the app hasn't applied yet"""
+        return self.collection.find_one_and_update(
+            {'status': {'$in': [STATUS_COMPLETED, STATUS_FAILED]}, 'notified_at': None},
+            {'$set': {'notified_at': datetime.now()}},
+            sort=[('finished_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def claim_progress(self):
+        """Atomically take one running job with a progress report the app hasn't pushed yet"""
+        return self.collection.find_one_and_update(
+            {'progress_pending': True},
+            {'$set': {'progress_pending': False}},
+            projection={'kind': 1, 'purpose': 1, 'context': 1, 'progress': 1, 'owner': 1}
+        )
+
+    def set_outcome(self, job_id, outcome):
+        """Store what the app made of the result (what the result endpoint returns)"""
+        self.collection.update_one({'_id': ObjectId(job_id)}, {'$set': {'outcome': outcome}})
+
+    def status_counts(self):
+        counts = {status: 0 for status in (STATUS_QUEUED, STATUS_RUNNING, STATUS_COMPLETED, STATUS_FAILED)}
+        for row in self.collection.aggregate([{'$group': {'_id': '$status', 'count': {'$sum': 1}}}]):
+            counts[row['_id']] = row['count']
+        return counts
+
+    # ==================== WORKER SIDE ====================
+
+    def claim_next(self, worker):
+        """
+        Atomically take the oldest queued job (or one whose worker died mid-run). Stale jobs
+        that already used max_attempts are failed instead, so one poisoned job can't take
+        down every worker in turn.
+        """
+        now = datetime.now()
+        self.collection.update_many(
+            {'status': STATUS_RUNNING, 'started_at': {'$lt': now - self.stale_after},
+             'attempts': {'$gte': self.max_attempts}},
+            {'$set': {'status': STATUS_FAILED, 'finished_at': now,
+                      'error': f'Worker stopped responding on all {self.max_attempts} attempts'}}
+        )
+        return self.collection.find_one_and_update(
+            {'$or': [
+                {'status': STATUS_QUEUED},
+                {'status': STATUS_RUNNING, 'started_at': {'$lt': now - self.stale_after},
+                 'attempts': {'$lt': self.max_attempts}}
+            ]},
+            {'$set': {'status': STATUS_RUNNING, 'started_at': now, 'worker': worker}, '$inc': {'attempts': 1}},
+            sort=[('created_at', 1), ('_id', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def heartbeat(self, worker):
+        self.workers.update_one(
+            {'_id': worker},
+            {'$set': {'last_seen': datetime.now(), 'host': socket.gethostname(), 'pid': os.getpid()}},
+            upsert=True
+        )
+
+    def fetch_files(self, payload, directory):
+        """The payload with its staged files written into directory and their keys pointing at the copies"""
+        staged = payload.get('staged_files')
+        if not staged:
+            return payload
+        local = dict(payload)
+        for key, file_ids in staged.items():
+            paths = []
+            for i, file_id in enumerate(file_ids):
+                stored = self.files.get(file_id)
+                path = os.path.join(directory, f'{i}-{stored.filename}')
+                with open(path, 'wb') as f:
+                    f.write(stored.read())
+                paths.append(path)
+            local[key] = paths if isinstance(payload[key], list) else paths[0]
+        return local
+
+    def complete(self, job_id, result):
+        self.collection.update_one(
+            {'_id': job_id},
+            {'$set': {'status': STATUS_COMPLETED, 'result': result, 'finished_at': datetime.now()}}
+        )
+
+    def report_progress(self, job_id, progress):
+        """Record progress of a running job; the app's watcher pushes it to clients"""
+        self.collection.update_one(
+            {'_id': job_id, 'status': STATUS_RUNNING},
+            {'$set': {'progress': progress, 'progress_pending': True}}
+        )
+
+    def fail(self, job_id, error):
+        self.collection.update_one(
+            {'_id': job_id},
+            {'$set': {'status': STATUS_FAILED, 'error': str(error), 'finished_at': datetime.now()}}
+        )
+
+
+# ==================== JOB HANDLERS (run inside worker processes) ====================
+
+def analyze_documents_job(engine, payload, db=None, progress=None):
+    """Verification pipeline over payload['file_paths']"""
+    # Same rule as LazyAIProvider: without the classifier the app uses basic verification
+    if engine is not None:
+        engine.refresh_document_classifier()
+    if engine is None or engine.document_classifier.registry_name in engine.degraded_models():
+        return {'degraded': True, 'model_versions': engine.model_versions() if engine else None}
+
+    results, stage_timings = engine.analyze_documents(payload['file_paths'])
+    return {'results': results, 'stage_timings': stage_timings, 'model_versions': engine.model_versions()}
+
+
+def detect_equipment_job(engine, payload, db=None, progress=None):
+    """Safety equipment detection over payload['file_paths'] in one batch"""
+    if engine is None:
+        raise RuntimeError('AI engine is not available on this worker')
+    return {
+        'results': engine.safety_detector.detect_equipment_batch(payload['file_paths']),
+        'model_versions': engine.model_versions()
+    }
+
+
+def score_compliance_job(engine, payload, db=None, progress=None):
+    """Re-score every application in payload['scope'] with one compliance predict call"""
+    if engine is None:
+        raise RuntimeError('AI engine is not available on this worker')
+    from compliance_scoring import score_applications
+    return score_applications(engine.compliance_analyzer, db['applications'], payload.get('scope', 'certified'))
+
+
+def train_classifier_job(engine, payload, db=None, progress=None):
+    """Incremental document classifier training on newly verified applications"""
+    if engine is None:
+        raise RuntimeError('AI engine is not available on this worker')
+    from incremental_training import DEFAULT_BATCH_SIZE, incremental_train
+    from real_ai_models import DocumentClassifier
+    # A separate instance: the worker's loaded classifier keeps serving while this one trains,
+    # and every worker switches to the published version on its next analysis
+    return incremental_train(DocumentClassifier(backend='hashing'), db['applications'],
+                             payload.get('batch_size') or DEFAULT_BATCH_SIZE)
+
+
+def analyze_video_job(engine, payload, db=None, progress=None):
+    """Keyframe safety equipment analysis of payload['video_path'], reporting progress per batch"""
+    if engine is None:
+        raise RuntimeError('AI engine is not available on this worker')
+    from video_analysis import analyze_video, DEFAULT_SAMPLE_FPS
+    return analyze_video(
+        engine.safety_detector, payload['video_path'],
+        sample_fps=payload.get('sample_fps') or DEFAULT_SAMPLE_FPS, progress=progress
+    )
+
+
+JOB_HANDLERS = {
+    'analyze_documents': analyze_documents_job,
+    'detect_equipment': detect_equipment_job,
+    'score_compliance': score_compliance_job,
+    'train_classifier': train_classifier_job,
+    'analyze_video': analyze_video_job
+}
+
+
+def process_one(queue, engine, worker, db=None):
+    """Run one queued job. Returns False when the queue was empty."""
+    job = queue.claim_next(worker)
+    if not job:
+        return False
+
+    started = time.perf_counter()
+    try:
+        handler = JOB_HANDLERS.get(job['kind'])
+        if handler is None:
+            raise ValueError(f"Unknown inference job kind: {job['kind']}")
+        def progress(data):
+            queue.report_progress(job['_id'], data)
+
+        with tempfile.TemporaryDirectory(prefix='inference-') as directory:
+            payload = queue.fetch_files(job['payload'], directory)
+            queue.complete(job['_id'], handler(engine, payload, db, progress))
+        print(f"✅ [{worker}] {job['kind']} job {job['_id']} done in {time.perf_counter() - started:.2f}s")
+    except Exception as e:
+        traceback.print_exc()
+        queue.fail(job['_id'], e)
+        print(f"❌ [{worker}] {job['kind']} job {job['_id']} failed: {e}")
+    return True
+
+
+def _parent_alive(parent_pid):
+    if parent_pid is None:
+        return True
+    try:
+        os.kill(parent_pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+def _send_heartbeats(queue, worker, interval=HEARTBEAT_INTERVAL):
+    """Heartbeat thread: keeps the worker visible to the app while a long job runs"""
+    while True:
+        try:
+            queue.heartbeat(worker)
+        except Exception as e:
+            print(f"⚠️ [{worker}] Heartbeat failed: {e}")
+        time.sleep(interval)
+
+
+def worker_main(worker, poll_interval=DEFAULT_POLL_INTERVAL, parent_pid=None):
+    """Entry point of one worker process: load the engine once, then drain the queue"""
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+
+    load_dotenv()
+    db = MongoClient(os.getenv('MONGODB_URI', os.getenv('DATABASE_URL', 'mongodb://localhost:27017/')))[
+        os.getenv('DB_NAME', 'aek_noc')]
+
+    # Beat from the start, so the app queues jobs for this worker while its models load
+    queue = InferenceJobQueue(db['inference_jobs'])
+    threading.Thread(target=_send_heartbeats, args=(queue, worker), name='inference-heartbeat', daemon=True).start()
+
+    from analysis_cache import AnalysisCache
+    try:
+        from real_ai_models import ai_engine
+        ai_engine.analysis_cache = AnalysisCache(
+            db['ai_analysis_cache'],
+            max_entries=int(os.getenv('ANALYSIS_CACHE_MEMORY_ENTRIES', 512))
+        )
+        versions = ai_engine.load_models()
+        print(f"🤖 [{worker}] AI engine loaded: {versions}")
+    except ImportError as e:
+        # Keep draining the queue so jobs still finish (the app falls back to basic verification)
+        ai_engine = None
+        print(f"⚠️ [{worker}] AI models not available - answering jobs in basic mode ({e})")
+
+    while _parent_alive(parent_pid):
+        try:
+            if not process_one(queue, ai_engine, worker, db):
+                time.sleep(poll_interval)
+        except Exception as e:
+            print(f"Error in inference worker {worker}: {e}")
+            time.sleep(poll_interval)
+    print(f"👋 [{worker}] Parent process exited, stopping")
+
+
+def start_local_workers(processes=DEFAULT_PROCESSES):
+    """
+    Start the worker pool as a child of the web server (for single-service deployments).
+    The workers exit when the web server process does.
+    """
+    command = [sys.executable, os.path.abspath(__file__), '--processes', str(processes), '--parent-pid', str(os.getpid())]
+    process = subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)))
+    print(f"🚀 Started {processes} inference worker process(es) (pid {process.pid})")
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the Fire NOC AI inference workers')
+    parser.add_argument('--processes', type=int, default=DEFAULT_PROCESSES, help='worker processes (one engine each)')
+    parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL, help='seconds between polls when idle')
+    parser.add_argument('--parent-pid', type=int, default=None, help='exit when this process exits')
+    args = parser.parse_args()
+
+    # spawn: every worker imports TensorFlow itself instead of inheriting a forked copy
+    context = multiprocessing.get_context('spawn')
+    host = socket.gethostname()
+    workers = [
+        context.Process(
+            target=worker_main,
+            args=(f'{host}-{os.getpid()}-{i}', args.poll_interval, args.parent_pid or os.getpid()),
+            name=f'inference-{i}'
+        )
+        for i in range(max(1, args.processes))
+    ]
+    for process in workers:
+        process.start()
+    print(f"🤖 Inference service running with {len(workers)} worker process(es)")
+
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Model Registry for Fire NOC System
+Model artifacts are built offline by train_ai_models.py and recorded in
+models/manifest.json with a version and SHA-256 checksum per file. The web app
+only ever reads them: a missing or corrupt artifact leaves that model unloaded
+(degraded mode) instead of training it on the request path.
+
+Usage:
+    python model_registry.py            # list registered models
+    python model_registry.py --verify   # check every artifact against its checksum
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+MODELS_DIR = os.environ.get('AI_MODELS_DIR', 'models')
+MANIFEST_FILE = 'manifest.json'
+
+
+class ModelUnavailable(Exception):
+    """A registered model cannot be loaded (not built, missing file or checksum mismatch)"""
+
+
+def sha256_file(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """Reads (and, for the training script, writes) the model manifest"""
+
+    def __init__(self, models_dir=MODELS_DIR):
+        self.models_dir = models_dir
+        self.manifest_path = os.path.join(models_dir, MANIFEST_FILE)
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def path(self, filename):
+        return os.path.join(self.models_dir, filename)
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'models': {}}
+
+    # ==================== OFFLINE (train_ai_models.py) ====================
+
+    def register(self, name, filenames, version=None, metadata=None):
+        """Record freshly built artifacts under a new version"""
+        version = version or datetime.now().strftime('%Y%m%d%H%M%S')
+        entry = {
+            'version': version,
+            'built_at': datetime.now().isoformat(),
+            'files': {filename: sha256_file(self.path(filename)) for filename in filenames},
+            'metadata': metadata or {}
+        }
+
+        with self._lock:
+            manifest = self.load_manifest()
+            manifest.setdefault('models', {})[name] = entry
+            manifest['updated_at'] = entry['built_at']
+            os.makedirs(self.models_dir, exist_ok=True)
+            tmp_path = self.manifest_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.manifest_path)
+
+        print(f"📦 Registered {name} version {version}")
+        return entry
+
+    # ==================== RUNTIME (read-only) ====================
+
+    def resolve(self, name):
+        """
+        Return {'version', 'paths'} for a registered model after checking every file
+        against its checksum. Raises ModelUnavailable otherwise.
+        """
+        entry = self.load_manifest().get('models', {}).get(name)
+        if not entry:
+            raise ModelUnavailable(f"{name} is not registered in {self.manifest_path} - run train_ai_models.py")
+
+        paths = {}
+        for filename, checksum in entry.get('files', {}).items():
+            path = self.path(filename)
+            if not os.path.exists(path):
+                raise ModelUnavailable(f"{name} artifact missing: {path}")
+            if sha256_file(path) != checksum:
+                raise ModelUnavailable(f"{name} artifact checksum mismatch: {path}")
+            paths[filename] = path
+        return {'version': entry.get('version'), 'paths': paths}
+
+    def mark_loaded(self, name, version):
+        self._loaded[name] = {'version': version, 'loaded_at': datetime.now().isoformat(), 'error': None}
+
+    def mark_unavailable(self, name, error):
+        self._loaded[name] = {'version': None, 'loaded_at': None, 'error': str(error)}
+
+    def loaded_versions(self):
+        """Versions of the models loaded in this process (None when degraded)"""
+        return {name: state['version'] for name, state in self._loaded.items()}
+
+    def status(self):
+        """Registered and loaded state of every model, for the admin API"""
+        registered = self.load_manifest().get('models', {})
+        names = sorted(set(registered) | set(self._loaded))
+        return {
+            name: {
+                'registered_version': registered.get(name, {}).get('version'),
+                'built_at': registered.get(name, {}).get('built_at'),
+                'loaded_version': self._loaded.get(name, {}).get('version'),
+                'loaded_at': self._loaded.get(name, {}).get('loaded_at'),
+                'error': self._loaded.get(name, {}).get('error')
+            }
+            for name in names
+        }
+
+
+# Global registry instance
+model_registry = ModelRegistry()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect the Fire NOC model manifest')
+    parser.add_argument('--verify', action='store_true', help='check every artifact against its checksum')
+    args = parser.parse_args()
+
+    manifest = model_registry.load_manifest().get('models', {})
+    if not manifest:
+        print(f"⚠️ No models registered in {model_registry.manifest_path}")
+        return 1
+
+    failures = 0
+    for name, entry in sorted(manifest.items()):
+        print(f"📦 {name}: version {entry.get('version')} built {entry.get('built_at')}")
+        if args.verify:
+            try:
+                model_registry.resolve(name)
+                print("   ✅ checksums OK")
+            except ModelUnavailable as e:
+                failures += 1
+                print(f"   ❌ {e}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
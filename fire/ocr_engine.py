@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+OCR Engine for Fire NOC System
+pytesseract starts a tesseract process, writes the image to a temp file and reloads the
+language model for every call. With tesserocr installed, OCR instead runs on a pool of
+long-lived in-process Tesseract API handles: each loads its language data once and is
+reused, and recognition releases the GIL so the pool's handles work in parallel.
+Without tesserocr (or its language data) pytesseract is used as before.
+
+Settings:
+    OCR_BACKEND     auto (default), tesserocr or pytesseract
+    OCR_LANGUAGE    tesseract language(s), default eng
+    OCR_POOL_SIZE   handles in the pool, default AI_OCR_WORKERS (4)
+    TESSDATA_PREFIX directory holding <language>.traineddata (tesserocr's default otherwise)
+"""
+
+import os
+import queue
+import threading
+
+OCR_BACKEND = os.environ.get('OCR_BACKEND', 'auto')
+OCR_LANGUAGE = os.environ.get('OCR_LANGUAGE', 'eng')
+# One handle per concurrent OCR worker in the verification pipeline
+DEFAULT_POOL_SIZE = int(os.environ.get('OCR_POOL_SIZE', os.environ.get('AI_OCR_WORKERS', 4)))
+
+
+class PytesseractOCR:
+    """One tesseract process per image (the original behaviour)"""
+
+    backend = 'pytesseract'
+
+    def __init__(self, language=OCR_LANGUAGE):
+        import pytesseract
+
+        self._pytesseract = pytesseract
+        self.language = language
+
+    def image_to_string(self, image):
+        return self._pytesseract.image_to_string(image, lang=self.language)
+
+    def warm_up(self):
+        pass
+
+    def status(self):
+        return {'backend': self.backend, 'language': self.language}
+
+    def close(self):
+        pass
+
+
+class TesseractPool:
+    """Long-lived tesserocr handles, created on demand up to size and checked out one per call"""
+
+    backend = 'tesserocr'
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, language=OCR_LANGUAGE, tessdata=None):
+        self.size = max(1, size)
+        self.language = language
+        self.tessdata = tessdata or os.environ.get('TESSDATA_PREFIX')
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _create_handle(self):
+        import tesserocr
+
+        kwargs = {'lang': self.language}
+        if self.tessdata:
+            kwargs['path'] = self.tessdata.rstrip('/\\') + os.sep
+        # Raises when the language data is missing
+        return tesserocr.PyTessBaseAPI(**kwargs)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if not create:
+            return self._idle.get()
+        try:
+            return self._create_handle()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def image_to_string(self, image):
+        api = self._acquire()
+        try:
+            api.SetImage(image)
+            return api.GetUTF8Text()
+        finally:
+            # Drop the image and results but keep the loaded language model
+            api.Clear()
+            self.calls += 1
+            self._idle.put(api)
+
+    def warm_up(self):
+        """Load the first handle now so the first document doesn't pay for it"""
+        self._idle.put(self._acquire())
+
+    def status(self):
+        return {
+            'backend': self.backend,
+            'language': self.language,
+            'pool_size': self.size,
+            'handles_loaded': self._created,
+            'handles_idle': self._idle.qsize(),
+            'calls': self.calls
+        }
+
+    def close(self):
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().End()
+                except queue.Empty:
+                    break
+                self._created -= 1
+
+
+def create_ocr(backend=OCR_BACKEND, size=DEFAULT_POOL_SIZE, language=OCR_LANGUAGE, tessdata=None):
+    """
+    The configured OCR engine. 'auto' uses the tesserocr pool when tesserocr and its
+    language data load, and pytesseract otherwise.
+    """
+    if backend == 'pytesseract':
+        return PytesseractOCR(language)
+    try:
+        pool = TesseractPool(size, language, tessdata)
+        pool.warm_up()
+        return pool
+    except Exception as e:
+        if backend == 'tesserocr':
+            raise
+        print(f"⚠️ In-process OCR unavailable, using pytesseract ({e})")
+        return PytesseractOCR(language)
+
+
+_ocr = None
+_ocr_lock = threading.Lock()
+
+
+def get_ocr():
+    """Process-wide OCR engine, created on first use"""
+    global _ocr
+    if _ocr is None:
+        with _ocr_lock:
+            if _ocr is None:
+                _ocr = create_ocr()
+    return _ocr
+
+
+def image_to_string(image):
+    """Drop-in for pytesseract.image_to_string(image)"""
+    return get_ocr().image_to_string(image)
@@ -4,30 +4,63 @@ Real AI Models for Fire NOC System
 Implements actual machine learning models for document verification and analysis
 """
 
-import cv2
 import numpy as np
 import tensorflow as tf
 from tensorflow import keras
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
 from sklearn.svm import SVC
 import pickle
 import os
-import pytesseract
-from PIL import Image
 import re
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from analysis_cache import AnalysisCache, model_fingerprint
+from compliance_scoring import compliance_features, recommendation_codes, score_feature_matrix, RECOMMENDATION_SETS
+from image_preprocessing import load_cnn_input, preprocess_document
+from model_registry import model_registry
+from ocr_engine import get_ocr
+from tflite_model import TFLiteModel, export_int8
+from verification_pipeline import run_verification_pipeline
+
+# backend -> (registry name, artifact files)
+CLASSIFIER_BACKENDS = {
+    # TF-IDF vocabulary + 100-tree Random Forest
+    'forest': ('document_classifier', ('document_classifier.pkl', 'document_vectorizer.pkl')),
+    # Stateless feature hashing + linear model: nothing but the weights to load, supports partial_fit
+    'hashing': ('document_classifier_hashing', ('document_classifier_hashing.pkl',))
+}
+HASHING_FEATURES = 2 ** 16
+
+def default_classifier_backend(registry=model_registry):
+    """
+    AI_CLASSIFIER_BACKEND if set; otherwise 'hashing' once incremental training has published
+    a hashing model (the one kept current with verified documents), 'forest' before that
+    """
+    configured = os.environ.get('AI_CLASSIFIER_BACKEND')
+    if configured:
+        return configured
+    registered = registry.load_manifest().get('models', {})
+    return 'hashing' if CLASSIFIER_BACKENDS['hashing'][0] in registered else 'forest'
 
 class DocumentClassifier:
     """AI Model for Document Type Classification"""
     
-    def __init__(self):
+    def __init__(self, registry=model_registry, backend=None):
+        self.backend = backend or default_classifier_backend(registry)
+        if self.backend not in CLASSIFIER_BACKENDS:
+            raise ValueError(f"Unknown document classifier backend: {self.backend}")
+        self.registry_name, artifacts = CLASSIFIER_BACKENDS[self.backend]
         self.model = None
         self.vectorizer = None
         self.label_encoder = None
-        self.model_path = 'models/document_classifier.pkl'
-        self.vectorizer_path = 'models/document_vectorizer.pkl'
+        self.registry = registry
+        self.version = None
+        self.load_error = None
+        self.model_path = registry.path(artifacts[0])
+        self.vectorizer_path = registry.path(artifacts[1]) if len(artifacts) > 1 else None
         
     def create_training_data(self):
         """Create training data for document classification"""
@@ -77,64 +110,163 @@ class DocumentClassifier:
         texts = [item[0] for item in training_data]
         labels = [item[1] for item in training_data]
         
-        # Create TF-IDF vectorizer
-        self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
-        X = self.vectorizer.fit_transform(texts)
-        
-        # Train Random Forest classifier
-        self.model = RandomForestClassifier(n_estimators=100, random_state=42)
-        self.model.fit(X, labels)
+        if self.backend == 'hashing':
+            self.vectorizer = self.create_hashing_vectorizer()
+            X = self.vectorizer.transform(texts)
+            self.model = self.create_hashing_model(max_iter=50)
+            self.model.fit(X, labels)
+            metadata = {'type': 'SGD logistic regression', 'features': f'hashing ({HASHING_FEATURES})'}
+        else:
+            # Create TF-IDF vectorizer
+            self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+            X = self.vectorizer.fit_transform(texts)
+            
+            # Train Random Forest classifier
+            self.model = RandomForestClassifier(n_estimators=100, random_state=42)
+            self.model.fit(X, labels)
+            metadata = {'type': 'Random Forest', 'features': 'TF-IDF'}
         
         # Save model
-        os.makedirs('models', exist_ok=True)
-        with open(self.model_path, 'wb') as f:
-            pickle.dump(self.model, f)
-        with open(self.vectorizer_path, 'wb') as f:
-            pickle.dump(self.vectorizer, f)
+        self.save_model(dict(metadata, backend=self.backend, training_samples=len(texts)))
         
         print("✅ Document Classification Model Trained Successfully!")
         return True
     
+    def create_hashing_vectorizer(self):
+        """Stateless: the same text always maps to the same columns, nothing to fit or pickle"""
+        return HashingVectorizer(n_features=HASHING_FEATURES, alternate_sign=False, stop_words='english')
+    
+    def create_hashing_model(self, max_iter=5):
+        """Logistic regression trained by SGD, so predict_proba and partial_fit both work"""
+        return SGDClassifier(loss='log_loss', alpha=1e-4, max_iter=max_iter, tol=None, random_state=42)
+    
+    def save_model(self, metadata):
+        """Write the backend's artifacts and register them as a new version"""
+        os.makedirs(self.registry.models_dir, exist_ok=True)
+        if self.backend == 'hashing':
+            # Only hashed columns seen in training carry weight: store them sparse (smaller file, faster load)
+            self.model.sparsify()
+        paths = [self.model_path] + ([self.vectorizer_path] if self.vectorizer_path else [])
+        with open(self.model_path, 'wb') as f:
+            pickle.dump(self.model, f)
+        if self.vectorizer_path:
+            with open(self.vectorizer_path, 'wb') as f:
+                pickle.dump(self.vectorizer, f)
+        
+        entry = self.registry.register(
+            self.registry_name,
+            [os.path.basename(path) for path in paths],
+            metadata=metadata
+        )
+        self.version = entry['version']
+        return entry
+    
+    def partial_fit(self, texts, labels, classes=None):
+        """
+        Update the hashing backend in place with new labelled texts (the caller saves).
+        Starting from no model, classes must list every document type.
+        """
+        if self.backend != 'hashing':
+            raise ValueError("partial_fit needs the 'hashing' classifier backend")
+        if self.vectorizer is None:
+            self.vectorizer = self.create_hashing_vectorizer()
+        if self.model is None:
+            self.model = self.create_hashing_model()
+        elif hasattr(self.model.coef_, 'toarray'):
+            self.model.densify()
+        X = self.vectorizer.transform([text.lower().strip() for text in texts])
+        self.model.partial_fit(X, labels, classes=classes)
+        return self.model
+    
     def load_model(self):
-        """Load trained model"""
+        """Load the registered model artifacts (never trains)"""
         try:
+            entry = self.registry.resolve(self.registry_name)
             with open(self.model_path, 'rb') as f:
                 self.model = pickle.load(f)
-            with open(self.vectorizer_path, 'rb') as f:
-                self.vectorizer = pickle.load(f)
+            if self.vectorizer_path:
+                with open(self.vectorizer_path, 'rb') as f:
+                    self.vectorizer = pickle.load(f)
+            else:
+                self.vectorizer = self.create_hashing_vectorizer()
+            self.version = entry['version']
+            self.load_error = None
+            self.registry.mark_loaded(self.registry_name, self.version)
             return True
-        except:
+        except Exception as e:
+            self.model = None
+            self.vectorizer = None
+            self.load_error = str(e)
+            self.registry.mark_unavailable(self.registry_name, e)
+            print(f"⚠️ Document classifier unavailable: {e}")
             return False
     
+    def is_loaded(self):
+        return self.model is not None and self.vectorizer is not None
+    
     def classify_document(self, text):
         """Classify document type from extracted text"""
-        if not self.model or not self.vectorizer:
-            if not self.load_model():
-                self.train_model()
-        
-        # Preprocess text
-        text = text.lower().strip()
-        
-        # Vectorize text
-        X = self.vectorizer.transform([text])
-        
-        # Predict
-        prediction = self.model.predict(X)[0]
-        confidence = max(self.model.predict_proba(X)[0])
-        
-        return {
-            'document_type': prediction,
-            'confidence': float(confidence),
-            'timestamp': datetime.now().isoformat()
-        }
+        return self.classify_batch([text])[0]
+    
+    def classify_batch(self, texts):
+        """Classify several extracted texts with one vectorize and one predict_proba call"""
+        if not self.is_loaded():
+            if self.load_error or not self.load_model():
+                # Degraded mode: no model, no training on the request path
+                return [{
+                    'document_type': 'unknown',
+                    'confidence': 0.0,
+                    'degraded': True,
+                    'timestamp': datetime.now().isoformat()
+                } for _ in texts]
+        if not texts:
+            return []
+        
+        # Preprocess and vectorize text
+        X = self.vectorizer.transform([text.lower().strip() for text in texts])
+        
+        # Label and confidence both come from the one probability pass
+        probabilities = self.model.predict_proba(X)
+        best = probabilities.argmax(axis=1)
+        labels = self.model.classes_[best]
+        confidences = probabilities[np.arange(len(best)), best]
+        
+        timestamp = datetime.now().isoformat()
+        return [
+            {
+                'document_type': str(label),
+                'confidence': float(confidence),
+                'timestamp': timestamp
+            }
+            for label, confidence in zip(labels, confidences)
+        ]
+
+# architecture -> (registry name, artifact file)
+DETECTOR_ARCHITECTURES = {
+    # Original Keras CNN (Flatten + Dense(512), ~44M parameters)
+    'cnn': ('safety_detector', 'safety_detector.h5'),
+    # Depthwise-separable convs + global average pooling, served as an int8 TFLite model
+    'compact': ('safety_detector_compact', 'safety_detector_compact.tflite')
+}
 
 class SafetyEquipmentDetector:
     """AI Model for Safety Equipment Detection in Images/Videos"""
     
-    def __init__(self):
+    def __init__(self, registry=model_registry, architecture=None):
+        self.architecture = architecture or os.environ.get('AI_DETECTOR_ARCH', 'cnn')
+        if self.architecture not in DETECTOR_ARCHITECTURES:
+            raise ValueError(f"Unknown detector architecture: {self.architecture}")
+        self.registry_name, artifact = DETECTOR_ARCHITECTURES[self.architecture]
         self.model = None
-        self.model_path = 'models/safety_detector.h5'
+        self.registry = registry
+        self.version = None
+        self.load_error = None
+        self.model_path = registry.path(artifact)
         self.classes = ['fire_extinguisher', 'smoke_detector', 'emergency_exit', 'fire_alarm', 'sprinkler']
+        self.input_size = 224
+        self.batch_size = int(os.environ.get('AI_DETECTOR_BATCH_SIZE', 32))
+        self.decode_workers = int(os.environ.get('AI_DECODE_WORKERS', 4))
+        self._decode_pool = None
         
     def create_cnn_model(self):
         """Create CNN model for safety equipment detection"""
@@ -159,72 +291,215 @@ class SafetyEquipmentDetector:
         
         return model
     
+    def create_compact_model(self):
+        """
+        CPU-friendly variant: strided depthwise-separable conv blocks and global average
+        pooling instead of Flatten + Dense(512): ~43k parameters instead of ~44M
+        """
+        layers = [
+            keras.layers.Conv2D(16, (3, 3), strides=2, padding='same', use_bias=False,
+                                input_shape=(self.input_size, self.input_size, 3)),
+            keras.layers.BatchNormalization(),
+            keras.layers.ReLU(6.0)
+        ]
+        for filters, strides in ((32, 1), (64, 2), (96, 2), (128, 2), (128, 2)):
+            layers += [
+                keras.layers.SeparableConv2D(filters, (3, 3), strides=strides, padding='same', use_bias=False),
+                keras.layers.BatchNormalization(),
+                keras.layers.ReLU(6.0)
+            ]
+        layers += [
+            keras.layers.GlobalAveragePooling2D(),
+            keras.layers.Dropout(0.2),
+            keras.layers.Dense(len(self.classes), activation='softmax')
+        ]
+        
+        model = keras.Sequential(layers)
+        model.compile(
+            optimizer='adam',
+            loss='categorical_crossentropy',
+            metrics=['accuracy']
+        )
+        
+        return model
+    
+    def create_model(self):
+        """Keras model for the configured architecture"""
+        if self.architecture == 'compact':
+            return self.create_compact_model()
+        return self.create_cnn_model()
+    
+    def save_model(self, model, representative_images):
+        """Write the artifact for the configured architecture (int8 TFLite for compact)"""
+        os.makedirs(self.registry.models_dir, exist_ok=True)
+        if self.architecture == 'compact':
+            export_int8(model, representative_images, self.model_path)
+            return TFLiteModel(self.model_path)
+        model.save(self.model_path)
+        return model
+    
     def train_model(self):
         """Train safety equipment detection model"""
-        print("🤖 Training Safety Equipment Detection Model...")
+        print(f"🤖 Training Safety Equipment Detection Model ({self.architecture})...")
         
         # Create model
-        self.model = self.create_cnn_model()
+        model = self.create_model()
         
         # Generate synthetic training data (in real scenario, use actual images)
-        X_train = np.random.random((1000, 224, 224, 3))
+        X_train = np.random.random((1000, 224, 224, 3)).astype(np.float32)
         y_train = keras.utils.to_categorical(np.random.randint(0, len(self.classes), 1000), len(self.classes))
         
         # Train model
-        self.model.fit(X_train, y_train, epochs=10, batch_size=32, validation_split=0.2, verbose=1)
+        model.fit(X_train, y_train, epochs=10, batch_size=32, validation_split=0.2, verbose=1)
         
         # Save model
-        os.makedirs('models', exist_ok=True)
-        self.model.save(self.model_path)
+        self.model = self.save_model(model, X_train)
+        
+        entry = self.registry.register(
+            self.registry_name,
+            [os.path.basename(self.model_path)],
+            metadata={
+                'type': 'int8 TFLite (separable CNN + GAP)' if self.architecture == 'compact' else 'CNN',
+                'architecture': self.architecture,
+                'parameters': int(model.count_params()),
+                'input_shape': [self.input_size, self.input_size, 3],
+                'classes': self.classes
+            }
+        )
+        self.version = entry['version']
         
         print("✅ Safety Equipment Detection Model Trained Successfully!")
         return True
     
     def load_model(self):
-        """Load trained model"""
+        """Load the registered model artifact (never trains)"""
         try:
-            self.model = keras.models.load_model(self.model_path)
+            entry = self.registry.resolve(self.registry_name)
+            if self.architecture == 'compact':
+                self.model = TFLiteModel(self.model_path)
+            else:
+                self.model = keras.models.load_model(self.model_path, compile=False)
+            self.version = entry['version']
+            self.load_error = None
+            self.registry.mark_loaded(self.registry_name, self.version)
             return True
-        except:
+        except Exception as e:
+            self.model = None
+            self.load_error = str(e)
+            self.registry.mark_unavailable(self.registry_name, e)
+            print(f"⚠️ Safety equipment detector unavailable: {e}")
             return False
     
+    def is_loaded(self):
+        return self.model is not None
+    
     def detect_equipment(self, image_path):
         """Detect safety equipment in image"""
-        if not self.model:
-            if not self.load_model():
-                self.train_model()
-        
-        try:
-            # Load and preprocess image
-            img = cv2.imread(image_path)
-            img = cv2.resize(img, (224, 224))
-            img = img / 255.0
-            img = np.expand_dims(img, axis=0)
+        return self.detect_equipment_batch([image_path])[0]
+    
+    def detect_equipment_batch(self, image_paths, batch_size=None):
+        """
+        Detect safety equipment in several images. Images are decoded (at reduced JPEG
+        scale) and resized in parallel straight into one preallocated float32 array and
+        run through the CNN in chunks of batch_size. Returns one result per path.
+        """
+        return self._detect(len(image_paths), lambda batch, slot, i: self.decode_into(batch, slot, image_paths[i]),
+                            batch_size, parallel=True)
+    
+    def detect_equipment_arrays(self, arrays, batch_size=None):
+        """
+        Detect safety equipment in images already preprocessed to normalized
+        input_size x input_size arrays (image_preprocessing.to_cnn_input).
+        None entries get an error result.
+        """
+        def fill(batch, slot, i):
+            if arrays[i] is None:
+                return ValueError('No image data')
+            batch[slot] = arrays[i]
+            return None
+        return self._detect(len(arrays), fill, batch_size, parallel=False)
+    
+    def _detect(self, count, fill, batch_size, parallel):
+        """Fill preallocated batches with fill(batch, slot, index) and predict them chunk by chunk"""
+        if not self.is_loaded():
+            if self.load_error or not self.load_model():
+                # Degraded mode: report every image as undetected instead of training
+                return [dict(self.error_result('Safety detector model not loaded'), degraded=True) for _ in range(count)]
+        
+        batch_size = batch_size or self.batch_size
+        results = [None] * count
+        
+        for start in range(0, count, batch_size):
+            size = min(batch_size, count - start)
+            batch = np.empty((size, self.input_size, self.input_size, 3), dtype=np.float32)
             
-            # Predict
-            predictions = self.model.predict(img)
-            predicted_class = np.argmax(predictions[0])
-            confidence = float(predictions[0][predicted_class])
+            # PIL releases the GIL while decoding and resizing, so threads overlap
+            if parallel:
+                errors = list(self.decode_pool().map(fill, [batch] * size, range(size), range(start, start + size)))
+            else:
+                errors = [fill(batch, slot, start + slot) for slot in range(size)]
+            decoded = [i for i, error in enumerate(errors) if error is None]
+            for i, error in enumerate(errors):
+                if error is not None:
+                    results[start + i] = self.error_result(error)
+            if not decoded:
+                continue
             
-            return {
-                'detected_equipment': self.classes[predicted_class],
-                'confidence': confidence,
-                'all_predictions': {self.classes[i]: float(predictions[0][i]) for i in range(len(self.classes))},
-                'timestamp': datetime.now().isoformat()
-            }
+            if len(decoded) < size:
+                batch = batch[decoded]
+            
+            try:
+                predictions = np.asarray(self.model.predict_on_batch(batch))
+                for i, prediction in zip(decoded, predictions):
+                    results[start + i] = self.format_prediction(prediction)
+            except Exception as e:
+                for i in decoded:
+                    results[start + i] = self.error_result(e)
+        
+        return results
+    
+    def decode_pool(self):
+        """Thread pool shared by all batches for image decoding"""
+        if self._decode_pool is None:
+            self._decode_pool = ThreadPoolExecutor(max_workers=self.decode_workers, thread_name_prefix='cnn-decode')
+        return self._decode_pool
+    
+    def decode_into(self, batch, slot, image_path):
+        """Decode one image into batch[slot]; returns an exception instead of raising"""
+        try:
+            batch[slot] = load_cnn_input(image_path, self.input_size)
+            return None
         except Exception as e:
-            return {
-                'error': str(e),
-                'detected_equipment': 'unknown',
-                'confidence': 0.0
-            }
+            return e
+    
+    def format_prediction(self, prediction):
+        """Turn one softmax row into a detection result"""
+        predicted_class = int(np.argmax(prediction))
+        return {
+            'detected_equipment': self.classes[predicted_class],
+            'confidence': float(prediction[predicted_class]),
+            'all_predictions': {self.classes[i]: float(prediction[i]) for i in range(len(self.classes))},
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def error_result(self, error):
+        return {
+            'error': str(error),
+            'detected_equipment': 'unknown',
+            'confidence': 0.0
+        }
 
 class ComplianceAnalyzer:
     """AI Model for Compliance Analysis"""
     
-    def __init__(self):
+    registry_name = 'compliance_analyzer'
+    
+    def __init__(self, registry=model_registry):
         self.model = None
-        self.model_path = 'models/compliance_analyzer.pkl'
+        self.registry = registry
+        self.version = None
+        self.load_error = None
+        self.model_path = registry.path('compliance_analyzer.pkl')
         
     def create_training_data(self):
         """Create training data for compliance analysis"""
@@ -257,27 +532,52 @@ class ComplianceAnalyzer:
         self.model.fit(X, y)
         
         # Save model
-        os.makedirs('models', exist_ok=True)
+        os.makedirs(self.registry.models_dir, exist_ok=True)
         with open(self.model_path, 'wb') as f:
             pickle.dump(self.model, f)
         
+        entry = self.registry.register(
+            self.registry_name,
+            [os.path.basename(self.model_path)],
+            metadata={'type': 'SVM', 'training_samples': len(training_data)}
+        )
+        self.version = entry['version']
+        
         print("✅ Compliance Analysis Model Trained Successfully!")
         return True
     
     def load_model(self):
-        """Load trained model"""
+        """Load the registered model artifact (never trains)"""
         try:
+            entry = self.registry.resolve(self.registry_name)
             with open(self.model_path, 'rb') as f:
                 self.model = pickle.load(f)
+            self.version = entry['version']
+            self.load_error = None
+            self.registry.mark_loaded(self.registry_name, self.version)
             return True
-        except:
+        except Exception as e:
+            self.model = None
+            self.load_error = str(e)
+            self.registry.mark_unavailable(self.registry_name, e)
+            print(f"⚠️ Compliance analyzer unavailable: {e}")
             return False
     
+    def is_loaded(self):
+        return self.model is not None
+    
     def analyze_compliance(self, features):
         """Analyze compliance based on features"""
-        if not self.model:
-            if not self.load_model():
-                self.train_model()
+        if not self.is_loaded():
+            if self.load_error or not self.load_model():
+                # Degraded mode: no model, no training on the request path
+                return {
+                    'error': 'Compliance model not loaded',
+                    'degraded': True,
+                    'compliance_score': 0,
+                    'risk_level': 'Unknown',
+                    'recommendations': []
+                }
         
         # Predict compliance score
         score = self.model.predict([features])[0]
@@ -292,27 +592,26 @@ class ComplianceAnalyzer:
             'timestamp': datetime.now().isoformat()
         }
     
+    def analyze_compliance_batch(self, features):
+        """
+        Score an (n, 5) feature matrix with one predict call (see compliance_scoring).
+        Returns arrays of scores and risk levels plus per-row recommendation lists.
+        """
+        if not self.is_loaded():
+            if self.load_error or not self.load_model():
+                return {'error': 'Compliance model not loaded', 'degraded': True}
+        
+        scores, risk_levels, recommendations = score_feature_matrix(self.model, np.asarray(features, dtype=np.float64))
+        return {
+            'compliance_scores': scores,
+            'risk_levels': risk_levels,
+            'recommendations': recommendations
+        }
+    
     def generate_recommendations(self, features, score):
-        """Generate recommendations based on analysis"""
-        recommendations = []
-        
-        area, occupancy, extinguishers, exits, detectors = features
-        
-        # Calculate ratios
-        extinguisher_ratio = extinguishers / (area / 1000)  # per 1000 sqft
-        exit_ratio = exits / (occupancy / 50)  # per 50 people
-        detector_ratio = detectors / (area / 500)  # per 500 sqft
-        
-        if extinguisher_ratio < 1:
-            recommendations.append("Install additional fire extinguishers")
-        if exit_ratio < 1:
-            recommendations.append("Add more emergency exits")
-        if detector_ratio < 1:
-            recommendations.append("Install more smoke detectors")
-        if score < 70:
-            recommendations.append("Immediate safety improvements required")
-        
-        return recommendations
+        """Generate recommendations based on analysis (same checks as the batch path)"""
+        code = recommendation_codes(np.array([features], dtype=np.float64), np.array([score]))[0]
+        return list(RECOMMENDATION_SETS[code])
     
     def get_risk_level(self, score):
         """Determine risk level based on score"""
@@ -332,6 +631,9 @@ class RealAIEngine:
         self.document_classifier = DocumentClassifier()
         self.safety_detector = SafetyEquipmentDetector()
         self.compliance_analyzer = ComplianceAnalyzer()
+        # Replaced with a MongoDB-backed cache by the app (see ai_provider)
+        self.analysis_cache = AnalysisCache()
+        self._refresh_failed = None
         
     def train_all_models(self):
         """Train all AI models"""
@@ -347,19 +649,74 @@ class RealAIEngine:
         self.compliance_analyzer.train_model()
         
         print("🎉 All AI Models Trained Successfully!")
+    
+    def load_models(self):
+        """Load every registered model read-only; missing ones leave the engine degraded"""
+        for component in (self.document_classifier, self.safety_detector, self.compliance_analyzer):
+            component.load_model()
+        
+        # Load the OCR engine's language data now rather than on the first document
+        print(f"🔤 OCR engine: {get_ocr().status()}")
+        return self.model_versions()
+    
+    def refresh_document_classifier(self):
+        """
+        Serve the newest published document classifier. Incremental training publishes while
+        the engine is running, so without this the served model would stay on the version
+        loaded at start-up. Returns True when the classifier was swapped.
+        """
+        current = self.document_classifier
+        backend = default_classifier_backend(current.registry)
+        entry = current.registry.load_manifest().get('models', {}).get(CLASSIFIER_BACKENDS[backend][0])
+        if not entry or (backend == current.backend and entry['version'] == current.version):
+            return False
+        if self._refresh_failed == (backend, entry['version']):
+            return False
+        
+        classifier = DocumentClassifier(current.registry, backend)
+        if not classifier.load_model():
+            # Don't retry a broken artifact on every analysis; the next published version is tried
+            self._refresh_failed = (backend, entry['version'])
+            return False
+        self.document_classifier = classifier
+        print(f"🔄 Document classifier now serving {classifier.registry_name} v{classifier.version}")
+        return True
+    
+    def model_versions(self):
+        """Loaded version of each model (None for a model running degraded)"""
+        return {
+            component.registry_name: component.version if component.is_loaded() else None
+            for component in (self.document_classifier, self.safety_detector, self.compliance_analyzer)
+        }
+    
+    def model_fingerprint(self):
+        return model_fingerprint(self.model_versions())
+    
+    def degraded_models(self):
+        return [name for name, version in self.model_versions().items() if version is None]
         
     def analyze_document(self, file_path):
-        """Complete document analysis using AI"""
+        """Complete document analysis using AI (cached by file content and model versions)"""
+        self.refresh_document_classifier()
+        fingerprint = self.model_fingerprint()
+        cached = self.analysis_cache.get(file_path, fingerprint)
+        if cached is not None:
+            return cached
+        
+        result = self._analyze_document(file_path)
+        self.analysis_cache.set(file_path, fingerprint, result)
+        return result
+    
+    def _analyze_document(self, file_path):
         try:
-            # Extract text using OCR
-            img = Image.open(file_path)
-            extracted_text = pytesseract.image_to_string(img)
+            # Decode once, extract text using OCR
+            extracted_text, cnn_input = self.read_document(file_path)
             
             # Classify document type
             classification = self.document_classifier.classify_document(extracted_text)
             
-            # Detect safety equipment if it's an image
-            equipment_detection = self.safety_detector.detect_equipment(file_path)
+            # Detect safety equipment on the same decoded image
+            equipment_detection = self.safety_detector.detect_equipment_arrays([cnn_input])[0]
             
             return {
                 'extracted_text': extracted_text,
@@ -374,17 +731,42 @@ class RealAIEngine:
                 'analysis_timestamp': datetime.now().isoformat()
             }
     
+    def read_document(self, file_path):
+        """
+        Decode the file once and run OCR on its binarized form.
+        Returns (extracted_text, cnn_input) so detection reuses the same decode.
+        """
+        image = preprocess_document(file_path, self.safety_detector.input_size)
+        return get_ocr().image_to_string(image.ocr_image), image.cnn_input
+    
+    def extract_text(self, file_path):
+        """OCR stage of document analysis"""
+        return self.read_document(file_path)[0]
+    
+    def analyze_documents(self, file_paths, max_workers=4):
+        """
+        Analyze several documents at once: cached files are answered from the analysis
+        cache, the rest go through concurrent OCR and one CNN batch.
+        Returns (results, stage_timings); see verification_pipeline.run_verification_pipeline.
+        """
+        self.refresh_document_classifier()
+        fingerprint = self.model_fingerprint()
+        results = [self.analysis_cache.get(file_path, fingerprint) for file_path in file_paths]
+        misses = [i for i, result in enumerate(results) if result is None]
+        
+        fresh, timings = run_verification_pipeline(self, [file_paths[i] for i in misses], max_workers=max_workers)
+        for i, result in zip(misses, fresh):
+            results[i] = result
+            self.analysis_cache.set(file_paths[i], fingerprint, result)
+        
+        timings['cache_hits'] = len(file_paths) - len(misses)
+        return results, timings
+    
     def analyze_compliance(self, application_data):
         """Analyze compliance for an application"""
         try:
             # Extract features from application data
-            features = [
-                application_data.get('area_sqft', 1000),
-                application_data.get('occupancy_count', 50),
-                application_data.get('fire_extinguishers', 2),
-                application_data.get('emergency_exits', 1),
-                application_data.get('smoke_detectors', 5)
-            ]
+            features = compliance_features(application_data)
             
             # Analyze compliance
             compliance_result = self.compliance_analyzer.analyze_compliance(features)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test that the lazy AI provider gates each caller on the model it needs
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai_provider import LazyAIProvider
+
+
+def loaded_provider(degraded):
+    provider = LazyAIProvider(dependencies=())
+    provider._engine = SimpleNamespace(
+        document_classifier=SimpleNamespace(registry_name='document_classifier_hashing'),
+        safety_detector=SimpleNamespace(registry_name='safety_detector_mobilenet'),
+        compliance_analyzer=SimpleNamespace(registry_name='compliance_analyzer')
+    )
+    provider.degraded_models = list(degraded)
+    provider._ready.set()
+    return provider
+
+
+def test_degraded_classifier_leaves_other_models_usable():
+    provider = loaded_provider(['document_classifier_hashing'])
+    assert provider.get_engine() is None
+    assert provider.get_engine(requires='compliance_analyzer') is provider._engine
+    assert provider.get_engine(requires='safety_detector') is provider._engine
+    assert provider.get_engine(requires=None) is provider._engine
+
+
+def test_each_model_is_checked_on_its_own():
+    provider = loaded_provider(['compliance_analyzer'])
+    assert provider.get_engine() is provider._engine
+    assert provider.get_engine(requires='compliance_analyzer') is None
+
+
+if __name__ == "__main__":
+    print("🧪 Testing lazy AI provider")
+    print("=" * 50)
+    failures = 0
+    for test in (test_degraded_classifier_leaves_other_models_usable, test_each_model_is_checked_on_its_own):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All AI provider checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
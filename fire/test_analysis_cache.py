@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test the content-addressed document analysis cache: hashing, model-version
+invalidation, shared MongoDB tier and LRU bounds
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import mongomock
+
+from analysis_cache import AnalysisCache, model_fingerprint
+from db_indexes import INDEX_SPECS
+
+V1 = model_fingerprint({'document_classifier': '1.0', 'safety_detector': None})
+V2 = model_fingerprint({'document_classifier': '1.1', 'safety_detector': None})
+RESULT = {'extracted_text': 'fire safety certificate', 'classification': {'document_type': 'safety_certificate', 'confidence': 0.9}}
+
+
+def write(directory, name, data):
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def test_identical_bytes_hit_regardless_of_path():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = AnalysisCache()
+        original = write(directory, 'upload_1.jpg', b'same scan')
+        reupload = write(directory, 'upload_2.jpg', b'same scan')
+        other = write(directory, 'upload_3.jpg', b'different scan')
+
+        assert cache.get(original, V1) is None
+        cache.set(original, V1, RESULT)
+        hit = cache.get(reupload, V1)
+        assert hit['classification'] == RESULT['classification'] and hit['cache_hit']
+        assert cache.get(other, V1) is None
+        assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+
+def test_model_version_change_invalidates():
+    collection = mongomock.MongoClient().db.ai_analysis_cache
+    with tempfile.TemporaryDirectory() as directory:
+        old_worker = AnalysisCache(collection)
+        path = write(directory, 'plan.jpg', b'plan')
+        old_worker.set(path, V1, RESULT)
+
+        # A worker on the new models misses, but leaves the old worker's entries in place
+        # (during a rolling deploy it is still serving them); the TTL index ages them out
+        new_worker = AnalysisCache(collection)
+        assert new_worker.get(path, V2) is None
+        new_worker.set(path, V2, RESULT)
+        assert AnalysisCache(collection).get(path, V1)['cache_hit']
+        assert collection.count_documents({}) == 2
+
+    ttl = [spec for spec in INDEX_SPECS
+           if spec['collection'] == 'ai_analysis_cache' and 'expireAfterSeconds' in spec['options']]
+    assert ttl and ttl[0]['keys'] == [('last_used_at', 1)]
+
+
+def test_modified_file_and_errors_are_not_served():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = AnalysisCache()
+        path = write(directory, 'license.jpg', b'v1')
+        cache.set(path, V1, RESULT)
+        time.sleep(0.01)
+        write(directory, 'license.jpg', b'v2 edited')
+        assert cache.get(path, V1) is None
+
+        cache.set(path, V1, {'error': 'tesseract is not installed'})
+        assert cache.get(path, V1) is None
+
+
+def test_shared_tier_survives_restart_and_memory_is_bounded():
+    collection = mongomock.MongoClient().db.ai_analysis_cache
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [write(directory, f'doc{i}.jpg', f'doc {i}'.encode()) for i in range(5)]
+        first = AnalysisCache(collection, max_entries=2)
+        for path in paths:
+            first.set(path, V1, RESULT)
+        assert first.stats()['memory_entries'] == 2
+
+        # A new worker process sees the entries through MongoDB
+        second = AnalysisCache(collection)
+        assert second.get(paths[0], V1)['cache_hit']
+        assert collection.find_one({'fingerprint': V1, 'hits': 1})
+
+
+def test_repeat_lookup_is_microseconds():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = AnalysisCache()
+        path = write(directory, 'photo.jpg', os.urandom(4 * 1024 * 1024))
+        cache.set(path, V1, RESULT)
+
+        lookups = 2000
+        started = time.perf_counter()
+        for _ in range(lookups):
+            cache.get(path, V1)
+        per_lookup_us = (time.perf_counter() - started) / lookups * 1e6
+        print(f"   📈 {per_lookup_us:.1f} µs per cached lookup")
+        assert per_lookup_us < 500
+
+
+if __name__ == "__main__":
+    print("🧪 Testing document analysis cache")
+    print("=" * 50)
+    failures = 0
+    for test in (test_identical_bytes_hit_regardless_of_path, test_model_version_change_invalidates,
+                 test_modified_file_and_errors_are_not_served, test_shared_tier_survives_restart_and_memory_is_bounded,
+                 test_repeat_lookup_is_microseconds):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All analysis cache checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
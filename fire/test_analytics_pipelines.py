@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Test the $facet analytics pipelines against the original count_documents implementation
+Seeds an in-memory database (mongomock) and checks every number in the three payloads matches
+"""
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import mongomock
+
+from analytics_pipelines import (
+    build_overview_analytics, build_compliance_analytics, build_predictive_analytics,
+    calculate_trend_percentage
+)
+
+# Fixed clock so month windows are deterministic (includes a month-end edge case)
+NOW_VALUES = [datetime(2025, 3, 31, 15, 30), datetime(2025, 7, 14, 9, 0)]
+
+
+def seed_database(now, seed=7):
+    """Create applications, inspections and users spread over the last year"""
+    rng = random.Random(seed)
+    db = mongomock.MongoClient().db
+    statuses = ['pending', 'approved', 'rejected', 'certificate_issued', 'inspection_scheduled']
+    business_types = ['Restaurant', 'Hotel', 'Hospital', 'Factory', 'School', 'Mall', 'Office']
+    inspectors = ['insp_a', 'insp_b', 'insp_c', 'insp_d', 'insp_e', 'insp_f']
+
+    apps = []
+    for i in range(400):
+        created = now - timedelta(days=rng.randint(0, 360), hours=rng.randint(0, 23))
+        status = rng.choice(statuses)
+        app = {
+            'business_name': f'Business {i}',
+            # Skewed distribution so the top-5 business types have a stable order
+            'business_type': business_types[min(int(rng.expovariate(0.6)), len(business_types) - 1)],
+            'status': status,
+            'timestamp': created
+        }
+        if status == 'approved':
+            app['approved_at'] = created + timedelta(days=rng.randint(-2, 40))
+        if status == 'rejected':
+            app['processed_date'] = created + timedelta(days=rng.randint(0, 20))
+        if status == 'certificate_issued':
+            app['noc_certificate_expiry'] = created + timedelta(days=rng.randint(30, 400))
+        if i % 37 == 0:
+            app['timestamp'] = created.isoformat()  # legacy string timestamps must be ignored
+        apps.append(app)
+    db.applications.insert_many(apps)
+
+    inspection_docs = []
+    for i in range(150):
+        date = now - timedelta(days=rng.randint(0, 200))
+        status = rng.choice(['pending', 'completed', 'completed', 'scheduled'])
+        doc = {'date': date, 'status': status, 'inspector_id': rng.choice(inspectors)}
+        if status == 'completed':
+            doc['completion_date'] = date + timedelta(days=rng.randint(0, 10))
+        inspection_docs.append(doc)
+    db.inspections.insert_many(inspection_docs)
+
+    db.users.insert_many([
+        {'username': 'insp_a', 'name': 'Inspector A'},
+        {'username': 'insp_b', 'name': 'Inspector B'},
+        {'username': 'insp_c'},
+    ])
+    return db
+
+
+# ==================== ORIGINAL IMPLEMENTATION (reference) ====================
+
+def legacy_overview(applications, inspections, users, now):
+    stats = {
+        'total': applications.count_documents({}),
+        'pending': applications.count_documents({'status': 'pending'}),
+        'approved': applications.count_documents({'status': 'approved'}),
+        'rejected': applications.count_documents({'status': 'rejected'})
+    }
+    total_processed = stats['approved'] + stats['rejected']
+    stats['approval_rate'] = round((stats['approved'] / total_processed) * 100) if total_processed > 0 else 0
+
+    processing_times = []
+    # (string timestamps are skipped here; the original loop raised TypeError on them)
+    for app in applications.find({'status': 'approved', 'approved_at': {'$exists': True}, 'timestamp': {'$type': 'date'}}):
+        processing_time = (app['approved_at'] - app['timestamp']).days
+        if processing_time >= 0:
+            processing_times.append(processing_time)
+    stats['avg_processing_time'] = round(sum(processing_times) / len(processing_times), 1) if processing_times else 0
+
+    total_certificates = applications.count_documents({'status': 'certificate_issued'})
+    valid_certificates = applications.count_documents({
+        'status': 'certificate_issued',
+        'noc_certificate_expiry': {'$gt': now}
+    })
+    stats['compliance_rate'] = round((valid_certificates / total_certificates) * 100) if total_certificates > 0 else 0
+
+    current_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
+    current_month_apps = applications.count_documents({'timestamp': {'$gte': current_month_start}})
+    last_month_apps = applications.count_documents({
+        'timestamp': {'$gte': last_month_start, '$lt': current_month_start}
+    })
+    trends = {
+        'total': calculate_trend_percentage(last_month_apps, current_month_apps),
+        'approval_rate': 0,
+        'processing_time': 0,
+        'compliance': 0
+    }
+
+    months, new_apps, approved_apps, rejected_apps = [], [], [], []
+    for i in range(5, -1, -1):
+        month_start = (now - timedelta(days=30*i)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        month_end = (month_start + timedelta(days=32)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        months.append(month_start.strftime('%b %Y'))
+        new_apps.append(applications.count_documents({'timestamp': {'$gte': month_start, '$lt': month_end}}))
+        approved_apps.append(applications.count_documents({
+            'approved_at': {'$gte': month_start, '$lt': month_end}, 'status': 'approved'
+        }))
+        rejected_apps.append(applications.count_documents({
+            'processed_date': {'$gte': month_start, '$lt': month_end}, 'status': 'rejected'
+        }))
+
+    status_distribution = [
+        stats['pending'], stats['approved'], stats['rejected'],
+        applications.count_documents({'status': 'certificate_issued'})
+    ]
+    business_types = list(applications.aggregate([
+        {'$group': {'_id': '$business_type', 'count': {'$sum': 1}}},
+        {'$sort': {'count': -1}},
+        {'$limit': 5}
+    ]))
+    inspector_performance = list(inspections.aggregate([
+        {'$match': {'status': 'completed'}},
+        {'$group': {'_id': '$inspector_id', 'completed': {'$sum': 1}}},
+        {'$sort': {'completed': -1}},
+        {'$limit': 5}
+    ]))
+    inspector_names, inspector_counts = [], []
+    for inspector in inspector_performance:
+        inspector_user = users.find_one({'username': inspector['_id']})
+        inspector_names.append(inspector_user.get('name', inspector['_id']) if inspector_user else inspector['_id'])
+        inspector_counts.append(inspector['completed'])
+
+    return {
+        'stats': stats,
+        'trends': trends,
+        'charts': {
+            'application_trends': {'labels': months, 'new': new_apps, 'approved': approved_apps, 'rejected': rejected_apps},
+            'status_distribution': {
+                'labels': ['Pending', 'Approved', 'Rejected', 'Certificate Issued'],
+                'data': status_distribution
+            },
+            'business_types': {
+                'labels': [bt['_id'] for bt in business_types],
+                'data': [bt['count'] for bt in business_types]
+            },
+            'inspector_performance': {'labels': inspector_names, 'data': inspector_counts}
+        }
+    }
+
+
+def legacy_compliance(applications, inspections, now):
+    total_certificates = applications.count_documents({'status': 'certificate_issued'})
+    valid_certificates = applications.count_documents({
+        'status': 'certificate_issued', 'noc_certificate_expiry': {'$gt': now}
+    })
+    overall_compliance = round((valid_certificates / total_certificates) * 100) if total_certificates > 0 else 0
+
+    expiring_soon = applications.count_documents({
+        'status': 'certificate_issued',
+        'noc_certificate_expiry': {'$gt': now, '$lte': now + timedelta(days=30)}
+    })
+
+    total_inspections = inspections.count_documents({})
+    completed_inspections = inspections.count_documents({'status': 'completed'})
+    inspection_compliance = round((completed_inspections / total_inspections) * 100) if total_inspections > 0 else 0
+
+    business_types = list(applications.aggregate([
+        {'$match': {'status': 'certificate_issued'}},
+        {'$group': {
+            '_id': '$business_type',
+            'total': {'$sum': 1},
+            'valid': {'$sum': {'$cond': [{'$gt': ['$noc_certificate_expiry', now]}, 1, 0]}}
+        }},
+        {'$project': {'type': '$_id', 'compliance_rate': {'$multiply': [{'$divide': ['$valid', '$total']}, 100]}}},
+        {'$sort': {'compliance_rate': -1}},
+        {'$limit': 5}
+    ]))
+
+    months, compliance_trend = [], []
+    current_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    for i in range(5, -1, -1):
+        month_start = (current_month - timedelta(days=30*i)).replace(day=1)
+        month_end = (month_start + timedelta(days=32)).replace(day=1)
+        month_total = applications.count_documents({'status': 'certificate_issued', 'timestamp': {'$lt': month_end}})
+        month_valid = applications.count_documents({
+            'status': 'certificate_issued', 'timestamp': {'$lt': month_end},
+            'noc_certificate_expiry': {'$gt': month_start}
+        })
+        months.append(month_start.strftime('%b %Y'))
+        compliance_trend.append(round((month_valid / month_total) * 100) if month_total > 0 else 0)
+
+    current_quarter_start = current_month - timedelta(days=90)
+    previous_quarter_start = current_quarter_start - timedelta(days=90)
+
+    def quarter_rate(timestamp_before, expiry_after):
+        total = applications.count_documents({'status': 'certificate_issued', 'timestamp': {'$lt': timestamp_before}})
+        valid = applications.count_documents({
+            'status': 'certificate_issued', 'timestamp': {'$lt': timestamp_before},
+            'noc_certificate_expiry': {'$gt': expiry_after}
+        })
+        return (valid / total) * 100 if total > 0 else 0
+
+    def inspection_rate(start, end):
+        total = inspections.count_documents({'date': {'$gte': start, '$lt': end}})
+        completed = inspections.count_documents({'status': 'completed', 'date': {'$gte': start, '$lt': end}})
+        return (completed / total) * 100 if total > 0 else 0
+
+    overall_trend = calculate_trend_percentage(
+        quarter_rate(current_quarter_start, previous_quarter_start),
+        quarter_rate(current_month, current_quarter_start)
+    )
+    inspection_trend = calculate_trend_percentage(
+        inspection_rate(previous_quarter_start, current_quarter_start),
+        inspection_rate(current_quarter_start, current_month)
+    )
+
+    return {
+        'compliance': {'overall': overall_compliance, 'expiring': expiring_soon, 'inspection': inspection_compliance},
+        'trends': {'overall': overall_trend, 'inspection': inspection_trend},
+        'charts': {
+            'by_type': {
+                'labels': [bt.get('type', 'Unknown') for bt in business_types],
+                'data': [round(bt.get('compliance_rate', 0)) for bt in business_types]
+            },
+            'trend': {'labels': months, 'data': compliance_trend}
+        }
+    }
+
+
+def legacy_predictive(applications, inspections, now):
+    thirty_days_ago = now - timedelta(days=30)
+    sixty_days_ago = now - timedelta(days=60)
+    recent_applications = applications.count_documents({'timestamp': {'$gte': thirty_days_ago}})
+    previous_applications = applications.count_documents({'timestamp': {'$gte': sixty_days_ago, '$lt': thirty_days_ago}})
+    if previous_applications > 0:
+        predicted_applications = round(recent_applications * (recent_applications / previous_applications))
+    else:
+        predicted_applications = recent_applications
+
+    renewals = applications.count_documents({
+        'status': 'certificate_issued',
+        'noc_certificate_expiry': {'$gt': now, '$lte': now + timedelta(days=30)}
+    })
+
+    pending_inspections = inspections.count_documents({'status': 'pending'})
+    last_month_start = (now - timedelta(days=30)).replace(hour=0, minute=0, second=0, microsecond=0)
+    completed_last_month = inspections.count_documents({
+        'status': 'completed', 'completion_date': {'$gte': last_month_start}
+    })
+
+    current_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    historical_applications = []
+    for i in range(6, 0, -1):
+        month_start = (current_month - timedelta(days=30*i)).replace(day=1)
+        month_end = (month_start + timedelta(days=32)).replace(day=1)
+        historical_applications.append(applications.count_documents({'timestamp': {'$gte': month_start, '$lt': month_end}}))
+
+    avg_monthly_growth = sum(
+        (historical_applications[i] - historical_applications[i-1]) for i in range(1, len(historical_applications))
+    ) / (len(historical_applications) - 1)
+    last_value = historical_applications[-1]
+
+    months, application_forecast, renewal_forecast = [], [], []
+    for i in range(6):
+        next_month = (current_month + timedelta(days=30*i)).replace(day=1)
+        months.append(next_month.strftime('%b %Y'))
+        application_forecast.append(max(0, round(last_value + avg_monthly_growth * (i+1))))
+        month_end = (next_month + timedelta(days=32)).replace(day=1)
+        renewal_forecast.append(applications.count_documents({
+            'status': 'certificate_issued',
+            'noc_certificate_expiry': {'$gte': next_month, '$lt': month_end}
+        }))
+
+    return {
+        'predictions': {
+            'applications': predicted_applications,
+            'renewals': renewals,
+            'inspections': pending_inspections + completed_last_month
+        },
+        'forecasts': {
+            'applications': {'labels': months, 'data': application_forecast},
+            'renewals': {'labels': months, 'data': renewal_forecast}
+        }
+    }
+
+
+# ==================== TESTS ====================
+
+def test_overview_matches_legacy():
+    for now in NOW_VALUES:
+        db = seed_database(now)
+        expected = legacy_overview(db.applications, db.inspections, db.users, now)
+        actual = build_overview_analytics(db.applications, db.inspections, db.users, now=now)
+        assert actual == expected, f"overview mismatch at {now}:\n{actual}\n!=\n{expected}"
+
+
+def test_compliance_matches_legacy():
+    for now in NOW_VALUES:
+        db = seed_database(now)
+        expected = legacy_compliance(db.applications, db.inspections, now)
+        actual = build_compliance_analytics(db.applications, db.inspections, now=now)
+        assert actual == expected, f"compliance mismatch at {now}:\n{actual}\n!=\n{expected}"
+
+
+def test_predictive_matches_legacy():
+    for now in NOW_VALUES:
+        db = seed_database(now)
+        expected = legacy_predictive(db.applications, db.inspections, now)
+        actual = build_predictive_analytics(db.applications, db.inspections, now=now)
+        assert actual == expected, f"predictive mismatch at {now}:\n{actual}\n!=\n{expected}"
+
+
+def test_empty_database():
+    db = mongomock.MongoClient().db
+    now = NOW_VALUES[0]
+    assert build_overview_analytics(db.applications, db.inspections, db.users, now=now) == \
+        legacy_overview(db.applications, db.inspections, db.users, now)
+    assert build_compliance_analytics(db.applications, db.inspections, now=now) == \
+        legacy_compliance(db.applications, db.inspections, now)
+    assert build_predictive_analytics(db.applications, db.inspections, now=now) == \
+        legacy_predictive(db.applications, db.inspections, now)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing $facet analytics pipelines against count_documents implementation")
+    print("=" * 70)
+    failures = 0
+    for test in (test_overview_matches_legacy, test_compliance_matches_legacy,
+                 test_predictive_matches_legacy, test_empty_database):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 70)
+    print("🎉 All analytics checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
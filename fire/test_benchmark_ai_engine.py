@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test the AI engine benchmark's fixtures, latency summary and baseline comparison
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+
+from benchmark_ai_engine import application_fixtures, compare_results, latency_summary, run_stage, write_document_images
+from compliance_scoring import compliance_features
+
+
+def test_fixtures_are_reproducible():
+    with tempfile.TemporaryDirectory() as directory:
+        documents = write_document_images(directory, 3, page_size=(400, 560))
+        assert len(documents) == 3
+        path, label = documents[0]
+        assert os.path.basename(path).startswith(label)
+        with Image.open(path) as page:
+            assert page.size == (400, 560)
+
+    applications = application_fixtures(5)
+    assert applications == application_fixtures(5)
+    assert all(len(compliance_features(application)) == 5 for application in applications)
+
+
+def test_latency_summary():
+    summary = latency_summary([0.001 * i for i in range(1, 101)], wall_seconds=2.0, errors=1)
+    assert summary['operations'] == 100 and summary['errors'] == 1
+    assert summary['throughput_per_second'] == 50.0
+    assert summary['p50_ms'] == 50.5 and summary['p99_ms'] == 99.01 and summary['max_ms'] == 100.0
+
+
+def test_run_stage_counts_error_results():
+    summary = run_stage(lambda n: {'error': 'odd'} if n % 2 else {'value': n}, list(range(10)), 2, 2)
+    assert summary['operations'] == 20 and summary['errors'] == 10
+    assert summary['p95_ms'] >= summary['p50_ms']
+
+
+def test_compare_flags_only_regressions_beyond_threshold():
+    baseline = {'results': [
+        {'stage': 'ocr', 'concurrency': 1, 'p95_ms': 100.0, 'throughput_per_second': 10.0},
+        {'stage': 'detection', 'concurrency': 4, 'p95_ms': 20.0, 'throughput_per_second': 200.0},
+        {'stage': 'compliance', 'skipped': 'compliance_analyzer not loaded'}
+    ]}
+    results = [
+        {'stage': 'ocr', 'concurrency': 1, 'p95_ms': 115.0, 'throughput_per_second': 9.0},
+        {'stage': 'detection', 'concurrency': 4, 'p95_ms': 30.0, 'throughput_per_second': 150.0},
+        {'stage': 'detection', 'concurrency': 8, 'p95_ms': 90.0, 'throughput_per_second': 1.0},
+        {'stage': 'compliance', 'concurrency': 1, 'p95_ms': 1.0, 'throughput_per_second': 1000.0}
+    ]
+    regressions = compare_results(results, baseline, max_regression=0.2)
+    assert regressions == [
+        ('detection', 4, 'p95_ms', 20.0, 30.0),
+        ('detection', 4, 'throughput_per_second', 200.0, 150.0)
+    ]
+
+
+if __name__ == "__main__":
+    print("🧪 Testing AI engine benchmark harness")
+    print("=" * 50)
+    failures = 0
+    for test in (test_fixtures_are_reproducible, test_latency_summary, test_run_stage_counts_error_results,
+                 test_compare_flags_only_regressions_beyond_threshold):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All benchmark harness checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
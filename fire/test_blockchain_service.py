@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Test the blockchain block log, snapshots, certificate/transaction indexes, Merkle batches,
+the background anchor queue and checkpointed validation
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import blockchain_service
+from blockchain_service import AnchorQueue, Blockchain, merkle_leaf, merkle_levels, merkle_proof, verify_merkle_proof
+
+
+def certificate_block(blockchain, transaction_id, certificate_hash):
+    return blockchain.add_block({
+        'transaction_id': transaction_id,
+        'certificate_data': {'certificate_hash': certificate_hash, 'business_name': f'Business {transaction_id}'},
+        'timestamp': 'now'
+    })
+
+
+def test_indexes_follow_add_block_and_survive_reload():
+    with tempfile.TemporaryDirectory() as directory:
+        blockchain = Blockchain(directory)
+        first = certificate_block(blockchain, 'tx-1', 'hash-1')
+        certificate_block(blockchain, 'tx-2', 'hash-2')
+        # A re-issued hash keeps pointing at the earliest block, as the linear scan did
+        certificate_block(blockchain, 'tx-3', 'hash-1')
+
+        assert blockchain.find_certificate('hash-1') is first
+        assert blockchain.find_transaction('tx-3').index == 3
+        assert blockchain.find_certificate('missing') is None and blockchain.find_transaction('missing') is None
+
+        reloaded = Blockchain(directory)
+        assert reloaded.certificate_index == {'hash-1': 1, 'hash-2': 2}
+        assert reloaded.transaction_index == {'tx-1': 1, 'tx-2': 2, 'tx-3': 3}
+        assert reloaded.is_chain_valid()
+
+
+def test_block_log_snapshots_and_recovery():
+    with tempfile.TemporaryDirectory() as directory:
+        blockchain = Blockchain(directory, snapshot_interval=3)
+        for i in range(1, 5):
+            certificate_block(blockchain, f'tx-{i}', f'hash-{i}')
+
+        # Genesis + 2 blocks went into the first snapshot, the last 2 are still in the log
+        with open(os.path.join(directory, blockchain_service.SNAPSHOT_FILE)) as f:
+            assert len(f.readlines()) == 3
+        with open(os.path.join(directory, blockchain_service.BLOCK_LOG_FILE)) as f:
+            assert [json.loads(line)['index'] for line in f] == [3, 4]
+
+        # A crash mid-append leaves a torn line; the block before it survives
+        log_file = os.path.join(directory, blockchain_service.BLOCK_LOG_FILE)
+        with open(log_file, 'a') as f:
+            f.write('{"index": 5, "timest')
+        torn_size = os.path.getsize(log_file)
+        reloaded = Blockchain(directory, snapshot_interval=3)
+        assert [block.index for block in reloaded.chain] == [0, 1, 2, 3, 4] and reloaded.is_chain_valid()
+        # Loading only reads; the writer cuts the torn line off when it next appends
+        assert os.path.getsize(log_file) == torn_size
+        certificate_block(reloaded, 'tx-5', 'hash-5')
+        assert [block.index for block in Blockchain(directory).chain] == [0, 1, 2, 3, 4, 5]
+
+
+def test_corrupt_block_record_fails_loudly():
+    with tempfile.TemporaryDirectory() as directory:
+        blockchain = Blockchain(directory)
+        for i in range(1, 4):
+            certificate_block(blockchain, f'tx-{i}', f'hash-{i}')
+        log_file = os.path.join(directory, blockchain_service.BLOCK_LOG_FILE)
+        with open(log_file, 'rb') as f:
+            lines = f.readlines()
+        lines[1] = b'{"index": 1, "garbage\n'
+        with open(log_file, 'wb') as f:
+            f.writelines(lines)
+
+        try:
+            Blockchain(directory)
+            assert False, 'a corrupt record in the middle of the log must not load'
+        except ValueError as e:
+            assert 'Corrupt block record' in str(e)
+        # Nothing after the bad record was dropped
+        with open(log_file, 'rb') as f:
+            assert f.readlines() == lines
+
+
+def test_legacy_chain_file_is_migrated():
+    with tempfile.TemporaryDirectory() as directory:
+        blockchain = Blockchain(directory)
+        certificate_block(blockchain, 'tx-1', 'hash-1')
+        with open(os.path.join(directory, blockchain_service.LEGACY_CHAIN_FILE), 'w') as f:
+            json.dump([block.to_dict() for block in blockchain.chain], f, indent=4)
+        os.remove(os.path.join(directory, blockchain_service.BLOCK_LOG_FILE))
+
+        migrated = Blockchain(directory)
+        assert [block.hash for block in migrated.chain] == [block.hash for block in blockchain.chain]
+        assert migrated.find_certificate('hash-1').index == 1
+        assert not os.path.exists(os.path.join(directory, blockchain_service.LEGACY_CHAIN_FILE))
+
+
+def test_verify_certificate_and_get_transaction():
+    with tempfile.TemporaryDirectory() as directory:
+        blockchain_service._blockchain = Blockchain(directory)
+        try:
+            transaction_id = blockchain_service.store_certificate({'certificate_hash': 'abc', 'business_name': 'Cafe'})
+            result = blockchain_service.verify_certificate('abc')
+            assert result['verified'] and result['block_index'] == 1
+            assert result['transaction_id'] == transaction_id
+            assert result['certificate_data']['business_name'] == 'Cafe'
+            assert blockchain_service.verify_certificate('unknown') == {'verified': False}
+
+            transaction = blockchain_service.get_transaction(transaction_id)
+            assert transaction['block_index'] == 1 and transaction['certificate_data']['certificate_hash'] == 'abc'
+            assert blockchain_service.get_transaction('unknown') is None
+        finally:
+            blockchain_service._blockchain = None
+
+
+def test_merkle_proofs_for_every_leaf():
+    for count in range(1, 10):
+        leaves = [merkle_leaf({'transaction_id': str(i)}) for i in range(count)]
+        levels = merkle_levels(leaves)
+        root = levels[-1][0]
+        for position, leaf in enumerate(leaves):
+            proof = merkle_proof(levels, position)
+            assert verify_merkle_proof(leaf, proof, root)
+            assert len(proof) <= (count - 1).bit_length()
+            assert not verify_merkle_proof(merkle_leaf({'transaction_id': 'forged'}), proof, root)
+
+
+def test_batched_certificates_verify_with_inclusion_proofs():
+    with tempfile.TemporaryDirectory() as directory:
+        blockchain_service._blockchain = Blockchain(directory)
+        blockchain_service._anchor_queue = queue = AnchorQueue(mode='batch', batch_size=3, interval=0)
+        try:
+            transaction_ids = [queue.submit({'certificate_hash': f'h{i}', 'business_name': f'B{i}'}) for i in range(5)]
+            # Nothing is mined on submit; the first flush commits one full batch of 3
+            assert len(blockchain_service._blockchain.chain) == 1
+            queue.flush()
+            assert len(blockchain_service._blockchain.chain) == 2
+            assert blockchain_service.verify_certificate('h4') == {'verified': False, 'pending': True}
+            assert blockchain_service.get_transaction(transaction_ids[4])['pending']
+            queue.flush()
+
+            for i in range(5):
+                result = blockchain_service.verify_certificate(f'h{i}')
+                assert result['verified'] and result['block_index'] == (1 if i < 3 else 2)
+                assert result['transaction_id'] == transaction_ids[i] and result['certificate_data']['business_name'] == f'B{i}'
+                proof = result['merkle_proof']
+                assert proof['leaf_hash'] == merkle_leaf({'transaction_id': transaction_ids[i],
+                                                          'certificate_data': result['certificate_data']})
+                assert verify_merkle_proof(proof['leaf_hash'], proof['path'], result['merkle_root'])
+            assert blockchain_service.get_transaction(transaction_ids[1])['certificate_data']['certificate_hash'] == 'h1'
+
+            reloaded = Blockchain(directory)
+            assert reloaded.is_chain_valid() and reloaded.leaf_index == blockchain_service._blockchain.leaf_index
+            reloaded.chain[1].certificates[0]['certificate_data']['business_name'] = 'Forged'
+            assert not reloaded.is_chain_valid()
+        finally:
+            blockchain_service._blockchain = None
+            blockchain_service._anchor_queue = None
+
+
+def test_anchor_thread_mines_submitted_certificates():
+    with tempfile.TemporaryDirectory() as directory:
+        blockchain_service._blockchain = Blockchain(directory)
+        blockchain_service._anchor_queue = queue = AnchorQueue(mode='block')
+        anchored = []
+        done = threading.Event()
+
+        def listener(block, entries):
+            anchored.append((block.index, [entry['transaction_id'] for entry in entries]))
+            if len(anchored) == 3:
+                done.set()
+
+        queue.listeners.append(listener)
+        try:
+            transaction_ids = [queue.submit({'certificate_hash': f'h{i}', 'business_name': f'B{i}'}) for i in range(3)]
+            # Returned before any mining: still pending
+            assert blockchain_service.get_transaction(transaction_ids[0])['pending']
+
+            queue.start()
+            assert done.wait(10), 'anchor thread did not mine the queued certificates'
+            assert anchored == [(i + 1, [transaction_ids[i]]) for i in range(3)]
+
+            # Same block layout as a synchronous store_certificate
+            block = blockchain_service._blockchain.chain[2]
+            assert block.certificates is None and block.data['transaction_id'] == transaction_ids[1]
+            assert blockchain_service.get_transaction(transaction_ids[1])['block_index'] == 2
+            assert blockchain_service.verify_certificate('h2')['verified']
+        finally:
+            queue.stop()
+            blockchain_service._blockchain = None
+            blockchain_service._anchor_queue = None
+
+
+def test_validation_resumes_from_checkpoint():
+    with tempfile.TemporaryDirectory() as directory:
+        blockchain = Blockchain(directory)
+        for i in range(1, 6):
+            certificate_block(blockchain, f'tx-{i}', f'hash-{i}')
+
+        report = blockchain.validate_chain()
+        assert report['valid'] and report['checked_from'] == 1 and report['blocks_checked'] == 5
+        assert not report['resumed_from_checkpoint']
+
+        certificate_block(blockchain, 'tx-6', 'hash-6')
+        report = Blockchain(directory).validate_chain()
+        assert report['valid'] and report['resumed_from_checkpoint'] and report['blocks_checked'] == 1
+
+        # A tampered new block fails the audit and leaves the checkpoint where it was
+        certificate_block(blockchain, 'tx-7', 'hash-7')
+        blockchain.chain[7].data['certificate_data']['business_name'] = 'Forged'
+        report = blockchain.validate_chain()
+        assert not report['valid'] and report['first_invalid_block'] == 7
+        assert blockchain.load_checkpoint()['index'] == 6
+
+        # Full revalidation in parallel chunks finds the same block
+        report = blockchain.validate_chain(full=True, workers=2)
+        assert not report['valid'] and report['first_invalid_block'] == 7 and report['checked_from'] == 1
+
+        # A checkpoint with a bad signature is ignored
+        with open(os.path.join(directory, blockchain_service.CHECKPOINT_FILE)) as f:
+            checkpoint = json.load(f)
+        checkpoint['index'] = 7
+        with open(os.path.join(directory, blockchain_service.CHECKPOINT_FILE), 'w') as f:
+            json.dump(checkpoint, f)
+        assert blockchain.load_checkpoint() is None
+
+
+if __name__ == "__main__":
+    print("🧪 Testing blockchain storage and indexes")
+    print("=" * 50)
+    failures = 0
+    for test in (test_indexes_follow_add_block_and_survive_reload, test_block_log_snapshots_and_recovery,
+                 test_corrupt_block_record_fails_loudly, test_legacy_chain_file_is_migrated,
+                 test_verify_certificate_and_get_transaction,
+                 test_merkle_proofs_for_every_leaf, test_batched_certificates_verify_with_inclusion_proofs,
+                 test_anchor_thread_mines_submitted_certificates, test_validation_resumes_from_checkpoint):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All blockchain checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
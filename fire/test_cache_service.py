@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test the analytics result cache: TTL expiry, single-flight coalescing and invalidation
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import mongomock
+from flask import Flask, jsonify, session
+
+from cache_service import InMemoryCacheBackend, InvalidatingCollection, MongoCacheBackend, ResultCache
+
+
+def test_ttl_expiry():
+    cache = ResultCache(InMemoryCacheBackend())
+    calls = []
+    compute = lambda: calls.append(1) or {'value': len(calls)}
+
+    assert cache.get_or_compute('analytics:a', compute, ttl=0.2) == {'value': 1}
+    assert cache.get_or_compute('analytics:a', compute, ttl=0.2) == {'value': 1}
+    time.sleep(0.25)
+    assert cache.get_or_compute('analytics:a', compute, ttl=0.2) == {'value': 2}
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+
+def test_concurrent_misses_compute_once():
+    cache = ResultCache(InMemoryCacheBackend())
+    calls = []
+    start = threading.Barrier(8)
+
+    def slow_compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'total': 42}
+
+    results = []
+
+    def worker():
+        start.wait()
+        results.append(cache.get_or_compute('analytics:overview', slow_compute, ttl=60))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{'total': 42}] * 8
+    assert cache.stats()['coalesced'] == 7
+
+
+def test_invalidation_by_prefix():
+    for backend in (InMemoryCacheBackend(), MongoCacheBackend(mongomock.MongoClient().db.cache_entries)):
+        cache = ResultCache(backend)
+        cache.get_or_compute('analytics:overview', lambda: {'v': 1}, ttl=60)
+        cache.get_or_compute('other:key', lambda: {'v': 1}, ttl=60)
+        cache.invalidate('analytics')
+        assert cache.get_or_compute('analytics:overview', lambda: {'v': 2}, ttl=60) == {'v': 2}
+        assert cache.get_or_compute('other:key', lambda: {'v': 3}, ttl=60) == {'v': 1}
+
+
+def test_cached_view_checks_role_and_skips_errors():
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    cache = ResultCache(InMemoryCacheBackend())
+    calls = []
+
+    @app.route('/login/<role>')
+    def login(role):
+        session['role'] = role
+        session['username'] = role + '_user'
+        return 'ok'
+
+    @app.route('/stats')
+    @cache.cached_json('analytics:stats', 60, roles=['admin'])
+    def stats():
+        if session.get('role') != 'admin':
+            return jsonify({'error': 'Unauthorized'}), 401
+        calls.append(1)
+        return jsonify({'count': len(calls)})
+
+    client = app.test_client()
+    client.get('/login/admin')
+    assert client.get('/stats').get_json() == {'count': 1}
+    assert client.get('/stats').get_json() == {'count': 1}
+
+    # A cached payload is never served to a user who fails the role check
+    other = app.test_client()
+    other.get('/login/user')
+    assert other.get('/stats').status_code == 401
+
+
+def test_collection_writes_invalidate_once_per_request():
+    app = Flask(__name__)
+    cache = ResultCache(InMemoryCacheBackend())
+    applications = InvalidatingCollection(mongomock.MongoClient().db.applications, cache, 'analytics')
+
+    @app.teardown_request
+    def flush(error=None):
+        cache.flush_request_invalidations()
+
+    @app.route('/approve', methods=['PUT'])
+    def approve():
+        applications.insert_one({'status': 'pending'})
+        applications.update_many({}, {'$set': {'status': 'approved'}})
+        return jsonify({'invalidations': cache.invalidations})
+
+    @app.route('/count')
+    def count():
+        return jsonify({'count': applications.count_documents({})})
+
+    cache.get_or_compute('analytics:overview', lambda: {'v': 1}, ttl=60)
+    with app.test_client() as client:
+        assert client.put('/approve').get_json() == {'invalidations': 0}
+        assert cache.invalidations == 1
+        client.get('/count')
+        assert cache.invalidations == 1
+    assert cache.get_or_compute('analytics:overview', lambda: {'v': 2}, ttl=60) == {'v': 2}
+
+    # Outside a request (background jobs) the write invalidates straight away
+    applications.delete_many({})
+    assert cache.invalidations == 2
+
+
+if __name__ == "__main__":
+    print("🧪 Testing analytics result cache")
+    print("=" * 50)
+    failures = 0
+    for test in (test_ttl_expiry, test_concurrent_misses_compute_once,
+                 test_invalidation_by_prefix, test_cached_view_checks_role_and_skips_errors,
+                 test_collection_writes_invalidate_once_per_request):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All cache checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
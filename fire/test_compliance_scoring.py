@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test vectorized portfolio compliance scoring against the original per-application math
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import mongomock
+import numpy as np
+
+from compliance_scoring import (
+    compliance_features, recommendation_codes, risk_levels, score_applications,
+    score_feature_matrix, RECOMMENDATION_SETS
+)
+
+
+class FakeModel:
+    """Stands in for the SVC: a fixed linear score, counting predict calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, features):
+        self.calls += 1
+        features = np.asarray(features)
+        return np.clip(40 + features[:, 2] * 5 + features[:, 3] * 8 - features[:, 0] / 500, 0, 100)
+
+
+class FakeAnalyzer:
+    version = 'test'
+
+    def __init__(self):
+        self.model = FakeModel()
+
+    def analyze_compliance_batch(self, features):
+        scores, levels, recommendations = score_feature_matrix(self.model, features)
+        return {'compliance_scores': scores, 'risk_levels': levels, 'recommendations': recommendations}
+
+
+class BulkResult:
+    def __init__(self, modified_count):
+        self.modified_count = modified_count
+
+
+def make_applications():
+    """mongomock's bulk_write doesn't accept current pymongo UpdateOne objects; replay them one by one"""
+    collection = mongomock.MongoClient().db.applications
+
+    def bulk_write(operations, ordered=True):
+        return BulkResult(sum(
+            collection.update_one(operation._filter, operation._doc).modified_count for operation in operations
+        ))
+
+    collection.bulk_write = bulk_write
+    return collection
+
+
+def scalar_recommendations(features, score):
+    """The per-application implementation the batch path replaces"""
+    recommendations = []
+    area, occupancy, extinguishers, exits, detectors = features
+    if extinguishers / (area / 1000) < 1:
+        recommendations.append("Install additional fire extinguishers")
+    if exits / (occupancy / 50) < 1:
+        recommendations.append("Add more emergency exits")
+    if detectors / (area / 500) < 1:
+        recommendations.append("Install more smoke detectors")
+    if score < 70:
+        recommendations.append("Immediate safety improvements required")
+    return recommendations
+
+
+def scalar_risk_level(score):
+    if score >= 90:
+        return "Low Risk"
+    elif score >= 70:
+        return "Medium Risk"
+    elif score >= 50:
+        return "High Risk"
+    return "Critical Risk"
+
+
+def test_features_read_form_fields_with_defaults():
+    assert compliance_features({'area_sqft': 1200, 'occupancy_count': 60, 'fire_extinguishers': 5,
+                                'emergency_exits': 2, 'smoke_detectors': 10}) == [1200, 60, 5, 2, 10]
+    # Submitted applications store form strings under different names
+    assert compliance_features({'building_area': '5000', 'max_occupancy': '120', 'fire_extinguishers': '8',
+                                'emergency_exits': 'Yes'}) == [5000.0, 120.0, 8.0, 1, 5]
+    assert compliance_features({}) == [1000, 50, 2, 1, 5]
+
+
+def test_vectorized_checks_match_scalar_math():
+    rng = np.random.default_rng(7)
+    features = np.column_stack([
+        rng.integers(200, 20000, 500), rng.integers(5, 500, 500), rng.integers(0, 30, 500),
+        rng.integers(0, 8, 500), rng.integers(0, 60, 500)
+    ]).astype(np.float64)
+    scores = rng.uniform(0, 100, 500)
+    scores[:4] = [90, 70, 50, 69.99]
+
+    codes = recommendation_codes(features, scores)
+    levels = risk_levels(scores)
+    for row, score, code, level in zip(features, scores, codes, levels):
+        assert RECOMMENDATION_SETS[code] == scalar_recommendations(row, score)
+        assert level == scalar_risk_level(score)
+
+
+def test_batch_scores_and_bulk_writes_certified_applications():
+    collection = make_applications()
+    collection.insert_many([
+        {'business_name': f'Business {i}', 'building_area': str(1000 + i * 10), 'max_occupancy': '80',
+         'fire_extinguishers': str(i % 6), 'emergency_exits': '2', 'certificate_number': f'NOC-{i}'}
+        for i in range(300)
+    ] + [{'business_name': 'Pending', 'building_area': '900'}])
+
+    analyzer = FakeAnalyzer()
+    stats = score_applications(analyzer, collection, 'certified', write_batch_size=128)
+
+    assert stats['success'] and stats['rows'] == 300 and stats['written'] == 300
+    assert analyzer.model.calls == 1
+    assert stats['rows_per_second'] > 0
+    assert collection.count_documents({'compliance_analysis': {'$exists': True}}) == 300
+    assert 'compliance_analysis' not in collection.find_one({'business_name': 'Pending'})
+
+    stored = collection.find_one({'business_name': 'Business 0'})['compliance_analysis']
+    expected_score = float(analyzer.model.predict([[1000, 80, 0, 2, 5]])[0])
+    assert stored['compliance_score'] == expected_score
+    assert stored['risk_level'] == scalar_risk_level(expected_score)
+    assert stored['recommendations'] == scalar_recommendations([1000, 80, 0, 2, 5], expected_score)
+    assert stored['model_version'] == 'test'
+
+
+def test_empty_portfolio():
+    collection = make_applications()
+    stats = score_applications(FakeAnalyzer(), collection, 'all')
+    assert stats['success'] and stats['rows'] == 0 and stats['written'] == 0
+
+
+if __name__ == "__main__":
+    print("🧪 Testing portfolio compliance scoring")
+    print("=" * 50)
+    failures = 0
+    for test in (test_features_read_form_fields_with_defaults, test_vectorized_checks_match_scalar_math,
+                 test_batch_scores_and_bulk_writes_certified_applications, test_empty_portfolio):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All compliance scoring checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
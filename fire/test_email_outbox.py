@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test the transactional email outbox: dedupe, delivery, retry/backoff and final failure
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import mongomock
+
+from email_outbox import EmailOutbox
+
+
+def make_outbox(deliver, **kwargs):
+    collection = mongomock.MongoClient().db.email_outbox
+    outbox = EmailOutbox(collection, deliver, **kwargs)
+    outbox.start = lambda: None  # drive process_one() by hand
+    return outbox, collection
+
+
+def test_identical_messages_are_deduplicated():
+    outbox, collection = make_outbox(lambda message: None)
+    assert outbox.enqueue('New Application', 'admin@example.com', 'body')
+    assert outbox.enqueue('New Application', 'admin@example.com', 'body')
+    assert outbox.enqueue('New Application', 'admin@example.com', 'other body')
+    assert collection.count_documents({}) == 2
+
+
+def test_dedupe_window_expires():
+    outbox, collection = make_outbox(lambda message: None, dedupe_window_seconds=60)
+    collection.create_index('dedupe_slot', unique=True, partialFilterExpression={'dedupe_slot': {'$exists': True}})
+    outbox.enqueue('Subject', 'user@example.com', 'body')
+    collection.update_many({}, {'$set': {'created_at': datetime.now() - timedelta(minutes=5)}})
+    outbox.enqueue('Subject', 'user@example.com', 'body')
+    assert collection.count_documents({}) == 2
+    assert collection.count_documents({'dedupe_slot': {'$exists': True}}) == 1
+
+
+def test_racing_enqueue_is_suppressed_by_unique_slot():
+    outbox, collection = make_outbox(lambda message: None)
+    collection.create_index('dedupe_slot', unique=True, partialFilterExpression={'dedupe_slot': {'$exists': True}})
+
+    class RacingCollection:
+        """Another web worker inserts the same message just before our upsert"""
+        def __getattr__(self, name):
+            return getattr(collection, name)
+
+        def update_one(self, query, update, upsert=False):
+            if not upsert:
+                return collection.update_one(query, update)
+            collection.insert_one(dict(update['$setOnInsert'], _id='other-worker'))
+            return collection.update_one({'dedupe_slot': query['dedupe_slot'], 'status': 'never'}, update, upsert=upsert)
+
+    outbox.collection = RacingCollection()
+    assert outbox.enqueue('Subject', 'user@example.com', 'body')
+    assert collection.count_documents({}) == 1
+
+
+def test_start_ensures_dedupe_index():
+    collection = mongomock.MongoClient().db.email_outbox
+    outbox = EmailOutbox(collection, lambda message: None, workers=1)
+    outbox.start()
+    outbox.stop()
+    assert collection.index_information()['dedupe_slot_unique']['unique']
+
+    class NoIndexCollection:
+        def __getattr__(self, name):
+            return getattr(collection, name)
+
+        def create_index(self, *args, **kwargs):
+            raise RuntimeError('not authorized')
+
+    outbox = EmailOutbox(NoIndexCollection(), lambda message: None, workers=1)
+    outbox.start()
+    assert outbox._threads == []
+
+
+def test_delivery_marks_sent():
+    delivered = []
+    outbox, collection = make_outbox(delivered.append)
+    outbox.enqueue('Subject', 'user@example.com', 'body', '<p>body</p>',
+                   [{'filename': 'report.pdf', 'data': b'%PDF'}], default_content_type='application/pdf')
+
+    assert outbox.process_one()
+    assert not outbox.process_one()
+    assert delivered[0]['attachments'][0]['content_type'] == 'application/pdf'
+    message = collection.find_one()
+    assert message['status'] == 'sent' and message['attempts'] == 1
+    assert 'attachments' not in message
+
+
+def test_retry_with_backoff_then_fail():
+    def failing(message):
+        raise ConnectionError('SMTP relay unavailable')
+
+    outbox, collection = make_outbox(failing, max_attempts=3, backoff_seconds=30)
+    outbox.enqueue('Subject', 'user@example.com', 'body')
+
+    assert outbox.process_one()
+    message = collection.find_one()
+    assert message['status'] == 'retry'
+    assert message['next_attempt_at'] > datetime.now() + timedelta(seconds=25)
+    assert 'SMTP relay unavailable' in message['last_error']
+
+    # Not due yet
+    assert not outbox.process_one()
+
+    for _ in range(2):
+        collection.update_many({}, {'$set': {'next_attempt_at': datetime.now()}})
+        assert outbox.process_one()
+
+    message = collection.find_one()
+    assert message['status'] == 'failed' and message['attempts'] == 3
+    assert outbox.status_counts()['failed'] == 1
+
+
+def test_batch_delivery_records_each_message():
+    batches = []
+
+    def deliver_batch(messages):
+        batches.append([message['recipient'] for message in messages])
+        return [None if message['recipient'] != 'bounce@example.com' else ConnectionError('refused')
+                for message in messages]
+
+    outbox, collection = make_outbox(None, deliver_batch=deliver_batch, batch_size=2)
+    for recipient in ('a@example.com', 'bounce@example.com', 'c@example.com'):
+        outbox.enqueue('Certificate Issued', recipient, 'body')
+
+    assert outbox.process_batch()
+    assert outbox.process_batch()
+    assert not outbox.process_batch()
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert outbox.status_counts()['sent'] == 2
+    assert collection.find_one({'recipient': 'bounce@example.com'})['status'] == 'retry'
+
+
+if __name__ == "__main__":
+    print("🧪 Testing email outbox")
+    print("=" * 50)
+    failures = 0
+    for test in (test_identical_messages_are_deduplicated, test_dedupe_window_expires,
+                 test_racing_enqueue_is_suppressed_by_unique_slot, test_start_ensures_dedupe_index,
+                 test_delivery_marks_sent, test_retry_with_backoff_then_fail,
+                 test_batch_delivery_records_each_message):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All outbox checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
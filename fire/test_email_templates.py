@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test the precompiled email templates against the golden test_email_*.html outputs
+and check render throughput
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask_mail import Mail
+
+from email_service import EmailService, get_email_environment
+
+FIXTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_TIMESTAMP = '2025-05-25 17:00:36'
+
+# Same data test_email_system.py used to generate the fixtures, with its datetime.now() fields pinned
+TEMPLATE_DATA = {
+    'application_received': {
+        'template_type': 'application_received',
+        'business_name': 'Test Restaurant',
+        'business_type': 'Restaurant',
+        'applicant_name': 'John Doe',
+        'application_id': 'APP123456',
+        'submission_date': FIXTURE_TIMESTAMP,
+        'dashboard_url': 'http://localhost:5000/manager_dashboard',
+        'plain_text': 'New NOC application received from Test Restaurant'
+    },
+    'inspection_scheduled': {
+        'template_type': 'inspection_scheduled',
+        'user_name': 'John Doe',
+        'business_name': 'Test Restaurant',
+        'inspector_name': 'Inspector Smith',
+        'inspection_date': '2024-01-15',
+        'application_id': 'APP123456',
+        'application_url': 'http://localhost:5000/view_application/APP123456',
+        'plain_text': 'Inspection scheduled for Test Restaurant'
+    },
+    'inspector_assignment': {
+        'template_type': 'inspector_assignment',
+        'inspector_name': 'Inspector Smith',
+        'business_name': 'Test Restaurant',
+        'business_address': '123 Main St, City',
+        'business_type': 'Restaurant',
+        'inspection_date': '2024-01-15',
+        'application_id': 'APP123456',
+        'assigned_by': 'Manager',
+        'inspector_dashboard_url': 'http://localhost:5000/inspector_dashboard',
+        'plain_text': 'You have been assigned to inspect Test Restaurant'
+    },
+    'inspection_started': {
+        'template_type': 'inspection_started',
+        'user_name': 'John Doe',
+        'business_name': 'Test Restaurant',
+        'inspector_name': 'Inspector Smith',
+        'start_time': FIXTURE_TIMESTAMP,
+        'application_id': 'APP123456',
+        'application_url': 'http://localhost:5000/view_application/APP123456',
+        'plain_text': 'Inspection has started for Test Restaurant'
+    },
+    'inspection_completed': {
+        'template_type': 'inspection_completed',
+        'user_name': 'John Doe',
+        'business_name': 'Test Restaurant',
+        'inspector_name': 'Inspector Smith',
+        'completion_time': FIXTURE_TIMESTAMP,
+        'compliance_score': '95',
+        'overall_result': 'Approved',
+        'report_number': 'RPT-20240115-123456',
+        'application_id': 'APP123456',
+        'application_url': 'http://localhost:5000/view_application/APP123456',
+        'plain_text': 'Inspection completed for Test Restaurant'
+    },
+    'manager_approval': {
+        'template_type': 'manager_approval',
+        'business_name': 'Test Restaurant',
+        'inspector_name': 'Inspector Smith',
+        'completion_date': FIXTURE_TIMESTAMP,
+        'compliance_score': '95',
+        'recommendation': 'Approved',
+        'application_id': 'APP123456',
+        'key_findings': [
+            'Fire extinguishers properly installed',
+            'Emergency exits clearly marked',
+            'Smoke detectors functional',
+            'Fire safety training completed'
+        ],
+        'manager_dashboard_url': 'http://localhost:5000/manager_dashboard',
+        'plain_text': 'Inspection completed for Test Restaurant and requires your approval'
+    },
+    'certificate_issued': {
+        'template_type': 'certificate_issued',
+        'user_name': 'John Doe',
+        'business_name': 'Test Restaurant',
+        'certificate_number': 'NOC-20240115-123456',
+        'issue_date': FIXTURE_TIMESTAMP[:10],
+        'valid_until': '2025-01-15',
+        'approved_by': 'Manager',
+        'certificate_url': 'http://localhost:5000/view_certificate/APP123456',
+        'plain_text': 'NOC Certificate issued for Test Restaurant'
+    }
+}
+
+
+def make_service():
+    app = Flask(__name__)
+    app.config['MAIL_USERNAME'] = 'test@firenoc.gov.in'
+    return EmailService(Mail(app), app.config)
+
+
+def load_fixture(template_type):
+    with open(os.path.join(FIXTURE_DIR, f'test_email_{template_type}.html'), encoding='utf-8', newline='') as f:
+        golden = f.read().replace('\r\n', '\n')
+    # The fixtures were written with datetime.now(); pin every timestamp to one value
+    golden = re.sub(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', FIXTURE_TIMESTAMP, golden)
+    return re.sub(r'(Issue Date:</th><td>)\d{4}-\d{2}-\d{2}', r'\g<1>' + FIXTURE_TIMESTAMP[:10], golden)
+
+
+def test_templates_match_golden_fixtures():
+    service = make_service()
+    for template_type, data in TEMPLATE_DATA.items():
+        assert service.generate_html_template(data) == load_fixture(template_type), template_type
+
+
+def test_default_template_and_missing_fields():
+    service = make_service()
+    html = service.generate_html_template({'title': 'Hello', 'message': 'Body text'})
+    assert '<title>Hello</title>' in html and '<h2>Hello</h2>' in html
+    assert '<p>Body text</p>' in html and 'View Details' in html
+
+    html = service.generate_html_template({'template_type': 'manager_approval', 'key_findings': [str(i) for i in range(7)]})
+    assert '<td>N/A</td>' in html
+    assert html.count('<li>') == 6 and '...and more (see full report)' in html
+
+
+def test_templates_compiled_once():
+    first = get_email_environment()
+    make_service().generate_html_template(TEMPLATE_DATA['certificate_issued'])
+    assert get_email_environment() is first
+    assert make_service().get_email_css() is first.globals['email_css']
+
+
+def test_render_throughput():
+    service = make_service()
+    renders = 2000
+    started = time.perf_counter()
+    for i in range(renders):
+        service.generate_html_template(TEMPLATE_DATA['manager_approval'])
+    elapsed = time.perf_counter() - started
+    rate = renders / elapsed
+    print(f"   📈 {rate:,.0f} renders/s ({elapsed / renders * 1e6:.0f} µs per email)")
+    assert rate > 500
+
+
+if __name__ == "__main__":
+    print("🧪 Testing precompiled email templates")
+    print("=" * 50)
+    failures = 0
+    for test in (test_templates_match_golden_fixtures, test_default_template_and_missing_fields,
+                 test_templates_compiled_once, test_render_throughput):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All email template checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test single-decode image preprocessing: reduced JPEG decode, OCR binarization and CNN input
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from PIL import Image
+
+from image_preprocessing import load_cnn_input, preprocess_document
+
+
+def save(directory, name, image, **options):
+    path = os.path.join(directory, name)
+    image.save(path, **options)
+    return path
+
+
+def test_large_jpeg_is_decoded_reduced():
+    with tempfile.TemporaryDirectory() as directory:
+        path = save(directory, 'phone.jpg', Image.new('RGB', (4000, 3000), (200, 30, 10)), quality=90)
+        result = preprocess_document(path, max_side=2048)
+
+        assert result.original_size == (4000, 3000)
+        assert result.decoded_size == (2000, 1500)  # DCT scale 1/2, no full-resolution buffer
+        assert result.ocr_image.mode == '1' and result.ocr_image.size == (2000, 1500)
+        assert result.cnn_input.shape == (224, 224, 3) and result.cnn_input.dtype == np.float32
+
+
+def test_cnn_input_is_normalized_bgr():
+    with tempfile.TemporaryDirectory() as directory:
+        path = save(directory, 'red.png', Image.new('RGB', (640, 480), (255, 0, 0)))
+        array = load_cnn_input(path)
+        # Same layout as cv2.imread(...)/255.0: blue, green, red
+        assert np.allclose(array[0, 0], [0.0, 0.0, 1.0])
+        assert array.max() <= 1.0 and array.min() >= 0.0
+
+
+def test_ocr_binarization_matches_previous_threshold():
+    with tempfile.TemporaryDirectory() as directory:
+        gray = np.tile(np.arange(256, dtype=np.uint8), (16, 1))
+        path = save(directory, 'ramp.png', Image.fromarray(gray).convert('RGB'))
+        ocr = np.asarray(preprocess_document(path).ocr_image)
+
+        expected = Image.open(path).convert('L').point(lambda x: 0 if x < 128 else 255, '1')
+        assert np.array_equal(ocr, np.asarray(expected))
+
+
+def test_exif_orientation_is_applied():
+    with tempfile.TemporaryDirectory() as directory:
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotate 90 CW on display
+        path = save(directory, 'rotated.jpg', Image.new('RGB', (300, 200)), exif=exif.tobytes())
+        assert preprocess_document(path).decoded_size == (200, 300)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing image preprocessing")
+    print("=" * 50)
+    failures = 0
+    for test in (test_large_jpeg_is_decoded_reduced, test_cnn_input_is_normalized_bgr,
+                 test_ocr_binarization_matches_previous_threshold, test_exif_orientation_is_applied):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All preprocessing checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test incremental classifier training: watermark streaming, batching and versioning
+"""
+
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import mongomock
+from bson import ObjectId
+
+from incremental_training import DOCUMENT_LABELS, document_label, incremental_train, iter_training_batches, training_texts
+from model_registry import ModelRegistry
+
+START = datetime(2026, 1, 1, 9, 0, 0)
+
+
+class FakeClassifier:
+    """Stands in for DocumentClassifier(backend='hashing'): records partial_fit calls"""
+
+    backend = 'hashing'
+    registry_name = 'document_classifier_hashing'
+    saves = 0
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.model = None
+        self.version = None
+        self.fitted = []
+
+    def create_training_data(self):
+        return [('fire safety certificate', 'safety_certificate'), ('fire insurance policy', 'insurance')]
+
+    def load_model(self):
+        try:
+            self.version = self.registry.resolve(self.registry_name)['version']
+        except Exception:
+            return False
+        self.model = SimpleNamespace(classes_=list(DOCUMENT_LABELS))
+        return True
+
+    def partial_fit(self, texts, labels, classes=None):
+        if self.model is None:
+            self.model = SimpleNamespace(classes_=list(classes))
+        self.fitted.append(list(labels))
+
+    def save_model(self, metadata):
+        with open(self.registry.path('document_classifier_hashing.pkl'), 'w') as f:
+            json.dump(self.fitted, f)
+        # Distinct versions even when saved within the same second
+        FakeClassifier.saves += 1
+        entry = self.registry.register(self.registry_name, ['document_classifier_hashing.pkl'],
+                                       version=f'v{FakeClassifier.saves}', metadata=metadata)
+        self.version = entry['version']
+        return entry
+
+
+def verified_application(collection, minutes, documents, verified=True, _id=None):
+    results = [{'document': doc_type, 'status': 'verified', 'predicted_type': document_label(doc_type),
+                'extracted_text_preview': text[:20] + '...'}
+               for doc_type, text in documents]
+    texts = training_texts(results, [{'extracted_text': text} for _, text in documents], range(len(documents)))
+    application = {
+        'documents_verified': verified,
+        'verified_at': START + timedelta(minutes=minutes),
+        'document_verification': {'results': results, 'extracted_texts': texts,
+                                  'verification_method': 'machine_learning'}
+    }
+    if _id is not None:
+        application['_id'] = _id
+    collection.insert_one(application)
+    return application['_id']
+
+
+def test_batches_follow_verified_at_and_end_on_application_boundaries():
+    applications = mongomock.MongoClient().db.applications
+    verified_application(applications, 3, [('Insurance Document', 'fire insurance policy premium')])
+    first = verified_application(applications, 1, [('Building Plan', 'floor plan elevation'),
+                                                   ('Safety Certificate', 'fire safety certificate'),
+                                                   ('Unknown', 'ignored')])
+    verified_application(applications, 2, [('Building Plan', 'site plan')], verified=False)
+    # Older verification without full texts: the preview is used
+    applications.insert_one({
+        'documents_verified': True, 'verified_at': START + timedelta(minutes=4),
+        'document_verification': {'verification_method': 'machine_learning',
+                                  'results': [{'document': 'Business License', 'status': 'verified',
+                                               'predicted_type': 'business_license',
+                                               'extracted_text_preview': 'trade license...'},
+                                              {'document': 'Building Plan', 'status': 'failed', 'reason': 'File not found'}]}
+    })
+
+    batches = list(iter_training_batches(applications, batch_size=2))
+    assert [labels for _, labels, _ in batches] == [['building_plan', 'safety_certificate'], ['insurance', 'business_license']]
+    assert batches[0][0] == ['floor plan elevation', 'fire safety certificate']
+    assert batches[1][0][1] == 'trade license'
+    assert batches[0][2] == (START + timedelta(minutes=1), first)
+
+    # Resuming from the first batch's watermark skips everything up to it
+    assert [labels for _, labels, _ in iter_training_batches(applications, batches[0][2])] == [['insurance', 'business_license']]
+
+
+def test_only_verified_documents_are_trained_on():
+    applications = mongomock.MongoClient().db.applications
+    documents = [('Building Plan', 'floor plan elevation'), ('Safety Certificate', 'restaurant menu'),
+                 ('Insurance Document', 'blurry scan')]
+    _id = verified_application(applications, 1, documents)
+    # The AI was unsure about the second document and rejected the third
+    applications.update_one({'_id': _id}, {'$set': {
+        'document_verification.results.1.status': 'needs_review',
+        'document_verification.results.2.status': 'failed'
+    }})
+
+    batches = list(iter_training_batches(applications))
+    assert [(texts, labels) for texts, labels, _ in batches] == [(['floor plan elevation'], ['building_plan'])]
+
+
+def test_basic_verifications_and_disagreeing_predictions_are_skipped():
+    applications = mongomock.MongoClient().db.applications
+    verified_application(applications, 1, [('Building Plan', 'floor plan elevation'),
+                                           ('Insurance Document', 'trade license municipal corporation')])
+    applications.update_one({}, {'$set': {'document_verification.results.1.predicted_type': 'business_license'}})
+    # The AI engine was down: basic verification stored its placeholder text
+    _id = verified_application(applications, 2, [('Safety Certificate', 'Document verified: Safety Certificate')])
+    applications.update_one({'_id': _id}, {'$set': {'document_verification.verification_method': 'basic'}})
+
+    batches = list(iter_training_batches(applications))
+    assert [(texts, labels) for texts, labels, _ in batches] == [(['floor plan elevation'], ['building_plan'])]
+
+
+def test_ties_on_verified_at_are_broken_by_id():
+    applications = mongomock.MongoClient().db.applications
+    ids = sorted(ObjectId() for _ in range(3))
+    for _id, doc_type in zip(ids, ('Building Plan', 'Insurance Document', 'Safety Certificate')):
+        verified_application(applications, 5, [(doc_type, f'{doc_type} text')], _id=_id)
+
+    (_, labels, watermark), = iter_training_batches(applications, (START + timedelta(minutes=5), ids[0]))
+    assert labels == ['insurance', 'safety_certificate'] and watermark[1] == ids[2]
+
+
+def test_runs_publish_versions_and_only_train_on_new_documents():
+    applications = mongomock.MongoClient().db.applications
+    with tempfile.TemporaryDirectory() as directory:
+        registry = ModelRegistry(directory)
+
+        # Cold start: seeded from the built-in examples, published without a watermark
+        classifier = FakeClassifier(registry)
+        stats = incremental_train(classifier, applications)
+        assert stats['published'] and stats['base_version'] is None and stats['watermark'] is None
+        assert set(classifier.model.classes_) == set(DOCUMENT_LABELS)
+        first_version = stats['version']
+
+        verified_application(applications, 1, [('Building Plan', 'floor plan'), ('Insurance Document', 'premium')])
+        verified_application(applications, 2, [('PAN Card', 'income tax department')])
+        classifier = FakeClassifier(registry)
+        stats = incremental_train(classifier, applications, batch_size=2)
+        assert classifier.fitted == [['building_plan', 'insurance'], ['pan']]
+        assert stats['base_version'] == first_version and stats['documents'] == 3 and stats['batches'] == 2
+        assert stats['watermark']['verified_at'] == (START + timedelta(minutes=2)).isoformat()
+        metadata = registry.load_manifest()['models']['document_classifier_hashing']['metadata']
+        assert metadata['documents_trained'] == 3 and metadata['base_version'] == first_version
+
+        # Nothing new: no new version
+        classifier = FakeClassifier(registry)
+        stats = incremental_train(classifier, applications)
+        assert not stats['published'] and classifier.fitted == [] and stats['documents_trained'] == 3
+
+        verified_application(applications, 3, [('Safety Certificate', 'fire noc certificate')])
+        classifier = FakeClassifier(registry)
+        stats = incremental_train(classifier, applications)
+        assert classifier.fitted == [['safety_certificate']] and stats['documents_trained'] == 4
+
+
+def test_forest_backend_is_rejected():
+    classifier = FakeClassifier(ModelRegistry(tempfile.gettempdir()))
+    classifier.backend = 'forest'
+    try:
+        incremental_train(classifier, mongomock.MongoClient().db.applications)
+    except ValueError as e:
+        assert 'hashing' in str(e)
+    else:
+        raise AssertionError('the forest backend cannot be trained incrementally')
+
+
+if __name__ == "__main__":
+    print("🧪 Testing incremental classifier training")
+    print("=" * 50)
+    failures = 0
+    for test in (test_batches_follow_verified_at_and_end_on_application_boundaries,
+                 test_only_verified_documents_are_trained_on, test_basic_verifications_and_disagreeing_predictions_are_skipped,
+                 test_ties_on_verified_at_are_broken_by_id,
+                 test_runs_publish_versions_and_only_train_on_new_documents, test_forest_backend_is_rejected):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All incremental training checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
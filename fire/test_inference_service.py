@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test the inference job queue and worker job handling with a fake engine
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import mongomock
+import mongomock.gridfs
+
+from inference_service import InferenceJobQueue, process_one
+
+
+class FakeEngine:
+    def __init__(self, degraded=()):
+        self.degraded = list(degraded)
+        self.document_classifier = SimpleNamespace(registry_name='document_classifier')
+
+    def refresh_document_classifier(self):
+        return False
+
+    def degraded_models(self):
+        return self.degraded
+
+    def model_versions(self):
+        return {'document_classifier': None if self.degraded else '1.0'}
+
+    def analyze_documents(self, file_paths):
+        return [{'extracted_text': path} for path in file_paths], {'documents': len(file_paths)}
+
+
+mongomock.gridfs.enable_gridfs_integration()
+
+
+def make_queue(**kwargs):
+    # Paths in these tests are only labels; staging through GridFS is tested on its own
+    kwargs.setdefault('stage_files', False)
+    return InferenceJobQueue(mongomock.MongoClient().db.inference_jobs, **kwargs)
+
+
+def test_jobs_run_in_submission_order():
+    queue = make_queue()
+    first = queue.submit('analyze_documents', {'file_paths': ['a.jpg']}, purpose='document_verification', owner='admin')
+    second = queue.submit('analyze_documents', {'file_paths': ['b.jpg', 'c.jpg']})
+
+    assert queue.status(second)['queue_position'] == 1
+    assert process_one(queue, FakeEngine(), 'worker-0')
+    assert queue.status(first)['status'] == 'completed'
+    assert queue.status(second)['status'] == 'queued'
+
+    assert process_one(queue, FakeEngine(), 'worker-0')
+    assert not process_one(queue, FakeEngine(), 'worker-0')
+    job = queue.get(second)
+    assert job['result']['results'] == [{'extracted_text': 'b.jpg'}, {'extracted_text': 'c.jpg'}]
+    assert job['result']['stage_timings'] == {'documents': 2}
+
+
+def test_finished_jobs_are_claimed_once_and_ready_after_outcome():
+    queue = make_queue()
+    job_id = queue.submit('analyze_documents', {'file_paths': ['a.jpg']}, context={'application_id': 'app-1'})
+    assert queue.claim_finished() is None
+
+    process_one(queue, FakeEngine(), 'worker-0')
+    job = queue.claim_finished()
+    assert str(job['_id']) == job_id and job['context'] == {'application_id': 'app-1'}
+    assert queue.claim_finished() is None
+    assert not queue.status(job_id)['ready']
+
+    queue.set_outcome(job_id, {'success': True})
+    assert queue.status(job_id)['ready']
+
+
+def test_degraded_engine_and_unknown_kind():
+    queue = make_queue()
+    degraded = queue.submit('analyze_documents', {'file_paths': ['a.jpg']})
+    unknown = queue.submit('summarize', {})
+    process_one(queue, FakeEngine(degraded=['document_classifier']), 'worker-0')
+    process_one(queue, FakeEngine(), 'worker-0')
+
+    assert queue.get(degraded)['result']['degraded'] is True
+    assert queue.status(unknown)['status'] == 'failed'
+    assert 'Unknown inference job kind' in queue.status(unknown)['error']
+    assert queue.status_counts() == {'queued': 0, 'running': 0, 'completed': 1, 'failed': 1}
+    assert queue.status('not-an-id') is None
+
+
+def test_published_classifier_is_picked_up_before_analysis():
+    class RetrainedEngine(FakeEngine):
+        """The forest classifier never loaded; incremental training has since published a hashing one"""
+        def refresh_document_classifier(self):
+            self.document_classifier = SimpleNamespace(registry_name='document_classifier_hashing')
+            return True
+
+    queue = make_queue()
+    job_id = queue.submit('analyze_documents', {'file_paths': ['a.jpg']})
+    process_one(queue, RetrainedEngine(degraded=['document_classifier']), 'worker-0')
+    assert 'degraded' not in queue.get(job_id)['result']
+
+
+def test_stale_running_job_is_reclaimed():
+    queue = make_queue(stale_after_seconds=60)
+    job_id = queue.submit('analyze_documents', {'file_paths': ['a.jpg']})
+    assert queue.claim_next('worker-0')['worker'] == 'worker-0'
+    assert queue.claim_next('worker-1') is None
+
+    queue.collection.update_many({}, {'$set': {'started_at': datetime.now() - timedelta(minutes=5)}})
+    job = queue.claim_next('worker-1')
+    assert str(job['_id']) == job_id and job['attempts'] == 2
+
+
+def test_job_is_failed_after_max_attempts():
+    queue = make_queue(stale_after_seconds=60, max_attempts=2)
+    job_id = queue.submit('analyze_documents', {'file_paths': ['crashes-the-worker.jpg']})
+    for attempt in (1, 2):
+        assert queue.claim_next(f'worker-{attempt}')['attempts'] == attempt
+        queue.collection.update_many({}, {'$set': {'started_at': datetime.now() - timedelta(minutes=5)}})
+
+    assert queue.claim_next('worker-3') is None
+    job = queue.get(job_id)
+    assert job['status'] == 'failed' and job['attempts'] == 2 and 'attempts' in job['error']
+    # The app still gets to apply the failure
+    assert str(queue.claim_finished()['_id']) == job_id
+
+
+def test_progress_reports_are_pushed_once():
+    queue = make_queue()
+    job_id = queue.submit('analyze_video', {'video_path': 'site.mp4'}, context={'filename': 'site.mp4'}, owner='inspector1')
+    job = queue.claim_next('worker-0')
+    queue.report_progress(job['_id'], {'frames_analyzed': 16, 'percent': 25})
+    queue.report_progress(job['_id'], {'frames_analyzed': 32, 'percent': 50})
+
+    progressed = queue.claim_progress()
+    assert str(progressed['_id']) == job_id and progressed['progress']['percent'] == 50
+    assert progressed['context'] == {'filename': 'site.mp4'} and progressed['owner'] == 'inspector1'
+    assert queue.claim_progress() is None
+    assert queue.status(job_id)['progress']['frames_analyzed'] == 32
+
+    # Late reports after the job finished are dropped
+    queue.complete(job['_id'], {'frames_analyzed': 64})
+    queue.report_progress(job['_id'], {'frames_analyzed': 48, 'percent': 75})
+    assert queue.claim_progress() is None
+
+
+def test_files_reach_the_worker_through_gridfs():
+    queue = make_queue(stage_files=True)
+    with tempfile.TemporaryDirectory() as upload_folder:
+        paths = []
+        for name, data in (('license.jpg', b'first'), ('permit.jpg', b'second')):
+            paths.append(os.path.join(upload_folder, name))
+            with open(paths[-1], 'wb') as f:
+                f.write(data)
+        job_id = queue.submit('analyze_documents', {'file_paths': paths})
+
+    # The web server's copies are gone; the worker reads its own
+    class ReadingEngine(FakeEngine):
+        def analyze_documents(self, file_paths):
+            contents = []
+            for path in file_paths:
+                with open(path, 'rb') as f:
+                    contents.append({'extracted_text': f.read().decode()})
+            return contents, {}
+
+    assert process_one(queue, ReadingEngine(), 'worker-0')
+    job = queue.get(job_id)
+    assert job['result']['results'] == [{'extracted_text': 'first'}, {'extracted_text': 'second'}]
+    assert job['payload']['file_paths'] == paths
+
+    file_ids = job['payload']['staged_files']['file_paths']
+    assert all(queue.files.exists(file_id) for file_id in file_ids)
+    queue.release_files(job)
+    assert not any(queue.files.exists(file_id) for file_id in file_ids)
+
+
+def test_workers_alive_follows_heartbeats():
+    queue = make_queue(heartbeat_timeout=60, worker_check_interval=0)
+    assert not queue.workers_alive()
+    queue.heartbeat('worker-0')
+    assert queue.workers_alive()
+    queue.workers.update_many({}, {'$set': {'last_seen': datetime.now() - timedelta(minutes=5)}})
+    assert not queue.workers_alive()
+
+
+if __name__ == "__main__":
+    print("🧪 Testing inference job queue")
+    print("=" * 50)
+    failures = 0
+    for test in (test_jobs_run_in_submission_order, test_finished_jobs_are_claimed_once_and_ready_after_outcome,
+                 test_degraded_engine_and_unknown_kind, test_published_classifier_is_picked_up_before_analysis,
+                 test_stale_running_job_is_reclaimed,
+                 test_job_is_failed_after_max_attempts, test_progress_reports_are_pushed_once,
+                 test_files_reach_the_worker_through_gridfs, test_workers_alive_follows_heartbeats):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All inference queue checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test the model registry: manifest versions, checksum verification and degraded status
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from model_registry import ModelRegistry, ModelUnavailable
+
+
+def write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def test_register_and_resolve():
+    with tempfile.TemporaryDirectory() as models_dir:
+        registry = ModelRegistry(models_dir)
+        write(registry.path('compliance_analyzer.pkl'), b'model bytes')
+        registry.register('compliance_analyzer', ['compliance_analyzer.pkl'], version='2024.1')
+
+        entry = ModelRegistry(models_dir).resolve('compliance_analyzer')
+        assert entry['version'] == '2024.1'
+        assert entry['paths']['compliance_analyzer.pkl'] == registry.path('compliance_analyzer.pkl')
+
+
+def test_unregistered_missing_and_tampered_models_are_unavailable():
+    with tempfile.TemporaryDirectory() as models_dir:
+        registry = ModelRegistry(models_dir)
+        write(registry.path('safety_detector.h5'), b'weights')
+        registry.register('safety_detector', ['safety_detector.h5'])
+
+        try:
+            registry.resolve('document_classifier')
+            assert False, 'resolved an unregistered model'
+        except ModelUnavailable as e:
+            assert 'not registered' in str(e)
+
+        write(registry.path('safety_detector.h5'), b'other weights')
+        try:
+            registry.resolve('safety_detector')
+            assert False, 'resolved a tampered artifact'
+        except ModelUnavailable as e:
+            assert 'checksum mismatch' in str(e)
+
+        os.remove(registry.path('safety_detector.h5'))
+        try:
+            registry.resolve('safety_detector')
+            assert False, 'resolved a missing artifact'
+        except ModelUnavailable as e:
+            assert 'missing' in str(e)
+
+
+def test_status_reports_loaded_and_degraded_models():
+    with tempfile.TemporaryDirectory() as models_dir:
+        registry = ModelRegistry(models_dir)
+        write(registry.path('document_classifier.pkl'), b'clf')
+        registry.register('document_classifier', ['document_classifier.pkl'], version='1.0')
+        registry.mark_loaded('document_classifier', '1.0')
+        registry.mark_unavailable('safety_detector', ModelUnavailable('safety_detector is not registered'))
+
+        status = registry.status()
+        assert status['document_classifier']['loaded_version'] == '1.0'
+        assert status['document_classifier']['registered_version'] == '1.0'
+        assert status['safety_detector']['loaded_version'] is None
+        assert 'not registered' in status['safety_detector']['error']
+        assert registry.loaded_versions() == {'document_classifier': '1.0', 'safety_detector': None}
+
+
+def test_shipped_manifest_matches_artifacts():
+    registry = ModelRegistry(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models'))
+    assert registry.resolve('document_classifier')['version']
+
+
+if __name__ == "__main__":
+    print("🧪 Testing model registry")
+    print("=" * 50)
+    failures = 0
+    for test in (test_register_and_resolve, test_unregistered_missing_and_tampered_models_are_unavailable,
+                 test_status_reports_loaded_and_degraded_models, test_shipped_manifest_matches_artifacts):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All registry checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test the in-process OCR handle pool with fake Tesseract handles
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ocr_engine import TesseractPool, create_ocr
+
+
+class FakeHandle:
+    """Records how a handle is used; 'slow' images simulate recognition time"""
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.image = None
+        self.cleared = 0
+
+    def SetImage(self, image):
+        self.image = image
+
+    def GetUTF8Text(self):
+        with self.tracker['lock']:
+            self.tracker['busy'] += 1
+            self.tracker['max_busy'] = max(self.tracker['max_busy'], self.tracker['busy'])
+        try:
+            if self.image == 'broken':
+                raise RuntimeError('recognition failed')
+            time.sleep(0.01)
+            return f'text of {self.image}'
+        finally:
+            with self.tracker['lock']:
+                self.tracker['busy'] -= 1
+
+    def Clear(self):
+        self.image = None
+        self.cleared += 1
+
+    def End(self):
+        self.tracker['ended'] += 1
+
+
+class FakePool(TesseractPool):
+    def __init__(self, size, fail=False):
+        super().__init__(size)
+        self.fail = fail
+        self.handles = []
+        self.tracker = {'lock': threading.Lock(), 'busy': 0, 'max_busy': 0, 'ended': 0}
+
+    def _create_handle(self):
+        if self.fail:
+            raise RuntimeError('Failed to init API, possibly an invalid tessdata path')
+        handle = FakeHandle(self.tracker)
+        self.handles.append(handle)
+        return handle
+
+
+def test_handles_are_bounded_and_reused():
+    pool = FakePool(size=2)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        texts = list(executor.map(pool.image_to_string, [f'page{i}' for i in range(40)]))
+
+    assert texts == [f'text of page{i}' for i in range(40)]
+    assert len(pool.handles) == 2 and pool.tracker['max_busy'] == 2
+    assert sum(handle.cleared for handle in pool.handles) == 40
+    assert pool.status()['handles_loaded'] == 2 and pool.status()['handles_idle'] == 2 and pool.calls == 40
+
+
+def test_failed_recognition_returns_the_handle():
+    pool = FakePool(size=1)
+    try:
+        pool.image_to_string('broken')
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError('recognition errors should propagate')
+    assert pool.handles[0].image is None
+    assert pool.image_to_string('page') == 'text of page' and len(pool.handles) == 1
+
+
+def test_warm_up_loads_one_handle_and_close_ends_them():
+    pool = FakePool(size=4)
+    pool.warm_up()
+    assert pool.status()['handles_loaded'] == 1
+    pool.close()
+    assert pool.tracker['ended'] == 1 and pool.status()['handles_loaded'] == 0
+
+
+def test_failed_handle_creation_is_not_counted():
+    pool = FakePool(size=2, fail=True)
+    for _ in range(3):
+        try:
+            pool.image_to_string('page')
+        except RuntimeError:
+            pass
+    assert pool.status()['handles_loaded'] == 0
+
+    try:
+        create_ocr('tesserocr', tessdata='/nonexistent/tessdata')
+    except Exception:
+        pass
+    else:
+        raise AssertionError('an explicitly requested tesserocr backend must not fall back silently')
+
+
+if __name__ == "__main__":
+    print("🧪 Testing OCR engine pool")
+    print("=" * 50)
+    failures = 0
+    for test in (test_handles_are_bounded_and_reused, test_failed_recognition_returns_the_handle,
+                 test_warm_up_loads_one_handle_and_close_ends_them, test_failed_handle_creation_is_not_counted):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All OCR engine checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test the int8 quantization helpers used by the TFLite safety detector
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from tflite_model import dequantize, quantize
+
+
+def test_input_quantization_round_trips_within_one_step():
+    # Typical calibrated input range for 0-1 images: scale 1/255, zero point -128
+    scale, zero_point = 1 / 255, -128
+    batch = np.random.default_rng(0).random((4, 8, 8, 3), dtype=np.float32)
+    quantized = quantize(batch, scale, zero_point, np.int8)
+    assert quantized.dtype == np.int8
+    assert np.abs(dequantize(quantized, scale, zero_point) - batch).max() <= scale / 2 + 1e-6
+
+
+def test_out_of_range_values_saturate():
+    quantized = quantize(np.array([-1.0, 0.0, 2.0]), 1 / 255, -128, np.int8)
+    assert quantized.tolist() == [-128, -128, 127]
+
+
+def test_float_models_pass_through():
+    batch = np.array([[0.25, 0.75]], dtype=np.float64)
+    assert quantize(batch, 0.0, 0, np.float32).dtype == np.float32
+    assert np.allclose(dequantize(batch, 0.0, 0), batch)
+
+
+def test_softmax_output_dequantizes_to_probabilities():
+    # int8 softmax outputs are fixed by TFLite at scale 1/256, zero point -128
+    output = np.array([[-128, 127, -128]], dtype=np.int8)
+    probabilities = dequantize(output, 1 / 256, -128)
+    assert probabilities.dtype == np.float32
+    assert int(np.argmax(probabilities)) == 1 and abs(float(probabilities[0, 1]) - 255 / 256) < 1e-6
+
+
+if __name__ == "__main__":
+    print("🧪 Testing TFLite quantization helpers")
+    print("=" * 50)
+    failures = 0
+    for test in (test_input_quantization_round_trips_within_one_step, test_out_of_range_values_saturate,
+                 test_float_models_pass_through, test_softmax_output_dequantizes_to_probabilities):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All TFLite helper checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
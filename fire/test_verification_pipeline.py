@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the document verification pipeline: concurrent OCR, one detector batch, error merging
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from verification_pipeline import run_verification_pipeline
+
+OCR_SECONDS = 0.2
+
+
+class FakeClassifier:
+    def __init__(self):
+        self.batches = []
+
+    def classify_batch(self, texts):
+        self.batches.append(list(texts))
+        return [self.classify_document(text) for text in texts]
+
+    def classify_document(self, text):
+        if text == 'garbled':
+            raise ValueError('empty vocabulary')
+        return {'document_type': text, 'confidence': 0.9}
+
+
+class FakeDetector:
+    def __init__(self):
+        self.batches = []
+
+    def detect_equipment_arrays(self, arrays):
+        self.batches.append(list(arrays))
+        return [{'detected_equipment': 'fire_extinguisher', 'confidence': 0.8} for _ in arrays]
+
+
+class FakeEngine:
+    """Stands in for RealAIEngine: OCR blocks like a tesseract subprocess, the 'decoded image' is the path"""
+
+    def __init__(self):
+        self.document_classifier = FakeClassifier()
+        self.safety_detector = FakeDetector()
+        self.ocr_threads = set()
+
+    def read_document(self, file_path):
+        self.ocr_threads.add(threading.current_thread().name)
+        time.sleep(OCR_SECONDS)
+        if file_path.endswith('.missing'):
+            raise FileNotFoundError(file_path)
+        return os.path.splitext(os.path.basename(file_path))[0], file_path
+
+
+def test_ocr_runs_concurrently_and_detector_sees_one_batch_of_decoded_images():
+    engine = FakeEngine()
+    paths = ['uploads/building_plan.jpg', 'uploads/safety_certificate.jpg', 'uploads/insurance.jpg']
+
+    started = time.perf_counter()
+    results, timings = run_verification_pipeline(engine, paths, max_workers=4)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < OCR_SECONDS * 2, f'OCR was not concurrent ({elapsed:.2f}s)'
+    assert len(engine.ocr_threads) == 3
+    assert engine.safety_detector.batches == [paths]
+    assert engine.document_classifier.batches == [['building_plan', 'safety_certificate', 'insurance']]
+    assert [r['classification']['document_type'] for r in results] == ['building_plan', 'safety_certificate', 'insurance']
+    assert all(r['equipment_detection']['detected_equipment'] == 'fire_extinguisher' for r in results)
+    assert timings['documents'] == 3 and timings['ocr_workers'] == 3
+    assert len(timings['per_document_ocr_ms']) == 3
+    assert timings['ocr_ms'] < sum(timings['per_document_ocr_ms'])
+    assert timings['total_ms'] >= timings['ocr_ms']
+
+
+def test_worker_pool_is_bounded():
+    engine = FakeEngine()
+    results, timings = run_verification_pipeline(engine, [f'doc{i}.jpg' for i in range(6)], max_workers=2)
+    assert timings['ocr_workers'] == 2 and len(engine.ocr_threads) == 2
+    assert timings['ocr_ms'] >= OCR_SECONDS * 3 * 1000 * 0.9
+    assert len(results) == 6
+
+
+def test_failed_documents_keep_their_position():
+    engine = FakeEngine()
+    paths = ['building_plan.jpg', 'lost.missing', 'garbled.jpg', 'insurance.jpg']
+    results, _ = run_verification_pipeline(engine, paths)
+
+    assert 'lost.missing' in results[1]['error']
+    assert results[2]['error'] == 'empty vocabulary'
+    assert results[0]['classification']['document_type'] == 'building_plan'
+    assert results[3]['classification']['document_type'] == 'insurance'
+    # Only documents that made it through OCR and classification reach the CNN
+    assert engine.safety_detector.batches == [['building_plan.jpg', 'insurance.jpg']]
+
+
+def test_empty_input():
+    results, timings = run_verification_pipeline(FakeEngine(), [])
+    assert results == [] and timings['documents'] == 0
+
+
+if __name__ == "__main__":
+    print("🧪 Testing document verification pipeline")
+    print("=" * 50)
+    failures = 0
+    for test in (test_ocr_runs_concurrently_and_detector_sees_one_batch_of_decoded_images, test_worker_pool_is_bounded,
+                 test_failed_documents_keep_their_position, test_empty_input):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All pipeline checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test batched keyframe analysis with a synthetic frame stream and a fake detector
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from video_analysis import EquipmentTimeline, analyze_keyframes
+
+
+class FakeDetector:
+    """Sees a fire extinguisher in bright frames and nothing it trusts in dark ones"""
+
+    input_size = 8
+    version = 'test'
+
+    def __init__(self, degraded=False):
+        self.degraded = degraded
+        self.batches = []
+
+    def detect_equipment_arrays(self, arrays):
+        self.batches.append(len(arrays))
+        if self.degraded:
+            return [{'error': 'Safety detector model not loaded', 'degraded': True,
+                     'detected_equipment': 'unknown', 'confidence': 0.0} for _ in arrays]
+        return [
+            {'detected_equipment': 'fire_extinguisher', 'confidence': 0.9}
+            if array.mean() > 0.5 else {'detected_equipment': 'smoke_detector', 'confidence': 0.2}
+            for array in arrays
+        ]
+
+
+def keyframes(count, bright, produced):
+    """One keyframe per second; frames whose second is in `bright` are white"""
+    for second in range(count):
+        produced.append(second)
+        value = 255 if second in bright else 0
+        yield float(second), np.full((8, 8, 3), value, dtype=np.uint8)
+
+
+def test_batches_are_bounded_and_stream_is_consumed_lazily():
+    detector = FakeDetector()
+    produced = []
+    frames_at_first_batch = []
+    original = detector.detect_equipment_arrays
+
+    def detect(arrays):
+        if not frames_at_first_batch:
+            frames_at_first_batch.append(len(produced))
+        return original(arrays)
+
+    detector.detect_equipment_arrays = detect
+    _, analyzed = analyze_keyframes(detector, keyframes(1000, set(), produced), 1.0, batch_size=16)
+
+    assert analyzed == 1000
+    assert max(detector.batches) == 16 and sum(detector.batches) == 1000
+    # Only one batch of frames is pulled from the video before the first detection
+    assert frames_at_first_batch == [16]
+
+
+def test_detections_merge_into_timestamped_segments():
+    detector = FakeDetector()
+    bright = set(range(10, 20)) | set(range(40, 43))
+    progress = []
+    equipment, analyzed = analyze_keyframes(
+        detector, keyframes(60, bright, []), 1.0, batch_size=8,
+        progress=lambda frames, position: progress.append((frames, position))
+    )
+
+    # Low-confidence smoke detector frames are ignored
+    assert list(equipment) == ['fire_extinguisher']
+    extinguisher = equipment['fire_extinguisher']
+    assert extinguisher['detections'] == 13
+    assert extinguisher['first_seen'] == 10.0 and extinguisher['last_seen'] == 42.0
+    assert [(s['start'], s['end']) for s in extinguisher['segments']] == [(10.0, 19.0), (40.0, 42.0)]
+    assert progress[-1] == (60, 59.0) and len(progress) == 8
+
+
+def test_segments_are_capped():
+    timeline = EquipmentTimeline(sample_interval=1.0)
+    for second in range(0, 1000, 2):
+        timeline.add(float(second), {'detected_equipment': 'sprinkler', 'confidence': 0.8})
+    sprinkler = timeline.summary()['sprinkler']
+    assert sprinkler['detections'] == 500
+    assert len(sprinkler['segments']) == 200 and sprinkler['segments_truncated']
+    assert sprinkler['last_seen'] == 998.0
+
+
+def test_degraded_detector_raises():
+    try:
+        analyze_keyframes(FakeDetector(degraded=True), keyframes(5, set(), []), 1.0, batch_size=4)
+    except RuntimeError as e:
+        assert 'not loaded' in str(e)
+    else:
+        raise AssertionError('degraded detector should stop the analysis')
+
+
+if __name__ == "__main__":
+    print("🧪 Testing inspection video analysis")
+    print("=" * 50)
+    failures = 0
+    for test in (test_batches_are_bounded_and_stream_is_consumed_lazily, test_detections_merge_into_timestamped_segments,
+                 test_segments_are_capped, test_degraded_detector_raises):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print("🎉 All video analysis checks passed!" if failures == 0 else f"⚠️ {failures} check(s) failed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+TFLite Inference for Fire NOC System
+Exports a Keras classifier to a full-integer (int8) TFLite artifact and runs it through
+the TFLite interpreter behind the same predict_on_batch() interface as a Keras model,
+so SafetyEquipmentDetector batches work unchanged. The interpreter comes from the
+small tflite-runtime package when installed, otherwise from TensorFlow.
+"""
+
+import os
+import threading
+
+import numpy as np
+
+DEFAULT_THREADS = int(os.environ.get('AI_TFLITE_THREADS', os.cpu_count() or 1))
+
+
+def interpreter_class():
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        from tensorflow.lite import Interpreter
+    return Interpreter
+
+
+def quantize(values, scale, zero_point, dtype):
+    """float -> integer tensor values (no-op for float models, whose scale is 0)"""
+    if not scale:
+        return np.asarray(values, dtype=dtype)
+    info = np.iinfo(dtype)
+    quantized = np.round(np.asarray(values, dtype=np.float32) / scale) + zero_point
+    return np.clip(quantized, info.min, info.max).astype(dtype)
+
+
+def dequantize(values, scale, zero_point):
+    """integer tensor values -> float32"""
+    if not scale:
+        return np.asarray(values, dtype=np.float32)
+    return (np.asarray(values, dtype=np.float32) - zero_point) * np.float32(scale)
+
+
+class TFLiteModel:
+    """A TFLite classifier usable wherever a Keras model's predict_on_batch is"""
+
+    def __init__(self, model_path, num_threads=DEFAULT_THREADS):
+        self.model_path = model_path
+        self.interpreter = interpreter_class()(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self._batch_size = int(self.input['shape'][0])
+        # One interpreter, one set of tensors: calls must not overlap
+        self._lock = threading.Lock()
+
+    def _resize(self, batch_size):
+        if batch_size != self._batch_size:
+            shape = list(self.input['shape'])
+            shape[0] = batch_size
+            self.interpreter.resize_tensor_input(self.input['index'], shape)
+            self.interpreter.allocate_tensors()
+            self.input = self.interpreter.get_input_details()[0]
+            self.output = self.interpreter.get_output_details()[0]
+            self._batch_size = batch_size
+
+    def predict_on_batch(self, batch):
+        in_scale, in_zero_point = self.input['quantization']
+        out_scale, out_zero_point = self.output['quantization']
+        with self._lock:
+            self._resize(len(batch))
+            self.interpreter.set_tensor(self.input['index'], quantize(batch, in_scale, in_zero_point, self.input['dtype']))
+            self.interpreter.invoke()
+            output = self.interpreter.get_tensor(self.output['index'])
+        return dequantize(output, out_scale, out_zero_point)
+
+
+def export_int8(keras_model, representative_images, output_path, samples=100):
+    """
+    Convert a trained Keras model to a full-integer TFLite file, calibrating the
+    activation ranges on representative_images. Returns the artifact size in bytes.
+    """
+    import tensorflow as tf
+
+    def representative_dataset():
+        for image in representative_images[:samples]:
+            yield [np.expand_dims(image, 0).astype(np.float32)]
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(converter.convert())
+    os.replace(tmp_path, output_path)
+    return os.path.getsize(output_path)
@@ -25,6 +25,7 @@ def install_requirements():
         "opencv-python>=4.6.0",
         "pillow>=9.0.0",
         "pytesseract>=0.3.10",
+        "tesserocr>=2.6.0",
         "numpy>=1.21.0"
     ]
     
@@ -119,7 +120,9 @@ def train_document_classifier():
     """Train document classification model with enhanced data"""
     print("🤖 Training Enhanced Document Classifier...")
     
-    classifier = DocumentClassifier()
+    # AI_CLASSIFIER_BACKEND=hashing builds the feature-hashing + linear model (supports partial_fit).
+    # Explicit, so a full retrain never replaces an incrementally trained hashing model by default
+    classifier = DocumentClassifier(backend=os.environ.get('AI_CLASSIFIER_BACKEND', 'forest'))
     
     # Get enhanced training data
     document_data, _ = create_enhanced_training_data()
@@ -153,6 +156,7 @@ def train_safety_detector():
     """Train safety equipment detection model"""
     print("🤖 Training Safety Equipment Detector...")
     
+    # AI_DETECTOR_ARCH=compact builds the separable-conv/GAP variant exported as int8 TFLite
     detector = SafetyEquipmentDetector()
     
     # Train model (uses synthetic data for now)
@@ -291,6 +295,7 @@ def main():
     if all(results.values()):
         print("\n🎉 All AI models trained successfully!")
         print("📁 Models saved in 'models/' directory")
+        print("📦 Versions and checksums recorded in models/manifest.json (the app loads only registered artifacts)")
         print("🔧 Models are now ready for integration with Fire NOC system")
         
         print("\n📋 Next Steps:")
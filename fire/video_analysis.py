@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Inspection Video Analysis for Fire NOC System
+Streams an uploaded inspection video through OpenCV, samples keyframes at a fixed
+rate and runs the safety equipment detector on them in fixed-size batches. Only one
+batch of frames is ever held in memory, so long videos cost time, not memory.
+Detections are summarised per equipment type as timestamped segments.
+"""
+
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+DEFAULT_SAMPLE_FPS = float(os.environ.get('VIDEO_SAMPLE_FPS', 1.0))
+DEFAULT_BATCH_SIZE = int(os.environ.get('VIDEO_BATCH_SIZE', 16))
+# Keyframes below this confidence don't count as a sighting
+MIN_CONFIDENCE = float(os.environ.get('VIDEO_MIN_CONFIDENCE', 0.5))
+# Bound on stored segments per equipment type (flickering detections on long videos)
+MAX_SEGMENTS = 200
+# Container frame rate when the file doesn't report one
+FALLBACK_FPS = 25.0
+
+
+def video_info(path):
+    """(fps, frame_count, duration_seconds) from the container header"""
+    import cv2
+
+    capture = cv2.VideoCapture(path)
+    try:
+        if not capture.isOpened():
+            raise ValueError(f"Cannot open video: {path}")
+        fps = capture.get(cv2.CAP_PROP_FPS) or FALLBACK_FPS
+        frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        return fps, frame_count, frame_count / fps if frame_count else None
+    finally:
+        capture.release()
+
+
+def iter_keyframes(path, sample_fps=DEFAULT_SAMPLE_FPS, size=224):
+    """
+    Yield (timestamp_seconds, frame) for one frame every 1/sample_fps seconds, each
+    resized to size x size BGR uint8. Skipped frames are only grabbed, never converted.
+    """
+    import cv2
+
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise ValueError(f"Cannot open video: {path}")
+    try:
+        fps = capture.get(cv2.CAP_PROP_FPS) or FALLBACK_FPS
+        step = max(1, int(round(fps / sample_fps)))
+        index = 0
+        while True:
+            if index % step:
+                if not capture.grab():
+                    break
+            else:
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                yield index / fps, cv2.resize(frame, (size, size), interpolation=cv2.INTER_AREA)
+            index += 1
+    finally:
+        capture.release()
+
+
+class EquipmentTimeline:
+    """Per-equipment detection counts and merged [start, end] sighting segments"""
+
+    def __init__(self, sample_interval, min_confidence=MIN_CONFIDENCE):
+        # Sightings further apart than this start a new segment
+        self.max_gap = sample_interval * 1.5
+        self.min_confidence = min_confidence
+        self.equipment = {}
+
+    def add(self, timestamp, detection):
+        if 'error' in detection or detection.get('confidence', 0.0) < self.min_confidence:
+            return
+        name = detection['detected_equipment']
+        confidence = round(detection['confidence'], 4)
+        entry = self.equipment.get(name)
+        if entry is None:
+            entry = self.equipment[name] = {
+                'detections': 0,
+                'max_confidence': 0.0,
+                'first_seen': timestamp,
+                'last_seen': timestamp,
+                'segments': [],
+                'segments_truncated': False
+            }
+
+        entry['detections'] += 1
+        entry['max_confidence'] = max(entry['max_confidence'], confidence)
+        segments = entry['segments']
+        if segments and timestamp - segments[-1]['end'] <= self.max_gap:
+            segments[-1]['end'] = timestamp
+            segments[-1]['max_confidence'] = max(segments[-1]['max_confidence'], confidence)
+        elif len(segments) < MAX_SEGMENTS:
+            segments.append({'start': timestamp, 'end': timestamp, 'max_confidence': confidence})
+        else:
+            entry['segments_truncated'] = True
+        entry['last_seen'] = timestamp
+
+    def summary(self):
+        return self.equipment
+
+
+def analyze_keyframes(detector, keyframes, sample_interval, batch_size=DEFAULT_BATCH_SIZE, progress=None,
+                      min_confidence=MIN_CONFIDENCE):
+    """
+    Run the detector over an iterable of (timestamp, BGR uint8 frame) in batches of
+    batch_size, reusing one preallocated float32 buffer. progress(frames_analyzed,
+    position_seconds) is called after every batch. Returns (equipment summary,
+    frames_analyzed), or raises RuntimeError if the detector is running degraded.
+    """
+    size = detector.input_size
+    buffer = np.empty((batch_size, size, size, 3), dtype=np.float32)
+    timestamps = [0.0] * batch_size
+    timeline = EquipmentTimeline(sample_interval, min_confidence)
+    analyzed = 0
+    filled = 0
+
+    def flush(count):
+        detections = detector.detect_equipment_arrays(buffer[:count])
+        if detections and detections[0].get('degraded'):
+            raise RuntimeError(detections[0].get('error', 'Safety detector model not loaded'))
+        for timestamp, detection in zip(timestamps, detections):
+            timeline.add(timestamp, detection)
+
+    for timestamp, frame in keyframes:
+        # Same scaling as image_preprocessing.to_cnn_input (BGR, 0-1)
+        np.multiply(frame, np.float32(1.0 / 255.0), out=buffer[filled], casting='unsafe')
+        timestamps[filled] = round(timestamp, 3)
+        filled += 1
+        if filled == batch_size:
+            flush(filled)
+            analyzed += filled
+            filled = 0
+            if progress:
+                progress(analyzed, timestamp)
+
+    if filled:
+        flush(filled)
+        analyzed += filled
+        if progress:
+            progress(analyzed, timestamps[filled - 1])
+
+    return timeline.summary(), analyzed
+
+
+def analyze_video(detector, path, sample_fps=DEFAULT_SAMPLE_FPS, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Keyframe analysis of one video file. progress(dict) receives frames_analyzed,
+    position_seconds, duration_seconds and percent after every batch.
+    """
+    started = time.perf_counter()
+    fps, frame_count, duration = video_info(path)
+
+    def report(frames_analyzed, position):
+        if progress:
+            progress({
+                'frames_analyzed': frames_analyzed,
+                'position_seconds': round(position, 1),
+                'duration_seconds': round(duration, 1) if duration else None,
+                'percent': min(100, int(position / duration * 100)) if duration else None
+            })
+
+    equipment, analyzed = analyze_keyframes(
+        detector, iter_keyframes(path, sample_fps, detector.input_size), 1.0 / sample_fps, batch_size, report
+    )
+    return {
+        'duration_seconds': round(duration, 2) if duration else None,
+        'video_fps': round(fps, 2),
+        'sample_fps': sample_fps,
+        'frames_analyzed': analyzed,
+        'equipment': equipment,
+        'equipment_detected': sorted(equipment),
+        'min_confidence': MIN_CONFIDENCE,
+        'model_version': detector.version,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        'analyzed_at': datetime.now().isoformat()
+    }